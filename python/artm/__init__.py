@@ -8,4 +8,6 @@ from .regularizers import *
 from .scores import *
 from .batches_utils import *
 from .master_component import MasterComponent
+from .inference_session import InferenceSession
+from .transform_coalescer import TransformCoalescer
 from .wrapper import messages_pb2 as messages
@@ -10,18 +10,22 @@ import numpy
 import datetime
 import json
 import pickle
+import threading
+import contextlib
+import multiprocessing
 
-from pandas import DataFrame
 from six import iteritems, string_types
 from six.moves import range, zip
 from multiprocessing.pool import ThreadPool, ApplyResult
 from copy import deepcopy
-import tqdm
 
 from . import wrapper
 from .wrapper import constants as const
 from .wrapper import messages_pb2 as messages
+from .wrapper.exceptions import InvalidOperationException, OperationCancelledException
 from . import master_component as mc
+from .inference_session import InferenceSession
+from .transform_coalescer import TransformCoalescer
 
 from .regularizers import Regularizers
 from .regularizers import *
@@ -91,15 +95,91 @@ def _topic_selection_regularizer_func(self, regularizers):
             self.regularizers[name].config = config
 
 
+def _save_raw_as_npy(raw_path, npy_path, dtype, shape):
+    # raw_path contains values of C-ordered array without any header, they are copied after npy header
+    header = {'descr': numpy.lib.format.dtype_to_descr(numpy.dtype(dtype)), 'fortran_order': False, 'shape': shape}
+    with open(npy_path, 'wb') as fout:
+        numpy.lib.format.write_array_header_1_0(fout, header)
+        with open(raw_path, 'rb') as fin:
+            shutil.copyfileobj(fin, fout)
+
+
+def _dense_to_csr(nd_array, row_indices, col_indices, eps, chunk_size=1 << 22):
+    # converts the slice of nd_array into CSR arrays, values with abs(value) <= eps are skipped (as in the core);
+    # rows are processed in chunks of about chunk_size values, so no dense copy of the whole slice is made
+    num_rows = nd_array.shape[0] if row_indices is None else len(row_indices)
+    num_cols = nd_array.shape[1] if col_indices is None else len(col_indices)
+    chunk_rows = max(1, chunk_size // max(1, num_cols))
+
+    row_sizes = [numpy.zeros(0, dtype=numpy.int64)]
+    indices = [numpy.zeros(0, dtype=numpy.int32)]
+    values = [numpy.zeros(0, dtype=nd_array.dtype)]
+    for begin in range(0, num_rows, chunk_rows):
+        end = min(begin + chunk_rows, num_rows)
+        block = nd_array[begin: end] if row_indices is None else nd_array[row_indices[begin: end]]
+        if col_indices is not None:
+            block = block[:, col_indices]
+
+        block_rows, block_cols = numpy.nonzero(numpy.abs(block) > eps)
+        row_sizes.append(numpy.bincount(block_rows, minlength=end - begin))
+        indices.append(block_cols.astype(numpy.int32))
+        values.append(block[block_rows, block_cols])
+
+    indptr = numpy.zeros(num_rows + 1, dtype=numpy.int64)
+    numpy.cumsum(numpy.concatenate(row_sizes), out=indptr[1:])
+    return indptr, numpy.concatenate(indices), numpy.concatenate(values)
+
+
+class _AsyncOperation(object):
+    # one asyncio call of ARTM, that is cancelled independently of the others, see ARTM._run_in_executor()
+    def __init__(self):
+        self.id = str(uuid.uuid4())
+        self.cancelled = False
+
+
 class ArtmThreadPool(object):
     def __init__(self, async=True):
-        self._pool = ThreadPool(processes=1) if async else None
+        self._async = async
+        self._pool = None  # created on first use, see apply_async()
+        self._pool_lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextlib.contextmanager
+    def synchronous(self, operation=None):
+        # calls from current thread bypass the pool, e.g. when they are already run on an executor;
+        # operation (an instance of _AsyncOperation) is reported to them by current_operation()
+        previous = (getattr(self._local, 'synchronous', False), self.current_operation())
+        self._local.synchronous, self._local.operation = True, operation
+        try:
+            yield
+        finally:
+            self._local.synchronous, self._local.operation = previous
+
+    def current_operation(self):
+        return getattr(self._local, 'operation', None)
 
     def apply_async(self, func, args):
-        return self._pool.apply_async(func, args) if self._pool else func(*args)
+        if not self._async or getattr(self._local, 'synchronous', False):
+            return func(*args)
+
+        # the pool is shared by all calls and has several workers, so calls from different threads are not serialized;
+        # workers mostly wait for native calls, so their number is chosen as in concurrent.futures.ThreadPoolExecutor
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPool(processes=min(32, multiprocessing.cpu_count() + 4))
+        return self._pool.apply_async(func, args)
+
+    def close(self):
+        # stops worker threads, the pool will be re-created if apply_async() is called again
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.terminate()
+            pool.join()
 
     def __deepcopy__(self, memo):
-        return self
+        # copies get pools of their own, so that disposing of one copy doesn't affect the others
+        return ArtmThreadPool(async=self._async)
 
 
 class ARTM(object):
@@ -239,7 +319,7 @@ class ARTM(object):
         self._model_nwt = 'nwt'
         self._theta_name = theta_name
 
-        self._lib = wrapper.LibArtm()
+        self._lib = wrapper.shared_lib()
         master_config = messages.MasterModelConfig()
         if theta_name:
             master_config.ptd_name = theta_name
@@ -272,7 +352,10 @@ class ARTM(object):
         self._synchronizations_processed = 0
         self._initialized = False
         self._phi_cached = None  # This field will be set during .phi_ call
+        self._phi_snapshots = {}  # model_name -> (version, data, rows, columns), see _get_phi_snapshot()
+        self._top_tokens_cached = {}  # This field will be filled during .get_top_tokens() calls
         self._num_online_processed_batches = 0
+        self._cancel_generation = 0  # incremented by each cancel() call
 
         # temp code for easy using of TopicSelectionThetaRegularizer from Python
         self._internal_topic_mass_score_name = None
@@ -293,6 +376,7 @@ class ARTM(object):
           * ARTM class implements __exit__ and __del___ methods,
             which automatically call dispose.
         """
+        self._pool.close()
         if self._master is not None:
             self._lib.ArtmDisposeMasterComponent(self.master.master_id)
             self._master = None
@@ -422,9 +506,15 @@ class ARTM(object):
 
     @property
     def phi_(self):
-        if self._phi_cached is None:
-            self._phi_cached = self.get_phi()
-        return self._phi_cached
+        if not self._initialized:
+            raise RuntimeError('Model does not exist yet. Use ARTM.initialize()/ARTM.fit_*()')
+
+        version, nd_array, tokens, topic_names = self._get_phi_snapshot(self.model_pwt)
+        if version is None or self._phi_cached is None or self._phi_cached[0] != version:
+            from pandas import DataFrame
+
+            self._phi_cached = (version, DataFrame(data=nd_array, columns=topic_names, index=tokens))
+        return self._phi_cached[1]
 
     @property
     def info(self):
@@ -531,6 +621,7 @@ class ARTM(object):
         if not(isinstance(async_result, ApplyResult)):
             return async_result
 
+        import tqdm
         import warnings
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore", category=DeprecationWarning)
@@ -546,6 +637,33 @@ class ARTM(object):
                     previous_num_batches = current_num_batches
                 return async_result.get()
 
+    def _run_in_executor(self, func, args, loop=None, executor=None):
+        import asyncio
+
+        if loop is None:
+            loop = asyncio.get_event_loop()
+
+        started = threading.Event()
+        operation = _AsyncOperation()
+
+        def _job():
+            started.set()
+            with self._pool.synchronous(operation):
+                return func(*args)
+
+        # the native calls release GIL, so the event loop is free while the job is waiting for batches,
+        # and the completion is delivered to the loop via call_soon_threadsafe, without any polling
+        future = loop.run_in_executor(executor, _job)
+
+        def _on_done(done_future):
+            # only this call is cancelled, the calls of the model from other futures and threads go on
+            if done_future.cancelled() and started.is_set():
+                operation.cancelled = True
+                self.master.cancel_operation(operation.id)
+
+        future.add_done_callback(_on_done)
+        return future
+
     # ========== METHODS ==========
     def fit_offline(self, batch_vectorizer=None, num_collection_passes=1, reset_nwt=True):
         """
@@ -564,12 +682,22 @@ class ARTM(object):
         # outer cycle is needed because of TopicSelectionThetaRegularizer
         # and current ScoreTracker implementation
 
+        cancel_generation = self._cancel_generation
+        operation = self._pool.current_operation()
+        operation_id = operation.id if operation is not None else None
+        import tqdm
         import warnings
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore", category=DeprecationWarning)
             progress = tqdm.tnrange if _run_from_notebook() else tqdm.trange
             for _ in progress(num_collection_passes, desc='Pass',
                               disable=not self._show_progress_bars):
+                # cancel() might be called between two passes, when there is nothing to cancel in the core
+                if self._cancel_generation != cancel_generation:
+                    raise OperationCancelledException('fit_offline() was cancelled by ARTM.cancel()')
+                if operation is not None and operation.cancelled:
+                    raise OperationCancelledException('afit_offline() future was cancelled')
+
                 # temp code for easy using of TopicSelectionThetaRegularizer from Python
                 _topic_selection_regularizer_func(self, self._regularizers)
 
@@ -577,7 +705,7 @@ class ARTM(object):
                 self._wait_for_batches_processed(
                     self._pool.apply_async(func=self.master.fit_offline,
                                            args=(batch_vectorizer.batches_ids,
-                                                 batch_vectorizer.weights, 1, None, reset_nwt)),
+                                                 batch_vectorizer.weights, 1, None, reset_nwt, operation_id)),
                     batch_vectorizer.num_batches)
 
                 for name in self.scores.data.keys():
@@ -585,8 +713,6 @@ class ARTM(object):
                         self.score_tracker[name] =\
                             SCORE_TRACKER[self.scores[name].type](self.scores[name])
 
-        self._phi_cached = None
-
     def fit_online(self, batch_vectorizer=None, tau0=1024.0, kappa=0.7, update_every=1,
                    apply_weight=None, decay_weight=None, update_after=None, async=False):
         """
@@ -644,11 +770,13 @@ class ARTM(object):
         # temp code for easy using of TopicSelectionThetaRegularizer from Python
         _topic_selection_regularizer_func(self, self._regularizers)
 
+        operation = self._pool.current_operation()
         self._wait_for_batches_processed(
             self._pool.apply_async(func=self.master.fit_online,
                                    args=(batch_vectorizer.batches_ids, batch_vectorizer.weights,
                                          update_after_final, apply_weight_final,
-                                         decay_weight_final, async)),
+                                         decay_weight_final, async,
+                                         operation.id if operation is not None else None)),
             batch_vectorizer.num_batches)
 
         for name in self.scores.data.keys():
@@ -657,7 +785,62 @@ class ARTM(object):
                     SCORE_TRACKER[self.scores[name].type](self.scores[name])
 
         self._synchronizations_processed += len(update_after_final)
-        self._phi_cached = None
+
+    def cancel(self):
+        """
+        :Description: cancels fit_offline(), fit_online() and transform() calls of this model,\
+                      that run at the moment in other threads
+
+        :Note:
+          * all pending batches are removed from the processor queue,\
+            while the batches being processed at the moment are finished.
+          * cancelled calls raise OperationCancelledException.
+          * fit_offline() and fit_online() stop at the end of current pass (or update),\
+            so p_wt is always normalized from n_wt, accumulated over all completely processed batches.\
+            Scores of the interrupted pass are not stored in score_tracker.
+          * this method cancels all operations of the model, that run concurrently,\
+            and does nothing if there are no such operations.
+        """
+        self._cancel_generation += 1
+        self.master.cancel_operation()
+
+    def afit_offline(self, batch_vectorizer=None, num_collection_passes=1, reset_nwt=True,
+                     loop=None, executor=None):
+        """
+        :Description: asyncio version of ARTM.fit_offline()
+
+        :param object_referenece batch_vectorizer: an instance of BatchVectorizer class
+        :param int num_collection_passes: number of iterations over whole given collection
+        :param bool reset_nwt: a flag indicating whether to reset n_wt matrix to 0.
+        :param loop: asyncio event loop, the current one will be used if not specified
+        :param executor: concurrent.futures.Executor to run the learning on,\
+                the default executor of the loop will be used if not specified
+
+        :return: asyncio.Future, that is done when the learning is finished
+
+        :Note:
+          * cancellation of a started future cancels only this call, like ARTM.cancel() does for all calls.\
+            The batches being processed at the moment are finished in background.
+          * the progress bar of batches is not shown for asyncio calls.
+        """
+        return self._run_in_executor(self.fit_offline,
+                                     (batch_vectorizer, num_collection_passes, reset_nwt),
+                                     loop=loop, executor=executor)
+
+    def afit_online(self, batch_vectorizer=None, tau0=1024.0, kappa=0.7, update_every=1,
+                    apply_weight=None, decay_weight=None, update_after=None, async=False,
+                    loop=None, executor=None):
+        """
+        :Description: asyncio version of ARTM.fit_online(), see it for the description\
+                      of parameters and ARTM.afit_offline() for the description of loop,\
+                      executor and cancellation
+
+        :return: asyncio.Future, that is done when the learning is finished
+        """
+        return self._run_in_executor(self.fit_online,
+                                     (batch_vectorizer, tau0, kappa, update_every,
+                                      apply_weight, decay_weight, update_after, async),
+                                     loop=loop, executor=executor)
 
     def save(self, filename, model_name='p_wt'):
         """
@@ -724,6 +907,8 @@ class ARTM(object):
         self._synchronizations_processed = 0
         self._num_online_processed_batches = 0
         self._phi_cached = None
+        self._phi_snapshots = {}
+        self._top_tokens_cached = {}
 
     def get_phi_dense(self, topic_names=None, class_ids=None, model_name=None):
         """
@@ -741,26 +926,26 @@ class ARTM(object):
           * data --- numpy.ndarray with Phi data (i.e., p(w|t) values)
           * rows --- the tokens of topic model;
           * columns --- the names of topics in topic model;
+
+        :Note:
+          * the whole matrix is fetched from the core only once per its modification,\
+            requested topics and class ids are sliced from this cached snapshot.
         """
         if not self._initialized:
             raise RuntimeError('Model does not exist yet. Use ARTM.initialize()/ARTM.fit_*()')
 
         valid_model_name = self.model_pwt if model_name is None else model_name
+        snapshot = self._get_phi_snapshot(valid_model_name)
+        row_indices, col_indices, tokens, topic_names = self._slice_phi_snapshot(
+            snapshot, valid_model_name, topic_names=topic_names, class_ids=class_ids)
+        nd_array = snapshot[1]
+        if row_indices is not None:
+            nd_array = nd_array[row_indices, :]
+        if col_indices is not None:
+            nd_array = nd_array[:, col_indices]
+        if row_indices is None and col_indices is None:
+            nd_array = nd_array.copy()
 
-        info = self.master.get_phi_info(valid_model_name)
-
-        if isinstance(topic_names, string_types):
-            topic_names = [topic_names]
-        if isinstance(class_ids, string_types):
-            class_ids = [class_ids]
-
-        _, nd_array = self.master.get_phi_matrix(model=valid_model_name,
-                                                 topic_names=topic_names,
-                                                 class_ids=class_ids)
-
-        tokens = [(c, t) for t, c in zip(info.token, info.class_id) if (class_ids is None or c in class_ids)]
-        topic_names = [topic_name for topic_name in info.topic_name
-                       if topic_names is None or topic_name in topic_names]
         return nd_array, tokens, topic_names
 
     def get_phi(self, topic_names=None, class_ids=None, model_name=None):
@@ -784,6 +969,8 @@ class ARTM(object):
         (nd_array, tokens, topic_names) = self.get_phi_dense(topic_names=topic_names,
                                                              class_ids=class_ids,
                                                              model_name=model_name)
+        from pandas import DataFrame
+
         phi_data_frame = DataFrame(data=nd_array,
                                    columns=topic_names,
                                    index=tokens)
@@ -807,50 +994,161 @@ class ARTM(object):
           * data --- scipy.sparse.csr_matrix with values
           * columns --- the names of topics in topic model;
           * rows --- the tokens of topic model;
+
+        :Note:
+          * if Phi snapshot is cached and up to date (see ARTM.get_phi_dense()), the result\
+            is built from this snapshot, otherwise the matrix is exported from the core.
         """
         from scipy import sparse
 
         if not self._initialized:
             raise RuntimeError('Model does not exist yet. Use ARTM.initialize()/ARTM.fit_*()')
 
-        args = messages.GetTopicModelArgs()
-        args.matrix_layout = wrapper.constants.MatrixLayout_Sparse
-        if model_name is not None:
-            args.model_name = model_name
-        if eps is not None:
-            args.eps = eps
-        if topic_names is not None:
-            if isinstance(topic_names, string_types):
-                topic_names = [topic_names]
-            for topic_name in topic_names:
-                args.topic_name.append(topic_name)
-        if class_ids is not None:
-            if isinstance(class_ids, string_types):
-                class_ids = [class_ids]
-            for class_id in class_ids:
-                args.class_id.append(class_id)
-
-        tm = self._lib.ArtmRequestTopicModelExternal(self.master.master_id, args)
+        valid_model_name = self.model_pwt if model_name is None else model_name
+        if isinstance(topic_names, string_types):
+            topic_names = [topic_names]
+        if isinstance(class_ids, string_types):
+            class_ids = [class_ids]
 
-        numpy_ndarray = numpy.zeros(shape=(3 * tm.num_values, 1), dtype=numpy.float32)
-        self._lib.ArtmCopyRequestedObject(numpy_ndarray)
+        snapshot = self._phi_snapshots.get(valid_model_name)
+        if snapshot is not None and snapshot[0] == self.master.get_phi_version(valid_model_name):
+            valid_eps = messages.GetTopicModelArgs().eps if eps is None else eps
+            row_indices, col_indices, rows, columns = self._slice_phi_snapshot(
+                snapshot, valid_model_name, topic_names=topic_names, class_ids=class_ids)
+            indptr, indices, values = _dense_to_csr(snapshot[1], row_indices, col_indices, valid_eps)
+            data = sparse.csr_matrix((values, indices, indptr), shape=(len(rows), len(columns)), copy=False)
+            return data, rows, columns
 
-        row_ind = numpy.frombuffer(numpy_ndarray.tobytes(), dtype=numpy.int32,
-                                   count=tm.num_values, offset=0)
-        col_ind = numpy.frombuffer(numpy_ndarray.tobytes(), dtype=numpy.int32,
-                                   count=tm.num_values, offset=4*tm.num_values)
-        data = numpy.frombuffer(numpy_ndarray.tobytes(), dtype=numpy.float32,
-                                count=tm.num_values, offset=8*tm.num_values)
+        tm, indptr, indices, values = self.master.get_phi_matrix_csr(model=valid_model_name,
+                                                                     topic_names=topic_names,
+                                                                     class_ids=class_ids,
+                                                                     eps=eps)
 
         # Rows correspond to tokens; get tokens from tm.token
         # Columns correspond to topics; get topic names from tm.topic_name
-        data = sparse.csr_matrix((data, (row_ind, col_ind)),
-                                 shape=(len(tm.token), len(tm.topic_name)))
+        data = sparse.csr_matrix((values, indices, indptr),
+                                 shape=(len(tm.token), len(tm.topic_name)), copy=False)
+        rows = [(c, t) for t, c in zip(tm.token, tm.class_id)]
         columns = list(tm.topic_name)
-
-        rows = [(c, t) in zip(tm.token, tm.class_id)]
         return data, rows, columns
 
+    def _get_phi_snapshot(self, model_name):
+        """
+        :Description: returns a read-only copy of the whole Phi matrix,\
+                      which is re-fetched from the core only if the matrix has changed
+
+        :param str model_name: name of the matrix in the core
+
+        :return:
+          * a 4-tuple of (version, data, rows, columns), where
+          * version --- version of the matrix in the core (None for attached matrices,\
+            which are never cached, see MasterComponent.get_phi_version());
+          * data --- read-only numpy.ndarray with Phi data;
+          * rows --- the tokens of topic model;
+          * columns --- the names of topics in topic model.
+        """
+        # version is requested first, so a concurrent update can only lead to an extra re-fetch
+        version = self.master.get_phi_version(model_name)
+        snapshot = self._phi_snapshots.get(model_name)
+        if version is None or snapshot is None or snapshot[0] != version:
+            info, nd_array = self.master.get_phi_matrix(model=model_name)
+            nd_array.flags.writeable = False
+            tokens = [(c, t) for t, c in zip(info.token, info.class_id)]
+            snapshot = (version, nd_array, tokens, list(info.topic_name))
+            if version is None:
+                self._phi_snapshots.pop(model_name, None)
+            else:
+                self._phi_snapshots[model_name] = snapshot
+        return snapshot
+
+    def _slice_phi_snapshot(self, snapshot, model_name, topic_names=None, class_ids=None):
+        """
+        :Description: finds rows and columns of Phi snapshot for given topics and class ids
+
+        :return:
+          * a 4-tuple of (row_indices, col_indices, rows, columns), where
+          * row_indices, col_indices --- lists of indices to take from the snapshot,\
+            None means that all rows (or columns) should be taken;
+          * rows --- the tokens, that correspond to row_indices;
+          * columns --- the names of topics, that correspond to col_indices.
+        """
+        _, _, all_tokens, all_topic_names = snapshot
+
+        if isinstance(topic_names, string_types):
+            topic_names = [topic_names]
+        if isinstance(class_ids, string_types):
+            class_ids = [class_ids]
+
+        row_indices, rows = None, all_tokens
+        if class_ids is not None:
+            class_ids = set(class_ids)
+            row_indices = [i for i, (c, _) in enumerate(all_tokens) if c in class_ids]
+            rows = [all_tokens[i] for i in row_indices]
+
+        col_indices, columns = None, all_topic_names
+        if topic_names is not None:
+            topic_index = {topic_name: i for i, topic_name in enumerate(all_topic_names)}
+            for topic_name in topic_names:
+                if topic_name not in topic_index:
+                    raise InvalidOperationException(
+                        'Topic {0} does not exist in matrix {1}'.format(topic_name, model_name))
+            col_indices = [topic_index[topic_name] for topic_name in topic_names]
+            columns = list(topic_names)
+
+        return row_indices, col_indices, rows, columns
+
+    def get_top_tokens(self, num_tokens=10, topic_names=None, class_ids=None, model_name=None):
+        """
+        :Description: get indices and weights of the most probable tokens for each topic.\
+                      The selection is performed in the core without Phi matrix extraction.
+
+        :param int num_tokens: number of top tokens to be returned for each topic
+        :param topic_names: list with topics or single topic to extract, None value means all topics
+        :type topic_names: list of str or str or None
+        :param class_ids: list with class_ids or single class_id to select tokens from,\
+                          None means all class ids
+        :type class_ids: list of str or str or None
+        :param str model_name: self.model_pwt by default
+
+        :return:
+          * a 3-tuple of (token_indices, weights, columns), where
+          * token_indices --- numpy.ndarray of shape (num_topics, num_tokens) with indices\
+            of tokens, that correspond to rows of ARTM.phi_;
+          * weights --- numpy.ndarray of shape (num_topics, num_tokens) with p(w|t) values,\
+            sorted in descending order within each topic;
+          * columns --- the names of topics in topic model.
+
+        :Note:
+          * results are cached until the next modification of Phi matrix,\
+            returned arrays are read-only.
+        """
+        if not self._initialized:
+            raise RuntimeError('Model does not exist yet. Use ARTM.initialize()/ARTM.fit_*()')
+
+        valid_model_name = self.model_pwt if model_name is None else model_name
+        if isinstance(topic_names, string_types):
+            topic_names = [topic_names]
+        if isinstance(class_ids, string_types):
+            class_ids = [class_ids]
+
+        version = self.master.get_phi_version(valid_model_name)
+        key = (valid_model_name, num_tokens,
+               None if topic_names is None else tuple(topic_names),
+               None if class_ids is None else tuple(class_ids))
+        cached = self._top_tokens_cached.get(key)
+        if version is None or cached is None or cached[0] != version:
+            info, token_indices, weights = self.master.get_top_tokens(model=valid_model_name,
+                                                                      num_tokens=num_tokens,
+                                                                      topic_names=topic_names,
+                                                                      class_ids=class_ids)
+            token_indices.flags.writeable = False
+            weights.flags.writeable = False
+            cached = (version, (token_indices, weights, list(info.topic_name)))
+            if version is not None:
+                self._top_tokens_cached[key] = cached
+
+        return cached[1]
+
     def get_theta(self, topic_names=None):
         """
         :Description: get Theta matrix for training set of documents (or cached after transform)
@@ -883,6 +1181,8 @@ class ARTM(object):
         use_topic_names = topic_names if topic_names is not None else all_topic_names
         _, nd_array = self.master.get_theta_matrix(topic_names=use_topic_names)
 
+        from pandas import DataFrame
+
         theta_data_frame = DataFrame(data=nd_array.transpose(),
                                      columns=column_names,
                                      index=use_topic_names)
@@ -909,31 +1209,14 @@ class ARTM(object):
         if not self._initialized:
             raise RuntimeError('Model does not exist yet. Use ARTM.initialize()/ARTM.fit_*()')
 
-        args = messages.GetThetaMatrixArgs()
-        args.matrix_layout = wrapper.constants.MatrixLayout_Sparse
-        if eps is not None:
-            args.eps = eps
-        if topic_names is not None:
-            if isinstance(topic_names, string_types):
-                topic_names = [topic_names]
-            for topic_name in topic_names:
-                args.topic_name.append(topic_name)
-        theta = self._lib.ArtmRequestThetaMatrixExternal(self.master.master_id, args)
-
-        numpy_ndarray = numpy.zeros(shape=(3 * theta.num_values, 1), dtype=numpy.float32)
-        self._lib.ArtmCopyRequestedObject(numpy_ndarray)
-
-        col_ind = numpy.frombuffer(numpy_ndarray.tobytes(), dtype=numpy.int32,
-                                   count=theta.num_values, offset=0)
-        row_ind = numpy.frombuffer(numpy_ndarray.tobytes(), dtype=numpy.int32,
-                                   count=theta.num_values, offset=4*theta.num_values)
-        data = numpy.frombuffer(numpy_ndarray.tobytes(), dtype=numpy.float32,
-                                count=theta.num_values, offset=8*theta.num_values)
+        if isinstance(topic_names, string_types):
+            topic_names = [topic_names]
+        theta, indptr, indices, values = self.master.get_theta_matrix_csr(topic_names=topic_names, eps=eps)
 
         # Rows correspond to topics; get topic names from theta.topic_name
         # Columns correspond to items; get item IDs from theta.item_id
-        data = sparse.csr_matrix((data, (row_ind, col_ind)),
-                                 shape=(len(theta.topic_name), len(theta.item_id)))
+        data = sparse.csr_matrix((values, indices, indptr),
+                                 shape=(len(theta.topic_name), len(theta.item_id)), copy=False)
         rows = list(theta.topic_name)
         columns = list(theta.item_title) if self._theta_columns_naming == 'title' else list(theta.item_id)
         return data, rows, columns
@@ -952,17 +1235,22 @@ class ARTM(object):
         """
         return self.master.get_score(score_name)
 
-    def transform(self, batch_vectorizer=None, theta_matrix_type='dense_theta', predict_class_id=None):
+    def transform(self, batch_vectorizer=None, theta_matrix_type='dense_theta', predict_class_id=None,
+                  eps=None, num_top_topics=None):
         """
         :Description: find Theta matrix for new documents
 
         :param object_reference batch_vectorizer: an instance of BatchVectorizer class
         :param str theta_matrix_type: type of matrix to be returned, possible values:
-                'dense_theta', 'dense_ptdw', 'cache', None, default='dense_theta'
+                'dense_theta', 'dense_ptdw', 'sparse_theta', 'sparse_ptdw', 'cache', None,
+                default='dense_theta'
         :param str predict_class_id: class_id of a target modality to predict.\
                 When this option is enabled the resulting columns of theta matrix will\
                 correspond to unique labels of a target modality. The values will represent\
                 p(c|d), which give the probability of class label c for document d.
+        :param float eps: threshold to consider values as zero, used only in sparse modes
+        :param int num_top_topics: max number of topics with highest values to keep\
+                for each document, used only in sparse modes (None means all topics)
 
         :return:
           * pandas.DataFrame: (data, columns, rows), where:
@@ -970,6 +1258,11 @@ class ARTM(object):
           * rows --- the names of topics in topic model, that was used to create Theta;
           * data --- content of Theta matrix.
 
+          * for 'sparse_theta' and 'sparse_ptdw' modes a 3-tuple of (data, rows, columns), where
+          * data --- scipy.sparse.csr_matrix with values
+          * columns --- the ids of documents;
+          * rows --- the names of topics in topic model;
+
         :Note:
           * 'dense_ptdw' mode provides simple access to values of p(t|w,d).
             The resulting pandas.DataFrame object will contain a flat theta matrix (no 3D) where
@@ -977,6 +1270,13 @@ class ARTM(object):
             These columns will have the same item_id.
             The order of columns with equal item_id is the same
             as the order of tokens in the input data (batch.item.token_id).
+          * 'sparse_ptdw' mode has the same layout of columns as 'dense_ptdw'.
+          * transform can be called from several threads at once for the same model.
+            Concurrent calls share p_wt matrix read-only and do not affect results of each other,
+            and ARTM.get_score() returns the scores of the latest completed call.
+            The only exception is 'cache' mode, which replaces the content of theta cache.
+            Calls of fit_offline(), fit_online(), initialize() or reshape()
+            must not run concurrently with transform.
         """
         if batch_vectorizer is None:
             raise IOError('No batches were given for processing')
@@ -989,33 +1289,151 @@ class ARTM(object):
             theta_matrix_type_real = const.ThetaMatrixType_Dense
         elif theta_matrix_type == 'sparse_theta':
             theta_matrix_type_real = const.ThetaMatrixType_Sparse
-            raise NotImplementedError('Sparse format is currently unavailable from Python')
         elif theta_matrix_type == 'dense_ptdw':
             theta_matrix_type_real = const.ThetaMatrixType_DensePtdw
         elif theta_matrix_type == 'sparse_ptdw':
             theta_matrix_type_real = const.ThetaMatrixType_SparsePtdw
-            raise NotImplementedError('Sparse format is currently unavailable from Python')
         elif theta_matrix_type == 'cache':
             theta_matrix_type_real = const.ThetaMatrixType_Cache
 
-        theta_info, numpy_ndarray = self._wait_for_batches_processed(
+        operation = self._pool.current_operation()
+        theta_info, theta_data = self._wait_for_batches_processed(
             self._pool.apply_async(func=self.master.transform,
-                                   args=(None, batch_vectorizer.batches_ids, theta_matrix_type_real, predict_class_id)),
+                                   args=(None, batch_vectorizer.batches_ids, theta_matrix_type_real,
+                                         predict_class_id, eps, num_top_topics,
+                                         operation.id if operation is not None else None)),
             batch_vectorizer.num_batches)
 
         if theta_matrix_type is not None and theta_matrix_type != 'cache':
-            document_ids = []
-            if self._theta_columns_naming == 'title':
-                document_ids = [item_title for item_title in theta_info.item_title]
-            else:
-                document_ids = [item_id for item_id in theta_info.item_id]
+            data, topic_names, document_ids = self._unpack_transform_result(theta_info, theta_data)
+            if theta_matrix_type in ['sparse_theta', 'sparse_ptdw']:
+                return data, topic_names, document_ids
 
-            topic_names = [topic_name for topic_name in theta_info.topic_name]
-            theta_data_frame = DataFrame(data=numpy_ndarray.transpose(),
+            from pandas import DataFrame
+
+            theta_data_frame = DataFrame(data=data,
                                          columns=document_ids,
                                          index=topic_names)
             return theta_data_frame
 
+    def atransform(self, batch_vectorizer=None, theta_matrix_type='dense_theta', predict_class_id=None,
+                   eps=None, num_top_topics=None, loop=None, executor=None):
+        """
+        :Description: asyncio version of ARTM.transform(), see it for the description\
+                      of parameters and the result
+
+        :param loop: asyncio event loop, the current one will be used if not specified
+        :param executor: concurrent.futures.Executor to run the inference on,\
+                the default executor of the loop will be used if not specified
+
+        :return: asyncio.Future with the result of ARTM.transform()
+
+        :Note:
+          * cancellation of a started future cancels only this call, like ARTM.cancel() does for all calls.\
+            The batches being processed at the moment are finished in background.
+        """
+        return self._run_in_executor(self.transform,
+                                     (batch_vectorizer, theta_matrix_type, predict_class_id,
+                                      eps, num_top_topics),
+                                     loop=loop, executor=executor)
+
+    def _unpack_transform_result(self, theta_info, theta_data):
+        """
+        :Description: converts the result of MasterComponent.transform() into a 3-tuple\
+                      of (data, rows, columns), where rows correspond to topics\
+                      and columns correspond to documents, data is either numpy.ndarray\
+                      or scipy.sparse.csr_matrix (no copies of theta values are made)
+        """
+        document_ids = []
+        if self._theta_columns_naming == 'title':
+            document_ids = [item_title for item_title in theta_info.item_title]
+        else:
+            document_ids = [item_id for item_id in theta_info.item_id]
+
+        topic_names = [topic_name for topic_name in theta_info.topic_name]
+
+        if isinstance(theta_data, tuple):
+            from scipy import sparse
+
+            indptr, indices, values = theta_data
+            data = sparse.csr_matrix((values, indices, indptr),
+                                     shape=(len(topic_names), len(document_ids)), copy=False)
+            return data, topic_names, document_ids
+
+        return theta_data.transpose(), topic_names, document_ids
+
+    def transform_iter(self, batch_vectorizer, chunk_batches=1, theta_matrix_type='dense_theta',
+                       predict_class_id=None, eps=None, num_top_topics=None):
+        """
+        :Description: find Theta matrix for new documents chunk by chunk.\
+                      Batches are processed in groups of chunk_batches, and the next group\
+                      is processed while the caller handles the current one, so at most\
+                      two groups of Theta are kept in memory simultaneously.
+
+        :param object_reference batch_vectorizer: an instance of BatchVectorizer class
+        :param int chunk_batches: number of batches to be processed in one group
+        :param str theta_matrix_type: type of matrix to be returned, possible values:
+                'dense_theta', 'sparse_theta', default='dense_theta'
+        :param str predict_class_id: class_id of a target modality to predict,\
+                see ARTM.transform() for details
+        :param float eps: threshold to consider values as zero, used only in sparse mode
+        :param int num_top_topics: max number of topics with highest values to keep\
+                for each document, used only in sparse mode (None means all topics)
+
+        :return:
+          * generator of 2-tuples (item_ids, theta_block), one for each group of batches, where
+          * item_ids --- the ids (or titles, see ARTM.theta_columns_naming) of documents in the group;
+          * theta_block --- numpy.ndarray ('dense_theta') or scipy.sparse.csr_matrix ('sparse_theta')\
+            with rows corresponding to topics and columns corresponding to item_ids.
+
+        :Note:
+          * if the generator is closed before exhaustion, it waits for the group\
+            of batches, that is being processed at the moment.
+        """
+        if batch_vectorizer is None:
+            raise IOError('No batches were given for processing')
+
+        if not self._initialized:
+            raise RuntimeError('Model does not exist yet. Use ARTM.initialize()/ARTM.fit_*()')
+
+        if chunk_batches < 1:
+            raise ValueError('chunk_batches should be a positive integer')
+
+        if theta_matrix_type == 'dense_theta':
+            theta_matrix_type_real = const.ThetaMatrixType_Dense
+        elif theta_matrix_type == 'sparse_theta':
+            theta_matrix_type_real = const.ThetaMatrixType_Sparse
+        else:
+            raise ValueError('Only dense_theta and sparse_theta are supported by ARTM.transform_iter')
+
+        batches_ids = batch_vectorizer.batches_ids
+        chunks = [batches_ids[i: i + chunk_batches] for i in range(0, len(batches_ids), chunk_batches)]
+
+        def _transform_chunk(chunk):
+            return self.master.transform(None, chunk, theta_matrix_type_real, predict_class_id,
+                                         eps, num_top_topics)
+
+        # The native call releases GIL, so the next chunk is processed while the caller consumes current one
+        pool = ThreadPool(processes=1)
+        pending = None
+        try:
+            if chunks:
+                pending = pool.apply_async(func=_transform_chunk, args=(chunks[0], ))
+
+            for chunk_index in range(len(chunks)):
+                theta_info, theta_data = pending.get()
+                pending = None
+                if chunk_index + 1 < len(chunks):
+                    pending = pool.apply_async(func=_transform_chunk, args=(chunks[chunk_index + 1], ))
+
+                data, _, document_ids = self._unpack_transform_result(theta_info, theta_data)
+                yield document_ids, data
+        finally:
+            if pending is not None:
+                pending.wait()
+            pool.close()
+            pool.join()
+
     def transform_sparse(self, batch_vectorizer, eps=None):
         """
         :Description: find Theta matrix for new documents as sparse scipy matrix
@@ -1029,12 +1447,235 @@ class ARTM(object):
           * columns --- the ids of documents;
           * rows --- the names of topics in topic model;
         """
-        old_cache_theta = self.cache_theta
-        self.cache_theta = True
-        self.transform(batch_vectorizer=batch_vectorizer, theta_matrix_type='cache')
-        data, rows, columns = self.get_theta_sparse(eps=eps)
-        self.cache_theta = old_cache_theta
-        return data, rows, columns
+        return self.transform(batch_vectorizer=batch_vectorizer, theta_matrix_type='sparse_theta', eps=eps)
+
+    def inference_session(self):
+        """
+        :Description: create read-only session for low-latency inference of Theta\
+                      for single documents, see InferenceSession.transform().\
+                      The session uses a snapshot of current p_wt matrix,\
+                      so further changes of the model do not affect it.
+
+        :return: an instance of InferenceSession class
+        """
+        if not self._initialized:
+            raise RuntimeError('Model does not exist yet. Use ARTM.initialize()/ARTM.fit_*()')
+
+        _, phi, tokens, topic_names = self._get_phi_snapshot(self.model_pwt)
+        return InferenceSession(self.master._lib, phi, tokens, topic_names,
+                                class_ids=self._class_ids,
+                                num_document_passes=self._num_document_passes)
+
+    def transform_coalescer(self, max_delay=0.005, max_documents=256):
+        """
+        :Description: create a front end for concurrent transform requests with a few documents each.\
+                      The requests, that arrive within max_delay seconds, are merged into one batch\
+                      (of at most max_documents documents) and processed with a single native call,\
+                      see TransformCoalescer.transform().
+
+        :param float max_delay: max time (in seconds) to wait for other requests
+        :param int max_documents: max number of documents in one batch
+
+        :return: an instance of TransformCoalescer class
+        """
+        if not self._initialized:
+            raise RuntimeError('Model does not exist yet. Use ARTM.initialize()/ARTM.fit_*()')
+
+        return TransformCoalescer(self.master, self.model_pwt, self.topic_names,
+                                  max_delay=max_delay, max_documents=max_documents)
+
+    def export_theta(self, path, file_format='npy', dtype='float32', batch_vectorizer=None,
+                     topic_names=None, eps=None):
+        """
+        :Description: save Theta matrix to disk batch by batch, without loading\
+                      the whole matrix into memory
+
+        :param str path: name of file ('npy', 'npz_sparse') or directory ('columnar') to save Theta into
+        :param str file_format: format of the result, possible values:
+                'npy', 'npz_sparse', 'columnar', default='npy'
+        :param str dtype: type of saved values, 'float32' or 'float16', default='float32'
+        :param object_reference batch_vectorizer: an instance of BatchVectorizer class.\
+                If given, Theta is found by transform pass over its batches,\
+                otherwise the content of theta cache is saved
+        :param topic_names: list with topics or single topic to save, None means all topics
+        :type topic_names: list of str or str or None
+        :param float eps: threshold to consider values as zero, used only in 'npz_sparse' format
+
+        :return: list with the ids (or titles, see ARTM.theta_columns_naming) of saved documents
+
+        :Note:
+          * rows of saved matrix correspond to documents and columns correspond to topics,
+            i.e. it is transposed with respect to ARTM.get_theta().
+          * 'npy' --- dense matrix in .npy file, preallocated and filled via numpy.memmap;
+          * 'npz_sparse' --- scipy.sparse.csr_matrix in the format of scipy.sparse.save_npz\
+            (it appends '.npz' extension to path, if it is missing);
+          * 'columnar' --- directory with one .npy file for each topic (named as the topic),
+            preallocated and filled via numpy.memmap.
+          * ids of documents are saved next to the data: into path + '.item_ids.npy' file
+            ('npy' and 'npz_sparse' formats) or into 'item_ids.npy' file inside path ('columnar' format).
+          * the number of documents is taken from theta cache or from batches of batch_vectorizer.\
+            The number of non-zero values is not known in advance, so in 'npz_sparse' format\
+            they are appended to temporary files next to path, and then packed into the result.
+          * transform pass doesn't use theta cache, so cache_theta should be enabled\
+            only if batch_vectorizer is not given.
+        """
+        if file_format not in ['npy', 'npz_sparse', 'columnar']:
+            raise ValueError('file_format should be one of npy, npz_sparse, columnar')
+        if dtype not in ['float32', 'float16']:
+            raise ValueError('dtype should be one of float32, float16')
+
+        if batch_vectorizer is None and self.cache_theta is False:
+            raise ValueError('cache_theta == False. Set ARTM.cache_theta = True')
+        if not self._initialized:
+            raise RuntimeError('Model does not exist yet. Use ARTM.initialize()/ARTM.fit_*()')
+
+        if isinstance(topic_names, string_types):
+            topic_names = [topic_names]
+
+        is_sparse = file_format == 'npz_sparse'
+        if is_sparse:
+            from scipy import sparse
+
+        if batch_vectorizer is None:
+            cache_keys = self.master.get_theta_cache_keys()
+            theta_info = self.master.get_theta_info(cache_keys=cache_keys)
+            if topic_names is None:
+                topic_names = list(theta_info.topic_name) if theta_info.topic_name else self.topic_names
+            num_items = len(theta_info.item_id)
+        else:
+            if topic_names is None:
+                topic_names = self.topic_names
+            num_items = None if is_sparse else self._count_batch_items(batch_vectorizer.batches_ids)
+        num_topics = len(topic_names)
+
+        def _iter_blocks():
+            # yields (item_ids, block) with documents in rows of block, one batch or chunk at a time
+            if batch_vectorizer is None:
+                for cache_key in cache_keys:
+                    if is_sparse:
+                        info, indptr, indices, values = self.master.get_theta_matrix_csr(
+                            topic_names=topic_names, eps=eps, cache_keys=[cache_key])
+                        block = sparse.csr_matrix((values, indices, indptr),
+                                                  shape=(num_topics, len(info.item_id)), copy=False)
+                        block = block.transpose().tocsr()
+                    else:
+                        info, block = self.master.get_theta_matrix(topic_names=topic_names, cache_keys=[cache_key])
+
+                    if self._theta_columns_naming == 'title':
+                        yield [item_title for item_title in info.item_title], block
+                    else:
+                        yield [item_id for item_id in info.item_id], block
+            else:
+                topic_indices = [self.topic_names.index(topic_name) for topic_name in topic_names]
+                theta_matrix_type = 'sparse_theta' if is_sparse else 'dense_theta'
+                for document_ids, block in self.transform_iter(batch_vectorizer=batch_vectorizer,
+                                                               theta_matrix_type=theta_matrix_type,
+                                                               eps=eps):
+                    # rows of the block correspond to all topics of the model
+                    block = block[topic_indices, :]
+                    yield document_ids, block.transpose().tocsr() if is_sparse else block.transpose()
+
+        if file_format == 'npy':
+            data = numpy.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(num_items, num_topics))
+            item_ids_path = path + '.item_ids.npy'
+        elif file_format == 'columnar':
+            if not os.path.exists(path):
+                os.makedirs(path)
+            data = [numpy.lib.format.open_memmap(os.path.join(path, '{}.npy'.format(topic_name)),
+                                                 mode='w+', dtype=dtype, shape=(num_items, ))
+                    for topic_name in topic_names]
+            item_ids_path = os.path.join(path, 'item_ids.npy')
+        else:
+            item_ids = self._export_theta_npz(path, _iter_blocks(), dtype, num_topics)
+            numpy.save(path + '.item_ids.npy', numpy.array(item_ids))
+            return item_ids
+
+        item_ids = []
+        begin = 0
+        for block_item_ids, block in _iter_blocks():
+            item_ids += block_item_ids
+            end = begin + block.shape[0]
+            if file_format == 'npy':
+                data[begin: end] = block
+            else:
+                for topic_index, column in enumerate(data):
+                    column[begin: end] = block[:, topic_index]
+            begin = end
+
+        if begin != num_items:
+            raise InvalidOperationException(
+                'Expected {0} documents, but {1} were found while exporting theta'.format(num_items, begin))
+
+        if file_format == 'npy':
+            data.flush()
+        else:
+            for column in data:
+                column.flush()
+        del data
+
+        numpy.save(item_ids_path, numpy.array(item_ids))
+        return item_ids
+
+    def _count_batch_items(self, batches_ids):
+        """
+        :Description: returns the total number of documents in given batches,\
+                      batches are read from disk one by one, unless they are imported into the core
+        """
+        imported_batches = {info.name: info.num_items for info in self.master.get_info().batch}
+        num_items = 0
+        for batch_id in batches_ids:
+            if batch_id in imported_batches:
+                num_items += imported_batches[batch_id]
+            else:
+                batch = messages.Batch()
+                with open(batch_id, 'rb') as fin:
+                    batch.ParseFromString(fin.read())
+                num_items += len(batch.item)
+        return num_items
+
+    def _export_theta_npz(self, path, blocks, dtype, num_topics):
+        """
+        :Description: saves sparse blocks of Theta into npz file, that can be loaded with scipy.sparse.load_npz.\
+                      CSR arrays are appended to temporary files as blocks arrive, and then packed\
+                      into the result chunk by chunk.
+
+        :return: list with the ids of saved documents
+        """
+        spool_folder = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(path)))
+        spool_names = ['data', 'indices', 'indptr']
+        spool_paths = [os.path.join(spool_folder, '{}.raw'.format(name)) for name in spool_names]
+        try:
+            item_ids = []
+            num_values = 0
+            spool_files = [open(spool_path, 'wb') for spool_path in spool_paths]
+            try:
+                numpy.zeros(1, dtype=numpy.int64).tofile(spool_files[2])
+                for block_item_ids, block in blocks:
+                    item_ids += block_item_ids
+                    block.data.astype(dtype).tofile(spool_files[0])
+                    block.indices.astype(numpy.int32).tofile(spool_files[1])
+                    (block.indptr[1:] + num_values).astype(numpy.int64).tofile(spool_files[2])
+                    num_values += block.nnz
+            finally:
+                for spool_file in spool_files:
+                    spool_file.close()
+
+            num_items = len(item_ids)
+            shapes = [(num_values, ), (num_values, ), (num_items + 1, )]
+            dtypes = [dtype, numpy.int32, numpy.int64]
+            arrays = {}
+            for name, spool_path, shape, array_dtype in zip(spool_names, spool_paths, shapes, dtypes):
+                npy_path = os.path.join(spool_folder, '{}.npy'.format(name))
+                _save_raw_as_npy(spool_path, npy_path, array_dtype, shape)
+                arrays[name] = numpy.load(npy_path, mmap_mode='r')
+
+            # the same content as scipy.sparse.save_npz produces, arrays are written from disk chunk by chunk
+            numpy.savez_compressed(path, format='csr'.encode('ascii'), shape=(num_items, num_topics), **arrays)
+            del arrays
+        finally:
+            shutil.rmtree(spool_folder)
+
+        return item_ids
 
     def initialize(self, dictionary=None):
         """
@@ -1065,6 +1706,8 @@ class ARTM(object):
         self._synchronizations_processed = 0
         self._num_online_processed_batches = 0
         self._phi_cached = None
+        self._phi_snapshots = {}
+        self._top_tokens_cached = {}
 
     def reshape_topics(self, topic_names):
         """
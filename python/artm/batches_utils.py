@@ -6,7 +6,7 @@ import uuid
 import shutil
 import numpy as np
 
-from six import iteritems, string_types
+from six import iteritems, string_types, text_type
 from six.moves import range, zip
 
 from . import wrapper
@@ -17,10 +17,33 @@ from .dictionary import Dictionary
 
 
 __all__ = [
-    'BatchVectorizer'
+    'BatchVectorizer',
+    'hash_token',
 ]
 
 GLOB_EPS = 1e-37
+DEFAULT_CLASS = '@default_class'
+HASH_LOOKUP_FILE_NAME = 'hash_lookup.txt'
+
+
+def hash_token(token, num_hash_buckets):
+    """
+    :Description: returns the name of the bucket, in which the token is placed\
+                  by hashing trick of the parser (BatchVectorizer with num_hash_buckets)
+
+    :param str token: the token to hash
+    :param int num_hash_buckets: the number of buckets
+
+    :return: str, '#<bucket>', where bucket is 64-bit FNV-1a hash of utf-8 bytes\
+             of the token modulo num_hash_buckets
+    """
+    if isinstance(token, text_type):
+        token = token.encode('utf-8')
+
+    value = 14695981039346656037
+    for byte in bytearray(token):
+        value = ((value ^ byte) * 1099511628211) & 0xFFFFFFFFFFFFFFFF
+    return '#{}'.format(value % num_hash_buckets)
 
 
 class Batch(object):
@@ -38,7 +61,8 @@ class Batch(object):
 class BatchVectorizer(object):
     def __init__(self, batches=None, collection_name=None, data_path='', data_format='batches',
                  target_folder=None, batch_size=1000, batch_name_type='code', data_weight=1.0, n_wd=None,
-                 vocabulary=None, gather_dictionary=True, class_ids=None, process_in_memory_model=None):
+                 vocabulary=None, gather_dictionary=True, class_ids=None, process_in_memory_model=None,
+                 min_df=None, min_tf=None, num_hash_buckets=None, hash_lookup_size=10):
         """
         :param str collection_name: the name of text collection (required if data_format == 'bow_uci')
         :param str data_path: 1) if data_format == 'bow_uci' => folder containing\
@@ -77,6 +101,17 @@ class BatchVectorizer(object):
                                                   required when one needs processing of batches from\
                                                   disk in RAM (only if data_format == 'batches').\
                                                   NOTE: makes vectorizer model specific.
+        :param float min_df: (only if data_format == 'vowpal_wabbit') drop at parse time all tokens\
+                              that occur in less than min_df documents; requires extra pass over data_path
+        :param float min_tf: (only if data_format == 'vowpal_wabbit') drop at parse time all tokens\
+                              with total weight less than min_tf; requires extra pass over data_path
+        :param int num_hash_buckets: (only if data_format == 'vowpal_wabbit' or 'bow_n_wd') replace\
+                              each token by one of num_hash_buckets tokens of the same modality\
+                              (see artm.hash_token()), so the size of the dictionary and of Phi\
+                              matrix doesn't depend on the vocabulary; the dictionary contains all\
+                              the buckets of each modality
+        :param int hash_lookup_size: the number of most frequent tokens of each bucket\
+                              to be kept in hash_lookup, 0 or None means no lookup
         """
         self._remove_batches = False
         self._process_in_memory = data_format == 'batches' and process_in_memory_model is not None
@@ -99,6 +134,10 @@ class BatchVectorizer(object):
         self._data_path = data_path
         self._batch_size = batch_size
 
+        self._hash_lookup = None
+        self._num_hash_buckets = num_hash_buckets
+        self._hash_lookup_size = hash_lookup_size if num_hash_buckets else None
+
         self._dictionary = None
         if gather_dictionary and not isinstance(data_weight, list) and data_format != 'batches':
             self._dictionary = Dictionary()
@@ -108,7 +147,8 @@ class BatchVectorizer(object):
         elif data_format == 'batches':
             self._parse_batches(data_weight=data_weight, batches=batches)
         elif data_format == 'vowpal_wabbit':
-            self._parse_uci_or_vw(data_weight=data_weight, format='vw', class_ids=class_ids)
+            self._parse_uci_or_vw(data_weight=data_weight, format='vw', class_ids=class_ids,
+                                  min_df=min_df, min_tf=min_tf)
         elif data_format == 'bow_uci':
             self._parse_uci_or_vw(data_weight=data_weight,
                                   format='uci',
@@ -118,6 +158,9 @@ class BatchVectorizer(object):
         else:
             raise IOError('Unknown data format')
 
+        if self._num_hash_buckets and self._dictionary is not None:
+            self._add_missing_hash_buckets()
+
         self._data_path = data_path if data_format == 'batches' else self._target_folder
 
     def __dispose(self):
@@ -161,7 +204,8 @@ class BatchVectorizer(object):
 
         return data_paths, data_weights, target_folders
 
-    def _parse_uci_or_vw(self, data_weight=None, format=None, col_name=None, batch_name_type=None, class_ids=None):
+    def _parse_uci_or_vw(self, data_weight=None, format=None, col_name=None, batch_name_type=None, class_ids=None,
+                         min_df=None, min_tf=None):
         data_paths, data_weights, target_folders = self._populate_data(data_weight)
         for (data_p, data_w, target_f) in zip(data_paths, data_weights, target_folders):
             parser_config = messages.CollectionParserConfig()
@@ -182,17 +226,29 @@ class BatchVectorizer(object):
             elif format == 'vw':
                 parser_config.docword_file_path = data_p
                 parser_config.format = const.CollectionParserConfig_CollectionFormat_VowpalWabbit
+                if min_df is not None:
+                    parser_config.min_df = min_df
+                if min_tf is not None:
+                    parser_config.min_tf = min_tf
+                if self._num_hash_buckets:
+                    parser_config.num_hash_buckets = self._num_hash_buckets
+                if self._hash_lookup_size:
+                    parser_config.hash_lookup_file_path = os.path.join(target_f, HASH_LOOKUP_FILE_NAME)
+                    parser_config.hash_lookup_size = self._hash_lookup_size
 
             parser_config.name_type = const.CollectionParserConfig_BatchNameType_Code
             if batch_name_type == 'guid':
                 parser_config.name_type = const.CollectionParserConfig_BatchNameType_Guid
 
-            lib = wrapper.LibArtm()
+            lib = wrapper.shared_lib()
             lib.ArtmParseCollection(parser_config)
             batch_filenames = glob.glob(os.path.join(target_f, '*.batch'))
             self._batches_list += [Batch(filename) for filename in batch_filenames]
             self._weights += [data_w for i in range(len(batch_filenames))]
 
+            if parser_config.HasField('hash_lookup_file_path'):
+                self._load_hash_lookup(parser_config.hash_lookup_file_path)
+
             # next code will be processed only if for-loop has only one iteration
             if self._dictionary is not None:
                 self._dictionary.gather(data_path=target_f)
@@ -230,6 +286,7 @@ class BatchVectorizer(object):
 
         os.mkdir(self._target_folder)
         global_vocab, global_n = {}, 0.0
+        hashed_weights = {}
         batch, batch_vocab = __reset_batch()
         try:
             n_wd_T = n_wd.T
@@ -254,6 +311,10 @@ class BatchVectorizer(object):
                 if value <= GLOB_EPS:
                     continue
                 token = vocab[token_id]
+                if self._num_hash_buckets:
+                    if self._hash_lookup_size:
+                        hashed_weights[token] = hashed_weights.get(token, 0.0) + value
+                    token = hash_token(token, self._num_hash_buckets)
                 if token not in global_vocab:
                     global_vocab[token] = [0, 0, False]  # token_tf, token_df, appeared in this item
 
@@ -289,6 +350,62 @@ class BatchVectorizer(object):
 
         self._dictionary.create(dictionary_data)
 
+        if self._hash_lookup_size:
+            self._hash_lookup = {}
+            for token, weight in iteritems(hashed_weights):
+                bucket = (DEFAULT_CLASS, hash_token(token, self._num_hash_buckets))
+                self._hash_lookup.setdefault(bucket, []).append((token, float(weight)))
+            self._cut_hash_lookup()
+
+    def _load_hash_lookup(self, file_path):
+        """
+        Adds the top tokens of buckets, saved by the parser, to hash_lookup.
+        """
+        weights = {}
+        for bucket, top_tokens in iteritems(self._hash_lookup or {}):
+            for token, weight in top_tokens:
+                weights[(bucket, token)] = weight
+
+        with open(file_path, 'rb') as fin:
+            for line in fin:
+                bucket, class_id, token, weight = line.decode('utf-8').split()
+                key = ((class_id, bucket), token)
+                weights[key] = weights.get(key, 0.0) + float(weight)
+
+        self._hash_lookup = {}
+        for (bucket, token), weight in iteritems(weights):
+            self._hash_lookup.setdefault(bucket, []).append((token, weight))
+        self._cut_hash_lookup()
+
+    def _cut_hash_lookup(self):
+        for bucket in self._hash_lookup:
+            top_tokens = sorted(self._hash_lookup[bucket], key=lambda x: (-x[1], x[0]))
+            self._hash_lookup[bucket] = top_tokens[: self._hash_lookup_size]
+
+    def _add_missing_hash_buckets(self):
+        """
+        Adds to the dictionary the buckets that don't occur in the collection,
+        so the rows of Phi matrix are the same for any collection.
+        """
+        arrays = self._dictionary.to_arrays()
+        class_ids = sorted(set(arrays['class_id'])) or [DEFAULT_CLASS]
+        existing_entries = set(zip(arrays['class_id'], arrays['token']))
+
+        missing_entries = [(class_id, '#{}'.format(bucket)) for class_id in class_ids
+                           for bucket in range(self._num_hash_buckets)
+                           if (class_id, '#{}'.format(bucket)) not in existing_entries]
+        if not missing_entries:
+            return
+
+        zeros = np.zeros(len(missing_entries), dtype=np.float32)
+        self._dictionary = Dictionary.from_arrays(
+            token=list(arrays['token']) + [token for _, token in missing_entries],
+            class_id=list(arrays['class_id']) + [class_id for class_id, _ in missing_entries],
+            token_value=np.concatenate([arrays['token_value'], zeros]),
+            token_tf=np.concatenate([arrays['token_tf'], zeros]),
+            token_df=np.concatenate([arrays['token_df'], zeros]),
+            num_items_in_collection=arrays['num_items_in_collection'])
+
     @property
     def batches_ids(self):
         """
@@ -308,6 +425,16 @@ class BatchVectorizer(object):
         """
         return self._batches_list
 
+    @property
+    def hash_lookup(self):
+        """
+        :return: dict, mapping (class_id, bucket) of hashing trick to the list of\
+                 (token, weight) pairs of its most frequent tokens in descending order\
+                 (the weights may be overestimated for vowpal_wabbit data), or None,\
+                 if num_hash_buckets or hash_lookup_size wasn't set
+        """
+        return self._hash_lookup
+
     @property
     def weights(self):
         """
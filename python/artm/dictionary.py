@@ -4,6 +4,7 @@ import uuid
 import os
 import glob
 import codecs
+import numpy
 
 from six.moves import range
 
@@ -12,7 +13,8 @@ from .wrapper import messages_pb2 as messages
 from . import master_component
 
 __all__ = [
-    'Dictionary'
+    'Dictionary',
+    'convert_cooc_file'
 ]
 
 
@@ -28,8 +30,9 @@ class Dictionary(object):
         Note: all parameters are optional
         """
         self._name = name if name is not None else str(uuid.uuid4())
-        self._lib = wrapper.LibArtm()
-        self._master = master_component.MasterComponent(self._lib, num_processors=0)
+        self._lib = wrapper.shared_lib()
+        # dictionaries are shared by all master components, so no dedicated master component is needed
+        self._registry = master_component.DictionaryRegistry(self._lib)
 
         if dictionary_path is not None:
             self.load(dictionary_path=dictionary_path)
@@ -40,10 +43,9 @@ class Dictionary(object):
         return self
 
     def dispose(self):
-        if self._master is not None:
+        if self._registry is not None:
             self._reset()
-            self._lib.ArtmDisposeMasterComponent(self._master.master_id)
-            self._master = None
+            self._registry = None
 
     def __exit__(self, exc_type, exc_value, traceback):
         self.dispose()
@@ -56,7 +58,7 @@ class Dictionary(object):
         return self._name
 
     def _reset(self):
-        self._lib.ArtmDisposeDictionary(self._master.master_id, self._name)
+        self._registry.dispose_dictionary(self._name)
 
     def load(self, dictionary_path):
         """
@@ -65,7 +67,7 @@ class Dictionary(object):
         :param str dictionary_path: full filename of the dictionary
         """
         self._reset()
-        self._master.import_dictionary(filename=dictionary_path, dictionary_name=self._name)
+        self._registry.import_dictionary(filename=dictionary_path, dictionary_name=self._name)
 
     def save(self, dictionary_path):
         """
@@ -73,7 +75,7 @@ class Dictionary(object):
 
         :param str dictionary_path: full file name for the dictionary
         """
-        self._master.export_dictionary(filename=dictionary_path, dictionary_name=self._name)
+        self._registry.export_dictionary(filename=dictionary_path, dictionary_name=self._name)
 
     def save_text(self, dictionary_path, encoding='utf-8'):
         """
@@ -83,7 +85,7 @@ class Dictionary(object):
         :param str dictionary_path: full file name for the text dictionary file
         :param str encoding: an encoding of text in diciotnary
         """
-        dictionary_data = self._master.get_dictionary(self._name)
+        dictionary_data = self._registry.get_dictionary(self._name)
         with codecs.open(dictionary_path, 'w', encoding) as fout:
             fout.write(u'name: {} num_items: {}\n'.format(dictionary_data.name,
                                                           dictionary_data.num_items_in_collection))
@@ -120,7 +122,7 @@ class Dictionary(object):
                 dictionary_data.token_tf.append(float(line_list[3][0: -1]))
                 dictionary_data.token_df.append(float(line_list[4][0: -1]))
 
-        self._master.create_dictionary(dictionary_data=dictionary_data, dictionary_name=self._name)
+        self._registry.create_dictionary(dictionary_data=dictionary_data, dictionary_name=self._name)
 
     def create(self, dictionary_data):
         """
@@ -130,31 +132,132 @@ class Dictionary(object):
         :type dictionary_data: DictionaryData instance
         """
         self._reset()
-        self._master.create_dictionary(dictionary_data=dictionary_data, dictionary_name=self._name)
+        self._registry.create_dictionary(dictionary_data=dictionary_data, dictionary_name=self._name)
 
-    def gather(self, data_path, cooc_file_path=None, vocab_file_path=None, symmetric_cooc_values=False):
+    def to_arrays(self):
+        """
+        :Description: returns entries of the dictionary as numpy arrays,\
+                      that are copied from the lib through one memory buffer
+
+        :return: dict with 'token' and 'class_id' (numpy arrays of str), 'token_value', 'token_tf'\
+                 and 'token_df' (numpy arrays of float32) and 'num_items_in_collection' (int),\
+                 so the dictionary can be restored with Dictionary.from_arrays(**arrays)
+
+        :Note: co-occurrences are not included
+        """
+        return self._registry.get_dictionary_arrays(self._name)
+
+    @staticmethod
+    def from_arrays(token, class_id=None, token_value=None, token_tf=None, token_df=None,
+                    num_items_in_collection=None, name=None):
+        """
+        :Description: creates new dictionary from the arrays of its entries,\
+                      which are passed into the lib through one memory buffer
+
+        :param token: tokens of the entries (list or numpy array of str)
+        :param class_id: class ids of the entries, None means '@default_class' for all of them
+        :param token_value: values of the entries, None means zeros
+        :param token_tf: tf of the entries, None means zeros
+        :param token_df: df of the entries, None means zeros
+        :param int num_items_in_collection: number of documents in the collection
+        :param str name: name of the new dictionary
+
+        :return: new artm.Dictionary
+        """
+        target = Dictionary(name=name)
+        target._registry.create_dictionary_from_arrays(dictionary_name=target._name,
+                                                       token=token,
+                                                       class_id=class_id,
+                                                       token_value=token_value,
+                                                       token_tf=token_tf,
+                                                       token_df=token_df,
+                                                       num_items_in_collection=num_items_in_collection)
+        return target
+
+    def to_dataframe(self):
+        """
+        :Description: returns entries of the dictionary as pandas.DataFrame\
+                      with columns token, class_id, token_value, token_tf and token_df
+        """
+        from pandas import DataFrame
+
+        arrays = self.to_arrays()
+        columns = ['token', 'class_id', 'token_value', 'token_tf', 'token_df']
+        return DataFrame({column: arrays[column] for column in columns}, columns=columns)
+
+    def save_arrays(self, dictionary_path):
+        """
+        :Description: saves the BigARTM dictionary of the collection on the disk in columnar format,\
+                      which is much faster to save and load than the text one
+
+        :param str dictionary_path: full file name for the dictionary, '.npz' extension is added if missing
+
+        :Note: the file is an uncompressed numpy .npz archive with 'token' (uint8 array of utf-8 tokens,\
+               each one is terminated by zero byte), 'class_id' (unique class ids), 'class_index' (int32 index\
+               of class id of each entry), 'token_value', 'token_tf', 'token_df' (float32) and\
+               'num_items_in_collection' arrays, so it can be inspected with numpy.load() without the lib
+        """
+        arrays = self.to_arrays()
+        class_ids, class_index = numpy.unique(arrays['class_id'], return_inverse=True)
+        tokens = (u'\0'.join(arrays['token']) + u'\0').encode('utf-8') if len(arrays['token']) else b''
+        numpy.savez(dictionary_path,
+                    token=numpy.frombuffer(tokens, dtype=numpy.uint8),
+                    class_id=class_ids.astype(numpy.str_),
+                    class_index=class_index.astype(numpy.int32),
+                    token_value=arrays['token_value'],
+                    token_tf=arrays['token_tf'],
+                    token_df=arrays['token_df'],
+                    num_items_in_collection=numpy.int64(arrays['num_items_in_collection']))
+
+    def load_arrays(self, dictionary_path):
+        """
+        :Description: loads the BigARTM dictionary of the collection from the file,\
+                      created by Dictionary.save_arrays()
+
+        :param str dictionary_path: full file name of the dictionary
+        """
+        with numpy.load(dictionary_path) as data:
+            tokens = data['token'].tobytes().decode('utf-8').split(u'\0')[: -1]
+            num_items = int(data['num_items_in_collection'])
+            self._reset()
+            self._registry.create_dictionary_from_arrays(dictionary_name=self._name,
+                                                         token=tokens,
+                                                         class_id=data['class_id'][data['class_index']],
+                                                         token_value=data['token_value'],
+                                                         token_tf=data['token_tf'],
+                                                         token_df=data['token_df'],
+                                                         num_items_in_collection=num_items)
+
+    def gather(self, data_path, cooc_file_path=None, vocab_file_path=None, symmetric_cooc_values=False,
+               num_threads=None):
         """
         :Description: creates the BigARTM dictionary of the collection,\
                       represented as batches and load it in the lib
 
         :param str data_path: full path to batches folder
-        :param str cooc_file_path: full path to the file with cooc info. Cooc info is a file with three\
-                                   columns, first two a the zero-based indices of tokens in vocab file,\
-                                   and third one is a value of their co-occurrence in collection (or another)\
-                                   pairwise statistic.
+        :param str cooc_file_path: full path to the file with cooc info. Cooc info is either a text file,\
+                                   each line of which has the form 'token_1 token_2:value token_3:value ...'\
+                                   with values of co-occurrence of token_1 with other tokens in collection\
+                                   (or another pairwise statistic), or a binary file created by\
+                                   artm.convert_cooc_file() or by bigartm with --write-cooc-binary.\
+                                   Binary file is mapped into memory instead of being parsed and is shared\
+                                   between all dictionaries and processes that use it; it requires vocab_file_path.
         :param str vocab_file_path: full path to the file with vocabulary.\
                       If given, the dictionary token will have the same order, as in\
                       this file, otherwise the order will be random.\
                       If given, the tokens from batches, that are not presented in vocab, will be skipped.
         :param bool symmetric_cooc_values: if the cooc matrix should considered\
-                      to be symmetric or not
+                      to be symmetric or not (ignored for binary cooc files)
+        :param int num_threads: number of threads to read batches with,\
+                      by default one thread per CPU core is used
         """
         self._reset()
-        self._master.gather_dictionary(dictionary_target_name=self._name,
-                                       data_path=data_path,
-                                       cooc_file_path=cooc_file_path,
-                                       vocab_file_path=vocab_file_path,
-                                       symmetric_cooc_values=symmetric_cooc_values)
+        self._registry.gather_dictionary(dictionary_target_name=self._name,
+                                         data_path=data_path,
+                                         cooc_file_path=cooc_file_path,
+                                         vocab_file_path=vocab_file_path,
+                                         symmetric_cooc_values=symmetric_cooc_values,
+                                         num_threads=num_threads)
 
     def filter(self, class_id=None, min_df=None, max_df=None, min_df_rate=None, max_df_rate=None,
                min_tf=None, max_tf=None, max_dictionary_size=None, recalculate_value=False, inplace=True):
@@ -180,22 +283,65 @@ class Dictionary(object):
         :Note: the current dictionary will be replaced with filtered
         """
         target = self if inplace else Dictionary()
-        self._master.filter_dictionary(dictionary_target_name=target._name,
-                                       dictionary_name=self._name,
-                                       class_id=class_id,
-                                       min_df=min_df,
-                                       max_df=max_df,
-                                       min_df_rate=min_df_rate,
-                                       max_df_rate=max_df_rate,
-                                       min_tf=min_tf,
-                                       max_tf=max_tf,
-                                       max_dictionary_size=max_dictionary_size,
-                                       recalculate_value=recalculate_value)
+        self._registry.filter_dictionary(dictionary_target_name=target._name,
+                                         dictionary_name=self._name,
+                                         class_id=class_id,
+                                         min_df=min_df,
+                                         max_df=max_df,
+                                         min_df_rate=min_df_rate,
+                                         max_df_rate=max_df_rate,
+                                         min_tf=min_tf,
+                                         max_tf=max_tf,
+                                         max_dictionary_size=max_dictionary_size,
+                                         recalculate_value=recalculate_value)
+        return target
+
+    @staticmethod
+    def merge(dictionaries, name=None, merge_cooc=False):
+        """
+        :Description: merges dictionaries gathered on disjoint parts of the collection\
+                      (e.g. on different machines) into a new one, as if it was\
+                      gathered on the whole collection at once
+
+        :param dictionaries: dictionaries to merge
+        :type dictionaries: list of artm.Dictionary
+        :param str name: name of the new dictionary
+        :param bool merge_cooc: whether co-occurrence values should be summed too.\
+                                Note that cooc tf and df are summed correctly only if the parts\
+                                of the collection don't share documents (and windows)
+
+        :return: new artm.Dictionary with summed token_tf, token_df and num_items_in_collection\
+                 of all dictionaries, and token_value recalculated from the summed token_tf
+        """
+        target = Dictionary(name=name)
+        target._registry.merge_dictionary(dictionary_target_name=target._name,
+                                          dictionary_names=[dictionary._name for dictionary in dictionaries],
+                                          merge_cooc=merge_cooc)
         return target
 
     def __deepcopy__(self, memo):
         return self
 
     def __repr__(self):
-        descr = next(x for x in self._master.get_info().dictionary if x.name == self.name)
+        descr = self._registry.get_dictionary_info(self.name)[0]
         return 'artm.Dictionary(name={0}, num_entries={1})'.format(descr.name, descr.num_entries)
+
+
+def convert_cooc_file(source_file_path, target_file_path, vocab_file_path, symmetric_cooc_values=False):
+    """
+    :Description: converts text file with cooc info into binary one,\
+                  that can be passed to Dictionary.gather() much faster
+
+    :param str source_file_path: full path to the text file with cooc info\
+                                 (the format is described in Dictionary.gather())
+    :param str target_file_path: full path to the binary file to create, it should not exist
+    :param str vocab_file_path: full path to the file with vocabulary,\
+                                the same file should be passed to Dictionary.gather()
+    :param bool symmetric_cooc_values: if the cooc matrix should considered\
+                  to be symmetric or not
+    """
+    registry = master_component.DictionaryRegistry(wrapper.shared_lib())
+    registry.convert_cooc_file(source_file_path=source_file_path,
+                               target_file_path=target_file_path,
+                               vocab_file_path=vocab_file_path,
+                               symmetric_cooc_values=symmetric_cooc_values)
@@ -4,7 +4,6 @@ import artm
 import uuid
 import copy
 import numpy as np
-import pandas
 import os.path
 import os
 import pickle
@@ -444,6 +443,8 @@ class hARTM(object):
             theta = np.vstack((theta, theta_pd.values))
             index = index.append(
                 "level" + str(level_idx + 1) + "_" + theta_pd.index)
+        import pandas
+
         return pandas.DataFrame(data=theta, columns=columns, index=index)
 
     def transform(self, batch_vectorizer):
@@ -475,6 +476,8 @@ class hARTM(object):
             theta = np.vstack((theta, theta_pd.values))
             index = index.append(
                 "level" + str(level_idx + 1) + "_" + theta_pd.index)
+        import pandas
+
         return pandas.DataFrame(data=theta, columns=columns, index=index)
 
     def get_phi(self, class_ids=None, model_name=None):
@@ -496,6 +499,8 @@ class hARTM(object):
         :Note:
           * if you need to extract specified topics, use get_phi() method of individual level model
         """
+        import pandas
+
         phi = pandas.concat([level.get_phi(class_ids=class_ids, model_name=model_name)
                              for level in self._levels], axis=1)
         phi.columns = pandas.Series(["level" + str(level_idx) for level_idx, level in enumerate(self._levels)
@@ -651,6 +656,8 @@ class ARTM_Level(artm.ARTM):
         _, nd_array = self.master.get_theta_matrix(topic_names=use_topic_names)
 
         titles_list = [item_title for item_title in theta_info.item_title]
+        import pandas
+
         theta_data_frame = pandas.DataFrame(data=nd_array.transpose(),
                                             columns=titles_list,
                                             index=use_topic_names)
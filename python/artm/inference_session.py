@@ -0,0 +1,112 @@
+# Copyright 2017, Additive Regularization of Topic Models.
+
+import numpy
+
+from six import iteritems, string_types
+
+__all__ = [
+    'InferenceSession',
+]
+
+DEFAULT_CLASS = '@default_class'
+
+
+class InferenceSession(object):
+    def __init__(self, lib, phi, tokens, topic_names, class_ids=None, num_document_passes=10):
+        """
+        :Description: read-only inference of Theta for single documents against a frozen\
+                      snapshot of Phi matrix. Use ARTM.inference_session() to create it.
+
+        :param object_reference lib: an instance of wrapper.LibArtm
+        :param numpy.ndarray phi: read-only C-contiguous float32 array with Phi data,\
+                                  rows correspond to tokens and columns correspond to topics
+        :param tokens: (class_id, token) pairs, that correspond to rows of phi
+        :type tokens: list of tuple
+        :param topic_names: names of topics, that correspond to columns of phi
+        :type topic_names: list of str
+        :param dict class_ids: weights of class_ids, None or empty dict means\
+                               that all class_ids are used with weight 1.0
+        :param int num_document_passes: number of inner iterations over each document
+
+        :Note:
+          * the session does not change the model and can be used from several threads at once.
+          * Theta is computed on the caller's thread, the native call releases GIL.
+          * theta regularizers of the model are not applied, so the results are equal\
+            to ARTM.transform() only for models without theta regularizers.
+        """
+        self._lib = lib
+        self._phi = phi
+        self._topic_names = list(topic_names)
+        self._num_document_passes = num_document_passes
+        self._token_index = {token: index for index, token in enumerate(tokens)}
+
+        self._class_weights = None
+        if class_ids:
+            self._class_weights = numpy.array([class_ids.get(class_id, 0.0) for class_id, _ in tokens],
+                                              dtype=numpy.float32)
+
+    @property
+    def topic_names(self):
+        return self._topic_names
+
+    @property
+    def num_document_passes(self):
+        return self._num_document_passes
+
+    def token_index(self, token):
+        """
+        :param token: token of '@default_class' or (class_id, token) tuple
+        :type token: str or tuple
+
+        :return: index of token in the snapshot of Phi matrix, -1 if the token is not in the model
+        """
+        if isinstance(token, string_types):
+            token = (DEFAULT_CLASS, token)
+        return self._token_index.get(token, -1)
+
+    def transform(self, tokens, weights=None):
+        """
+        :Description: find Theta vector of a single document
+
+        :param tokens: either dict {token: weight}, where token is str (token of '@default_class')\
+                       or (class_id, token) tuple, or array of token indices\
+                       (see InferenceSession.token_index()). Tokens, that are not in the model,\
+                       are ignored in dict
+        :type tokens: dict or array-like
+        :param weights: weights of tokens, used only with array of token indices\
+                        (None means weight 1.0 for all tokens)
+        :type weights: array-like or None
+
+        :return: numpy.ndarray with p(t|d) values in the order of InferenceSession.topic_names
+        """
+        if isinstance(tokens, dict):
+            token_ids, token_weights = [], []
+            for token, weight in iteritems(tokens):
+                index = self.token_index(token)
+                if index >= 0:
+                    token_ids.append(index)
+                    token_weights.append(weight)
+            token_ids = numpy.array(token_ids, dtype=numpy.int32)
+            token_weights = numpy.array(token_weights, dtype=numpy.float32)
+        else:
+            token_ids = numpy.ascontiguousarray(tokens, dtype=numpy.int32)
+            if weights is None:
+                token_weights = numpy.ones(token_ids.shape, dtype=numpy.float32)
+            else:
+                token_weights = numpy.ascontiguousarray(weights, dtype=numpy.float32)
+            if token_ids.ndim != 1 or token_weights.shape != token_ids.shape:
+                raise ValueError('tokens and weights should be 1-dimensional arrays of equal length')
+
+        if self._class_weights is not None and len(token_ids) > 0:
+            if numpy.any(token_ids < 0) or numpy.any(token_ids >= len(self._class_weights)):
+                raise ValueError('token indices are out of range [0, {0})'.format(len(self._class_weights)))
+            class_weights = self._class_weights[token_ids]
+            in_effect = class_weights > 0
+            token_ids = token_ids[in_effect]
+            token_weights = token_weights[in_effect] * class_weights[in_effect]
+
+        theta = numpy.empty(shape=(len(self._topic_names), ), dtype=numpy.float32)
+        theta.fill(1.0 / len(self._topic_names))
+        if len(token_ids) > 0:
+            self._lib.ArtmInferThetaDense(self._phi, token_ids, token_weights, self._num_document_passes, theta)
+        return theta
@@ -15,6 +15,8 @@ from . import regularizers
 from . import scores
 
 
+DEFAULT_CLASS = '@default_class'
+
 REGULARIZERS = (
     (
         messages.SmoothSparseThetaConfig,
@@ -221,6 +223,145 @@ def _prepare_config(topic_names=None, class_ids=None, transaction_typenames=None
         return master_config
 
 
+def _make_gather_dictionary_args(dictionary_target_name=None, data_path=None, cooc_file_path=None,
+                                 vocab_file_path=None, symmetric_cooc_values=None, num_threads=None, args=None):
+    gather_args = messages.GatherDictionaryArgs()
+    if args is not None:
+        gather_args = args
+    if dictionary_target_name is not None:
+        gather_args.dictionary_target_name = dictionary_target_name
+    if data_path is not None:
+        gather_args.data_path = data_path
+    if cooc_file_path is not None:
+        gather_args.cooc_file_path = cooc_file_path
+    if vocab_file_path is not None:
+        gather_args.vocab_file_path = vocab_file_path
+    if symmetric_cooc_values is not None:
+        gather_args.symmetric_cooc_values = symmetric_cooc_values
+    if num_threads is not None:
+        gather_args.num_threads = num_threads
+
+    return gather_args
+
+
+def _make_filter_dictionary_args(dictionary_name=None, dictionary_target_name=None, class_id=None,
+                                 min_df=None, max_df=None,
+                                 min_df_rate=None, max_df_rate=None,
+                                 min_tf=None, max_tf=None,
+                                 max_dictionary_size=None,
+                                 recalculate_value=None,
+                                 args=None):
+    filter_args = messages.FilterDictionaryArgs()
+    if args is not None:
+        filter_args = args
+    if dictionary_target_name is not None:
+        filter_args.dictionary_target_name = dictionary_target_name
+    if dictionary_name is not None:
+        filter_args.dictionary_name = dictionary_name
+    if class_id is not None:
+        filter_args.class_id = class_id
+    if min_df is not None:
+        filter_args.min_df = min_df
+    if max_df is not None:
+        filter_args.max_df = max_df
+    if min_df_rate is not None:
+        filter_args.min_df_rate = min_df_rate
+    if max_df_rate is not None:
+        filter_args.max_df_rate = max_df_rate
+    if min_tf is not None:
+        filter_args.min_tf = min_tf
+    if max_tf is not None:
+        filter_args.max_tf = max_tf
+    if max_dictionary_size is not None:
+        filter_args.max_dictionary_size = max_dictionary_size
+    if recalculate_value is not None:
+        filter_args.recalculate_value = recalculate_value
+
+    return filter_args
+
+
+def _make_merge_dictionary_args(dictionary_target_name=None, dictionary_names=None, merge_cooc=None, args=None):
+    merge_args = messages.MergeDictionaryArgs()
+    if args is not None:
+        merge_args = args
+    if dictionary_target_name is not None:
+        merge_args.dictionary_target_name = dictionary_target_name
+    if dictionary_names is not None:
+        merge_args.dictionary_name.extend(dictionary_names)
+    if merge_cooc is not None:
+        merge_args.merge_cooc = merge_cooc
+
+    return merge_args
+
+
+def _make_dictionary_arrays(dictionary_name, token, class_id=None, token_value=None, token_tf=None,
+                            token_df=None, num_items_in_collection=None):
+    """
+    :Description: packs dictionary entries into DictionaryArraysInfo and one buffer\
+                  in the layout, described in messages.proto
+    """
+    num_entries = len(token)
+
+    def _float_array(values, name):
+        if values is None:
+            return numpy.zeros(shape=(num_entries, ), dtype=numpy.float32)
+        values = numpy.ascontiguousarray(values, dtype=numpy.float32)
+        if values.shape != (num_entries, ):
+            raise ValueError('{0} should have the same length as token ({1})'.format(name, num_entries))
+        return values
+
+    arrays = [_float_array(token_value, 'token_value'),
+              _float_array(token_tf, 'token_tf'),
+              _float_array(token_df, 'token_df')]
+
+    if class_id is None:
+        class_ids = [DEFAULT_CLASS] if num_entries else []
+        class_index = numpy.zeros(shape=(num_entries, ), dtype=numpy.int32)
+    else:
+        if len(class_id) != num_entries:
+            raise ValueError('class_id should have the same length as token ({0})'.format(num_entries))
+        class_ids, class_index = numpy.unique(numpy.asarray(class_id, dtype=object), return_inverse=True)
+        class_index = class_index.astype(numpy.int32)
+    arrays.append(class_index)
+
+    tokens = u'\0'.join(token)
+    if tokens.count(u'\0') + 1 != max(num_entries, 1):
+        raise ValueError('tokens should not contain zero characters')
+    tokens = (tokens + u'\0').encode('utf-8') if num_entries else b''
+    arrays.append(numpy.frombuffer(tokens, dtype=numpy.uint8))
+
+    info = messages.DictionaryArraysInfo(name=dictionary_name,
+                                         num_entries=num_entries,
+                                         tokens_length=len(tokens))
+    info.class_id.extend(class_ids)
+    if num_items_in_collection is not None:
+        info.num_items_in_collection = num_items_in_collection
+
+    return info, numpy.concatenate([array.view(numpy.uint8) for array in arrays])
+
+
+def _copy_requested_dictionary_arrays(lib, info):
+    """
+    :Description: copies the last requested dictionary arrays into one numpy buffer\
+                  and returns dict with views of this buffer
+    """
+    num_entries = info.num_entries
+    buffer = numpy.empty(shape=(16 * num_entries + info.tokens_length, ), dtype=numpy.uint8)
+    lib.ArtmCopyRequestedObject(buffer)
+
+    size = 4 * num_entries
+    class_index = buffer[3 * size: 4 * size].view(numpy.int32)
+    tokens = buffer[4 * size:].tobytes().decode('utf-8').split(u'\0')[: -1]
+    return {
+        'token': numpy.array(tokens, dtype=object),
+        'class_id': numpy.array(list(info.class_id), dtype=object)[class_index],
+        'token_value': buffer[0: size].view(numpy.float32),
+        'token_tf': buffer[size: 2 * size].view(numpy.float32),
+        'token_df': buffer[2 * size: 3 * size].view(numpy.float32),
+        'num_items_in_collection': info.num_items_in_collection,
+    }
+
+
 class MasterComponent(object):
     def __init__(self, library=None, topic_names=None, class_ids=None, transaction_typenames=None,
                  scores=None, regularizers=None, num_processors=None, pwt_name=None,
@@ -329,6 +470,21 @@ class MasterComponent(object):
 
         self._lib.ArtmCreateDictionary(self.master_id, dictionary_data)
 
+    def create_dictionary_from_arrays(self, dictionary_name, token, class_id=None, token_value=None,
+                                      token_tf=None, token_df=None, num_items_in_collection=None):
+        """
+        :param str dictionary_name: name of created dictionary
+        :param token: tokens of the dictionary entries
+        :param class_id: class ids of the entries (None means @default_class for all of them)
+        :param token_value: values of the entries (None means zeros)
+        :param token_tf: tf of the entries (None means zeros)
+        :param token_df: df of the entries (None means zeros)
+        :param int num_items_in_collection: number of documents in the collection
+        """
+        info, arrays = _make_dictionary_arrays(dictionary_name, token, class_id, token_value, token_tf,
+                                               token_df, num_items_in_collection)
+        self._lib.ArtmCreateDictionaryFromArrays(self.master_id, info, arrays)
+
     def get_dictionary(self, dictionary_name):
         """
         :param str dictionary_name: name of dictionary to get
@@ -337,8 +493,18 @@ class MasterComponent(object):
         dictionary_data = self._lib.ArtmRequestDictionary(self.master_id, args)
         return dictionary_data
 
+    def get_dictionary_arrays(self, dictionary_name):
+        """
+        :param str dictionary_name: name of dictionary to get
+        :return: dict with numpy arrays 'token', 'class_id', 'token_value', 'token_tf', 'token_df'\
+                 and 'num_items_in_collection' value
+        """
+        args = messages.GetDictionaryArgs(dictionary_name=dictionary_name)
+        info = self._lib.ArtmRequestDictionaryArrays(self.master_id, args)
+        return _copy_requested_dictionary_arrays(self._lib, info)
+
     def gather_dictionary(self, dictionary_target_name=None, data_path=None, cooc_file_path=None,
-                          vocab_file_path=None, symmetric_cooc_values=None, args=None):
+                          vocab_file_path=None, symmetric_cooc_values=None, num_threads=None, args=None):
         """
         :param str dictionary_target_name: name of the dictionary in the core
         :param str data_path: full path to batches folder
@@ -346,22 +512,11 @@ class MasterComponent(object):
         :param str vocab_file_path: full path to the file with vocabulary
         :param bool symmetric_cooc_values: whether the cooc matrix should\
                 considered to be symmetric or not
+        :param int num_threads: number of threads to read batches with (default: one per core)
         :param args: an instance of GatherDictionaryArgs
         """
-        gather_args = messages.GatherDictionaryArgs()
-        if args is not None:
-            gather_args = args
-        if dictionary_target_name is not None:
-            gather_args.dictionary_target_name = dictionary_target_name
-        if data_path is not None:
-            gather_args.data_path = data_path
-        if cooc_file_path is not None:
-            gather_args.cooc_file_path = cooc_file_path
-        if vocab_file_path is not None:
-            gather_args.vocab_file_path = vocab_file_path
-        if symmetric_cooc_values is not None:
-            gather_args.symmetric_cooc_values = symmetric_cooc_values
-
+        gather_args = _make_gather_dictionary_args(dictionary_target_name, data_path, cooc_file_path,
+                                                   vocab_file_path, symmetric_cooc_values, num_threads, args)
         self._lib.ArtmGatherDictionary(self.master_id, gather_args)
 
     def filter_dictionary(self, dictionary_name=None, dictionary_target_name=None, class_id=None,
@@ -388,34 +543,22 @@ class MasterComponent(object):
                                        according to new sun of tf values
         :param args: an instance of FilterDictionaryArgs
         """
-        filter_args = messages.FilterDictionaryArgs()
-        if args is not None:
-            filter_args = args
-        if dictionary_target_name is not None:
-            filter_args.dictionary_target_name = dictionary_target_name
-        if dictionary_name is not None:
-            filter_args.dictionary_name = dictionary_name
-        if class_id is not None:
-            filter_args.class_id = class_id
-        if min_df is not None:
-            filter_args.min_df = min_df
-        if max_df is not None:
-            filter_args.max_df = max_df
-        if min_df_rate is not None:
-            filter_args.min_df_rate = min_df_rate
-        if max_df_rate is not None:
-            filter_args.max_df_rate = max_df_rate
-        if min_tf is not None:
-            filter_args.min_tf = min_tf
-        if max_tf is not None:
-            filter_args.max_tf = max_tf
-        if max_dictionary_size is not None:
-            filter_args.max_dictionary_size = max_dictionary_size
-        if recalculate_value is not None:
-            filter_args.recalculate_value = recalculate_value
-
+        filter_args = _make_filter_dictionary_args(dictionary_name, dictionary_target_name, class_id,
+                                                   min_df, max_df, min_df_rate, max_df_rate, min_tf, max_tf,
+                                                   max_dictionary_size, recalculate_value, args)
         self._lib.ArtmFilterDictionary(self.master_id, filter_args)
 
+    def merge_dictionary(self, dictionary_target_name=None, dictionary_names=None, merge_cooc=None, args=None):
+        """
+        :param str dictionary_target_name: name for the new merged dictionary in the core
+        :param dictionary_names: names of the dictionaries in the core to merge
+        :type dictionary_names: list of str
+        :param bool merge_cooc: whether co-occurrence values should be summed too
+        :param args: an instance of MergeDictionaryArgs
+        """
+        merge_args = _make_merge_dictionary_args(dictionary_target_name, dictionary_names, merge_cooc, args)
+        self._lib.ArtmMergeDictionary(self.master_id, merge_args)
+
     def initialize_model(self, model_name=None, topic_names=None,
                          dictionary_name=None, seed=None, args=None):
         """
@@ -463,6 +606,20 @@ class MasterComponent(object):
         args = messages.ClearScoreArrayCacheArgs()
         self._lib.ArtmClearScoreArrayCache(self.master_id, args)
 
+    def cancel_operation(self, operation_id=None):
+        """
+        Removes all pending batches from processor queue. Batches, that are being processed\
+        at the moment, are not interrupted. Calls waiting for removed batches\
+        raise OperationCancelledException as soon as their in-flight batches are finished.
+
+        :param str operation_id: if specified, only the calls of fit_offline(), fit_online()\
+                and transform() with the same operation_id are cancelled
+        """
+        args = messages.CancelOperationArgs()
+        if operation_id is not None:
+            args.operation_id = operation_id
+        self._lib.ArtmCancelOperation(self.master_id, args)
+
     def process_batches(self, pwt, nwt=None, num_document_passes=None, batches_folder=None,
                         batches=None, regularizer_name=None, regularizer_tau=None,
                         class_ids=None, class_weights=None, find_theta=False,
@@ -737,21 +894,34 @@ class MasterComponent(object):
         self._config = master_config
         self._lib.ArtmReconfigureMasterModel(self.master_id, master_config)
 
-    def get_theta_info(self):
+    def get_theta_info(self, cache_keys=None):
         """
+        :param cache_keys: keys of theta cache entries to describe (None means all entries)
+        :type cache_keys: list of str or None
         :return: messages.ThetaMatrix object
         """
         args = messages.GetThetaMatrixArgs()
         args.matrix_layout = constants.MatrixLayout_Sparse
         args.eps = 1.001  # hack to not get any data back
+        if cache_keys is not None:
+            for cache_key in cache_keys:
+                args.cache_key.append(cache_key)
         theta_matrix_info = self._lib.ArtmRequestThetaMatrix(self.master_id, args)
 
         return theta_matrix_info
 
-    def get_theta_matrix(self, topic_names=None):
+    def get_theta_cache_keys(self):
+        """
+        :return: list with keys of all entries in theta cache
+        """
+        return [cache_entry.key for cache_entry in self.get_info().cache_entry]
+
+    def get_theta_matrix(self, topic_names=None, cache_keys=None):
         """
         :param topic_names: list of topics to retrieve (None means all topics)
         :type topic_names: list of str or None
+        :param cache_keys: keys of theta cache entries to retrieve (None means all entries)
+        :type cache_keys: list of str or None
         :return: numpy.ndarray with Theta data (i.e., p(t|d) values)
         """
         args = messages.GetThetaMatrixArgs()
@@ -759,6 +929,9 @@ class MasterComponent(object):
             args.ClearField('topic_name')
             for topic_name in topic_names:
                 args.topic_name.append(topic_name)
+        if cache_keys is not None:
+            for cache_key in cache_keys:
+                args.cache_key.append(cache_key)
 
         theta_matrix_info = self._lib.ArtmRequestThetaMatrixExternal(self.master_id, args)
 
@@ -769,6 +942,42 @@ class MasterComponent(object):
 
         return theta_matrix_info, numpy_ndarray
 
+    def get_theta_matrix_csr(self, topic_names=None, eps=None, cache_keys=None):
+        """
+        :param topic_names: list of topics to retrieve (None means all topics)
+        :type topic_names: list of str or None
+        :param float eps: threshold to consider values as zero
+        :param cache_keys: keys of theta cache entries to retrieve (None means all entries)
+        :type cache_keys: list of str or None
+        :return: tuple (messages.ThetaMatrix, indptr, indices, values) with CSR arrays\
+                 of Theta matrix, rows correspond to topics, columns correspond to items
+        """
+        args = messages.GetThetaMatrixArgs(matrix_layout=constants.MatrixLayout_SparseCsr)
+        if eps is not None:
+            args.eps = eps
+        if topic_names is not None:
+            for topic_name in topic_names:
+                args.topic_name.append(topic_name)
+        if cache_keys is not None:
+            for cache_key in cache_keys:
+                args.cache_key.append(cache_key)
+
+        theta_matrix_info = self._lib.ArtmRequestThetaMatrixExternal(self.master_id, args)
+        indptr, indices, values = self._copy_requested_csr(num_rows=len(theta_matrix_info.topic_name),
+                                                           num_values=theta_matrix_info.num_values)
+        return theta_matrix_info, indptr, indices, values
+
+    def _copy_requested_csr(self, num_rows, num_values):
+        """
+        :Description: copies CSR arrays of the last requested sparse matrix\
+                      directly into new numpy arrays
+        """
+        indptr = numpy.empty(shape=(num_rows + 1, ), dtype=numpy.int64)
+        indices = numpy.empty(shape=(num_values, ), dtype=numpy.int32)
+        values = numpy.empty(shape=(num_values, ), dtype=numpy.float32)
+        self._lib.ArtmCopyRequestedSparseMatrix(indptr, indices, values)
+        return indptr, indices, values
+
     def get_phi_info(self, model):
         """
         :param str model: name of matrix in BigARTM
@@ -781,6 +990,20 @@ class MasterComponent(object):
 
         return phi_matrix_info
 
+    def get_phi_version(self, model):
+        """
+        :param str model: name of matrix in BigARTM
+        :return: int, version of the matrix, that changes on each its modification\
+                 (0 if matrix does not exist, None if matrix is attached, see attach_model(),\
+                 so its values might be changed at any moment)
+        """
+        info = self._lib.ArtmRequestMasterComponentInfo(self.master_id,
+                                                        messages.GetMasterComponentInfoArgs(model_versions_only=True))
+        for model_info in info.model:
+            if model_info.name == model:
+                return None if model_info.is_attached else model_info.version
+        return 0
+
     def get_phi_matrix(self, model, topic_names=None, class_ids=None, use_sparse_format=None):
         """
         :param str model: name of matrix in BigARTM
@@ -812,6 +1035,63 @@ class MasterComponent(object):
 
         return phi_matrix_info, numpy_ndarray
 
+    def get_phi_matrix_csr(self, model, topic_names=None, class_ids=None, eps=None):
+        """
+        :param str model: name of matrix in BigARTM
+        :param topic_names: list of topics to retrieve (None means all topics)
+        :type topic_names: list of str or None
+        :param class_ids: list of class ids to retrieve (None means all class ids)
+        :type class_ids: list of str or None
+        :param float eps: threshold to consider values as zero
+        :return: tuple (messages.TopicModel, indptr, indices, values) with CSR arrays\
+                 of Phi matrix, rows correspond to tokens, columns correspond to topics
+        """
+        args = messages.GetTopicModelArgs(model_name=model, matrix_layout=constants.MatrixLayout_SparseCsr)
+        if eps is not None:
+            args.eps = eps
+        if topic_names is not None:
+            for topic_name in topic_names:
+                args.topic_name.append(topic_name)
+        if class_ids is not None:
+            for class_id in class_ids:
+                args.class_id.append(class_id)
+
+        phi_matrix_info = self._lib.ArtmRequestTopicModelExternal(self.master_id, args)
+        indptr, indices, values = self._copy_requested_csr(num_rows=len(phi_matrix_info.token),
+                                                           num_values=phi_matrix_info.num_values)
+        return phi_matrix_info, indptr, indices, values
+
+    def get_top_tokens(self, model, num_tokens=10, topic_names=None, class_ids=None):
+        """
+        :param str model: name of matrix in BigARTM
+        :param int num_tokens: number of top tokens to retrieve for each topic
+        :param topic_names: list of topics to retrieve (None means all topics)
+        :type topic_names: list of str or None
+        :param class_ids: list of class ids to select tokens from (None means all class ids)
+        :type class_ids: list of str or None
+        :return: tuple (messages.TopTokens, token_indices, weights), where token_indices\
+                 is numpy.ndarray of int32 with indices of tokens in Phi matrix, weights is\
+                 numpy.ndarray of float32 with p(w|t) values; both arrays have shape\
+                 (num_topics, num_tokens) and are sorted by weight in descending order
+        """
+        args = messages.GetTopTokensArgs(model_name=model, num_tokens=num_tokens)
+        if topic_names is not None:
+            for topic_name in topic_names:
+                args.topic_name.append(topic_name)
+        if class_ids is not None:
+            for class_id in class_ids:
+                args.class_id.append(class_id)
+
+        top_tokens_info = self._lib.ArtmRequestTopTokensExternal(self.master_id, args)
+
+        shape = (top_tokens_info.num_topics, top_tokens_info.num_tokens)
+        buffer = numpy.zeros(shape=(2 * shape[0] * shape[1], ), dtype=numpy.int32)
+        self._lib.ArtmCopyRequestedObject(buffer)
+
+        token_indices = buffer[:shape[0] * shape[1]].reshape(shape)
+        weights = buffer[shape[0] * shape[1]:].view(numpy.float32).reshape(shape)
+        return top_tokens_info, token_indices, weights
+
     def export_model(self, model, filename):
         """
         :param str model: name of matrix in BigARTM
@@ -835,7 +1115,7 @@ class MasterComponent(object):
 
     def fit_offline(self, batch_filenames=None, batch_weights=None,
                     num_collection_passes=None, batches_folder=None,
-                    reset_nwt=True):
+                    reset_nwt=True, operation_id=None):
         """
         :param batch_filenames: name of batches to process
         :type batch_filenames: list of str
@@ -844,6 +1124,7 @@ class MasterComponent(object):
         :param int num_collection_passes: number of outer iterations
         :param str batches_folder: folder containing batches to process
         :param bool reset_nwt: a flag indicating whether to reset n_wt matrix to 0.
+        :param str operation_id: id to cancel this call with cancel_operation()
         """
         args = messages.FitOfflineMasterModelArgs()
         args.reset_nwt = reset_nwt
@@ -863,10 +1144,13 @@ class MasterComponent(object):
         if batches_folder is not None:
             args.batch_folder = batches_folder
 
+        if operation_id is not None:
+            args.operation_id = operation_id
+
         self._lib.ArtmFitOfflineMasterModel(self.master_id, args)
 
     def fit_online(self, batch_filenames=None, batch_weights=None, update_after=None,
-                   apply_weight=None, decay_weight=None, async=None):
+                   apply_weight=None, decay_weight=None, async=None, operation_id=None):
         """
         :param batch_filenames: name of batches to process
         :type batch_filenames: list of str
@@ -882,6 +1166,7 @@ class MasterComponent(object):
         :type decay_weight: list of float
         :param bool async: whether to use the async implementation\
                 of the EM-algorithm or not
+        :param str operation_id: id to cancel this call with cancel_operation()
         """
         args = messages.FitOnlineMasterModelArgs()
         if batch_filenames is not None:
@@ -917,10 +1202,13 @@ class MasterComponent(object):
         if async is not None:
             args.async = async
 
+        if operation_id is not None:
+            args.operation_id = operation_id
+
         self._lib.ArtmFitOnlineMasterModel(self.master_id, args)
 
     def transform(self, batches=None, batch_filenames=None, theta_matrix_type=None,
-                  predict_class_id=None):
+                  predict_class_id=None, eps=None, num_top_topics=None, operation_id=None):
         """
         :param batches: list of Batch instances
         :param batch_weights: weights of batches to transform
@@ -928,7 +1216,12 @@ class MasterComponent(object):
         :param int theta_matrix_type: type of matrix to be returned
         :param predict_class_id: class_id of a target modality to predict
         :type predict_class_id: str, default None
-        :return: messages.ThetaMatrix object
+        :param float eps: threshold to consider values as zero (sparse types of matrix only)
+        :param int num_top_topics: max number of topics to keep for each item (sparse types of matrix only)
+        :param str operation_id: id to cancel this call with cancel_operation()
+        :return: tuple (messages.ThetaMatrix, data), where data is numpy.ndarray for dense types\
+                 of matrix, and 3-tuple of CSR arrays (indptr, indices, values) for sparse types,\
+                 in which rows correspond to topics and columns correspond to items
         """
         args = messages.TransformMasterModelArgs()
         if batches is not None:
@@ -948,7 +1241,22 @@ class MasterComponent(object):
         if predict_class_id is not None:
             args.predict_class_id = predict_class_id
 
-        if theta_matrix_type not in [constants.ThetaMatrixType_None, constants.ThetaMatrixType_Cache]:
+        if eps is not None:
+            args.eps = eps
+
+        if num_top_topics is not None:
+            args.num_top_topics = num_top_topics
+
+        if operation_id is not None:
+            args.operation_id = operation_id
+
+        if theta_matrix_type in [constants.ThetaMatrixType_Sparse, constants.ThetaMatrixType_SparsePtdw]:
+            args.matrix_layout = constants.MatrixLayout_SparseCsr
+            theta_matrix_info = self._lib.ArtmRequestTransformMasterModelExternal(self.master_id, args)
+            csr_arrays = self._copy_requested_csr(num_rows=len(theta_matrix_info.topic_name),
+                                                  num_values=theta_matrix_info.num_values)
+            return theta_matrix_info, csr_arrays
+        elif theta_matrix_type not in [constants.ThetaMatrixType_None, constants.ThetaMatrixType_Cache]:
             theta_matrix_info = self._lib.ArtmRequestTransformMasterModelExternal(self.master_id, args)
 
             num_rows = len(theta_matrix_info.item_id)
@@ -993,3 +1301,128 @@ class MasterComponent(object):
         """
         args = messages.ImportScoreTrackerArgs(file_name=filename)
         result = self._lib.ArtmImportScoreTracker(self.master_id, args)
+
+
+class DictionaryRegistry(object):
+    def __init__(self, library):
+        """
+        :Description: operations on dictionaries, that are shared by all master components;\
+                      unlike the same methods of MasterComponent they do not require master component
+
+        :param library: an instance of LibArtm
+        """
+        self._lib = library
+
+    def import_dictionary(self, filename, dictionary_name):
+        """
+        :param str filename: full name of dictionary file
+        :param str dictionary_name: name of imported dictionary
+        """
+        args = messages.ImportDictionaryArgs(dictionary_name=dictionary_name, file_name=filename)
+        self._lib.ArtmImportDictionaryGlobal(args)
+
+    def export_dictionary(self, filename, dictionary_name):
+        """
+        :param str filename: full name of dictionary file
+        :param str dictionary_name: name of exported dictionary
+        """
+        args = messages.ExportDictionaryArgs(dictionary_name=dictionary_name, file_name=filename)
+        self._lib.ArtmExportDictionaryGlobal(args)
+
+    def create_dictionary(self, dictionary_data, dictionary_name=None):
+        """
+        :param dictionary_data: an instance of DictionaryData with info about dictionary
+        :param str dictionary_name: name of created dictionary
+        """
+        if dictionary_name is not None:
+            dictionary_data.name = dictionary_name
+
+        self._lib.ArtmCreateDictionaryGlobal(dictionary_data)
+
+    def create_dictionary_from_arrays(self, dictionary_name, token, class_id=None, token_value=None,
+                                      token_tf=None, token_df=None, num_items_in_collection=None):
+        """
+        :Description: same as MasterComponent.create_dictionary_from_arrays()
+        """
+        info, arrays = _make_dictionary_arrays(dictionary_name, token, class_id, token_value, token_tf,
+                                               token_df, num_items_in_collection)
+        self._lib.ArtmCreateDictionaryFromArraysGlobal(info, arrays)
+
+    def get_dictionary(self, dictionary_name):
+        """
+        :param str dictionary_name: name of dictionary to get
+        """
+        args = messages.GetDictionaryArgs(dictionary_name=dictionary_name)
+        return self._lib.ArtmRequestDictionaryGlobal(args)
+
+    def get_dictionary_arrays(self, dictionary_name):
+        """
+        :Description: same as MasterComponent.get_dictionary_arrays()
+        """
+        args = messages.GetDictionaryArgs(dictionary_name=dictionary_name)
+        info = self._lib.ArtmRequestDictionaryArraysGlobal(args)
+        return _copy_requested_dictionary_arrays(self._lib, info)
+
+    def get_dictionary_info(self, dictionary_name=None):
+        """
+        :param str dictionary_name: name of dictionary, None means all dictionaries
+        :return: list of MasterComponentInfo.DictionaryInfo messages
+        """
+        args = messages.GetDictionaryArgs()
+        if dictionary_name is not None:
+            args.dictionary_name = dictionary_name
+        return list(self._lib.ArtmRequestDictionaryInfoGlobal(args).dictionary)
+
+    def dispose_dictionary(self, dictionary_name):
+        """
+        :param str dictionary_name: name of dictionary to dispose
+        """
+        self._lib.ArtmDisposeDictionaryGlobal(dictionary_name)
+
+    def gather_dictionary(self, dictionary_target_name=None, data_path=None, cooc_file_path=None,
+                          vocab_file_path=None, symmetric_cooc_values=None, num_threads=None, args=None):
+        """
+        :Description: same as MasterComponent.gather_dictionary(), but only batches\
+                      from data_path are used (in-memory batches belong to master components)
+        """
+        gather_args = _make_gather_dictionary_args(dictionary_target_name, data_path, cooc_file_path,
+                                                   vocab_file_path, symmetric_cooc_values, num_threads, args)
+        self._lib.ArtmGatherDictionaryGlobal(gather_args)
+
+    def convert_cooc_file(self, source_file_path, target_file_path, vocab_file_path,
+                          symmetric_cooc_values=None):
+        """
+        :param str source_file_path: full path to the text file with cooc info
+        :param str target_file_path: full path to the binary cooc file to create
+        :param str vocab_file_path: full path to the file with vocabulary
+        :param bool symmetric_cooc_values: whether the cooc matrix should\
+                considered to be symmetric or not
+        """
+        args = messages.ConvertCoocFileArgs(source_file_path=source_file_path,
+                                            target_file_path=target_file_path,
+                                            vocab_file_path=vocab_file_path)
+        if symmetric_cooc_values is not None:
+            args.symmetric_cooc_values = symmetric_cooc_values
+        self._lib.ArtmConvertCoocFile(args)
+
+    def filter_dictionary(self, dictionary_name=None, dictionary_target_name=None, class_id=None,
+                          min_df=None, max_df=None,
+                          min_df_rate=None, max_df_rate=None,
+                          min_tf=None, max_tf=None,
+                          max_dictionary_size=None,
+                          recalculate_value=None,
+                          args=None):
+        """
+        :Description: same as MasterComponent.filter_dictionary()
+        """
+        filter_args = _make_filter_dictionary_args(dictionary_name, dictionary_target_name, class_id,
+                                                   min_df, max_df, min_df_rate, max_df_rate, min_tf, max_tf,
+                                                   max_dictionary_size, recalculate_value, args)
+        self._lib.ArtmFilterDictionaryGlobal(filter_args)
+
+    def merge_dictionary(self, dictionary_target_name=None, dictionary_names=None, merge_cooc=None, args=None):
+        """
+        :Description: same as MasterComponent.merge_dictionary()
+        """
+        merge_args = _make_merge_dictionary_args(dictionary_target_name, dictionary_names, merge_cooc, args)
+        self._lib.ArtmMergeDictionaryGlobal(merge_args)
@@ -0,0 +1,190 @@
+# Copyright 2017, Additive Regularization of Topic Models.
+
+import time
+import uuid
+import threading
+
+import numpy
+
+from six import iteritems, string_types
+from six.moves import queue
+
+from .wrapper import constants as const
+from .wrapper import messages_pb2 as messages
+
+__all__ = [
+    'TransformCoalescer',
+]
+
+DEFAULT_CLASS = '@default_class'
+
+
+class _TransformRequest(object):
+    def __init__(self, documents):
+        self.documents = documents
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class TransformCoalescer(object):
+    def __init__(self, master, model_name, topic_names, max_delay=0.005, max_documents=256):
+        """
+        :Description: merges small concurrent transform requests into one in-memory batch,\
+                      processes it with one native call and returns the resulting columns\
+                      of Theta to the callers. Use ARTM.transform_coalescer() to create it.
+
+        :param object_reference master: an instance of MasterComponent class
+        :param str model_name: name of p_wt matrix, which tokens are sent to the core
+        :param topic_names: names of topics of the model
+        :type topic_names: list of str
+        :param float max_delay: max time (in seconds) to wait for other requests\
+                                after the first request of a batch has arrived
+        :param int max_documents: max number of documents in one batch
+
+        :Note:
+          * the vocabulary of the model is fixed on creation, tokens, that are not in it, are ignored.
+          * the requests are processed by a background thread, call TransformCoalescer.close()\
+            (or use the object as a context manager) to stop it.
+        """
+        if max_delay < 0:
+            raise ValueError('max_delay should be non-negative')
+        if max_documents < 1:
+            raise ValueError('max_documents should be a positive integer')
+
+        self._master = master
+        self._topic_names = list(topic_names)
+        self._max_delay = max_delay
+        self._max_documents = max_documents
+
+        phi_info = master.get_phi_info(model_name)
+        self._vocabulary = set(zip(phi_info.class_id, phi_info.token))
+
+        self._closed = False
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    @property
+    def topic_names(self):
+        return self._topic_names
+
+    @property
+    def max_delay(self):
+        return self._max_delay
+
+    @property
+    def max_documents(self):
+        return self._max_documents
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        :Description: processes the requests, that are already queued, and stops the background thread
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+
+    def transform(self, documents):
+        """
+        :Description: find Theta for a few documents, blocks until the batch\
+                      with these documents is processed
+
+        :param documents: documents as dicts {token: weight}, where token is str\
+                          (token of '@default_class') or (class_id, token) tuple
+        :type documents: list of dict
+
+        :return: numpy.ndarray with p(t|d) values, rows correspond to topics\
+                 and columns correspond to documents
+        """
+        if not documents:
+            return numpy.zeros(shape=(len(self._topic_names), 0), dtype=numpy.float32)
+
+        request = _TransformRequest(documents)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('TransformCoalescer is closed')
+            self._queue.put(request)
+
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _run(self):
+        stop = False
+        while not stop:
+            request = self._queue.get()
+            if request is None:
+                break
+
+            requests = [request]
+            num_documents = len(request.documents)
+            deadline = time.time() + self._max_delay
+            while num_documents < self._max_documents:
+                timeout = deadline - time.time()
+                if timeout <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                requests.append(request)
+                num_documents += len(request.documents)
+
+            self._process(requests)
+
+    def _process(self, requests):
+        try:
+            batch = messages.Batch(id=str(uuid.uuid4()))
+            token_index = {}
+            for request in requests:
+                for document in request.documents:
+                    item = batch.item.add()
+                    item.id = len(batch.item) - 1
+                    for token, weight in iteritems(document):
+                        token = (DEFAULT_CLASS, token) if isinstance(token, string_types) else tuple(token)
+                        if token not in self._vocabulary:
+                            continue
+                        index = token_index.get(token)
+                        if index is None:
+                            index = len(token_index)
+                            token_index[token] = index
+                            batch.class_id.append(token[0])
+                            batch.token.append(token[1])
+                        item.token_id.append(index)
+                        item.token_weight.append(weight)
+
+            # documents without known tokens keep the initial (uniform) theta, as in the core
+            theta = numpy.empty(shape=(len(batch.item), len(self._topic_names)), dtype=numpy.float32)
+            theta.fill(1.0 / len(self._topic_names))
+            if token_index:
+                info, data = self._master.transform(batches=[batch],
+                                                    theta_matrix_type=const.ThetaMatrixType_Dense)
+                theta[list(info.item_id)] = data
+
+            begin = 0
+            for request in requests:
+                end = begin + len(request.documents)
+                request.result = theta[begin: end].transpose().copy()
+                begin = end
+        except Exception as e:
+            for request in requests:
+                request.error = e
+        finally:
+            for request in requests:
+                request.done.set()
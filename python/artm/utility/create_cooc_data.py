@@ -1,144 +1,333 @@
 # Copyright 2017, Additive Regularization of Topic Models.
 
 # Utility to generate pairwise co-occurrence information of tokens
-# of collection in BigARTM batches with default dictionary.
-# It will create 'cooc_data.txt' file in the directory with
-# this script, that should be passed into artm.Dictionary.gather()
-# method as 'cooc_data_path' parameter.
+# of collection in BigARTM batches. The result is written in the text
+# or in the binary format, and should be passed into artm.Dictionary.gather()
+# method as 'cooc_file_path' parameter together with the vocab file
+# ('vocab_file_path' parameter), that defines the order of tokens.
+#
+# Co-occurrences are counted in windows of given size, that slide through
+# the tokens of each item (window_size <= 0 means the whole item).
+# The value of the pair of tokens in one window is the minimum of their weights
+# (cooc tf), and the number of items, where the pair occurred (cooc df).
+# Pairs of tokens from different modalities are skipped unless --merge-modalities is set.
+#
+# Each batch is converted into sparse matrices with numpy,
+# batches are processed and summed in parallel by the pool of processes.
+#
+# Usage example:
+#   python create_cooc_data.py <folder_with_batches> --window-size 10 --min-tf 5\
+#       --cooc-tf cooc_tf.bin --format binary --vocab vocab.txt
+#
+#   dictionary.gather(data_path=<folder_with_batches>, vocab_file_path='vocab.txt', cooc_file_path='cooc_tf.bin')
 
 # Author: Murat Apishev (great-mel@yandex.ru)
 
 from __future__ import print_function
 
 import os
-import sys
 import glob
 import time
-import artm
 import codecs
+import struct
+import argparse
+import multiprocessing
+
+import numpy
+from scipy import sparse
 
-from six import iteritems
 from six.moves import range
 
-HELP_STR = '\nUsage: python create_cooc_dictionary'
-HELP_STR += '<folder_with_batches_and_dictionary> [<window_size>] [<merge_modalities>]\n'
-HELP_STR += '<window_size> is int greater than zero, <merge_modalities> is 0 or 1\n'
-HELP_STR += 'if <window_size> is not specified, whole document window will be used\n\n'
+import artm
+
+DEFAULT_CLASS = '@default_class'
+
+COOC_FILE_MAGIC = b'ARTMCOOC'
+COOC_FILE_VERSION = 1
+COOC_FILE_HEADER = struct.Struct('=8sii5q')  # see CoocFileHeader in src/artm/core/cooc_file.h
+
 
 def __read_params():
-    window_size = -1  # window size equal to whole document
-    if len(sys.argv) < 2 or len(sys.argv) > 3:
-        raise RuntimeError(HELP_STR)
-    if len(sys.argv) > 2:
-        window_size = int(sys.argv[2])
-
-    batches_folder = sys.argv[1]
-
-    return batches_folder, window_size
-
-
-def __create_batch_dictionary(batch):
-    batch_dictionary = {}
-    for index, token in enumerate(batch.token):
-        batch_dictionary[index] = token
-
-    return batch_dictionary
-
-
-def __save_dictionary(cooc_dictionary, num_tokens):
-    with open('cooc_data.txt', 'w') as fout:
-        for index in range(num_tokens):
-            if index in cooc_dictionary:
-                for key, value in iteritems(cooc_dictionary[index]):
-                    fout.write(u'{0} {1} {2}\n'.format(index, key, value))
-
-
-def __process_batch(global_cooc_dictionary, batch, window_size, dictionary):
-    batch_dictionary = __create_batch_dictionary(batch)
-
-    def __process_window(token_ids, token_weights):
-        for j in range(1, len(token_ids)):
-            value = min(token_weights[0], token_weights[j])
-            token_index_1 = dictionary[batch_dictionary[token_ids[0]]]
-            token_index_2 = dictionary[batch_dictionary[token_ids[j]]]
-
-            if token_index_1 in global_cooc_dictionary:
-                if token_index_2 in global_cooc_dictionary:
-                    if token_index_2 in global_cooc_dictionary[token_index_1]:
-                        global_cooc_dictionary[token_index_1][token_index_2] += value
-                    else:
-                        if token_index_1 in global_cooc_dictionary[token_index_2]:
-                            global_cooc_dictionary[token_index_2][token_index_1] += value
-                        else:
-                            global_cooc_dictionary[token_index_1][token_index_2] = value
-                else:
-                    if token_index_2 in global_cooc_dictionary[token_index_1]:
-                        global_cooc_dictionary[token_index_1][token_index_2] += value
-                    else:
-                        global_cooc_dictionary[token_index_1][token_index_2] = value
-            else:
-                if token_index_2 in global_cooc_dictionary:
-                    if token_index_1 in global_cooc_dictionary[token_index_2]:
-                        global_cooc_dictionary[token_index_2][token_index_1] += value
-                    else:
-                        global_cooc_dictionary[token_index_2][token_index_1] = value
-                else:
-                    global_cooc_dictionary[token_index_1] = {}
-                    global_cooc_dictionary[token_index_1][token_index_2] = value
-
-    for item in batch.item:
-        real_window_size = window_size if window_size > 0 else len(item.token_id)
-        for window_start_id in range(len(item.token_id)):
-            end_index = window_start_id + real_window_size
-            token_ids = item.token_id[window_start_id: end_index if end_index < len(item.token_id) else len(item.token_id)]
-            token_weights = item.token_weight[window_start_id: end_index if end_index < len(item.token_id) else len(item.token_id)]
-            __process_window(token_ids, token_weights)
-
-def __size(obj):
-    result = sys.getsizeof(global_cooc_dictionary)
-    for k_1, internal in iteritems(global_cooc_dictionary):
-        result += sys.getsizeof(k_1)
-        for t, v in iteritems(internal):
-            result += sys.getsizeof(t)
-            result += sys.getsizeof(v)
-
-    return result
+    parser = argparse.ArgumentParser(description='Gathers co-occurrences of tokens in BigARTM batches')
+    parser.add_argument('batches_folder', help='folder with batches')
+    parser.add_argument('--window-size', type=int, default=-1,
+                        help='size of the window (default: the whole item)')
+    parser.add_argument('--merge-modalities', action='store_true',
+                        help='count co-occurrences of tokens from different modalities')
+    parser.add_argument('--min-tf', type=float, default=0.0,
+                        help='minimal value of cooc tf to be saved')
+    parser.add_argument('--min-df', type=float, default=0.0,
+                        help='minimal value of cooc df to be saved')
+    parser.add_argument('--vocab', default=None,
+                        help='vocab file with the order of tokens; if it does not exist,\
+                              it will be created from tokens of batches (default: vocab.txt)')
+    parser.add_argument('--cooc-tf', default=None, help='output file for cooc tf (default: cooc_data.txt)')
+    parser.add_argument('--cooc-df', default=None, help='output file for cooc df')
+    parser.add_argument('--format', choices=['text', 'binary'], default='text',
+                        help='format of output files')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='number of processes (default: number of cpu)')
+    args = parser.parse_args()
 
-if __name__ == "__main__":
+    if args.cooc_tf is None and args.cooc_df is None:
+        args.cooc_tf = 'cooc_data.txt'
+    if args.vocab is None:
+        args.vocab = 'vocab.txt'
+
+    return args
+
+
+def __load_batch(filename):
+    batch = artm.messages.Batch()
+    with open(filename, 'rb') as fin:
+        batch.ParseFromString(fin.read())
+
+    return batch
+
+
+def __batch_tokens(batch):
+    class_ids = batch.class_id if len(batch.class_id) > 0 else [DEFAULT_CLASS] * len(batch.token)
+    return [(token, class_id or DEFAULT_CLASS) for token, class_id in zip(batch.token, class_ids)]
+
+
+def __read_batch_tokens(filename):
+    return __batch_tokens(__load_batch(filename))
+
+
+def __read_vocab(file_name):
+    tokens = []
+    with codecs.open(file_name, 'r', 'utf-8') as fin:
+        for line in fin:
+            strs = line.split()
+            if len(strs) > 0:
+                tokens.append((strs[0], strs[1] if len(strs) > 1 else DEFAULT_CLASS))
+
+    return tokens
+
+
+def __save_vocab(tokens, file_name):
+    with codecs.open(file_name, 'w', 'utf-8') as fout:
+        for token, class_id in tokens:
+            fout.write(u'{0}\n'.format(token if class_id == DEFAULT_CLASS else u'{0} {1}'.format(token, class_id)))
+
+
+# state of worker processes, it's set once by __init_worker
+__worker_state = {}
+
+
+def __init_worker(tokens, window_size, merge_modalities, gather_tf, gather_df):
+    class_index = {}
+    __worker_state['token_index'] = {token: index for index, token in enumerate(tokens)}
+    __worker_state['token_class'] = numpy.array([class_index.setdefault(c, len(class_index)) for _, c in tokens],
+                                                dtype=numpy.int32)
+    __worker_state['window_size'] = window_size
+    __worker_state['merge_modalities'] = merge_modalities
+    __worker_state['gather_tf'] = gather_tf
+    __worker_state['gather_df'] = gather_df
+
+
+def __process_batch(batch):
+    """
+    :return: tuple of upper-triangular scipy.sparse.csr_matrix with cooc tf and cooc df of the batch
+    """
+    token_index = __worker_state['token_index']
+    token_class = __worker_state['token_class']
+    window_size = __worker_state['window_size']
+    num_tokens = len(token_class)
+
+    # global indices of batch tokens (-1 for tokens, that are not in vocab)
+    batch_to_global = numpy.array([token_index.get(token, -1) for token in __batch_tokens(batch)],
+                                  dtype=numpy.int64)
+
+    # all items are concatenated, windows never cross the bounds of items
+    lengths = numpy.array([len(item.token_id) for item in batch.item], dtype=numpy.int64)
+    num_positions = int(lengths.sum())
+    token_ids = numpy.fromiter((token_id for item in batch.item for token_id in item.token_id),
+                               dtype=numpy.int64, count=num_positions)
+    weights = numpy.fromiter((weight for item in batch.item for weight in item.token_weight),
+                             dtype=numpy.float32, count=num_positions)
+    token_ids = batch_to_global[token_ids]
+    item_ids = numpy.repeat(numpy.arange(len(lengths)), lengths)
+    starts = numpy.cumsum(lengths) - lengths
+    num_right_tokens = numpy.repeat(starts + lengths, lengths) - numpy.arange(num_positions) - 1
+
+    # on each step all pairs of positions on the distance 'shift' are taken at once
+    first, second, values, items = [], [], [], []
+    positions = numpy.nonzero(num_right_tokens > 0)[0]
+    shift = 1
+    while len(positions) > 0 and (window_size <= 0 or shift < window_size):
+        first_ids = token_ids[positions]
+        second_ids = token_ids[positions + shift]
+        mask = (first_ids >= 0) & (second_ids >= 0) & (first_ids != second_ids)
+        if not __worker_state['merge_modalities']:
+            mask &= token_class[numpy.maximum(first_ids, 0)] == token_class[numpy.maximum(second_ids, 0)]
+
+        first.append(numpy.minimum(first_ids, second_ids)[mask])
+        second.append(numpy.maximum(first_ids, second_ids)[mask])
+        values.append(numpy.minimum(weights[positions], weights[positions + shift])[mask])
+        items.append(item_ids[positions][mask])
+
+        shift += 1
+        positions = positions[num_right_tokens[positions] >= shift]
+
+    first = numpy.concatenate(first) if first else numpy.zeros(0, dtype=numpy.int64)
+    second = numpy.concatenate(second) if second else numpy.zeros(0, dtype=numpy.int64)
+    shape = (num_tokens, num_tokens)
+
+    cooc_tf, cooc_df = None, None
+    if __worker_state['gather_tf']:
+        values = numpy.concatenate(values) if values else numpy.zeros(0, dtype=numpy.float32)
+        cooc_tf = sparse.coo_matrix((values.astype(numpy.float64), (first, second)), shape=shape).tocsr()
+
+    if __worker_state['gather_df']:
+        # each pair is counted once per item
+        items = numpy.concatenate(items) if items else numpy.zeros(0, dtype=numpy.int64)
+        order = numpy.lexsort((second, first, items))
+        is_new = numpy.ones(len(order), dtype=bool)
+        is_new[1:] = ((first[order][1:] != first[order][:-1]) | (second[order][1:] != second[order][:-1]) |
+                      (items[order][1:] != items[order][:-1]))
+        order = order[is_new]
+        cooc_df = sparse.coo_matrix((numpy.ones(len(order)), (first[order], second[order])), shape=shape).tocsr()
+
+    return cooc_tf, cooc_df
+
+
+def __process_batches(filenames):
+    cooc_tf, cooc_df = None, None
+    for filename in filenames:
+        batch_tf, batch_df = __process_batch(__load_batch(filename))
+        cooc_tf = batch_tf if cooc_tf is None else cooc_tf + batch_tf
+        cooc_df = batch_df if cooc_df is None else cooc_df + batch_df
+
+    return cooc_tf, cooc_df
+
+
+def __to_symmetric(cooc, min_value):
+    cooc = (cooc + cooc.T).tocsr()
+    cooc.data[cooc.data < min_value] = 0
+    cooc.eliminate_zeros()
+    cooc.sort_indices()
+    return cooc
+
+
+def __save_text(cooc, tokens, file_name):
+    def __format_token(index, class_id):
+        token, token_class_id = tokens[index]
+        return token if token_class_id == class_id else u'|{0} {1}'.format(token_class_id, token)
+
+    with codecs.open(file_name, 'w', 'utf-8') as fout:
+        for index in range(cooc.shape[0]):
+            start, end = cooc.indptr[index], cooc.indptr[index + 1]
+            if start == end:
+                continue
+
+            class_id = tokens[index][1]
+            pairs = [u'{0}:{1:.7g}'.format(__format_token(second_index, class_id), value)
+                     for second_index, value in zip(cooc.indices[start: end], cooc.data[start: end])]
+            fout.write(u'{0} {1}\n'.format(__format_token(index, DEFAULT_CLASS), u' '.join(pairs)))
+
+
+def __save_binary(cooc, file_name):
+    def __align(offset):
+        return (offset + 7) // 8 * 8
+
+    num_rows, num_nonzeros = cooc.shape[0], cooc.nnz
+    ids_offset = __align(COOC_FILE_HEADER.size)
+    values_offset = __align(ids_offset + 4 * num_nonzeros)
+    row_offsets_offset = __align(values_offset + 4 * num_nonzeros)
+
+    # the file is replaced at once, so processes, that have mapped the old one, are not affected
+    temp_file_name = file_name + '.tmp'
+    with open(temp_file_name, 'wb') as fout:
+        fout.write(COOC_FILE_HEADER.pack(COOC_FILE_MAGIC, COOC_FILE_VERSION, 0, num_rows, num_nonzeros,
+                                         ids_offset, values_offset, row_offsets_offset))
+        for offset, array in [(ids_offset, cooc.indices.astype(numpy.int32)),
+                              (values_offset, cooc.data.astype(numpy.float32)),
+                              (row_offsets_offset, cooc.indptr.astype(numpy.int64))]:
+            fout.write(b'\0' * (offset - fout.tell()))
+            fout.write(array.tobytes())
+
+    if os.path.exists(file_name):
+        os.remove(file_name)
+    os.rename(temp_file_name, file_name)
+
+
+def create_cooc_data(batches_folder, vocab_file_path, cooc_tf_file_path=None, cooc_df_file_path=None,
+                     window_size=-1, merge_modalities=False, min_tf=0.0, min_df=0.0,
+                     file_format='text', num_processes=None):
+    """
+    :param str batches_folder: folder with batches
+    :param str vocab_file_path: vocab file with the order of tokens, tokens out of it are skipped;\
+                                if it does not exist, it will be created from tokens of batches
+    :param str cooc_tf_file_path: output file for cooc tf values, None means not to gather them
+    :param str cooc_df_file_path: output file for cooc df values, None means not to gather them
+    :param int window_size: size of the window, <= 0 means the whole item
+    :param bool merge_modalities: count co-occurrences of tokens from different modalities or not
+    :param float min_tf: minimal value of cooc tf to be saved
+    :param float min_df: minimal value of cooc df to be saved
+    :param str file_format: 'text' or 'binary'
+    :param int num_processes: number of processes, None means number of cpu
+    """
     global_time_start = time.time()
-    batches_folder, window_size = __read_params()
-    batches_list = glob.glob(os.path.join(batches_folder, '*.batch'))
-    dictionaries_list = [name for name in glob.glob(os.path.join(batches_folder, '*.dict'))]
+    batches_list = sorted(glob.glob(os.path.join(batches_folder, '*.batch')))
+    if len(batches_list) < 1:
+        raise RuntimeError('No batches were found in given folder')
+    print('{} batches were found, start processing'.format(len(batches_list)))
 
-    if len(batches_list) < 1 or len(dictionaries_list) < 1:
-        raise RuntimeError('No batches or dictionaries were found in given folder')
+    num_processes = num_processes or multiprocessing.cpu_count()
+    if os.path.exists(vocab_file_path):
+        tokens = __read_vocab(vocab_file_path)
     else:
-        print('{} batches were found, start processing'.format(len(batches_list)))
+        tokens, token_index = [], set()
+        pool = multiprocessing.Pool(num_processes)
+        try:
+            for batch_tokens in pool.imap(__read_batch_tokens, batches_list):
+                for token in batch_tokens:
+                    if token not in token_index:
+                        token_index.add(token)
+                        tokens.append(token)
+        finally:
+            pool.close()
+            pool.join()
+        __save_vocab(tokens, vocab_file_path)
+        print('Vocab with {0} tokens was saved into {1}'.format(len(tokens), vocab_file_path))
 
-    temp_dict = artm.Dictionary()
-    temp_dict.load(dictionaries_list[0])
-    file_name = '../cooc_info/{}_temp_dict.txt'.format(time.time())
-    temp_dict.save_text(file_name)
+    chunk_size = max(1, min(64, len(batches_list) // (4 * num_processes)))
+    chunks = [batches_list[i: i + chunk_size] for i in range(0, len(batches_list), chunk_size)]
 
-    dictionary = {}
-    with codecs.open(file_name, 'r', 'utf-8') as fin:
-        fin.next()
-        fin.next()
-        for index, line in enumerate(fin):
-            dictionary[line.split(' ')[0][0: -1]] = index
-    os.remove(file_name)
-
-    global_cooc_dictionary = {}
-    for index, filename in enumerate(batches_list):
-        local_time_start = time.time()
-        print('Process batch: {}'.format(index))
-        current_batch = artm.messages.Batch()
-        with open(filename, 'rb') as fin:
-            current_batch.ParseFromString(fin.read())
-        __process_batch(global_cooc_dictionary, current_batch, window_size, dictionary)
-
-        print('Finished batch, elapsed time: {}'.format(time.time() - local_time_start))
-
-    __save_dictionary(global_cooc_dictionary, len(dictionary.keys()))
-    print('Finished collection, elapsed time: {0}, size: {1} Gb'.format(time.time() - global_time_start,
-                                                                        __size(global_cooc_dictionary) / 1000000000.0))
+    cooc_tf, cooc_df = None, None
+    pool = multiprocessing.Pool(num_processes, initializer=__init_worker,
+                                initargs=(tokens, window_size, merge_modalities,
+                                          cooc_tf_file_path is not None, cooc_df_file_path is not None))
+    try:
+        for index, (chunk_tf, chunk_df) in enumerate(pool.imap_unordered(__process_batches, chunks)):
+            cooc_tf = chunk_tf if cooc_tf is None else cooc_tf + chunk_tf
+            cooc_df = chunk_df if cooc_df is None else cooc_df + chunk_df
+            print('Processed {0} of {1} parts, elapsed time: {2}'.format(index + 1, len(chunks),
+                                                                        time.time() - global_time_start))
+    finally:
+        pool.close()
+        pool.join()
+
+    save = __save_binary if file_format == 'binary' else lambda cooc, name: __save_text(cooc, tokens, name)
+    for cooc, min_value, file_name in [(cooc_tf, min_tf, cooc_tf_file_path), (cooc_df, min_df, cooc_df_file_path)]:
+        if file_name is not None:
+            cooc = __to_symmetric(cooc, min_value)
+            save(cooc, file_name)
+            print('Saved {0} pairs into {1}'.format(cooc.nnz, file_name))
+
+    print('Finished collection, elapsed time: {0}'.format(time.time() - global_time_start))
+
+
+if __name__ == "__main__":
+    args = __read_params()
+    create_cooc_data(batches_folder=args.batches_folder,
+                     vocab_file_path=args.vocab,
+                     cooc_tf_file_path=args.cooc_tf,
+                     cooc_df_file_path=args.cooc_df,
+                     window_size=args.window_size,
+                     merge_modalities=args.merge_modalities,
+                     min_tf=args.min_tf,
+                     min_df=args.min_df,
+                     file_format=args.format,
+                     num_processes=args.processes)
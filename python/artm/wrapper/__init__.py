@@ -6,7 +6,7 @@ from . import exceptions
 from . import constants
 from . import messages_pb2 as messages
 
-from .api import LibArtm
+from .api import LibArtm, shared_lib
 
 from .exceptions import (
     ARTM_SUCCESS,
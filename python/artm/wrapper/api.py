@@ -7,6 +7,7 @@ Implementation of wrapper API
 import os
 import sys
 import ctypes
+import threading
 
 import numpy
 import six
@@ -18,15 +19,109 @@ from .exceptions import ARTM_EXCEPTION_BY_CODE
 from .spec import ARTM_API
 
 
+# Loaded shared libraries, key --- tuple of candidate library names, value --- (cdll, lib_name)
+_CDLL_CACHE = {}
+_CDLL_CACHE_LOCK = threading.Lock()
+
+# Process-wide instances of LibArtm, key --- lib_name passed to shared_lib()
+_SHARED_LIBS = {}
+# LibArtm constructor takes _CDLL_CACHE_LOCK, so shared_lib() needs its own lock
+_SHARED_LIBS_LOCK = threading.Lock()
+
+_ARTM_API_BY_NAME = {spec.name: spec for spec in ARTM_API}
+
+# Argument converters of each CallSpec, key --- spec.name (see _get_arg_converters)
+_ARG_CONVERTERS = {}
+
+
+def shared_lib(lib_name=None):
+    """
+    :Description: returns process-wide instance of LibArtm, that is created on first call\
+                  and is shared by all models, dictionaries and batch vectorizers
+
+    :param str lib_name: the name of shared library, see LibArtm
+    """
+    lib = _SHARED_LIBS.get(lib_name)
+    if lib is None:
+        with _SHARED_LIBS_LOCK:
+            lib = _SHARED_LIBS.get(lib_name)
+            if lib is None:
+                lib = LibArtm(lib_name=lib_name)
+                _SHARED_LIBS[lib_name] = lib
+    return lib
+
+
+def _make_arg_converter(spec, arg_pos, arg_name, arg_type):
+    """
+    Returns a function, that checks the value of argument, converts it to c-style\
+    and appends the result to the list of c-style arguments
+    """
+    def raise_type_error(arg_value):
+        raise TypeError('Argument {arg_position} ({arg_name}) should have '
+                        'type {arg_type} but {given_type} given'.format(
+            arg_position=arg_pos,
+            arg_name=arg_name,
+            arg_type=str(arg_type),
+            given_type=str(type(arg_value)),
+        ))
+
+    if issubclass(arg_type, protobuf.message.Message):
+        def convert(arg_value, c_args):
+            arg_casted = arg_value
+            if isinstance(arg_value, dict):
+                # dict -> protobuf message
+                arg_casted = utils.dict_to_message(arg_value, arg_type)
+            if not isinstance(arg_casted, arg_type):
+                raise_type_error(arg_value)
+
+            message_str = arg_casted.SerializeToString()
+            c_args.append(ctypes.c_int64(len(message_str)))
+            c_args.append(ctypes.create_string_buffer(message_str))
+
+    elif issubclass(arg_type, str):
+        def convert(arg_value, c_args):
+            if not isinstance(arg_value, arg_type):
+                raise_type_error(arg_value)
+            c_args.append(ctypes.create_string_buffer(arg_value.encode('utf-8')))
+
+    elif issubclass(arg_type, numpy.ndarray):
+        def convert(arg_value, c_args):
+            if not isinstance(arg_value, arg_type):
+                raise_type_error(arg_value)
+            # lengths are int64_t in c_interface.h, and plain ints would be passed as 32-bit on the stack
+            c_args.append(ctypes.c_int64(arg_value.nbytes))
+            c_args.append(ctypes.c_char_p(arg_value.ctypes.data))
+
+    else:
+        def convert(arg_value, c_args):
+            if not isinstance(arg_value, arg_type):
+                raise_type_error(arg_value)
+            c_args.append(arg_value)
+
+    return convert
+
+
+def _get_arg_converters(spec):
+    converters = _ARG_CONVERTERS.get(spec.name)
+    if converters is None:
+        converters = [_make_arg_converter(spec, arg_pos, arg_name, arg_type)
+                      for arg_pos, (arg_name, arg_type) in enumerate(spec.arguments)]
+        _ARG_CONVERTERS[spec.name] = converters
+    return converters
+
+
 class LibArtm(object):
     def __init__(self, lib_name=None, logging_config=None):
-        self.cdll, self.lib_name = self._load_cdll(lib_name)
+        """
+        :param str lib_name: the name of shared library, if not specified then\
+                             ARTM_SHARED_LIBRARY environment variable and default locations are used
+        :param logging_config: an instance of messages.ConfigureLoggingArgs or dict
 
-        # adding specified functions
-        for spec in ARTM_API:
-            func = self.cdll[spec.name]
-            setattr(self, spec.name, self._wrap_call(func, spec))
-            # TODO: add docstring for wrapped function
+        :Note:
+          * the shared library is loaded once per process, and C functions are bound on first use,\
+            so creating new instances of LibArtm is cheap. Still, consider using shared_lib().
+        """
+        self.cdll, self.lib_name = self._load_cdll(lib_name)
 
         if logging_config is not None:
             self.ArtmConfigureLogging(logging_config)
@@ -34,6 +129,16 @@ class LibArtm(object):
     def __deepcopy__(self, memo):
         return self
 
+    def __getattr__(self, name):
+        # C functions are bound on first use, see ARTM_API for the list of them
+        spec = _ARTM_API_BY_NAME.get(name)
+        if spec is None:
+            raise AttributeError("'{0}' object has no attribute '{1}'".format(type(self).__name__, name))
+
+        call = self._wrap_call(self.cdll[spec.name], spec)
+        setattr(self, name, call)
+        return call
+
     def _load_cdll(self, lib_name):
         # choose default library name
         default_lib_name = 'libartm.so'
@@ -53,7 +158,20 @@ class LibArtm(object):
         
         lib_names.append(default_lib_name)
         lib_names.append(os.path.join(os.path.dirname(__file__), "..", default_lib_name))
-        
+
+        cache_key = tuple(lib_names)
+        cached = _CDLL_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+        with _CDLL_CACHE_LOCK:
+            cached = _CDLL_CACHE.get(cache_key)
+            if cached is None:
+                cached = self._load_cdll_impl(lib_names, default_lib_name)
+                _CDLL_CACHE[cache_key] = cached
+        return cached
+
+    def _load_cdll_impl(self, lib_names, default_lib_name):
         # We look into 4 places: lib_name, ARTM_SHARED_LIBRARY, default_lib_name and
         # default_lib_name in the python package root
         cdll = None
@@ -75,16 +193,16 @@ class LibArtm(object):
             ).format(**locals())
             raise OSError(exception_message)
 
+        cdll.ArtmGetVersion.restype = ctypes.c_char_p
+        cdll.ArtmGetLastErrorMessage.restype = ctypes.c_char_p
         return (cdll, ln)
 
     def version(self):
-        self.cdll.ArtmGetVersion.restype = ctypes.c_char_p
         ver = self.cdll.ArtmGetVersion()
         return ver if six.PY2 else ver.decode('utf-8')
 
     def _check_error(self, error_code):
         if error_code < -1:
-            self.cdll.ArtmGetLastErrorMessage.restype = ctypes.c_char_p
             error_message = self.cdll.ArtmGetLastErrorMessage()
             if six.PY3:
                 error_message = error_message.decode('utf-8')
@@ -107,11 +225,16 @@ class LibArtm(object):
         return message
 
     def _wrap_call(self, func, spec):
+        converters = _get_arg_converters(spec)
+        n_args_takes = len(converters)
+        request_type = spec.request_type
+        result_type = spec.result_type
+        if result_type is not None:
+            func.restype = result_type
 
         def artm_api_call(*args):
             # check the number of arguments
             n_args_given = len(args)
-            n_args_takes = len(spec.arguments)
             if n_args_given != n_args_takes:
                 raise TypeError('{func_name} takes {n_takes} argument ({n_given} given)'.format(
                     func_name=spec.name,
@@ -119,51 +242,19 @@ class LibArtm(object):
                     n_given=n_args_given,
                 ))
 
+            # construct c-style arguments
             c_args = []
-            for (arg_pos, arg_value), (arg_name, arg_type) in zip(enumerate(args), spec.arguments):
-                # try to cast argument to the required type
-                arg_casted = arg_value
-                if issubclass(arg_type, protobuf.message.Message) and isinstance(arg_value, dict):
-                    # dict -> protobuf message
-                    arg_casted = utils.dict_to_message(arg_value, arg_type)
-
-                # check argument type
-                if not isinstance(arg_casted, arg_type):
-                    raise TypeError('Argument {arg_position} ({arg_name}) should have '
-                                    'type {arg_type} but {given_type} given'.format(
-                        arg_position=arg_pos,
-                        arg_name=arg_name,
-                        arg_type=str(arg_type),
-                        given_type=str(type(arg_value)),
-                    ))
-                arg_value = arg_casted
-
-                # construct c-style arguments
-                if issubclass(arg_type, str):
-                    arg_cstr_p = ctypes.create_string_buffer(arg_value.encode('utf-8'))
-                    c_args.append(arg_cstr_p)
-
-                elif issubclass(arg_type, protobuf.message.Message):
-                    message_str = arg_value.SerializeToString()
-                    message_cstr_p = ctypes.create_string_buffer(message_str)
-                    c_args += [len(message_str), message_cstr_p]
-
-                elif issubclass(arg_type, numpy.ndarray):
-                    c_args += [arg_value.nbytes, ctypes.c_char_p(arg_value.ctypes.data)]
-
-                else:
-                    c_args.append(arg_value)
+            for convert, arg_value in zip(converters, args):
+                convert(arg_value, c_args)
 
             # make api call
-            if spec.result_type is not None:
-                func.restype = spec.result_type
             result = func(*c_args)
             self._check_error(result)
 
             # return result value
-            if spec.request_type is not None:
-                return self._get_requested_message(length=result, func=spec.request_type)
-            if spec.result_type is not None:
+            if request_type is not None:
+                return self._get_requested_message(length=result, func=request_type)
+            if result_type is not None:
                 return result
 
         return artm_api_call
@@ -49,6 +49,7 @@ CollectionParserConfig_BatchNameType_Guid = 0
 CollectionParserConfig_BatchNameType_Code = 1
 MatrixLayout_Dense = 0
 MatrixLayout_Sparse = 1
+MatrixLayout_SparseCsr = 2
 ThetaMatrixType_None = 0
 ThetaMatrixType_Dense = 1
 ThetaMatrixType_Sparse = 2
@@ -42,6 +42,10 @@ class DiskWriteException(ArtmException):
     pass
 
 
+class OperationCancelledException(ArtmException):
+    pass
+
+
 ARTM_EXCEPTION_BY_CODE = {
     -2: InternalError,
     -3: ArgumentOutOfRangeException,
@@ -50,4 +54,5 @@ ARTM_EXCEPTION_BY_CODE = {
     -6: InvalidOperationException,
     -7: DiskReadException,
     -8: DiskWriteException,
+    -9: OperationCancelledException,
 }
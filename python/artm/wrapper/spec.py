@@ -65,6 +65,10 @@ ARTM_API = [
         'ArtmFilterDictionary',
         [('master_id', int), ('config', messages.FilterDictionaryArgs)],
     ),
+    CallSpec(
+        'ArtmMergeDictionary',
+        [('master_id', int), ('args', messages.MergeDictionaryArgs)],
+    ),
     CallSpec(
         'ArtmImportDictionary',
         [('master_id', int), ('args', messages.ImportDictionaryArgs)],
@@ -73,10 +77,61 @@ ARTM_API = [
         'ArtmExportDictionary',
         [('master_id', int), ('args', messages.ExportDictionaryArgs)],
     ),
+    CallSpec(
+        'ArtmCreateDictionaryGlobal',
+        [('config', messages.DictionaryData)],
+    ),
+    CallSpec(
+        'ArtmDisposeDictionaryGlobal',
+        [('name', str)],
+    ),
+    CallSpec(
+        'ArtmGatherDictionaryGlobal',
+        [('config', messages.GatherDictionaryArgs)],
+    ),
+    CallSpec(
+        'ArtmFilterDictionaryGlobal',
+        [('config', messages.FilterDictionaryArgs)],
+    ),
+    CallSpec(
+        'ArtmMergeDictionaryGlobal',
+        [('args', messages.MergeDictionaryArgs)],
+    ),
+    CallSpec(
+        'ArtmImportDictionaryGlobal',
+        [('args', messages.ImportDictionaryArgs)],
+    ),
+    CallSpec(
+        'ArtmExportDictionaryGlobal',
+        [('args', messages.ExportDictionaryArgs)],
+    ),
+    CallSpec(
+        'ArtmRequestDictionaryGlobal',
+        [('args', messages.GetDictionaryArgs)],
+        request=messages.DictionaryData,
+    ),
+    CallSpec(
+        'ArtmRequestDictionaryInfoGlobal',
+        [('args', messages.GetDictionaryArgs)],
+        request=messages.MasterComponentInfo,
+    ),
+    CallSpec(
+        'ArtmRequestDictionaryArraysGlobal',
+        [('args', messages.GetDictionaryArgs)],
+        request=messages.DictionaryArraysInfo,
+    ),
+    CallSpec(
+        'ArtmCreateDictionaryFromArraysGlobal',
+        [('info', messages.DictionaryArraysInfo), ('arrays', numpy.ndarray)],
+    ),
     CallSpec(
         'ArtmParseCollection',
         [('config', messages.CollectionParserConfig)],
     ),
+    CallSpec(
+        'ArtmConvertCoocFile',
+        [('args', messages.ConvertCoocFileArgs)],
+    ),
     CallSpec(
         'ArtmImportBatches',
         [('master_id', int), ('args', messages.ImportBatchesArgs)],
@@ -93,6 +148,10 @@ ARTM_API = [
         'ArtmClearScoreArrayCache',
         [('master_id', int), ('args', messages.ClearScoreArrayCacheArgs)],
     ),
+    CallSpec(
+        'ArtmCancelOperation',
+        [('master_id', int), ('args', messages.CancelOperationArgs)],
+    ),
     CallSpec(
         'ArtmDisposeBatch',
         [('master_id', int), ('name', six.text_type)],
@@ -159,6 +218,11 @@ ARTM_API = [
         [('master_id', int), ('args', messages.GetTopicModelArgs)],
         request=messages.TopicModel,
     ),
+    CallSpec(
+        'ArtmRequestTopTokensExternal',
+        [('master_id', int), ('args', messages.GetTopTokensArgs)],
+        request=messages.TopTokens,
+    ),
     CallSpec(
         'ArtmRequestScore',
         [('master_id', int), ('args', messages.GetScoreValueArgs)],
@@ -179,6 +243,15 @@ ARTM_API = [
         [('master_id', int), ('args', messages.GetDictionaryArgs)],
         request=messages.DictionaryData,
     ),
+    CallSpec(
+        'ArtmRequestDictionaryArrays',
+        [('master_id', int), ('args', messages.GetDictionaryArgs)],
+        request=messages.DictionaryArraysInfo,
+    ),
+    CallSpec(
+        'ArtmCreateDictionaryFromArrays',
+        [('master_id', int), ('info', messages.DictionaryArraysInfo), ('arrays', numpy.ndarray)],
+    ),
     CallSpec(
         'ArtmRequestMasterComponentInfo',
         [('master_id', int), ('args', messages.GetMasterComponentInfoArgs)],
@@ -192,6 +265,15 @@ ARTM_API = [
         'ArtmCopyRequestedObject',
         [('array', numpy.ndarray)],
     ),
+    CallSpec(
+        'ArtmCopyRequestedSparseMatrix',
+        [('indptr', numpy.ndarray), ('indices', numpy.ndarray), ('values', numpy.ndarray)],
+    ),
+    CallSpec(
+        'ArtmInferThetaDense',
+        [('phi', numpy.ndarray), ('token_ids', numpy.ndarray), ('token_weights', numpy.ndarray),
+         ('num_document_passes', int), ('theta', numpy.ndarray)],
+    ),
     CallSpec(
         'ArtmConfigureLogging',
         [('config', messages.ConfigureLoggingArgs)],
@@ -0,0 +1,80 @@
+# Copyright 2017, Additive Regularization of Topic Models.
+
+import shutil
+import tempfile
+import os
+import numpy
+
+from six.moves import range
+
+import artm
+
+def test_func():
+    try:
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+    except ImportError:
+        return  # asyncio API is available only in python 3
+
+    num_topics = 10
+    zero_eps = 1e-6
+
+    data_path = os.environ.get('BIGARTM_UNITTEST_DATA')
+    batches_folder = tempfile.mkdtemp()
+    loop = asyncio.new_event_loop()
+
+    try:
+        batch_vectorizer = artm.BatchVectorizer(data_path=data_path,
+                                                data_format='bow_uci',
+                                                collection_name='kos',
+                                                target_folder=batches_folder,
+                                                batch_size=100)
+
+        dictionary = artm.Dictionary()
+        dictionary.gather(data_path=batch_vectorizer.data_path)
+
+        model = artm.ARTM(topic_names=['topic_{}'.format(i) for i in range(num_topics)],
+                          dictionary=dictionary.name,
+                          scores=[artm.PerplexityScore(name='perplexity')])
+
+        loop.run_until_complete(model.afit_offline(batch_vectorizer=batch_vectorizer,
+                                                   num_collection_passes=2, loop=loop))
+        assert len(model.score_tracker['perplexity'].value) == 2
+
+        loop.run_until_complete(model.afit_online(batch_vectorizer=batch_vectorizer, loop=loop))
+        assert len(model.score_tracker['perplexity'].value) == 2 + batch_vectorizer.num_batches
+
+        theta = model.transform(batch_vectorizer=batch_vectorizer)
+        theta_async = loop.run_until_complete(model.atransform(batch_vectorizer=batch_vectorizer, loop=loop))
+        assert list(theta_async.columns) == list(theta.columns)
+        assert numpy.max(numpy.abs(theta_async.values - theta.values)) < zero_eps
+
+        # cancellation stops the learning without waiting for all queued batches
+        executor = ThreadPoolExecutor(max_workers=1)
+        future = model.afit_offline(batch_vectorizer=batch_vectorizer, num_collection_passes=100,
+                                    loop=loop, executor=executor)
+        loop.run_until_complete(asyncio.sleep(0.5))
+        future.cancel()
+        loop.run_until_complete(asyncio.sleep(0))
+        assert future.cancelled()
+        executor.shutdown(wait=True)
+        assert len(model.score_tracker['perplexity'].value) < 2 + batch_vectorizer.num_batches + 100
+
+        # the model is still usable after cancellation
+        theta_after = loop.run_until_complete(model.atransform(batch_vectorizer=batch_vectorizer, loop=loop))
+        assert theta_after.shape == theta.shape
+
+        # cancellation of one call doesn't affect the other calls of the model
+        executor = ThreadPoolExecutor(max_workers=2)
+        future = model.atransform(batch_vectorizer=batch_vectorizer, loop=loop, executor=executor)
+        future_concurrent = model.atransform(batch_vectorizer=batch_vectorizer, loop=loop, executor=executor)
+        loop.run_until_complete(asyncio.sleep(0.05))
+        future.cancel()
+        theta_concurrent = loop.run_until_complete(future_concurrent)
+        executor.shutdown(wait=True)
+        assert future.cancelled()
+        assert list(theta_concurrent.columns) == list(theta_after.columns)
+        assert numpy.max(numpy.abs(theta_concurrent.values - theta_after.values)) < zero_eps
+    finally:
+        loop.close()
+        shutil.rmtree(batches_folder)
@@ -0,0 +1,69 @@
+# Copyright 2017, Additive Regularization of Topic Models.
+
+import shutil
+import tempfile
+import os
+import time
+import threading
+import numpy
+
+from six.moves import range
+
+import artm
+from artm.wrapper.exceptions import OperationCancelledException
+
+def test_func():
+    num_topics = 10
+    num_collection_passes = 100
+    zero_eps = 1e-5
+
+    data_path = os.environ.get('BIGARTM_UNITTEST_DATA')
+    batches_folder = tempfile.mkdtemp()
+
+    try:
+        batch_vectorizer = artm.BatchVectorizer(data_path=data_path,
+                                                data_format='bow_uci',
+                                                collection_name='kos',
+                                                target_folder=batches_folder,
+                                                batch_size=100)
+
+        dictionary = artm.Dictionary()
+        dictionary.gather(data_path=batch_vectorizer.data_path)
+
+        model = artm.ARTM(topic_names=['topic_{}'.format(i) for i in range(num_topics)],
+                          dictionary=dictionary.name,
+                          scores=[artm.PerplexityScore(name='perplexity')])
+
+        # cancel() without running operations does nothing
+        model.cancel()
+        model.fit_offline(batch_vectorizer=batch_vectorizer, num_collection_passes=1)
+
+        errors = []
+
+        def _fit():
+            try:
+                model.fit_offline(batch_vectorizer=batch_vectorizer, num_collection_passes=num_collection_passes)
+            except OperationCancelledException as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=_fit)
+        thread.start()
+        time.sleep(0.5)
+        model.cancel()
+        thread.join()
+
+        assert len(errors) == 1
+        assert len(model.score_tracker['perplexity'].value) < 1 + num_collection_passes
+
+        # p_wt is normalized from n_wt
+        phi = model.get_phi()
+        nwt = model.get_phi(model_name=model.model_nwt)
+        n_t = nwt.values.sum(axis=0)
+        assert numpy.max(numpy.abs(phi.values - nwt.values / numpy.where(n_t > 0, n_t, 1))) < zero_eps
+
+        # the model is still usable after cancellation
+        model.fit_offline(batch_vectorizer=batch_vectorizer, num_collection_passes=1)
+        theta = model.transform(batch_vectorizer=batch_vectorizer)
+        assert theta.shape[0] == num_topics
+    finally:
+        shutil.rmtree(batches_folder)
@@ -0,0 +1,81 @@
+# Copyright 2018, Additive Regularization of Topic Models.
+
+import shutil
+import tempfile
+import os
+import struct
+import subprocess
+import sys
+import uuid
+
+import artm
+
+
+def test_func():
+    script_name = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               '..', '..', 'artm', 'utility', 'create_cooc_data.py')
+    tokens = ['A', 'B', 'C', 'D']
+    batches = [[[(0, 2), (2, 4), (3, 1)], [(1, 3), (2, 2), (0, 4), (3, 1)]],
+               [[(0, 2), (1, 1), (3, 1)], [(0, 6), (3, 2)]]]
+
+    # values for the whole item window and for the window of size 2 (neighbouring tokens)
+    cooc_tf = {('A', 'B'): 4, ('A', 'C'): 4, ('A', 'D'): 5, ('B', 'C'): 2, ('B', 'D'): 2, ('C', 'D'): 2}
+    cooc_df = {('A', 'C'): 2, ('A', 'D'): 2}
+
+    batches_folder = tempfile.mkdtemp()
+    vocab_file_name = os.path.join(batches_folder, 'vocab.txt')
+    cooc_tf_file_name = os.path.join(batches_folder, 'cooc_tf.txt')
+    cooc_df_file_name = os.path.join(batches_folder, 'cooc_df.bin')
+
+    def _check_cooc(cooc_file_name, expected_values):
+        dictionary = artm.Dictionary()
+        dictionary.gather(data_path=batches_folder, vocab_file_path=vocab_file_name, cooc_file_path=cooc_file_name)
+        dictionary_file_name = os.path.join(batches_folder, '{}.dict'.format(uuid.uuid4()))
+        dictionary.save(dictionary_path=dictionary_file_name)
+
+        # dictionary file contains version byte and a sequence of <int32 length><DictionaryData>
+        dictionary_data = artm.messages.DictionaryData()
+        with open(dictionary_file_name, 'rb') as fin:
+            fin.read(1)
+            length = fin.read(4)
+            while len(length) == 4:
+                dictionary_data.MergeFromString(fin.read(struct.unpack('i', length)[0]))
+                length = fin.read(4)
+
+        values = {}
+        for first, second, value in zip(dictionary_data.cooc_first_index,
+                                        dictionary_data.cooc_second_index,
+                                        dictionary_data.cooc_value):
+            values[(dictionary_data.token[first], dictionary_data.token[second])] = value
+
+        assert len(values) == 2 * len(expected_values)
+        for (first, second), value in expected_values.items():
+            assert values[(first, second)] == value
+            assert values[(second, first)] == value
+
+    try:
+        for batch_items in batches:
+            batch = artm.messages.Batch()
+            batch.token.extend(tokens)
+            for item_tokens in batch_items:
+                item = batch.item.add()
+                for token_id, token_weight in item_tokens:
+                    item.token_id.append(token_id)
+                    item.token_weight.append(token_weight)
+
+            with open(os.path.join(batches_folder, '{}.batch'.format(uuid.uuid4())), 'wb') as fout:
+                fout.write(batch.SerializeToString())
+
+        # vocab is created by the first run and reused by the second one
+        subprocess.check_call([sys.executable, script_name, batches_folder, '--vocab', vocab_file_name,
+                               '--cooc-tf', cooc_tf_file_name, '--processes', '2'])
+        with open(vocab_file_name, 'r') as fin:
+            assert sorted(fin.read().split()) == tokens
+        _check_cooc(cooc_tf_file_name, cooc_tf)
+
+        subprocess.check_call([sys.executable, script_name, batches_folder, '--vocab', vocab_file_name,
+                               '--cooc-df', cooc_df_file_name, '--window-size', '2', '--min-df', '2',
+                               '--format', 'binary', '--processes', '2'])
+        _check_cooc(cooc_df_file_name, cooc_df)
+    finally:
+        shutil.rmtree(batches_folder)
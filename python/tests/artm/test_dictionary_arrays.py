@@ -0,0 +1,54 @@
+# Copyright 2018, Additive Regularization of Topic Models.
+
+import shutil
+import tempfile
+import os
+
+import numpy
+
+import artm
+
+
+def test_func():
+    folder = tempfile.mkdtemp()
+
+    tokens = [u'token_{}'.format(i) for i in range(100)] + [u'\u0442\u043e\u043a\u0435\u043d']
+    class_ids = [u'@default_class' if i % 3 else u'author' for i in range(len(tokens))]
+    token_tf = numpy.arange(1, len(tokens) + 1, dtype=numpy.float32)
+    token_df = numpy.ones(len(tokens), dtype=numpy.float32)
+    token_value = token_tf / token_tf.sum()
+
+    def _check_arrays(arrays):
+        assert list(arrays['token']) == tokens
+        assert list(arrays['class_id']) == class_ids
+        assert numpy.allclose(arrays['token_value'], token_value)
+        assert numpy.allclose(arrays['token_tf'], token_tf)
+        assert numpy.allclose(arrays['token_df'], token_df)
+        assert arrays['num_items_in_collection'] == 42
+
+    try:
+        dictionary = artm.Dictionary.from_arrays(token=tokens, class_id=class_ids, token_value=token_value,
+                                                 token_tf=token_tf, token_df=token_df, num_items_in_collection=42)
+        _check_arrays(dictionary.to_arrays())
+
+        # arrays should be consistent with DictionaryData message
+        dictionary_data = dictionary._registry.get_dictionary(dictionary.name)
+        assert list(dictionary_data.token) == tokens
+        assert list(dictionary_data.class_id) == class_ids
+
+        restored = artm.Dictionary.from_arrays(**dictionary.to_arrays())
+        _check_arrays(restored.to_arrays())
+
+        file_name = os.path.join(folder, 'dictionary.npz')
+        dictionary.save_arrays(file_name)
+        loaded = artm.Dictionary()
+        loaded.load_arrays(file_name)
+        _check_arrays(loaded.to_arrays())
+
+        # tokens without class ids and frequencies belong to @default_class
+        empty = artm.Dictionary.from_arrays(token=tokens[: 3])
+        arrays = empty.to_arrays()
+        assert list(arrays['class_id']) == [u'@default_class'] * 3
+        assert not arrays['token_tf'].any()
+    finally:
+        shutil.rmtree(folder)
@@ -0,0 +1,57 @@
+# Copyright 2018, Additive Regularization of Topic Models.
+
+import shutil
+import glob
+import tempfile
+import os
+
+import artm
+
+
+def test_func():
+    data_path = os.environ.get('BIGARTM_UNITTEST_DATA')
+    batches_folder = tempfile.mkdtemp()
+    parts_folder = tempfile.mkdtemp()
+    eps = 1e-5
+
+    def _get_entries(dictionary):
+        dictionary_data = dictionary._registry.get_dictionary(dictionary.name)
+        entries = {}
+        for token, class_id, value, tf, df in zip(dictionary_data.token, dictionary_data.class_id,
+                                                  dictionary_data.token_value, dictionary_data.token_tf,
+                                                  dictionary_data.token_df):
+            entries[(token, class_id)] = (value, tf, df)
+        return entries, dictionary_data.num_items_in_collection
+
+    try:
+        batch_vectorizer = artm.BatchVectorizer(data_path=data_path,
+                                                data_format='bow_uci',
+                                                collection_name='kos',
+                                                target_folder=batches_folder,
+                                                batch_size=500)
+
+        # split batches into two parts, as if they were gathered on different machines;
+        # the parts are kept outside of batches_folder, because batches are searched recursively
+        parts = [os.path.join(parts_folder, 'part_{}'.format(i)) for i in range(2)]
+        for part in parts:
+            os.mkdir(part)
+        for index, batch_file in enumerate(sorted(glob.glob(os.path.join(batches_folder, '*.batch')))):
+            shutil.copy(batch_file, parts[index % 2])
+
+        dictionary = artm.Dictionary(data_path=batches_folder)
+        partial_dictionaries = [artm.Dictionary(data_path=part) for part in parts]
+        merged_dictionary = artm.Dictionary.merge(partial_dictionaries)
+
+        entries, num_items = _get_entries(dictionary)
+        merged_entries, merged_num_items = _get_entries(merged_dictionary)
+
+        assert merged_num_items == num_items
+        assert len(merged_entries) == len(entries)
+        for key, (value, tf, df) in entries.items():
+            merged_value, merged_tf, merged_df = merged_entries[key]
+            assert abs(merged_value - value) < eps
+            assert abs(merged_tf - tf) < eps
+            assert abs(merged_df - df) < eps
+    finally:
+        shutil.rmtree(batches_folder)
+        shutil.rmtree(parts_folder)
@@ -0,0 +1,50 @@
+# Copyright 2017, Additive Regularization of Topic Models.
+
+import shutil
+import tempfile
+import os
+
+from six.moves import range
+
+import artm
+
+def test_func():
+    data_path = os.environ.get('BIGARTM_UNITTEST_DATA')
+    batches_folder = tempfile.mkdtemp()
+
+    num_tokens = 6906
+    num_filtered_tokens = 2852
+    num_dictionaries = 100
+
+    try:
+        artm.BatchVectorizer(data_path=data_path,
+                             data_format='bow_uci',
+                             collection_name='kos',
+                             target_folder=batches_folder)
+
+        dictionary = artm.Dictionary()
+        dictionary.gather(data_path=batches_folder)
+        assert 'num_entries={0}'.format(num_tokens) in repr(dictionary)
+
+        # dictionaries are created without master components, and are still visible for models
+        filtered = [dictionary.filter(min_df=2, inplace=False) for _ in range(num_dictionaries)]
+        for filtered_dictionary in filtered:
+            assert 'num_entries={0}'.format(num_filtered_tokens) in repr(filtered_dictionary)
+
+        model = artm.ARTM(num_topics=5, dictionary=filtered[0])
+        assert filtered[0].name in [d.name for d in model.master.get_info().dictionary]
+        assert model.get_phi().shape[0] == num_filtered_tokens
+
+        # save / load / get_dictionary work through the registry
+        dictionary_data = model.master.get_dictionary(filtered[1].name)
+        assert len(dictionary_data.token) == num_filtered_tokens
+        filtered[1].save(dictionary_path=os.path.join(batches_folder, 'filtered'))
+        loaded = artm.Dictionary(dictionary_path=os.path.join(batches_folder, 'filtered.dict'))
+        assert 'num_entries={0}'.format(num_filtered_tokens) in repr(loaded)
+
+        # disposed dictionaries are removed from the registry
+        name = filtered[2].name
+        filtered[2].dispose()
+        assert name not in [d.name for d in model.master.get_info().dictionary]
+    finally:
+        shutil.rmtree(batches_folder)
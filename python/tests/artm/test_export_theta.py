@@ -0,0 +1,85 @@
+# Copyright 2017, Additive Regularization of Topic Models.
+
+import shutil
+import tempfile
+import os
+import numpy
+
+from six.moves import range
+
+import artm
+
+def test_func():
+    num_topics = 10
+    eps = 1e-3
+    zero_eps = 1e-6
+    float16_zero_eps = 1e-3
+
+    data_path = os.environ.get('BIGARTM_UNITTEST_DATA')
+    batches_folder = tempfile.mkdtemp()
+    export_folder = tempfile.mkdtemp()
+
+    try:
+        batch_vectorizer = artm.BatchVectorizer(data_path=data_path,
+                                                data_format='bow_uci',
+                                                collection_name='kos',
+                                                target_folder=batches_folder,
+                                                batch_size=500)
+
+        dictionary = artm.Dictionary()
+        dictionary.gather(data_path=batch_vectorizer.data_path)
+
+        model = artm.ARTM(topic_names=['topic_{}'.format(i) for i in range(num_topics)],
+                          dictionary=dictionary.name,
+                          cache_theta=True)
+        model.fit_offline(batch_vectorizer=batch_vectorizer, num_collection_passes=2)
+
+        # dense export from theta cache
+        theta = model.get_theta()
+        npy_path = os.path.join(export_folder, 'theta.npy')
+        item_ids = model.export_theta(npy_path)
+        assert sorted(item_ids) == sorted(theta.columns)
+
+        data = numpy.load(npy_path, mmap_mode='r')
+        assert data.dtype == numpy.float32
+        assert data.shape == (len(item_ids), num_topics)
+        assert numpy.max(numpy.abs(data - theta[item_ids].values.transpose())) < zero_eps
+        assert list(numpy.load(npy_path + '.item_ids.npy')) == item_ids
+        del data
+
+        # sparse export
+        from scipy import sparse
+
+        npz_path = os.path.join(export_folder, 'theta.npz')
+        item_ids = model.export_theta(npz_path, file_format='npz_sparse', eps=eps)
+        data = sparse.load_npz(npz_path)
+        assert data.shape == (len(item_ids), num_topics)
+        expected = theta[item_ids].values.transpose()
+        expected = numpy.where(expected >= eps, expected, 0)
+        assert numpy.max(numpy.abs(data.toarray() - expected)) < zero_eps
+
+        # columnar export after transform pass, with half precision values
+        columnar_path = os.path.join(export_folder, 'theta_columns')
+        topic_names = ['topic_3', 'topic_8']
+        item_ids = model.export_theta(columnar_path, file_format='columnar', dtype='float16',
+                                      batch_vectorizer=batch_vectorizer, topic_names=topic_names)
+        theta = model.transform(batch_vectorizer=batch_vectorizer)
+        assert sorted(item_ids) == sorted(theta.columns)
+        assert list(numpy.load(os.path.join(columnar_path, 'item_ids.npy'))) == item_ids
+        for topic_name in topic_names:
+            column = numpy.load(os.path.join(columnar_path, '{}.npy'.format(topic_name)), mmap_mode='r')
+            assert column.dtype == numpy.float16
+            assert numpy.max(numpy.abs(column - theta.loc[topic_name, item_ids].values)) < float16_zero_eps
+            del column
+
+        # sparse export after transform pass
+        item_ids = model.export_theta(npz_path, file_format='npz_sparse', batch_vectorizer=batch_vectorizer,
+                                      topic_names=topic_names, eps=eps)
+        data = sparse.load_npz(npz_path)
+        assert data.shape == (len(item_ids), len(topic_names))
+        expected = theta.loc[topic_names, item_ids].values.transpose()
+        expected = numpy.where(expected >= eps, expected, 0)
+        assert numpy.max(numpy.abs(data.toarray() - expected)) < zero_eps
+    finally:
+        shutil.rmtree(batches_folder)
+        shutil.rmtree(export_folder)
@@ -0,0 +1,59 @@
+# Copyright 2017, Additive Regularization of Topic Models.
+
+import shutil
+import tempfile
+import os
+import numpy
+
+from six.moves import range
+
+import artm
+
+def test_func():
+    num_topics = 10
+    eps = 1e-3
+    zero_eps = 1e-6
+
+    data_path = os.environ.get('BIGARTM_UNITTEST_DATA')
+    batches_folder = tempfile.mkdtemp()
+
+    try:
+        batch_vectorizer = artm.BatchVectorizer(data_path=data_path,
+                                                data_format='bow_uci',
+                                                collection_name='kos',
+                                                target_folder=batches_folder)
+
+        dictionary = artm.Dictionary()
+        dictionary.gather(data_path=batch_vectorizer.data_path)
+
+        model = artm.ARTM(topic_names=['topic_{}'.format(i) for i in range(num_topics)],
+                          dictionary=dictionary.name,
+                          cache_theta=True)
+        model.fit_offline(batch_vectorizer=batch_vectorizer, num_collection_passes=2)
+
+        # theta is exported from the core directly in CSR format
+        theta = model.get_theta()
+        data, rows, columns = model.get_theta_sparse(eps=eps)
+        assert data.format == 'csr'
+        assert rows == list(theta.index)
+        assert columns == list(theta.columns)
+        expected = numpy.where(theta.values > eps, theta.values, 0)
+        assert numpy.max(numpy.abs(data.toarray() - expected)) < zero_eps
+
+        data, rows, _ = model.get_theta_sparse(topic_names=['topic_7', 'topic_1'], eps=eps)
+        assert rows == ['topic_7', 'topic_1']
+        assert numpy.max(numpy.abs(data.toarray() - expected[[7, 1], :])) < zero_eps
+
+        # phi is exported in CSR format when there is no up-to-date snapshot of the whole matrix
+        data, rows, columns = model.get_phi_sparse(eps=eps)
+        assert data.format == 'csr'
+        phi = model.get_phi()
+        assert rows == list(phi.index)
+        assert columns == list(phi.columns)
+        expected = numpy.where(phi.values > eps, phi.values, 0)
+        assert numpy.max(numpy.abs(data.toarray() - expected)) < zero_eps
+
+        data_from_snapshot, _, _ = model.get_phi_sparse(eps=eps)
+        assert numpy.max(numpy.abs(data_from_snapshot.toarray() - expected)) < zero_eps
+    finally:
+        shutil.rmtree(batches_folder)
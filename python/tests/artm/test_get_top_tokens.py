@@ -0,0 +1,57 @@
+# Copyright 2017, Additive Regularization of Topic Models.
+
+import shutil
+import tempfile
+import os
+import numpy
+
+from six.moves import range
+
+import artm
+
+def test_func():
+    num_topics = 10
+    num_tokens = 12
+    weight_zero_eps = 1e-6
+
+    data_path = os.environ.get('BIGARTM_UNITTEST_DATA')
+    batches_folder = tempfile.mkdtemp()
+
+    try:
+        batch_vectorizer = artm.BatchVectorizer(data_path=data_path,
+                                                data_format='bow_uci',
+                                                collection_name='kos',
+                                                target_folder=batches_folder)
+
+        dictionary = artm.Dictionary()
+        dictionary.gather(data_path=batch_vectorizer.data_path)
+
+        model = artm.ARTM(topic_names=['topic_{}'.format(i) for i in range(num_topics)],
+                          dictionary=dictionary.name)
+        model.fit_offline(batch_vectorizer=batch_vectorizer, num_collection_passes=3)
+
+        token_indices, weights, columns = model.get_top_tokens(num_tokens=num_tokens)
+        assert token_indices.shape == (num_topics, num_tokens)
+        assert weights.shape == (num_topics, num_tokens)
+        assert columns == model.topic_names
+
+        phi = model.get_phi()
+        for topic_index, topic_name in enumerate(model.topic_names):
+            expected_weights = numpy.sort(phi[topic_name].values)[::-1][:num_tokens]
+            assert numpy.all(numpy.diff(weights[topic_index]) <= 0)
+            assert numpy.max(numpy.abs(weights[topic_index] - expected_weights)) < weight_zero_eps
+            assert numpy.max(numpy.abs(phi[topic_name].values[token_indices[topic_index]] -
+                                       weights[topic_index])) < weight_zero_eps
+
+        # subset of topics and repeated call, that should be served from cache
+        token_indices_2, weights_2, columns_2 = model.get_top_tokens(num_tokens=num_tokens,
+                                                                     topic_names='topic_3')
+        assert columns_2 == ['topic_3']
+        assert numpy.array_equal(token_indices_2[0], token_indices[3])
+        assert model.get_top_tokens(num_tokens=num_tokens, topic_names='topic_3')[0] is token_indices_2
+
+        # cache must be invalidated after the model is updated
+        model.fit_offline(batch_vectorizer=batch_vectorizer, num_collection_passes=1)
+        assert model.get_top_tokens(num_tokens=num_tokens, topic_names='topic_3')[0] is not token_indices_2
+    finally:
+        shutil.rmtree(batches_folder)
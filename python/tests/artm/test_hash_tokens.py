@@ -0,0 +1,68 @@
+# Copyright 2018, Additive Regularization of Topic Models.
+
+import os
+import shutil
+import tempfile
+
+import numpy
+
+import artm
+
+
+def test_func():
+    num_hash_buckets = 16
+    default_class = '@default_class'
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        vw_path = os.path.join(temp_dir, 'vw.txt')
+        with open(vw_path, 'w') as fout:
+            fout.write('doc1 a b c a\n')
+            fout.write('doc2 b c |author x y\n')
+            fout.write('doc3 c:2 a |author y\n')
+
+        batch_vectorizer = artm.BatchVectorizer(data_path=vw_path,
+                                                data_format='vowpal_wabbit',
+                                                target_folder=os.path.join(temp_dir, 'batches'),
+                                                batch_size=2,
+                                                num_hash_buckets=num_hash_buckets)
+
+        # tokens in batches are hashed in the same way as by artm.hash_token()
+        for filename in batch_vectorizer.batches_ids:
+            batch = artm.messages.Batch()
+            with open(filename, 'rb') as fin:
+                batch.ParseFromString(fin.read())
+            for item in batch.item:
+                if item.title == 'doc1':
+                    hashed_tokens = [batch.token[token_id] for token_id in item.token_id]
+                    assert hashed_tokens == [artm.hash_token(token, num_hash_buckets) for token in 'abca']
+
+        # the dictionary contains all buckets of both modalities
+        arrays = batch_vectorizer.dictionary.to_arrays()
+        assert len(arrays['token']) == 2 * num_hash_buckets
+        assert set(arrays['class_id']) == {default_class, 'author'}
+        assert abs(arrays['token_tf'].sum() - 12.0) < 1e-5
+        assert arrays['num_items_in_collection'] == 3
+
+        hash_lookup = batch_vectorizer.hash_lookup
+        assert sum(len(top_tokens) for top_tokens in hash_lookup.values()) == 5
+        assert (('a', 3.0) in hash_lookup[(default_class, artm.hash_token('a', num_hash_buckets))])
+        assert (('y', 2.0) in hash_lookup[('author', artm.hash_token('y', num_hash_buckets))])
+    finally:
+        shutil.rmtree(temp_dir)
+
+    n_wd = numpy.array([[1, 2, 3], [2, 0, 4], [0, 5, 6], [4, 5, 0]])
+    vocab = {0: 'test', 1: 'artm', 2: 'python', 3: 'batch'}
+    batch_vectorizer = artm.BatchVectorizer(data_format='bow_n_wd',
+                                            n_wd=n_wd,
+                                            vocabulary=vocab,
+                                            num_hash_buckets=3,
+                                            hash_lookup_size=1)
+    arrays = batch_vectorizer.dictionary.to_arrays()
+    assert sorted(arrays['token']) == ['#0', '#1', '#2']
+    assert abs(arrays['token_tf'].sum() - n_wd.sum()) < 1e-5
+
+    for (class_id, bucket), top_tokens in batch_vectorizer.hash_lookup.items():
+        assert class_id == default_class
+        assert len(top_tokens) == 1
+        assert artm.hash_token(top_tokens[0][0], 3) == bucket
@@ -0,0 +1,41 @@
+# Copyright 2017, Additive Regularization of Topic Models.
+
+import os
+import sys
+import json
+import subprocess
+
+# seconds, the cold import of artm should not be slower than this
+IMPORT_TIME_THRESHOLD = float(os.environ.get('BIGARTM_IMPORT_TIME_THRESHOLD', '2.0'))
+
+CODE = '''
+import sys
+import time
+import json
+
+start = time.time()
+import artm
+elapsed = time.time() - start
+
+print(json.dumps({
+    'time': elapsed,
+    'modules': [name for name in ['pandas', 'tqdm', 'scipy'] if name in sys.modules],
+    'num_loaded_libs': len(artm.wrapper.api._CDLL_CACHE),
+}))
+'''
+
+def test_func():
+    output = subprocess.check_output([sys.executable, '-c', CODE])
+    result = json.loads(output.decode('utf-8').strip().split('\n')[-1])
+
+    # heavy dependencies and the shared library are loaded on first use
+    assert result['modules'] == []
+    assert result['num_loaded_libs'] == 0
+
+    assert result['time'] < IMPORT_TIME_THRESHOLD, \
+        'import artm took {0:.3f} sec'.format(result['time'])
+
+    # and they are still available
+    import artm
+    model = artm.ARTM(num_topics=1)
+    assert len(model.library_version.split('.')) == 3
@@ -0,0 +1,64 @@
+# Copyright 2017, Additive Regularization of Topic Models.
+
+import shutil
+import tempfile
+import os
+import numpy
+
+from six.moves import range
+
+import artm
+
+def test_func():
+    num_topics = 10
+    num_documents_to_check = 20
+    zero_eps = 1e-4
+
+    data_path = os.environ.get('BIGARTM_UNITTEST_DATA')
+    batches_folder = tempfile.mkdtemp()
+
+    try:
+        batch_vectorizer = artm.BatchVectorizer(data_path=data_path,
+                                                data_format='bow_uci',
+                                                collection_name='kos',
+                                                target_folder=batches_folder)
+
+        dictionary = artm.Dictionary()
+        dictionary.gather(data_path=batch_vectorizer.data_path)
+
+        model = artm.ARTM(topic_names=['topic_{}'.format(i) for i in range(num_topics)],
+                          dictionary=dictionary.name)
+        model.fit_offline(batch_vectorizer=batch_vectorizer, num_collection_passes=3)
+
+        theta = model.transform(batch_vectorizer=batch_vectorizer)
+        session = model.inference_session()
+        assert session.topic_names == model.topic_names
+
+        batch = artm.messages.Batch()
+        with open(batch_vectorizer.batches_ids[0], 'rb') as fin:
+            batch.ParseFromString(fin.read())
+
+        for item in batch.item[:num_documents_to_check]:
+            document = {}
+            for token_id, token_weight in zip(item.token_id, item.token_weight):
+                document[batch.token[token_id]] = document.get(batch.token[token_id], 0.0) + token_weight
+
+            # documents given as {token: weight} dicts and as arrays of token indices
+            theta_from_dict = session.transform(document)
+            token_ids = [session.token_index(token) for token in document]
+            theta_from_arrays = session.transform(token_ids, list(document.values()))
+
+            assert theta_from_dict.shape == (num_topics, )
+            assert numpy.max(numpy.abs(theta_from_dict - theta[item.id].values)) < zero_eps
+            assert numpy.max(numpy.abs(theta_from_arrays - theta_from_dict)) < zero_eps
+
+        # unknown tokens are ignored, empty documents get uniform theta
+        theta_empty = session.transform({'unknown_token': 1.0})
+        assert numpy.max(numpy.abs(theta_empty - 1.0 / num_topics)) < zero_eps
+
+        # the session is not affected by further changes of the model
+        theta_before = session.transform(document)
+        model.fit_offline(batch_vectorizer=batch_vectorizer, num_collection_passes=1)
+        assert numpy.array_equal(session.transform(document), theta_before)
+    finally:
+        shutil.rmtree(batches_folder)
@@ -0,0 +1,72 @@
+# Copyright 2017, Additive Regularization of Topic Models.
+
+import shutil
+import tempfile
+import os
+import numpy
+
+from six.moves import range
+
+import artm
+
+def test_func():
+    num_topics = 8
+    zero_eps = 1e-6
+
+    data_path = os.environ.get('BIGARTM_UNITTEST_DATA')
+    batches_folder = tempfile.mkdtemp()
+
+    try:
+        batch_vectorizer = artm.BatchVectorizer(data_path=data_path,
+                                                data_format='bow_uci',
+                                                collection_name='kos',
+                                                target_folder=batches_folder)
+
+        dictionary = artm.Dictionary()
+        dictionary.gather(data_path=batch_vectorizer.data_path)
+
+        model = artm.ARTM(topic_names=['topic_{}'.format(i) for i in range(num_topics)],
+                          dictionary=dictionary.name)
+        model.fit_offline(batch_vectorizer=batch_vectorizer, num_collection_passes=2)
+
+        version = model.master.get_phi_version(model.model_pwt)
+        assert version > 0
+        assert model.master.get_phi_version(model.model_pwt) == version
+
+        # phi_ is kept while the model is not changed
+        phi = model.phi_
+        assert model.phi_ is phi
+
+        # subsets are sliced in requested order
+        phi_subset = model.get_phi(topic_names=['topic_5', 'topic_2'])
+        assert list(phi_subset.columns) == ['topic_5', 'topic_2']
+        assert numpy.max(numpy.abs(phi_subset.values - phi[['topic_5', 'topic_2']].values)) < zero_eps
+
+        data, rows, columns = model.get_phi_sparse(topic_names=['topic_1'], eps=1e-4)
+        assert columns == ['topic_1']
+        assert len(rows) == data.shape[0] == phi.shape[0]
+        assert numpy.max(numpy.abs(data.toarray()[:, 0] - numpy.where(phi['topic_1'].values > 1e-4,
+                                                                      phi['topic_1'].values, 0))) < zero_eps
+
+        # any update of the model changes its version and invalidates phi_
+        model.fit_offline(batch_vectorizer=batch_vectorizer, num_collection_passes=1)
+        assert model.master.get_phi_version(model.model_pwt) > version
+        assert model.phi_ is not phi
+
+        # renaming of topics changes the version, too
+        version = model.master.get_phi_version(model.model_pwt)
+        topic_names = ['renamed_{}'.format(i) for i in range(num_topics)]
+        model.topic_names = topic_names
+        assert model.master.get_phi_version(model.model_pwt) > version
+        assert list(model.get_phi().columns) == topic_names
+        assert list(model.get_phi(topic_names=['renamed_3']).columns) == ['renamed_3']
+
+        # attached matrix can be changed at any moment, so it is never cached
+        _, attached_phi = model.master.attach_model(model.model_pwt)
+        assert model.master.get_phi_version(model.model_pwt) is None
+        attached_phi[:, 0] = 0.5
+        assert numpy.max(numpy.abs(model.phi_['renamed_0'].values - 0.5)) < zero_eps
+        attached_phi[:, 0] = 0.25
+        assert numpy.max(numpy.abs(model.get_phi(topic_names=['renamed_0']).values - 0.25)) < zero_eps
+    finally:
+        shutil.rmtree(batches_folder)
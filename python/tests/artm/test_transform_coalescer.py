@@ -0,0 +1,76 @@
+# Copyright 2017, Additive Regularization of Topic Models.
+
+import shutil
+import tempfile
+import os
+import numpy
+
+from multiprocessing.pool import ThreadPool
+from six.moves import range
+
+import artm
+
+def test_func():
+    num_topics = 10
+    num_documents = 60
+    num_threads = 8
+    zero_eps = 1e-4
+
+    data_path = os.environ.get('BIGARTM_UNITTEST_DATA')
+    batches_folder = tempfile.mkdtemp()
+
+    try:
+        batch_vectorizer = artm.BatchVectorizer(data_path=data_path,
+                                                data_format='bow_uci',
+                                                collection_name='kos',
+                                                target_folder=batches_folder)
+
+        dictionary = artm.Dictionary()
+        dictionary.gather(data_path=batch_vectorizer.data_path)
+
+        model = artm.ARTM(topic_names=['topic_{}'.format(i) for i in range(num_topics)],
+                          dictionary=dictionary.name)
+        model.fit_offline(batch_vectorizer=batch_vectorizer, num_collection_passes=3)
+
+        theta = model.transform(batch_vectorizer=batch_vectorizer)
+
+        batch = artm.messages.Batch()
+        with open(batch_vectorizer.batches_ids[0], 'rb') as fin:
+            batch.ParseFromString(fin.read())
+
+        item_ids, documents = [], []
+        for item in batch.item[:num_documents]:
+            document = {}
+            for token_id, token_weight in zip(item.token_id, item.token_weight):
+                document[batch.token[token_id]] = document.get(batch.token[token_id], 0.0) + token_weight
+            item_ids.append(item.id)
+            documents.append(document)
+
+        # requests with one or two documents from many threads at once
+        requests = [(item_ids[i: i + 1 + i % 2], documents[i: i + 1 + i % 2])
+                    for i in range(0, num_documents, 3)]
+
+        with model.transform_coalescer(max_delay=0.05, max_documents=16) as coalescer:
+            pool = ThreadPool(processes=num_threads)
+            try:
+                results = pool.map(lambda request: coalescer.transform(request[1]), requests)
+            finally:
+                pool.close()
+                pool.join()
+
+            for (request_item_ids, _), result in zip(requests, results):
+                assert result.shape == (num_topics, len(request_item_ids))
+                assert numpy.max(numpy.abs(result - theta[request_item_ids].values)) < zero_eps
+
+            # unknown tokens are ignored
+            result = coalescer.transform([{'unknown_token': 1.0}, documents[0]])
+            assert numpy.max(numpy.abs(result[:, 0] - 1.0 / num_topics)) < zero_eps
+            assert numpy.max(numpy.abs(result[:, 1] - theta[item_ids[0]].values)) < zero_eps
+
+        try:
+            coalescer.transform(documents[:1])
+            assert False
+        except RuntimeError:
+            pass
+    finally:
+        shutil.rmtree(batches_folder)
@@ -0,0 +1,54 @@
+# Copyright 2017, Additive Regularization of Topic Models.
+
+import shutil
+import tempfile
+import os
+import numpy
+
+from six.moves import range
+
+import artm
+
+def test_func():
+    num_topics = 10
+    chunk_batches = 2
+    zero_eps = 1e-6
+
+    data_path = os.environ.get('BIGARTM_UNITTEST_DATA')
+    batches_folder = tempfile.mkdtemp()
+
+    try:
+        batch_vectorizer = artm.BatchVectorizer(data_path=data_path,
+                                                data_format='bow_uci',
+                                                collection_name='kos',
+                                                target_folder=batches_folder,
+                                                batch_size=500)
+
+        dictionary = artm.Dictionary()
+        dictionary.gather(data_path=batch_vectorizer.data_path)
+
+        model = artm.ARTM(topic_names=['topic_{}'.format(i) for i in range(num_topics)],
+                          dictionary=dictionary.name)
+        model.fit_offline(batch_vectorizer=batch_vectorizer, num_collection_passes=2)
+
+        theta = model.transform(batch_vectorizer=batch_vectorizer)
+
+        num_blocks = 0
+        item_ids = []
+        for block_item_ids, theta_block in model.transform_iter(batch_vectorizer, chunk_batches=chunk_batches):
+            assert theta_block.shape == (num_topics, len(block_item_ids))
+            assert numpy.max(numpy.abs(theta_block - theta[block_item_ids].values)) < zero_eps
+            item_ids += block_item_ids
+            num_blocks += 1
+
+        assert num_blocks == (batch_vectorizer.num_batches + chunk_batches - 1) // chunk_batches
+        assert sorted(item_ids) == sorted(theta.columns)
+
+        # sparse blocks and early exit from the generator
+        for block_item_ids, theta_block in model.transform_iter(batch_vectorizer, chunk_batches=1,
+                                                                theta_matrix_type='sparse_theta'):
+            assert theta_block.format == 'csr'
+            assert numpy.max(numpy.abs(theta_block.toarray() - theta[block_item_ids].values)) < zero_eps
+            break
+    finally:
+        shutil.rmtree(batches_folder)
@@ -0,0 +1,65 @@
+# Copyright 2017, Additive Regularization of Topic Models.
+
+import shutil
+import tempfile
+import os
+import numpy
+
+from six.moves import range
+
+import artm
+
+def test_func():
+    num_topics = 20
+    num_top_topics = 3
+    eps = 1e-3
+    zero_eps = 1e-6
+
+    data_path = os.environ.get('BIGARTM_UNITTEST_DATA')
+    batches_folder = tempfile.mkdtemp()
+
+    try:
+        batch_vectorizer = artm.BatchVectorizer(data_path=data_path,
+                                                data_format='bow_uci',
+                                                collection_name='kos',
+                                                target_folder=batches_folder)
+
+        dictionary = artm.Dictionary()
+        dictionary.gather(data_path=batch_vectorizer.data_path)
+
+        model = artm.ARTM(topic_names=['topic_{}'.format(i) for i in range(num_topics)],
+                          dictionary=dictionary.name)
+        model.fit_offline(batch_vectorizer=batch_vectorizer, num_collection_passes=3)
+
+        theta = model.transform(batch_vectorizer=batch_vectorizer)
+
+        # eps thresholding
+        data, rows, columns = model.transform(batch_vectorizer=batch_vectorizer,
+                                              theta_matrix_type='sparse_theta', eps=eps)
+        assert data.format == 'csr'
+        assert rows == list(theta.index)
+        theta = theta[columns]
+        expected = numpy.where(theta.values >= eps, theta.values, 0)
+        assert numpy.max(numpy.abs(data.toarray() - expected)) < zero_eps
+
+        # top-k topics per document
+        data, _, columns = model.transform(batch_vectorizer=batch_vectorizer,
+                                           theta_matrix_type='sparse_theta', num_top_topics=num_top_topics)
+        assert numpy.all(numpy.diff(data.tocsc().indptr) <= num_top_topics)
+        dense = data.toarray()
+        for doc_index in range(0, len(columns), 100):
+            expected_top = numpy.sort(theta.values[:, doc_index])[::-1][:num_top_topics]
+            actual_top = numpy.sort(dense[:, doc_index])[::-1][:num_top_topics]
+            assert numpy.max(numpy.abs(actual_top - expected_top)) < zero_eps
+
+        # sparse ptdw has the same columns as dense ptdw
+        batch_vectorizer_small = artm.BatchVectorizer(data_path=batches_folder, data_format='batches',
+                                                      batches=[os.path.basename(batch_vectorizer.batches_ids[0])])
+        ptdw = model.transform(batch_vectorizer=batch_vectorizer_small, theta_matrix_type='dense_ptdw')
+        data, rows, columns = model.transform(batch_vectorizer=batch_vectorizer_small,
+                                              theta_matrix_type='sparse_ptdw', eps=eps)
+        assert columns == list(ptdw.columns)
+        expected = numpy.where(ptdw.values >= eps, ptdw.values, 0)
+        assert numpy.max(numpy.abs(data.toarray() - expected)) < zero_eps
+    finally:
+        shutil.rmtree(batches_folder)
@@ -0,0 +1,43 @@
+# Copyright 2018, Additive Regularization of Topic Models.
+
+import os
+import shutil
+import tempfile
+
+import artm
+
+
+def test_func():
+    temp_dir = tempfile.mkdtemp()
+    try:
+        vw_path = os.path.join(temp_dir, 'vw.txt')
+        with open(vw_path, 'w') as fout:
+            fout.write('doc1 a b c a\n')
+            fout.write('doc2 b c |author x y\n')
+            fout.write('doc3 c:2 a |author y\n')
+
+        def parse_tokens(**kwargs):
+            batch_vectorizer = artm.BatchVectorizer(data_path=vw_path,
+                                                    data_format='vowpal_wabbit',
+                                                    target_folder=os.path.join(temp_dir, str(len(kwargs))),
+                                                    batch_size=2,
+                                                    **kwargs)
+            tokens = set()
+            for filename in batch_vectorizer.batches_ids:
+                batch = artm.messages.Batch()
+                with open(filename, 'rb') as fin:
+                    batch.ParseFromString(fin.read())
+                assert sum(1 for item in batch.item) > 0
+                tokens.update(zip(batch.class_id, batch.token))
+
+            entries = batch_vectorizer.dictionary.to_arrays()
+            assert set(zip(entries['class_id'], entries['token'])) == tokens
+            return tokens
+
+        default_class = '@default_class'
+        assert len(parse_tokens()) == 5
+        assert parse_tokens(min_df=2) == {(default_class, 'a'), (default_class, 'b'),
+                                          (default_class, 'c'), ('author', 'y')}
+        assert parse_tokens(min_df=2, min_tf=3) == {(default_class, 'a'), (default_class, 'c')}
+    finally:
+        shutil.rmtree(temp_dir)
@@ -0,0 +1,107 @@
+# Copyright 2017, Additive Regularization of Topic Models.
+
+import os
+import glob
+import tempfile
+import shutil
+import numpy
+
+from multiprocessing.pool import ThreadPool
+from six.moves import range
+
+import artm.wrapper
+import artm.wrapper.messages_pb2 as messages
+import artm.wrapper.constants as constants
+import artm.master_component as mc
+
+def test_func():
+    # Set some constants
+    data_path = os.environ.get('BIGARTM_UNITTEST_DATA')
+    dictionary_name = 'dictionary'
+    pwt = 'pwt'
+    docword = 'docword.kos.txt'
+    vocab = 'vocab.kos.txt'
+
+    num_topics = 10
+    num_document_passes = 10
+    num_collection_passes = 3
+    num_threads = 8
+    num_requests = 64
+    eps = 1e-3
+    zero_eps = 1e-5
+
+    batches_folder = tempfile.mkdtemp()
+    try:
+        # Create the instance of low-level API and master object
+        lib = artm.wrapper.LibArtm()
+
+        # Parse collection from disk
+        lib.ArtmParseCollection({'format': constants.CollectionParserConfig_CollectionFormat_BagOfWordsUci,
+                                 'docword_file_path': os.path.join(data_path, docword),
+                                 'vocab_file_path': os.path.join(data_path, vocab),
+                                 'target_folder': batches_folder,
+                                 'num_items_per_batch': 250})
+        batch_filenames = sorted(glob.glob(os.path.join(batches_folder, '*.batch')))
+
+        # Create master component, learn the model and fill theta cache
+        scores = {'Perplexity': messages.PerplexityScoreConfig()}
+        master = mc.MasterComponent(lib, scores=scores, num_document_passes=num_document_passes,
+                                    cache_theta=True)
+        master.gather_dictionary(dictionary_target_name=dictionary_name,
+                                 data_path=batches_folder,
+                                 vocab_file_path=os.path.join(data_path, vocab))
+        master.initialize_model(model_name=pwt,
+                                topic_names=['topic_{}'.format(i) for i in range(num_topics)],
+                                dictionary_name=dictionary_name)
+        master.fit_offline(batches_folder=batches_folder, num_collection_passes=num_collection_passes)
+
+        num_cached_items = len(master.get_theta_info().item_id)
+        phi_version = master.get_phi_version(pwt)
+
+        # Expected results are found sequentially, batch by batch
+        expected = {}
+        for batch_filename in batch_filenames:
+            info, theta = master.transform(batch_filenames=[batch_filename],
+                                           theta_matrix_type=constants.ThetaMatrixType_Dense)
+            perplexity = master.get_score('Perplexity').value
+            expected[batch_filename] = (list(info.item_id), theta, perplexity)
+
+        def _transform(request_index):
+            batch_filename = batch_filenames[request_index % len(batch_filenames)]
+            if request_index % 2 == 0:
+                info, theta = master.transform(batch_filenames=[batch_filename],
+                                               theta_matrix_type=constants.ThetaMatrixType_Dense)
+                return batch_filename, list(info.item_id), theta
+
+            info, (indptr, indices, values) = master.transform(batch_filenames=[batch_filename],
+                                                               theta_matrix_type=constants.ThetaMatrixType_Sparse,
+                                                               eps=eps)
+            theta = numpy.zeros(shape=(len(info.topic_name), len(info.item_id)), dtype=numpy.float32)
+            for row in range(len(info.topic_name)):
+                theta[row, indices[indptr[row]: indptr[row + 1]]] = values[indptr[row]: indptr[row + 1]]
+            return batch_filename, list(info.item_id), theta.transpose()
+
+        pool = ThreadPool(processes=num_threads)
+        try:
+            results = pool.map(_transform, range(num_requests))
+        finally:
+            pool.close()
+            pool.join()
+
+        # Concurrent requests must give the same results as sequential ones
+        for request_index, (batch_filename, item_ids, theta) in enumerate(results):
+            expected_item_ids, expected_theta, _ = expected[batch_filename]
+            assert item_ids == expected_item_ids
+            if request_index % 2 == 1:
+                expected_theta = numpy.where(expected_theta >= eps, expected_theta, 0)
+            assert numpy.max(numpy.abs(theta - expected_theta)) < zero_eps
+
+        # Score cache contains the scores of one of the transforms, not a mix of them
+        perplexity = master.get_score('Perplexity').value
+        assert min(abs(perplexity - value[2]) for value in expected.values()) < zero_eps * perplexity
+
+        # Neither p_wt nor theta cache are changed by transform
+        assert master.get_phi_version(pwt) == phi_version
+        assert len(master.get_theta_info().item_id) == num_cached_items
+    finally:
+        shutil.rmtree(batches_folder)
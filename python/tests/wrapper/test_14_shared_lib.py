@@ -0,0 +1,35 @@
+# Copyright 2017, Additive Regularization of Topic Models.
+
+import pytest
+
+import artm
+import artm.wrapper
+import artm.wrapper.messages_pb2 as messages
+
+def test_func():
+    lib = artm.wrapper.shared_lib()
+    assert artm.wrapper.shared_lib() is lib
+
+    # the shared library is loaded once per process
+    another_lib = artm.wrapper.LibArtm()
+    assert another_lib.cdll is lib.cdll
+
+    # C functions are bound on first use and then cached
+    assert lib.ArtmCreateMasterModel is lib.ArtmCreateMasterModel
+    with pytest.raises(AttributeError):
+        lib.ArtmNoSuchFunction
+
+    # arguments are still checked
+    with pytest.raises(TypeError):
+        lib.ArtmCreateMasterModel(messages.MasterModelConfig(), 1)
+    with pytest.raises(TypeError):
+        lib.ArtmDisposeMasterComponent('master_id')
+
+    master_id = lib.ArtmCreateMasterModel({'num_processors': 1})
+    lib.ArtmDisposeMasterComponent(master_id)
+
+    # models and dictionaries share the same instance
+    model = artm.ARTM(num_topics=1)
+    dictionary = artm.Dictionary()
+    assert model.master._lib is lib
+    assert dictionary._lib is lib
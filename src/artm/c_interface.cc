@@ -19,8 +19,11 @@
 #include "artm/core/exceptions.h"
 #include "artm/core/helpers.h"
 #include "artm/core/master_component.h"
+#include "artm/core/processor_helpers.h"
 #include "artm/core/template_manager.h"
 #include "artm/core/collection_parser.h"
+#include "artm/core/dictionary_operations.h"
+#include "artm/core/dictionary_registry.h"
 #include "artm/core/batch_manager.h"
 #include "artm/core/protobuf_serialization.h"
 
@@ -28,6 +31,7 @@ typedef artm::core::TemplateManager<std::shared_ptr< ::artm::core::MasterCompone
 typedef artm::core::TemplateManager<std::shared_ptr< ::artm::core::BatchManager>> AsyncProcessBatchesManager;
 
 using ::artm::core::MasterComponent;
+using ::artm::core::DictionaryRegistry;
 
 // Never use the following variables explicitly (only through the corresponding methods).
 // It might be good idea to make them a private members of a new singleton class.
@@ -237,6 +241,77 @@ int64_t ArtmCopyRequestedObject(int64_t length, char* address) {
   return ArtmCopyRequestImpl(length, address, last_message_ex());
 }
 
+int64_t ArtmCopyRequestedSparseMatrix(int64_t indptr_length, char* indptr,
+                                      int64_t indices_length, char* indices,
+                                      int64_t values_length, char* values) {
+  LOG(INFO) << "ArtmCopyRequestedSparseMatrix is copying "
+            << (indptr_length + indices_length + values_length) << " bytes...";
+  try {
+    std::string* source = last_message_ex();
+    if (indptr_length + indices_length + values_length != static_cast<int64_t>(source->size())) {
+      std::stringstream ss;
+      ss << "Invalid length of CSR arrays ";
+      ss << "(" << source->size() << " bytes expected in total, found "
+         << (indptr_length + indices_length + values_length) << ").";
+      set_last_error(ss.str());
+      return ARTM_INVALID_OPERATION;
+    }
+
+    if (indices_length != values_length) {
+      set_last_error("Invalid length of CSR arrays (indices and values must have equal length).");
+      return ARTM_INVALID_OPERATION;
+    }
+
+    char* source_ptr = StringAsArray(source);
+    memcpy(indptr, source_ptr, indptr_length);
+    memcpy(indices, source_ptr + indptr_length, indices_length);
+    memcpy(values, source_ptr + indptr_length + indices_length, values_length);
+    return ARTM_SUCCESS;
+  } CATCH_EXCEPTIONS;
+}
+
+// Stateless E-step for a single document over a dense phi snapshot, owned by the caller.
+// Nothing is logged here, since this method is intended for low-latency inference.
+int64_t ArtmInferThetaDense(int64_t phi_length, const char* phi,
+                            int64_t token_ids_length, const char* token_ids,
+                            int64_t token_weights_length, const char* token_weights,
+                            int num_document_passes,
+                            int64_t theta_length, char* theta) {
+  try {
+    const int64_t num_topics = theta_length / static_cast<int64_t>(sizeof(float));
+    if (num_topics <= 0 || theta_length % sizeof(float) != 0 || phi_length % (num_topics * sizeof(float)) != 0) {
+      set_last_error("Invalid length of phi or theta arrays (phi must have num_tokens * num_topics values).");
+      return ARTM_INVALID_OPERATION;
+    }
+
+    if (token_ids_length % sizeof(int) != 0 ||
+        token_ids_length / sizeof(int) != token_weights_length / sizeof(float)) {
+      set_last_error("Invalid length of token arrays (token_ids and token_weights must have equal length).");
+      return ARTM_INVALID_OPERATION;
+    }
+
+    const int64_t num_phi_tokens = phi_length / (num_topics * sizeof(float));
+    const int num_tokens = static_cast<int>(token_ids_length / sizeof(int));
+    const int* token_ids_ptr = reinterpret_cast<const int*>(token_ids);
+    for (int i = 0; i < num_tokens; ++i) {
+      if (token_ids_ptr[i] < 0 || token_ids_ptr[i] >= num_phi_tokens) {
+        std::stringstream ss;
+        ss << "token_ids[" << i << "] == " << token_ids_ptr[i] << " is out of range [0, " << num_phi_tokens << ")";
+        set_last_error(ss.str());
+        return ARTM_INVALID_OPERATION;
+      }
+    }
+
+    ::artm::core::ProcessorHelpers::InferThetaForItem(static_cast<int>(num_topics),
+                                                      reinterpret_cast<const float*>(phi),
+                                                      num_tokens, token_ids_ptr,
+                                                      reinterpret_cast<const float*>(token_weights),
+                                                      num_document_passes,
+                                                      reinterpret_cast<float*>(theta));
+    return ARTM_SUCCESS;
+  } CATCH_EXCEPTIONS;
+}
+
 int64_t ArtmSaveBatch(const char* disk_path, int64_t length, const char* batch) {
   try {
     EnableLogging();
@@ -354,6 +429,17 @@ int64_t ArtmParseCollection(int64_t length, const char* collection_parser_config
   } CATCH_EXCEPTIONS;
 }
 
+int64_t ArtmConvertCoocFile(int64_t length, const char* convert_cooc_file_args) {
+  try {
+    EnableLogging();
+    artm::ConvertCoocFileArgs args;
+    ParseFromArray(convert_cooc_file_args, length, &args);
+    ::artm::core::ValidateMessage(args, /* throw_error =*/ true);
+    ::artm::core::DictionaryOperations::ConvertCoocFile(args);
+    return ARTM_SUCCESS;
+  } CATCH_EXCEPTIONS;
+}
+
 int64_t ArtmRequestLoadBatch(const char* filename) {
   try {
     EnableLogging();
@@ -475,6 +561,10 @@ int64_t ArtmFilterDictionary(int master_id, int64_t length, const char* args) {
   return ArtmExecute< ::artm::FilterDictionaryArgs>(master_id, length, args, &MasterComponent::FilterDictionary);
 }
 
+int64_t ArtmMergeDictionary(int master_id, int64_t length, const char* args) {
+  return ArtmExecute< ::artm::MergeDictionaryArgs>(master_id, length, args, &MasterComponent::MergeDictionary);
+}
+
 int64_t ArtmCreateDictionary(int master_id, int64_t length, const char* data) {
   return ArtmExecute< ::artm::DictionaryData>(master_id, length, data, &MasterComponent::CreateDictionary);
 }
@@ -491,6 +581,114 @@ int64_t ArtmExportDictionary(int master_id, int64_t length, const char* args) {
   return ArtmExecute< ::artm::ExportDictionaryArgs>(master_id, length, args, &MasterComponent::ExportDictionary);
 }
 
+///////////////////////////////////////////////////////////////////////////////////////////////////
+// DICTIONARY REGISTRY routines (no master component is required)
+///////////////////////////////////////////////////////////////////////////////////////////////////
+
+// Execute a static method of DictionaryRegistry with args parsed from a protobuf blob
+template<typename ArgsT, typename FuncT>
+int64_t ArtmExecuteGlobal(int64_t length, const char* args_blob, FuncT func) {
+  try {
+    EnableLogging();
+    ArgsT args;
+    ParseFromArray(args_blob, length, &args);
+    ::artm::core::FixAndValidateMessage(&args, /* throw_error =*/ true);
+    std::string description = ::artm::core::DescribeMessage(args);
+    LOG_IF(INFO, !description.empty()) << "Pass " << description << " to DictionaryRegistry";
+    func(args);
+    return ARTM_SUCCESS;
+  } CATCH_EXCEPTIONS;
+}
+
+// Request a message from DictionaryRegistry with args parsed from a protobuf blob
+template<typename ArgsT, typename ResultT, typename FuncT>
+int64_t ArtmRequestGlobal(int64_t length, const char* args_blob, FuncT func) {
+  try {
+    EnableLogging();
+    ArgsT args;
+    ResultT result;
+    ParseFromArray(args_blob, length, &args);
+    ::artm::core::FixAndValidateMessage(&args, /* throw_error =*/ true);
+    func(args, &result);
+    ::artm::core::FixAndValidateMessage(&result, /* throw_error =*/ false);
+    SerializeToString(result, last_message());
+    return static_cast<int64_t>(last_message()->size());
+  } CATCH_EXCEPTIONS;
+}
+
+static void GatherDictionaryGlobal(const ::artm::GatherDictionaryArgs& args) {
+  // In-memory batches belong to master components, so only batches from disk are available here
+  ::artm::core::ThreadSafeCollectionHolder<std::string, ::artm::Batch> no_mem_batches;
+  DictionaryRegistry::Gather(args, no_mem_batches);
+}
+
+int64_t ArtmGatherDictionaryGlobal(int64_t length, const char* args) {
+  return ArtmExecuteGlobal< ::artm::GatherDictionaryArgs>(length, args, &GatherDictionaryGlobal);
+}
+
+int64_t ArtmFilterDictionaryGlobal(int64_t length, const char* args) {
+  return ArtmExecuteGlobal< ::artm::FilterDictionaryArgs>(length, args, &DictionaryRegistry::Filter);
+}
+
+int64_t ArtmMergeDictionaryGlobal(int64_t length, const char* args) {
+  return ArtmExecuteGlobal< ::artm::MergeDictionaryArgs>(length, args, &DictionaryRegistry::Merge);
+}
+
+int64_t ArtmCreateDictionaryGlobal(int64_t length, const char* data) {
+  return ArtmExecuteGlobal< ::artm::DictionaryData>(length, data, &DictionaryRegistry::Create);
+}
+
+int64_t ArtmImportDictionaryGlobal(int64_t length, const char* args) {
+  return ArtmExecuteGlobal< ::artm::ImportDictionaryArgs>(length, args, &DictionaryRegistry::Import);
+}
+
+int64_t ArtmExportDictionaryGlobal(int64_t length, const char* args) {
+  return ArtmExecuteGlobal< ::artm::ExportDictionaryArgs>(length, args, &DictionaryRegistry::Export);
+}
+
+int64_t ArtmRequestDictionaryGlobal(int64_t length, const char* args) {
+  return ArtmRequestGlobal< ::artm::GetDictionaryArgs,
+                            ::artm::DictionaryData>(length, args, &DictionaryRegistry::Request);
+}
+
+int64_t ArtmRequestDictionaryInfoGlobal(int64_t length, const char* args) {
+  return ArtmRequestGlobal< ::artm::GetDictionaryArgs,
+                            ::artm::MasterComponentInfo>(length, args, &DictionaryRegistry::RequestInfo);
+}
+
+int64_t ArtmRequestDictionaryArraysGlobal(int64_t length, const char* args_blob) {
+  try {
+    EnableLogging();
+    ::artm::GetDictionaryArgs args;
+    ::artm::DictionaryArraysInfo result;
+    ParseFromArray(args_blob, length, &args);
+    ::artm::core::FixAndValidateMessage(&args, /* throw_error =*/ true);
+    DictionaryRegistry::RequestArrays(args, &result, last_message_ex());
+    ::artm::core::FixAndValidateMessage(&result, /* throw_error =*/ false);
+    SerializeToString(result, last_message());
+    return static_cast<int64_t>(last_message()->size());
+  } CATCH_EXCEPTIONS;
+}
+
+int64_t ArtmCreateDictionaryFromArraysGlobal(int64_t length, const char* info_blob,
+                                             int64_t arrays_length, const char* arrays) {
+  try {
+    EnableLogging();
+    ::artm::DictionaryArraysInfo info;
+    ParseFromArray(info_blob, length, &info);
+    ::artm::core::FixAndValidateMessage(&info, /* throw_error =*/ true);
+    DictionaryRegistry::CreateFromArrays(info, arrays, arrays_length);
+    return ARTM_SUCCESS;
+  } CATCH_EXCEPTIONS;
+}
+
+int64_t ArtmDisposeDictionaryGlobal(const char* name) {
+  try {
+    DictionaryRegistry::Dispose(name != nullptr ? std::string(name) : std::string());
+    return ARTM_SUCCESS;
+  } CATCH_EXCEPTIONS;
+}
+
 int64_t ArtmReconfigureMasterModel(int master_id, int64_t length, const char* config) {
   return ArtmExecute< ::artm::MasterModelConfig>(master_id, length, config, &MasterComponent::ReconfigureMasterModel);
 }
@@ -520,6 +718,10 @@ int64_t ArtmClearScoreArrayCache(int master_id, int64_t length, const char* args
                                                         &MasterComponent::ClearScoreArrayCache);
 }
 
+int64_t ArtmCancelOperation(int master_id, int64_t length, const char* args) {
+  return ArtmExecute< ::artm::CancelOperationArgs>(master_id, length, args, &MasterComponent::CancelOperation);
+}
+
 int64_t ArtmDisposeRegularizer(int master_id, const char* name) {
   return ArtmExecute(master_id, name, &MasterComponent::DisposeRegularizer);
 }
@@ -598,6 +800,22 @@ int64_t ArtmRequestDictionary(int master_id, int64_t length, const char* args) {
                       ::artm::DictionaryData>(master_id, length, args);
 }
 
+int64_t ArtmRequestDictionaryArrays(int master_id, int64_t length, const char* args) {
+  return ArtmRequestExternal< ::artm::GetDictionaryArgs,
+                              ::artm::DictionaryArraysInfo>(master_id, length, args);
+}
+
+int64_t ArtmCreateDictionaryFromArrays(int master_id, int64_t length, const char* info_blob,
+                                       int64_t arrays_length, const char* arrays) {
+  try {
+    ::artm::DictionaryArraysInfo info;
+    ParseFromArray(info_blob, length, &info);
+    ::artm::core::FixAndValidateMessage(&info, /* throw_error =*/ true);
+    master_component(master_id)->CreateDictionaryFromArrays(info, arrays, arrays_length);
+    return ARTM_SUCCESS;
+  } CATCH_EXCEPTIONS;
+}
+
 int64_t ArtmRequestMasterComponentInfo(int master_id, int64_t length, const char* args) {
   return ArtmRequest< ::artm::GetMasterComponentInfoArgs,
                       ::artm::MasterComponentInfo>(master_id, length, args);
@@ -637,6 +855,11 @@ int64_t ArtmRequestTopicModelExternal(int master_id, int64_t length, const char*
                               ::artm::TopicModel>(master_id, length, args);
 }
 
+int64_t ArtmRequestTopTokensExternal(int master_id, int64_t length, const char* args) {
+  return ArtmRequestExternal< ::artm::GetTopTokensArgs,
+                              ::artm::TopTokens>(master_id, length, args);
+}
+
 int64_t ArtmRequestTransformMasterModel(int master_id, int64_t length, const char* args) {
   return ArtmRequest< ::artm::TransformMasterModelArgs,
                       ::artm::ThetaMatrix>(master_id, length, args);
@@ -21,6 +21,7 @@ extern "C" {
   DLL_PUBLIC int64_t ArtmClearThetaCache(int master_id, int64_t length, const char* clear_theta_cache_args);
   DLL_PUBLIC int64_t ArtmClearScoreCache(int master_id, int64_t length, const char* clear_score_cache_args);
   DLL_PUBLIC int64_t ArtmClearScoreArrayCache(int master_id, int64_t length, const char* clear_score_array_cache_args);
+  DLL_PUBLIC int64_t ArtmCancelOperation(int master_id, int64_t length, const char* cancel_operation_args);
 
   DLL_PUBLIC int64_t ArtmCreateRegularizer(int master_id, int64_t length, const char* regularizer_config);
   DLL_PUBLIC int64_t ArtmReconfigureRegularizer(int master_id, int64_t length, const char* regularizer_config);
@@ -28,15 +29,35 @@ extern "C" {
 
   DLL_PUBLIC int64_t ArtmGatherDictionary(int master_id, int64_t length, const char* gather_dictionary_args);
   DLL_PUBLIC int64_t ArtmFilterDictionary(int master_id, int64_t length, const char* filter_dictionary_args);
+  DLL_PUBLIC int64_t ArtmMergeDictionary(int master_id, int64_t length, const char* merge_dictionary_args);
   DLL_PUBLIC int64_t ArtmCreateDictionary(int master_id, int64_t length, const char* dictionary_data);
   DLL_PUBLIC int64_t ArtmCreateDictionaryNamed(int master_id, int64_t length,
                                                const char* dictionary_data, const char* name);
   DLL_PUBLIC int64_t ArtmRequestDictionary(int master_id, int64_t length, const char* request_dictionary_args);
+  DLL_PUBLIC int64_t ArtmRequestDictionaryArrays(int master_id, int64_t length, const char* request_dictionary_args);
+  DLL_PUBLIC int64_t ArtmCreateDictionaryFromArrays(int master_id, int64_t length, const char* dictionary_arrays_info,
+                                                    int64_t arrays_length, const char* arrays);
   DLL_PUBLIC int64_t ArtmDisposeDictionary(int master_id, const char* dictionary_name);
 
   DLL_PUBLIC int64_t ArtmImportDictionary(int master_id, int64_t length, const char* import_dictionary_args);
   DLL_PUBLIC int64_t ArtmExportDictionary(int master_id, int64_t length, const char* export_dictionary_args);
+
+  // Dictionaries are shared by all master components. The following methods operate on them without master_id.
+  DLL_PUBLIC int64_t ArtmGatherDictionaryGlobal(int64_t length, const char* gather_dictionary_args);
+  DLL_PUBLIC int64_t ArtmFilterDictionaryGlobal(int64_t length, const char* filter_dictionary_args);
+  DLL_PUBLIC int64_t ArtmMergeDictionaryGlobal(int64_t length, const char* merge_dictionary_args);
+  DLL_PUBLIC int64_t ArtmCreateDictionaryGlobal(int64_t length, const char* dictionary_data);
+  DLL_PUBLIC int64_t ArtmRequestDictionaryGlobal(int64_t length, const char* request_dictionary_args);
+  DLL_PUBLIC int64_t ArtmRequestDictionaryInfoGlobal(int64_t length, const char* request_dictionary_args);
+  DLL_PUBLIC int64_t ArtmRequestDictionaryArraysGlobal(int64_t length, const char* request_dictionary_args);
+  DLL_PUBLIC int64_t ArtmCreateDictionaryFromArraysGlobal(int64_t length, const char* dictionary_arrays_info,
+                                                          int64_t arrays_length, const char* arrays);
+  DLL_PUBLIC int64_t ArtmDisposeDictionaryGlobal(const char* dictionary_name);
+  DLL_PUBLIC int64_t ArtmImportDictionaryGlobal(int64_t length, const char* import_dictionary_args);
+  DLL_PUBLIC int64_t ArtmExportDictionaryGlobal(int64_t length, const char* export_dictionary_args);
+
   DLL_PUBLIC int64_t ArtmParseCollection(int64_t length, const char* collection_parser_config);
+  DLL_PUBLIC int64_t ArtmConvertCoocFile(int64_t length, const char* convert_cooc_file_args);
 
   DLL_PUBLIC int64_t ArtmImportBatches(int master_id, int64_t length, const char* import_batches_args);
   DLL_PUBLIC int64_t ArtmDisposeBatch(int master_id, const char* batch_name);
@@ -71,6 +92,7 @@ extern "C" {
   DLL_PUBLIC int64_t ArtmRequestThetaMatrixExternal(int master_id, int64_t length, const char* get_theta_args);
   DLL_PUBLIC int64_t ArtmRequestTopicModel(int master_id, int64_t length, const char* get_model_args);
   DLL_PUBLIC int64_t ArtmRequestTopicModelExternal(int master_id, int64_t length, const char* get_model_args);
+  DLL_PUBLIC int64_t ArtmRequestTopTokensExternal(int master_id, int64_t length, const char* get_top_tokens_args);
 
   DLL_PUBLIC int64_t ArtmRequestScore(int master_id, int64_t length, const char* get_score_args);
   DLL_PUBLIC int64_t ArtmRequestScoreArray(int master_id, int64_t length, const char* get_score_args);
@@ -82,6 +104,14 @@ extern "C" {
   DLL_PUBLIC int64_t ArtmRequestLoadBatch(const char* filename);
   DLL_PUBLIC int64_t ArtmCopyRequestedMessage(int64_t length, char* address);
   DLL_PUBLIC int64_t ArtmCopyRequestedObject(int64_t length, char* address);
+  DLL_PUBLIC int64_t ArtmCopyRequestedSparseMatrix(int64_t indptr_length, char* indptr,
+                                                   int64_t indices_length, char* indices,
+                                                   int64_t values_length, char* values);
+  DLL_PUBLIC int64_t ArtmInferThetaDense(int64_t phi_length, const char* phi,
+                                         int64_t token_ids_length, const char* token_ids,
+                                         int64_t token_weights_length, const char* token_weights,
+                                         int num_document_passes,
+                                         int64_t theta_length, char* theta);
 
   DLL_PUBLIC int64_t ArtmAwaitOperation(int operation_id, int64_t length, const char* await_operation_args);
 
@@ -7,7 +7,7 @@
 namespace artm {
 namespace core {
 
-BatchManager::BatchManager() : lock_(), in_progress_() { }
+BatchManager::BatchManager() : lock_(), in_progress_(), is_cancelled_(false) { }
 
 void BatchManager::Add(const boost::uuids::uuid& task_id) {
   boost::lock_guard<boost::mutex> guard(lock_);
@@ -24,5 +24,17 @@ void BatchManager::Callback(const boost::uuids::uuid& task_id) {
   in_progress_.erase(task_id);
 }
 
+void BatchManager::Cancel(const boost::uuids::uuid& task_id) {
+  boost::lock_guard<boost::mutex> guard(lock_);
+  if (in_progress_.erase(task_id) > 0) {
+    is_cancelled_ = true;
+  }
+}
+
+bool BatchManager::IsCancelled() const {
+  boost::lock_guard<boost::mutex> guard(lock_);
+  return is_cancelled_;
+}
+
 }  // namespace core
 }  // namespace artm
@@ -32,9 +32,16 @@ class BatchManager : boost::noncopyable {
   // Marks task as completed
   void Callback(const boost::uuids::uuid& task_id);
 
+  // Marks task as cancelled (i.e. removed from the processor queue without processing)
+  void Cancel(const boost::uuids::uuid& task_id);
+
+  // Checks if any of added tasks was cancelled
+  bool IsCancelled() const;
+
  private:
   mutable boost::mutex lock_;
   std::set<boost::uuids::uuid> in_progress_;
+  bool is_cancelled_;
 };
 
 }  // namespace core
@@ -2,6 +2,10 @@
 
 #include "artm/core/cache_manager.h"
 
+#include <algorithm>
+#include <functional>
+#include <vector>
+
 #include "boost/filesystem.hpp"
 #include "boost/lexical_cast.hpp"
 #include "boost/uuid/uuid_io.hpp"
@@ -62,13 +66,48 @@ void CacheManager::RequestMasterComponentInfo(MasterComponentInfo* master_info)
   }
 }
 
+// Keeps 'num_values' greatest elements of sparse vector (the order of the remaining elements is preserved).
+static void KeepTopValues(int num_values, ::artm::IntArray* indices, ::artm::FloatArray* values) {
+  if (values->value_size() <= num_values) {
+    return;
+  }
+
+  std::vector<float> sorted_values(values->value().begin(), values->value().end());
+  std::nth_element(sorted_values.begin(), sorted_values.begin() + (num_values - 1), sorted_values.end(),
+                   std::greater<float>());
+  const float threshold = sorted_values[num_values - 1];
+
+  // Values equal to the threshold are kept only while there is a room for them
+  int num_greater = 0;
+  for (float value : values->value()) {
+    if (value > threshold) {
+      num_greater++;
+    }
+  }
+  int num_equal_to_keep = num_values - num_greater;
+
+  int target = 0;
+  for (int source = 0; source < values->value_size(); ++source) {
+    const float value = values->value(source);
+    if (value > threshold || (value == threshold && num_equal_to_keep-- > 0)) {
+      indices->set_value(target, indices->value(source));
+      values->set_value(target, value);
+      target++;
+    }
+  }
+
+  indices->mutable_value()->Truncate(target);
+  values->mutable_value()->Truncate(target);
+}
+
 // ToDo(sashafrey): this method has grown too big and complicated.
 // It needs to be refactored.
 static bool PopulateThetaMatrixFromCacheEntry(const ThetaMatrix& cache,
                                               const GetThetaMatrixArgs& get_theta_args,
                                               ::artm::ThetaMatrix* theta_matrix) {
   auto& args_topic_name = get_theta_args.topic_name();
-  const bool has_sparse_format = get_theta_args.matrix_layout() == MatrixLayout_Sparse;
+  const bool has_sparse_format = get_theta_args.matrix_layout() == MatrixLayout_Sparse ||
+                                 get_theta_args.matrix_layout() == MatrixLayout_SparseCsr;
   const bool sparse_cache = cache.topic_indices_size() > 0;
   bool use_all_topics = false;
 
@@ -148,6 +187,10 @@ static bool PopulateThetaMatrixFromCacheEntry(const ThetaMatrix& cache,
         // sparse output -- sparse cache
         for (int index = 0; index < cache.topic_indices(item_index).value_size(); ++index) {
           int topic_index = cache.topic_indices(item_index).value(index);
+          if (item_theta.value(index) < get_theta_args.eps()) {
+            continue;
+          }
+
           if (use_all_topics) {
             theta_vec->add_value(item_theta.value(index));
             sparse_topic_indices->add_value(topic_index);
@@ -172,6 +215,10 @@ static bool PopulateThetaMatrixFromCacheEntry(const ThetaMatrix& cache,
           }
         }
       }
+
+      if (get_theta_args.num_top_topics() > 0) {
+        KeepTopValues(get_theta_args.num_top_topics(), sparse_topic_indices, theta_vec);
+      }
     }
   }
 
@@ -202,6 +249,18 @@ void CacheManager::RequestThetaMatrix(const GetThetaMatrixArgs& get_theta_args,
     return;
   }
 
+  if (get_theta_args.cache_key_size() > 0) {
+    for (const auto &key : get_theta_args.cache_key()) {
+      std::shared_ptr<ThetaMatrix> cached_theta = FindCacheEntry(key);
+      if (cached_theta == nullptr) {
+        BOOST_THROW_EXCEPTION(artm::core::InvalidOperation(
+            "GetThetaMatrixArgs.cache_key == " + key + " does not exist in theta cache"));
+      }
+      PopulateThetaMatrixFromCacheEntry(*cached_theta, get_theta_args, theta_matrix);
+    }
+    return;
+  }
+
   auto keys = cache_.keys();
   for (const auto &key : keys) {
     std::shared_ptr<ThetaMatrix> cached_theta = FindCacheEntry(key);
@@ -282,6 +341,7 @@ void CacheManager::UpdateCacheEntry(const std::string& batch_id, const ThetaMatr
         mutable_phi_matrix->set(token_id, topic_index, theta_matrix.item_weights(i).value(topic_index));
       }
     }
+    instance_->BumpPhiVersion(ptd_name);
     return;
   }
 
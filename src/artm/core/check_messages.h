@@ -369,6 +369,38 @@ inline std::string DescribeErrors(const ::artm::GatherDictionaryArgs& message) {
   return ss.str();
 }
 
+inline std::string DescribeErrors(const ::artm::MergeDictionaryArgs& message) {
+  std::stringstream ss;
+
+  if (!message.has_dictionary_target_name()) {
+    ss << "MergeDictionaryArgs has no target dictionary name; ";
+  }
+
+  if (message.dictionary_name_size() == 0) {
+    ss << "MergeDictionaryArgs has no dictionaries to merge; ";
+  }
+
+  return ss.str();
+}
+
+inline std::string DescribeErrors(const ::artm::ConvertCoocFileArgs& message) {
+  std::stringstream ss;
+
+  if (!message.has_source_file_path()) {
+    ss << "ConvertCoocFileArgs has no source_file_path; ";
+  }
+
+  if (!message.has_target_file_path()) {
+    ss << "ConvertCoocFileArgs has no target_file_path; ";
+  }
+
+  if (!message.has_vocab_file_path()) {
+    ss << "ConvertCoocFileArgs has no vocab_file_path; ";
+  }
+
+  return ss.str();
+}
+
 inline std::string DescribeErrors(const ::artm::DictionaryData& message) {
   std::stringstream ss;
 
@@ -403,6 +435,85 @@ inline std::string DescribeErrors(const ::artm::DictionaryData& message) {
   return ss.str();
 }
 
+inline std::string DescribeErrors(const ::artm::DictionaryArraysInfo& message) {
+  std::stringstream ss;
+
+  if (!message.has_name()) {
+    ss << "DictionaryArraysInfo has no dictionary name; ";
+  }
+
+  if (message.num_entries() < 0 || message.tokens_length() < 0) {
+    ss << "DictionaryArraysInfo.num_entries and DictionaryArraysInfo.tokens_length must be non-negative; ";
+  }
+
+  if (message.num_entries() > 0 && message.class_id_size() == 0) {
+    ss << "DictionaryArraysInfo has no class ids; ";
+  }
+
+  return ss.str();
+}
+
+inline std::string DescribeErrors(const ::artm::CollectionParserConfig& message) {
+  std::stringstream ss;
+
+  if (message.has_min_df() || message.has_min_tf()) {
+    if (message.format() != ::artm::CollectionParserConfig_CollectionFormat_VowpalWabbit) {
+      ss << "CollectionParserConfig.min_df and CollectionParserConfig.min_tf "
+         << "are supported only for VowpalWabbit format; ";
+    }
+
+    if (message.docword_file_path() == "-") {
+      ss << "CollectionParserConfig.min_df and CollectionParserConfig.min_tf require docword file, "
+         << "they can not be used when reading from standard input; ";
+    }
+
+    if (message.min_df() < 0 || message.min_tf() < 0) {
+      ss << "CollectionParserConfig.min_df and CollectionParserConfig.min_tf must be non-negative; ";
+    }
+  }
+
+  if (message.prefilter_max_memory_usage() < 0) {
+    ss << "CollectionParserConfig.prefilter_max_memory_usage must be non-negative; ";
+  }
+
+  if (message.num_hash_buckets() < 0) {
+    ss << "CollectionParserConfig.num_hash_buckets must be non-negative; ";
+  }
+
+  if (message.num_hash_buckets() > 0) {
+    if (message.format() != ::artm::CollectionParserConfig_CollectionFormat_VowpalWabbit) {
+      ss << "CollectionParserConfig.num_hash_buckets is supported only for VowpalWabbit format; ";
+    }
+
+    if (message.gather_cooc()) {
+      ss << "CollectionParserConfig.num_hash_buckets can not be used to gather co-occurrences; ";
+    }
+  }
+
+  if (message.parse_mapped_ranges()) {
+    if (message.format() != ::artm::CollectionParserConfig_CollectionFormat_VowpalWabbit) {
+      ss << "CollectionParserConfig.parse_mapped_ranges is supported only for VowpalWabbit format; ";
+    }
+
+    if (message.docword_file_path() == "-") {
+      ss << "CollectionParserConfig.parse_mapped_ranges requires docword file, "
+         << "it can not be used when reading from standard input; ";
+    }
+  }
+
+  if (message.has_hash_lookup_file_path()) {
+    if (message.num_hash_buckets() <= 0) {
+      ss << "CollectionParserConfig.hash_lookup_file_path requires positive num_hash_buckets; ";
+    }
+
+    if (message.hash_lookup_size() <= 0) {
+      ss << "CollectionParserConfig.hash_lookup_size must be positive; ";
+    }
+  }
+
+  return ss.str();
+}
+
 inline std::string DescribeErrors(const ::artm::ExportModelArgs& message) {
   std::stringstream ss;
   if (!message.has_file_name()) {
@@ -502,6 +613,8 @@ inline std::string DescribeErrors(const ::artm::MergeModelArgs& message) {
 
 // Empty ValidateMessage routines
 inline std::string DescribeErrors(const ::artm::GetTopicModelArgs& message) { return std::string(); }
+inline std::string DescribeErrors(const ::artm::GetTopTokensArgs& message) { return std::string(); }
+inline std::string DescribeErrors(const ::artm::TopTokens& message) { return std::string(); }
 inline std::string DescribeErrors(const ::artm::GetThetaMatrixArgs& message) { return std::string(); }
 inline std::string DescribeErrors(const ::artm::RegularizeModelArgs& message) { return std::string(); }
 inline std::string DescribeErrors(const ::artm::NormalizeModelArgs& message) { return std::string(); }
@@ -515,9 +628,9 @@ inline std::string DescribeErrors(const ::artm::ProcessBatchesResult& message) {
 inline std::string DescribeErrors(const ::artm::ClearThetaCacheArgs& message) { return std::string(); }
 inline std::string DescribeErrors(const ::artm::ClearScoreCacheArgs& message) { return std::string(); }
 inline std::string DescribeErrors(const ::artm::ClearScoreArrayCacheArgs& message) { return std::string(); }
+inline std::string DescribeErrors(const ::artm::CancelOperationArgs& message) { return std::string(); }
 inline std::string DescribeErrors(const ::artm::ScoreArray& message) { return std::string(); }
 inline std::string DescribeErrors(const ::artm::GetScoreArrayArgs& message) { return std::string(); }
-inline std::string DescribeErrors(const ::artm::CollectionParserConfig& message) { return std::string(); }
 
 ///////////////////////////////////////////////////////////////////////////////////////////////////
 // FixMessage routines (optional)
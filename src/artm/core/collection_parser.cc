@@ -3,7 +3,9 @@
 #include "artm/core/collection_parser.h"
 
 #include <algorithm>
+#include <cstring>
 #include <atomic>
+#include <fstream>
 #include <iostream>  // NOLINT
 #include <future>  // NOLINT
 #include <map>
@@ -28,6 +30,7 @@
 
 #include "artm/core/cooccurrence_collector.h"
 #include "artm/core/common.h"
+#include "artm/core/cuckoo_watch.h"
 #include "artm/core/exceptions.h"
 #include "artm/core/helpers.h"
 #include "artm/core/protobuf_helpers.h"
@@ -68,6 +71,24 @@ std::string BatchNameGenerator::next_name(const Batch& batch) {
   return old_next_name;
 }
 
+std::string BatchNameGenerator::name_at(int64_t index, const Batch& batch) const {
+  if (use_guid_name_) {
+    return batch.id();
+  }
+
+  std::string name(length_, 'a');
+  for (int i = length_ - 1; i >= 0 && index > 0; --i) {
+    name[i] += index % 26;
+    index /= 26;
+  }
+
+  if (index > 0) {
+    BOOST_THROW_EXCEPTION(InvalidOperation("Parser can't create more batches"));
+  }
+
+  return name;
+}
+
 static bool useClassId(const ClassId& class_id, const CollectionParserConfig& config) {
   if (config.class_id_size() == 0) {
     return true;
@@ -474,6 +495,400 @@ class CollectionParser::BatchCollector {
   const Batch& batch() { return batch_; }
 };
 
+// TokenPrefilter holds tf and df of all tokens of VW file, gathered by CountTokensVowpalWabbit()
+// before any batch is written, and decides which tokens pass min_df and min_tf thresholds.
+// The counters are exact, or approximated by a count-min sketch when the memory is capped.
+// The sketch may only overestimate the counters, so it never drops a token that passes the thresholds.
+class CollectionParser::TokenPrefilter {
+ public:
+  struct TokenCounters {
+    TokenCounters() : token_tf(0.0f), token_df(0.0f) { }
+    float token_tf;
+    float token_df;
+  };
+
+  typedef std::unordered_map<Token, TokenCounters, TokenHasher> TokenCountersMap;
+
+  explicit TokenPrefilter(const CollectionParserConfig& config)
+      : min_df_(config.min_df()), min_tf_(config.min_tf()), sketch_width_(0) {
+    if (config.prefilter_max_memory_usage() > 0) {
+      sketch_width_ = std::max<int64_t>(
+        1, config.prefilter_max_memory_usage() / (kSketchDepth * sizeof(TokenCounters)));
+      sketch_.resize(kSketchDepth * sketch_width_);
+    }
+  }
+
+  void Add(const TokenCountersMap& token_counters) {
+    for (const auto& elem : token_counters) {
+      if (sketch_width_ == 0) {
+        TokenCounters& counters = exact_[elem.first];
+        counters.token_tf += elem.second.token_tf;
+        counters.token_df += elem.second.token_df;
+        continue;
+      }
+
+      for (int row = 0; row < kSketchDepth; ++row) {
+        TokenCounters& counters = sketch_[SketchIndex(elem.first, row)];
+        counters.token_tf += elem.second.token_tf;
+        counters.token_df += elem.second.token_df;
+      }
+    }
+  }
+
+  // Adds tf and df of tokens from one line of VW file to token_counters.
+  // Transactions are treated as plain sequences of tokens. Malformed entries are skipped here,
+  // the error about them is reported later, when the line is parsed into a batch.
+  static void CountItem(const std::string& str, const CollectionParserConfig& config,
+                        TokenCountersMap* token_counters) {
+    std::vector<std::string> strs;
+    boost::split(strs, str, boost::is_any_of(" \t\r"));
+
+    ClassId current_class_id = DefaultClass;
+    std::unordered_map<Token, float, TokenHasher> item_tf;
+    for (unsigned elem_index = 1; elem_index < strs.size(); ++elem_index) {
+      const std::string& elem = strs[elem_index];
+      if (elem.size() == 0) {
+        continue;
+      }
+
+      if (elem[0] == '|') {
+        if (elem.size() > 1 && elem[1] == '|') {
+          current_class_id = DefaultClass;
+        } else {
+          current_class_id = elem.size() > 1 ? elem.substr(1) : DefaultClass;
+        }
+        continue;
+      }
+
+      if (!useClassId(current_class_id, config)) {
+        continue;
+      }
+
+      float token_weight = 1.0f;
+      size_t split_index = elem.find(':');
+      if (split_index != std::string::npos) {
+        if (split_index == 0 || split_index == (elem.size() - 1)) {
+          continue;
+        }
+        try {
+          token_weight = boost::lexical_cast<float>(elem.substr(split_index + 1));
+        }
+        catch (boost::bad_lexical_cast &) {
+          continue;
+        }
+      }
+
+      item_tf[Token(current_class_id, elem.substr(0, split_index))] += token_weight;
+    }
+
+    for (const auto& elem : item_tf) {
+      auto& counters = (*token_counters)[elem.first];
+      counters.token_tf += elem.second;
+      counters.token_df += 1.0f;
+    }
+  }
+
+  bool Keep(const Token& token) const {
+    TokenCounters counters;
+    if (sketch_width_ == 0) {
+      auto iter = exact_.find(token);
+      if (iter != exact_.end()) {
+        counters = iter->second;
+      }
+    } else {
+      counters = sketch_[SketchIndex(token, 0)];
+      for (int row = 1; row < kSketchDepth; ++row) {
+        const TokenCounters& row_counters = sketch_[SketchIndex(token, row)];
+        counters.token_tf = std::min(counters.token_tf, row_counters.token_tf);
+        counters.token_df = std::min(counters.token_df, row_counters.token_df);
+      }
+    }
+
+    return counters.token_df >= min_df_ && counters.token_tf >= min_tf_;
+  }
+
+  // Returns the number of tokens that pass the thresholds (known only for exact counters)
+  int64_t NumKeptTokens() const {
+    int64_t num_kept_tokens = 0;
+    for (const auto& elem : exact_) {
+      if (elem.second.token_df >= min_df_ && elem.second.token_tf >= min_tf_) {
+        ++num_kept_tokens;
+      }
+    }
+    return num_kept_tokens;
+  }
+
+  int64_t NumCountedTokens() const { return exact_.size(); }
+  bool IsApproximate() const { return sketch_width_ > 0; }
+
+ private:
+  static const int kSketchDepth = 4;
+
+  // Rows of the sketch are addressed by double hashing of the token
+  size_t SketchIndex(const Token& token, int row) const {
+    uint64_t hash = token.hash();
+    uint64_t second_hash = hash;
+    second_hash ^= second_hash >> 33;
+    second_hash *= 0xff51afd7ed558ccdULL;
+    second_hash ^= second_hash >> 33;
+    return row * sketch_width_ + (hash + row * (second_hash | 1)) % sketch_width_;
+  }
+
+  float min_df_;
+  float min_tf_;
+  TokenCountersMap exact_;
+  std::vector<TokenCounters> sketch_;
+  int64_t sketch_width_;
+};
+
+// VowpalWabbitRanges memory-maps docword file and splits it into ranges of lines,
+// so that every thread reads its own range and no shared stream has to be locked.
+// The ranges are aligned to portions of num_items_per_batch lines, therefore the portions
+// (and batches) are exactly the same as in sequential reading of the file.
+class CollectionParser::VowpalWabbitRanges : boost::noncopyable {
+ public:
+  VowpalWabbitRanges(const std::string& file_path, int num_ranges, int num_items_per_batch)
+      : file_(file_path), num_items_per_batch_(num_items_per_batch) {
+    const char* begin = file_.data();
+    const char* end = begin + file_.size();
+
+    // The same as std::getline-based reading, the last line is parsed only if it ends with '\n'
+    while (end != begin && *(end - 1) != '\n') {
+      --end;
+    }
+
+    // 1. Split the file into ranges of roughly equal size, starting at the beginnings of lines
+    std::vector<const char*> starts(num_ranges + 1, end);
+    starts[0] = begin;
+    for (int i = 1; i < num_ranges; ++i) {
+      const char* pos = std::max(begin + (end - begin) * i / num_ranges, starts[i - 1]);
+      starts[i] = (pos == begin) ? begin : NextLine(pos - 1, end);
+    }
+
+    // 2. Count lines of the ranges in parallel to find the number of the first line of each range
+    std::vector<std::future<int64_t>> num_lines;
+    for (int i = 0; i < num_ranges; ++i) {
+      num_lines.push_back(std::async(std::launch::async, [&starts, i]() {
+        return static_cast<int64_t>(std::count(starts[i], starts[i + 1], '\n'));
+      }));
+    }
+
+    std::vector<int64_t> first_line_no(num_ranges + 1, 0);
+    for (int i = 0; i < num_ranges; ++i) {
+      first_line_no[i + 1] = first_line_no[i] + num_lines[i].get();
+    }
+
+    // 3. Move the beginning of each range to the beginning of the nearest portion
+    for (int i = 0; i < num_ranges; ++i) {
+      const char* pos = starts[i];
+      int64_t line_no = first_line_no[i];
+      while (line_no % num_items_per_batch_ != 0 && pos != end) {
+        pos = NextLine(pos, end);
+        ++line_no;
+      }
+
+      positions_.push_back(pos);
+      line_no_.push_back(pos == end ? first_line_no[num_ranges] : line_no);
+    }
+
+    for (int i = 0; i < num_ranges; ++i) {
+      ends_.push_back(i + 1 < num_ranges ? positions_[i + 1] : end);
+    }
+  }
+
+  // Reads the next portion of lines of the range; returns its size in bytes (zero if the range is over).
+  // Different ranges may be read concurrently.
+  size_t ReadPortion(int range_index, std::vector<std::string>* strs, int* first_line_no) {
+    const char* start = positions_[range_index];
+    const char* pos = start;
+    const char* end = ends_[range_index];
+
+    *first_line_no = static_cast<int>(line_no_[range_index]);
+    while (pos != end && static_cast<int64_t>(strs->size()) < num_items_per_batch_) {
+      const char* next_line = NextLine(pos, end);
+      strs->emplace_back(pos, next_line - 1);
+      pos = next_line;
+    }
+
+    positions_[range_index] = pos;
+    line_no_[range_index] += strs->size();
+    return pos - start;
+  }
+
+ private:
+  // Returns the position after the first '\n' at or after pos
+  static const char* NextLine(const char* pos, const char* end) {
+    const char* eol = static_cast<const char*>(memchr(pos, '\n', end - pos));
+    return eol == nullptr ? end : eol + 1;
+  }
+
+  mapped_file_source file_;
+  int64_t num_items_per_batch_;
+  std::vector<const char*> positions_;
+  std::vector<const char*> ends_;
+  std::vector<int64_t> line_no_;
+};
+
+std::shared_ptr<CollectionParser::TokenPrefilter> CollectionParser::CountTokensVowpalWabbit(int num_threads) {
+  ifstream_or_cin stream_or_cin(config_.docword_file_path());
+  std::istream& docword = stream_or_cin.get_stream();
+  utility::ProgressPrinter progress(stream_or_cin.size());
+
+  auto config = config_;
+  auto prefilter = std::make_shared<TokenPrefilter>(config);
+
+  std::shared_ptr<VowpalWabbitRanges> ranges;
+  if (config.parse_mapped_ranges()) {
+    ranges = std::make_shared<VowpalWabbitRanges>(config.docword_file_path(), num_threads,
+                                                  config.num_items_per_batch());
+  }
+
+  std::mutex read_access;
+  std::mutex prefilter_access;
+
+  // Works in the same way as the parsing function in ParseVowpalWabbit():
+  // portions of num_items_per_batch lines are read (from the shared stream under the lock,
+  // or from the own range of the thread) and counted independently,
+  // then the local counters of the portion are added to the prefilter
+  auto func = [&docword, &progress, &read_access, &prefilter_access, &prefilter, ranges, config](int range_index) {
+    while (true) {
+      std::vector<std::string> all_strs_for_batch;
+      if (ranges != nullptr) {
+        int first_line_no_for_batch = -1;
+        size_t portion_size = ranges->ReadPortion(range_index, &all_strs_for_batch, &first_line_no_for_batch);
+        if (portion_size == 0) {
+          break;
+        }
+
+        std::lock_guard<std::mutex> guard(read_access);
+        progress.Add(portion_size);
+      } else {
+        std::lock_guard<std::mutex> guard(read_access);
+        if (docword.eof()) {
+          break;
+        }
+
+        while ((int64_t) all_strs_for_batch.size() < config.num_items_per_batch()) {
+          std::string str;
+          std::getline(docword, str);
+          progress.Set(docword.tellg());
+          if (docword.eof()) {
+            break;
+          }
+
+          all_strs_for_batch.push_back(str);
+        }
+      }
+
+      TokenPrefilter::TokenCountersMap token_counters;
+      for (const std::string& str : all_strs_for_batch) {
+        TokenPrefilter::CountItem(str, config, &token_counters);
+      }
+
+      std::lock_guard<std::mutex> guard(prefilter_access);
+      prefilter->Add(token_counters);
+    }
+  };
+
+  {
+    CuckooWatch cuckoo("CountTokensVowpalWabbit(" + config.docword_file_path() + ")");
+    std::vector<std::shared_future<void>> tasks;
+    for (int i = 0; i < num_threads; i++) {
+      tasks.push_back(std::move(std::async(std::launch::async, func, i)));
+    }
+    for (int i = 0; i < num_threads; i++) {
+      tasks[i].get();
+    }
+  }
+
+  if (prefilter->IsApproximate()) {
+    LOG(INFO) << "Tokens of " << config.docword_file_path() << " are counted approximately "
+              << "within prefilter_max_memory_usage = " << config.prefilter_max_memory_usage() << " bytes";
+  } else {
+    LOG(INFO) << prefilter->NumKeptTokens() << " of " << prefilter->NumCountedTokens() << " tokens of "
+              << config.docword_file_path() << " pass min_df = " << config.min_df()
+              << " and min_tf = " << config.min_tf();
+  }
+
+  return prefilter;
+}
+
+// Returns the name of the bucket, in which the hashing trick places the token:
+// 64-bit FNV-1a hash of its utf-8 bytes modulo num_hash_buckets.
+// Python API (artm.hash_token) must give the same result.
+static std::string HashTokenKeyword(const std::string& keyword, int num_hash_buckets) {
+  uint64_t hash = 14695981039346656037ULL;
+  for (unsigned char c : keyword) {
+    hash ^= c;
+    hash *= 1099511628211ULL;
+  }
+  return "#" + std::to_string(hash % num_hash_buckets);
+}
+
+// HashLookup keeps the most frequent original tokens of every hashed bucket,
+// so the buckets remain interpretable. Each bucket has at most hash_lookup_size counters,
+// which are maintained by space-saving algorithm: a new token replaces the least frequent one
+// and inherits its weight, so the weights of rare tokens may be overestimated.
+class CollectionParser::HashLookup {
+ public:
+  explicit HashLookup(const CollectionParserConfig& config)
+      : num_hash_buckets_(config.num_hash_buckets()), size_(config.hash_lookup_size()) { }
+
+  void Add(const Token& token, float weight) {
+    Token bucket(token.class_id, HashTokenKeyword(token.keyword, num_hash_buckets_));
+    std::vector<std::pair<std::string, float>>& top_tokens = top_tokens_[bucket];
+
+    for (auto& top_token : top_tokens) {
+      if (top_token.first == token.keyword) {
+        top_token.second += weight;
+        return;
+      }
+    }
+
+    if (static_cast<int>(top_tokens.size()) < size_) {
+      top_tokens.push_back(std::make_pair(token.keyword, weight));
+      return;
+    }
+
+    auto min_iter = std::min_element(top_tokens.begin(), top_tokens.end(),
+      [](const std::pair<std::string, float>& a, const std::pair<std::string, float>& b) {
+        return a.second < b.second;
+      });
+    min_iter->first = token.keyword;
+    min_iter->second += weight;
+  }
+
+  void Save(const std::string& file_path) const {
+    std::vector<Token> buckets;
+    for (const auto& elem : top_tokens_) {
+      buckets.push_back(elem.first);
+    }
+    std::sort(buckets.begin(), buckets.end());
+
+    std::ofstream fout(file_path);
+    if (!fout.good()) {
+      BOOST_THROW_EXCEPTION(DiskWriteException("Unable to create file " + file_path));
+    }
+
+    for (const Token& bucket : buckets) {
+      std::vector<std::pair<std::string, float>> top_tokens = top_tokens_.find(bucket)->second;
+      std::sort(top_tokens.begin(), top_tokens.end(),
+        [](const std::pair<std::string, float>& a, const std::pair<std::string, float>& b) {
+          return a.second > b.second || (a.second == b.second && a.first < b.first);
+        });
+      for (const auto& top_token : top_tokens) {
+        fout << bucket.keyword << " " << bucket.class_id << " " << top_token.first << " "
+             << top_token.second << std::endl;
+      }
+    }
+  }
+
+ private:
+  int num_hash_buckets_;
+  int size_;
+  std::unordered_map<Token, std::vector<std::pair<std::string, float>>, TokenHasher> top_tokens_;
+};
+
 // ToDo (MichaelSolotky): split this func into several
 CollectionParserInfo CollectionParser::ParseVowpalWabbit() {
   BatchNameGenerator batch_name_generator(kBatchNameLength,
@@ -484,6 +899,36 @@ CollectionParserInfo CollectionParser::ParseVowpalWabbit() {
 
   auto config = config_;
 
+  int num_threads = config.num_threads();
+  if (!config.has_num_threads() || config.num_threads() < 0) {
+    unsigned int n = std::thread::hardware_concurrency();
+    if (n == 0) {
+      LOG(INFO) << "CollectionParserConfig.num_threads is set to 1 (default)";
+      num_threads = 1;
+    } else {
+      LOG(INFO) << "CollectionParserConfig.num_threads is automatically set to " << n;
+      num_threads = n;
+    }
+  }
+
+  // Tokens below min_df or min_tf are not written into the batches
+  std::shared_ptr<const TokenPrefilter> prefilter;
+  if (config.has_min_df() || config.has_min_tf()) {
+    prefilter = CountTokensVowpalWabbit(num_threads);
+  }
+
+  // Original tokens of hashed buckets, updated after each batch under token_map_access
+  std::shared_ptr<HashLookup> hash_lookup;
+  if (config.num_hash_buckets() > 0 && config.has_hash_lookup_file_path()) {
+    hash_lookup = std::make_shared<HashLookup>(config);
+  }
+
+  std::shared_ptr<VowpalWabbitRanges> ranges;
+  if (config.parse_mapped_ranges()) {
+    ranges = std::make_shared<VowpalWabbitRanges>(config.docword_file_path(), num_threads,
+                                                  config.num_items_per_batch());
+  }
+
   std::mutex read_access;
   std::mutex cooc_config_access;
   std::mutex token_map_access;
@@ -505,11 +950,17 @@ CollectionParserInfo CollectionParser::ParseVowpalWabbit() {
   // 4. Parse strings, form a batch, and save it to disk
   // During parsing it gathers co-occurrence counters for pairs of tokens (if the correspondent flag == true)
   // Steps 1-4 are repeated in a while loop until there is no content left in docword file.
-  // Multiple copies of the function can work in parallel.
+  // With parse_mapped_ranges steps 1-3 are replaced by reading the lines from range_index-th range
+  // of memory-mapped docword file, which belongs only to this copy of the function.
+  // Multiple copies of the function can work in parallel. Each of them collects the tokens
+  // and parser info locally, and merges them into the global ones when the work is done.
   auto func = [&docword, &global_line_no, &progress, &batch_name_generator, &read_access,
                &cooc_config_access, &token_map_access, &token_statistics_access, &parser_info,
-               &token_map, &total_num_of_pairs, &cooc_collector, &gather_transaction_cooc, config]() {
+               &token_map, &total_num_of_pairs, &cooc_collector, &gather_transaction_cooc, prefilter, hash_lookup,
+               ranges, config](int range_index) {
     int64_t local_num_of_pairs = 0;  // statistics for future ppmi calculation
+    std::unordered_map<Token, bool, TokenHasher> local_token_map;
+    CollectionParserInfo local_parser_info;
     while (true) {
       // The following variable remembers at which line the batch has started.
       // It helps to create informative error message (including line number)
@@ -519,8 +970,20 @@ CollectionParserInfo CollectionParser::ParseVowpalWabbit() {
       std::vector<std::string> all_strs_for_batch;
       std::string batch_name;
       BatchCollector batch_collector;
+      std::unordered_map<Token, float, TokenHasher> hashed_token_weights;
 
-      {  // Read portion of documents
+      if (ranges != nullptr) {  // Read portion of documents from the own range
+        size_t portion_size = ranges->ReadPortion(range_index, &all_strs_for_batch, &first_line_no_for_batch);
+        if (portion_size == 0) {
+          break;
+        }
+
+        batch_name = batch_name_generator.name_at(first_line_no_for_batch / config.num_items_per_batch(),
+                                                  batch_collector.batch());
+
+        std::lock_guard<std::mutex> guard(read_access);
+        progress.Add(portion_size);
+      } else {  // Read portion of documents
         std::lock_guard<std::mutex> guard(read_access);
         first_line_no_for_batch = global_line_no;
         if (docword.eof()) {
@@ -585,6 +1048,10 @@ CollectionParserInfo CollectionParser::ParseVowpalWabbit() {
 
           if (elem[0] == '|') {
             if (elem.size() > 1 && elem[1] == '|') {
+              if (config.gather_cooc()) {
+                gather_transaction_cooc = true;
+                return;
+              }
               if (elem.size() == 2) {
                 // end of previous transaction
                 if (tokens.size() > 0) {
@@ -642,20 +1109,27 @@ CollectionParserInfo CollectionParser::ParseVowpalWabbit() {
             }
           }
 
+          if (prefilter != nullptr && !prefilter->Keep(Token(current_class_id, token))) {
+            continue;
+          }
+
+          if (config.num_hash_buckets() > 0) {
+            if (hash_lookup != nullptr) {
+              hashed_token_weights[Token(current_class_id, token)] += token_weight;
+            }
+            token = HashTokenKeyword(token, config.num_hash_buckets());
+          }
+
           tokens.push_back(token);
           class_ids.push_back(current_class_id);
           weights.push_back(token_weight);
 
           if (config.gather_cooc()) {
-            if (class_ids.size() > 1) {
-              gather_transaction_cooc = true;
-              return;
-            }
-            const ClassId first_token_class_id = class_ids[0];
+            const ClassId first_token_class_id = current_class_id;
 
             int first_token_id = -1;
             if (config.has_vocab_file_path()) {
-              first_token_id = cooc_collector.vocab_.FindTokenId(elem, first_token_class_id);
+              first_token_id = cooc_collector.vocab_.FindTokenId(token, first_token_class_id);
               if (first_token_id == TOKEN_NOT_FOUND) {
                 continue;
               }
@@ -691,7 +1165,8 @@ CollectionParserInfo CollectionParser::ParseVowpalWabbit() {
                 continue;
               }
               int second_token_id = -1;
-              const std::string neigh = strs[elem_index + neigh_index];
+              const std::string& neigh_elem = strs[elem_index + neigh_index];
+              const std::string neigh = neigh_elem.substr(0, neigh_elem.find(':'));
               if (config.has_vocab_file_path()) {
                 second_token_id = cooc_collector.vocab_.FindTokenId(neigh, second_token_class_id);
                 if (second_token_id == TOKEN_NOT_FOUND) {
@@ -726,55 +1201,58 @@ CollectionParserInfo CollectionParser::ParseVowpalWabbit() {
         batch_collector.FinishItem(line_no, item_title);
       }  // End of items of 1 batch parsing
       if (config.gather_cooc() && !cooc_stat_holder.Empty()) {
-        // This function saves gathered statistics on disk
+        // This function saves gathered statistics in RAM or on disk (if it exceeds the memory budget)
         // After saving on disk statistics from all the batches needs to be merged
         // This is implemented in ReadAndMergeCooccurrenceBatches(), so the next step is to call this method
         // Sorting is needed before storing all pairs of tokens on disk (it's for future agregation)
-        cooc_collector.UploadOnDisk(cooc_stat_holder);
+        cooc_collector.SaveStatistics(cooc_stat_holder);
       }
 
       if (all_strs_for_batch.size() > 0) {
-        artm::Batch batch;
-        {
+        artm::Batch batch = batch_collector.FinishBatch(&local_parser_info);
+        for (int token_id = 0; token_id < batch.token_size(); ++token_id) {
+          local_token_map[artm::core::Token(batch.class_id(token_id), batch.token(token_id))] = true;
+        }
+        if (hash_lookup != nullptr) {
           std::lock_guard<std::mutex> guard(token_map_access);
-          batch = batch_collector.FinishBatch(&parser_info);
-          for (int token_id = 0; token_id < batch.token_size(); ++token_id) {
-            token_map[artm::core::Token(batch.class_id(token_id), batch.token(token_id))] = true;
+          for (const auto& elem : hashed_token_weights) {
+            hash_lookup->Add(elem.first, elem.second);
           }
         }
         ::artm::core::Helpers::SaveBatch(batch, config.target_folder(), batch_name);
       }
     }  // End of collection parsing
 
-{  // Save number of pairs (needed for ppmi)
+    {  // Merge tokens and parser info of this thread
+      std::lock_guard<std::mutex> guard(token_map_access);
+      token_map.insert(local_token_map.begin(), local_token_map.end());
+      parser_info.set_num_items(parser_info.num_items() + local_parser_info.num_items());
+      parser_info.set_num_tokens(parser_info.num_tokens() + local_parser_info.num_tokens());
+      parser_info.set_total_token_weight(parser_info.total_token_weight() + local_parser_info.total_token_weight());
+      parser_info.set_num_batches(parser_info.num_batches() + local_parser_info.num_batches());
+    }
+
+    {  // Save number of pairs (needed for ppmi)
       std::unique_lock<std::mutex> lock(cooc_config_access);
       total_num_of_pairs += local_num_of_pairs;
     }
   };
 
-  int num_threads = config.num_threads();
-  if (!config.has_num_threads() || config.num_threads() < 0) {
-    unsigned int n = std::thread::hardware_concurrency();
-    if (n == 0) {
-      LOG(INFO) << "CollectionParserConfig.num_threads is set to 1 (default)";
-      num_threads = 1;
-    } else {
-      LOG(INFO) << "CollectionParserConfig.num_threads is automatically set to " << n;
-      num_threads = n;
-    }
-  }
-
   Helpers::CreateFolderIfNotExists(config.target_folder());
 
   // The func may throw an exception if docword is malformed.
   // This exception will be re-thrown on the main thread.
   // http://stackoverflow.com/questions/14222899/exception-propagation-and-stdfuture
-  std::vector<std::shared_future<void>> tasks;
-  for (int i = 0; i < num_threads; i++) {
-    tasks.push_back(std::move(std::async(std::launch::async, func)));
-  }
-  for (int i = 0; i < num_threads; i++) {
-    tasks[i].get();
+  {
+    // Reading of the collection is timed separately from merging of co-occurrences
+    CuckooWatch cuckoo("ParseVowpalWabbit(" + config.docword_file_path() + ")");
+    std::vector<std::shared_future<void>> tasks;
+    for (int i = 0; i < num_threads; i++) {
+      tasks.push_back(std::move(std::async(std::launch::async, func, i)));
+    }
+    for (int i = 0; i < num_threads; i++) {
+      tasks[i].get();
+    }
   }
 
   if (gather_transaction_cooc) {
@@ -786,11 +1264,16 @@ CollectionParserInfo CollectionParser::ParseVowpalWabbit() {
 
   // Launch merging of co-occurrence bathces and ppmi calculation
   if (config.gather_cooc() && cooc_collector.VocabSize() >= 2) {
-    if (cooc_collector.CooccurrenceBatchesQuantity() != 0) {
+    if (cooc_collector.CooccurrenceBatchesQuantity() != 0 || cooc_collector.NumOfPairsInMemory() != 0) {
+      CuckooWatch cuckoo("ReadAndMergeCooccurrenceBatches");
       cooc_collector.ReadAndMergeCooccurrenceBatches();
     }
   }
 
+  if (hash_lookup != nullptr) {
+    hash_lookup->Save(config.hash_lookup_file_path());
+  }
+
   parser_info.set_dictionary_size(token_map.size());
   return parser_info;
 }
@@ -26,6 +26,9 @@ class BatchNameGenerator {
   explicit BatchNameGenerator(int length, bool use_guid_name);
   std::string next_name(const Batch& batch);
 
+  // Returns the name that the index-th call of next_name() returns (counting from zero)
+  std::string name_at(int64_t index, const Batch& batch) const;
+
  private:
   int length_;
   std::string next_name_;
@@ -56,12 +59,18 @@ class CollectionParser : boost::noncopyable {
   typedef std::unordered_map<int, CollectionParserTokenInfo> TokenMap;
 
   class BatchCollector;
+  class TokenPrefilter;
+  class HashLookup;
+  class VowpalWabbitRanges;
 
   // ParseDocwordBagOfWordsUci is also used to parse MatrixMarket format, because
   // the format of docword file is the same for both.
   CollectionParserInfo ParseDocwordBagOfWordsUci(TokenMap* token_map);
   CollectionParserInfo ParseVowpalWabbit();
 
+  // Counts tf and df of all tokens in VW file to drop rare tokens later, when batches are written.
+  std::shared_ptr<TokenPrefilter> CountTokensVowpalWabbit(int num_threads);
+
   TokenMap ParseVocabBagOfWordsUci();
   TokenMap ParseVocabMatrixMarket();
 
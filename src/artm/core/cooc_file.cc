@@ -0,0 +1,320 @@
+// Copyright 2017, Additive Regularization of Topic Models.
+
+#include "artm/core/cooc_file.h"
+
+#include <algorithm>
+#include <cstring>
+#include <memory>
+#include <sstream>
+
+#include "boost/filesystem.hpp"
+#include "boost/iostreams/device/mapped_file.hpp"
+
+#include "glog/logging.h"
+
+#include "artm/core/exceptions.h"
+
+namespace fs = boost::filesystem;
+
+namespace artm {
+namespace core {
+
+namespace {
+
+const char kCoocFileMagic[8] = { 'A', 'R', 'T', 'M', 'C', 'O', 'O', 'C' };
+const int32_t kCoocFileVersion = 1;
+
+int64_t AlignOffset(int64_t offset) {
+  return (offset + 7) / 8 * 8;
+}
+
+void FillHeader(int64_t num_rows, int64_t num_nonzeros, CoocFileHeader* header) {
+  memset(header, 0, sizeof(CoocFileHeader));
+  memcpy(header->magic, kCoocFileMagic, sizeof(kCoocFileMagic));
+  header->version = kCoocFileVersion;
+  header->num_rows = num_rows;
+  header->num_nonzeros = num_nonzeros;
+  header->ids_offset = AlignOffset(sizeof(CoocFileHeader));
+  header->values_offset = AlignOffset(header->ids_offset + sizeof(int) * num_nonzeros);
+  header->row_offsets_offset = AlignOffset(header->values_offset + sizeof(float) * num_nonzeros);
+}
+
+int64_t GetFileSize(const CoocFileHeader& header) {
+  return header.row_offsets_offset + sizeof(int64_t) * (header.num_rows + 1);
+}
+
+}  // namespace
+
+// ****************************** Methods of class CoocFileWriter ***********************************
+
+CoocFileWriter::CoocFileWriter(const std::string& file_name, int num_rows, bool symmetric)
+    : file_name_(file_name), records_file_name_(file_name + ".records.tmp"),
+      num_rows_(num_rows), symmetric_(symmetric), last_row_(-1), num_nonzeros_(0),
+      row_sizes_(num_rows, 0), own_sizes_(num_rows, 0), is_closed_(false) {
+  records_.open(records_file_name_, std::ios::out | std::ios::binary | std::ios::trunc);
+  if (!records_.is_open()) {
+    BOOST_THROW_EXCEPTION(DiskWriteException("Unable to create file " + records_file_name_));
+  }
+}
+
+CoocFileWriter::~CoocFileWriter() {
+  if (!is_closed_) {
+    records_.close();
+    boost::system::error_code error;
+    fs::remove(records_file_name_, error);
+  }
+}
+
+void CoocFileWriter::AddRow(int row, const std::vector<int>& ids, const std::vector<float>& values) {
+  if (row < 0 || row >= num_rows_ || row <= last_row_) {
+    std::stringstream ss;
+    ss << "Row " << row << " can't be added to " << file_name_ << " after row " << last_row_;
+    BOOST_THROW_EXCEPTION(InvalidOperation(ss.str()));
+  }
+
+  if (ids.size() != values.size()) {
+    BOOST_THROW_EXCEPTION(InvalidOperation("Number of ids and values in a row must be equal"));
+  }
+
+  last_row_ = row;
+  if (ids.empty()) {
+    return;
+  }
+
+  for (int i = 0; i < static_cast<int>(ids.size()); ++i) {
+    if (ids[i] < (symmetric_ ? row : 0) || ids[i] >= num_rows_ || (i > 0 && ids[i] <= ids[i - 1])) {
+      std::stringstream ss;
+      ss << "Invalid or unsorted index " << ids[i] << " in row " << row << " of " << file_name_;
+      BOOST_THROW_EXCEPTION(InvalidOperation(ss.str()));
+    }
+
+    ++row_sizes_[row];
+    ++own_sizes_[row];
+    if (symmetric_ && ids[i] != row) {
+      ++row_sizes_[ids[i]];
+    }
+  }
+
+  int32_t size = static_cast<int32_t>(ids.size());
+  records_.write(reinterpret_cast<const char*>(&row), sizeof(row));
+  records_.write(reinterpret_cast<const char*>(&size), sizeof(size));
+  records_.write(reinterpret_cast<const char*>(ids.data()), sizeof(int) * size);
+  records_.write(reinterpret_cast<const char*>(values.data()), sizeof(float) * size);
+  if (!records_.good()) {
+    BOOST_THROW_EXCEPTION(DiskWriteException("Unable to write into file " + records_file_name_));
+  }
+}
+
+void CoocFileWriter::Append(CoocFileWriter* writer) {
+  if (is_closed_ || writer->is_closed_ || writer->num_rows_ != num_rows_ || writer->symmetric_ != symmetric_) {
+    BOOST_THROW_EXCEPTION(InvalidOperation("Writer of " + writer->file_name_ +
+                                           " can't be appended to writer of " + file_name_));
+  }
+
+  for (int row = 0; row < num_rows_; ++row) {
+    if (writer->own_sizes_[row] != 0 && row <= last_row_) {
+      std::stringstream ss;
+      ss << "Row " << row << " can't be appended to " << file_name_ << " after row " << last_row_;
+      BOOST_THROW_EXCEPTION(InvalidOperation(ss.str()));
+    }
+  }
+
+  for (int row = 0; row < num_rows_; ++row) {
+    row_sizes_[row] += writer->row_sizes_[row];
+    own_sizes_[row] += writer->own_sizes_[row];
+  }
+  last_row_ = std::max(last_row_, writer->last_row_);
+
+  writer->records_.close();
+  {
+    std::ifstream records(writer->records_file_name_, std::ios::in | std::ios::binary);
+    if (!records.is_open()) {
+      BOOST_THROW_EXCEPTION(DiskReadException("Unable to open file " + writer->records_file_name_));
+    }
+    if (records.peek() != std::ifstream::traits_type::eof()) {
+      records_ << records.rdbuf();
+    }
+    if (!records_.good()) {
+      BOOST_THROW_EXCEPTION(DiskWriteException("Unable to write into file " + records_file_name_));
+    }
+  }
+
+  boost::system::error_code error;
+  fs::remove(writer->records_file_name_, error);
+  writer->is_closed_ = true;
+}
+
+void CoocFileWriter::Close() {
+  if (is_closed_) {
+    return;
+  }
+
+  records_.close();
+  for (int64_t row_size : row_sizes_) {
+    num_nonzeros_ += row_size;
+  }
+
+  CoocFileHeader header;
+  FillHeader(num_rows_, num_nonzeros_, &header);
+
+  // The records are scattered into a memory-mapped temporary file, which then replaces the target one.
+  // Mirrored elements of a symmetric matrix are written at the beginning of each row, and the elements
+  // added by AddRow() at the end of it. Rows are added in ascending order, so both parts stay sorted.
+  std::string output_file_name = file_name_ + ".tmp";
+  {
+    boost::iostreams::mapped_file_params params(output_file_name);
+    params.flags = boost::iostreams::mapped_file::readwrite;
+    params.new_file_size = GetFileSize(header);
+    boost::iostreams::mapped_file output(params);
+    if (!output.is_open()) {
+      BOOST_THROW_EXCEPTION(DiskWriteException("Unable to create file " + output_file_name));
+    }
+
+    memcpy(output.data(), &header, sizeof(header));
+    int* ids = reinterpret_cast<int*>(output.data() + header.ids_offset);
+    float* values = reinterpret_cast<float*>(output.data() + header.values_offset);
+    int64_t* row_offsets = reinterpret_cast<int64_t*>(output.data() + header.row_offsets_offset);
+
+    row_offsets[0] = 0;
+    for (int row = 0; row < num_rows_; ++row) {
+      row_offsets[row + 1] = row_offsets[row] + row_sizes_[row];
+    }
+
+    std::vector<int64_t> mirrored_cursor(row_offsets, row_offsets + num_rows_);
+    std::ifstream records(records_file_name_, std::ios::in | std::ios::binary);
+    if (!records.is_open()) {
+      BOOST_THROW_EXCEPTION(DiskReadException("Unable to open file " + records_file_name_));
+    }
+
+    std::vector<int> row_ids;
+    std::vector<float> row_values;
+    int32_t row, size;
+    while (records.read(reinterpret_cast<char*>(&row), sizeof(row))) {
+      records.read(reinterpret_cast<char*>(&size), sizeof(size));
+      row_ids.resize(size);
+      row_values.resize(size);
+      records.read(reinterpret_cast<char*>(row_ids.data()), sizeof(int) * size);
+      records.read(reinterpret_cast<char*>(row_values.data()), sizeof(float) * size);
+      if (!records.good()) {
+        BOOST_THROW_EXCEPTION(DiskReadException("Unable to read from file " + records_file_name_));
+      }
+
+      int64_t own_cursor = row_offsets[row + 1] - own_sizes_[row];
+      for (int i = 0; i < size; ++i) {
+        ids[own_cursor] = row_ids[i];
+        values[own_cursor] = row_values[i];
+        ++own_cursor;
+
+        if (symmetric_ && row_ids[i] != row) {
+          int64_t& cursor = mirrored_cursor[row_ids[i]];
+          ids[cursor] = row;
+          values[cursor] = row_values[i];
+          ++cursor;
+        }
+      }
+    }
+  }
+
+  boost::system::error_code error;
+  fs::remove(records_file_name_, error);
+  fs::rename(output_file_name, file_name_);
+  is_closed_ = true;
+
+  LOG(INFO) << "Binary co-occurrence file " << file_name_ << " is written, num_rows = "
+            << num_rows_ << ", num_nonzeros = " << num_nonzeros_;
+}
+
+// ****************************** Methods of class CoocFile ***********************************
+
+bool CoocFile::IsCoocFile(const std::string& file_name) {
+  std::ifstream fin(file_name, std::ios::in | std::ios::binary);
+  char magic[sizeof(kCoocFileMagic)];
+  if (!fin.is_open() || !fin.read(magic, sizeof(magic))) {
+    return false;
+  }
+
+  return memcmp(magic, kCoocFileMagic, sizeof(kCoocFileMagic)) == 0;
+}
+
+CoocMatrix CoocFile::Map(const std::string& file_name) {
+  if (!fs::exists(file_name) || !fs::is_regular_file(file_name)) {
+    BOOST_THROW_EXCEPTION(DiskReadException("File " + file_name + " does not exist"));
+  }
+
+  auto file = std::make_shared<boost::iostreams::mapped_file_source>(file_name);
+  if (!file->is_open()) {
+    BOOST_THROW_EXCEPTION(DiskReadException("Unable to map file " + file_name));
+  }
+
+  const int64_t file_size = static_cast<int64_t>(file->size());
+  if (file_size < static_cast<int64_t>(sizeof(CoocFileHeader))) {
+    BOOST_THROW_EXCEPTION(CorruptedMessageException("File " + file_name + " is not a binary cooc file"));
+  }
+
+  CoocFileHeader header;
+  memcpy(&header, file->data(), sizeof(header));
+  if (memcmp(header.magic, kCoocFileMagic, sizeof(kCoocFileMagic)) != 0) {
+    BOOST_THROW_EXCEPTION(CorruptedMessageException("File " + file_name + " is not a binary cooc file"));
+  }
+
+  if (header.version != kCoocFileVersion) {
+    std::stringstream ss;
+    ss << "Unsupported version " << header.version << " of binary cooc file " << file_name;
+    BOOST_THROW_EXCEPTION(CorruptedMessageException(ss.str()));
+  }
+
+  CoocFileHeader expected_header;
+  FillHeader(header.num_rows, header.num_nonzeros, &expected_header);
+  if (header.num_rows < 0 || header.num_rows > INT32_MAX || header.num_nonzeros < 0 ||
+      header.ids_offset != expected_header.ids_offset ||
+      header.values_offset != expected_header.values_offset ||
+      header.row_offsets_offset != expected_header.row_offsets_offset ||
+      GetFileSize(header) != file_size) {
+    BOOST_THROW_EXCEPTION(CorruptedMessageException("Binary cooc file " + file_name + " is corrupted"));
+  }
+
+  const int* ids = reinterpret_cast<const int*>(file->data() + header.ids_offset);
+  const float* values = reinterpret_cast<const float*>(file->data() + header.values_offset);
+  const int64_t* row_offsets = reinterpret_cast<const int64_t*>(file->data() + header.row_offsets_offset);
+
+  // the rest of the code relies on valid offsets and ids, so they are checked once here
+  bool is_valid = (row_offsets[0] == 0) && (row_offsets[header.num_rows] == header.num_nonzeros);
+  for (int64_t row = 0; is_valid && row < header.num_rows; ++row) {
+    is_valid = row_offsets[row] <= row_offsets[row + 1];
+  }
+  for (int64_t i = 0; is_valid && i < header.num_nonzeros; ++i) {
+    is_valid = ids[i] >= 0 && ids[i] < header.num_rows;
+  }
+  if (!is_valid) {
+    BOOST_THROW_EXCEPTION(CorruptedMessageException("Binary cooc file " + file_name + " is corrupted"));
+  }
+
+  CoocMatrix matrix;
+  matrix.Attach(file, static_cast<int>(header.num_rows), header.num_nonzeros, row_offsets, ids, values);
+  return matrix;
+}
+
+void CoocFile::Write(const CoocMatrix& matrix, const std::string& file_name) {
+  CoocFileWriter writer(file_name, matrix.num_rows(), /* symmetric = */ false);
+  std::vector<int> ids;
+  std::vector<float> values;
+  for (int index = 0; index < matrix.num_rows(); ++index) {
+    CoocRow row = matrix.row(index);
+    if (row.empty()) {
+      continue;
+    }
+
+    ids.assign(row.size(), 0);
+    values.assign(row.size(), 0.0f);
+    for (int i = 0; i < row.size(); ++i) {
+      ids[i] = row.id(i);
+      values[i] = row.value(i);
+    }
+    writer.AddRow(index, ids, values);
+  }
+  writer.Close();
+}
+
+}  // namespace core
+}  // namespace artm
+// vim: set ts=2 sw=2:
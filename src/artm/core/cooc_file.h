@@ -0,0 +1,79 @@
+// Copyright 2017, Additive Regularization of Topic Models.
+
+#pragma once
+
+#include <stdint.h>
+
+#include <fstream>
+#include <string>
+#include <vector>
+
+#include "boost/utility.hpp"
+
+#include "artm/core/dictionary.h"
+
+namespace artm {
+namespace core {
+
+// Binary co-occurrence file stores a sparse co-occurrence matrix in sorted CSR format.
+// Rows and columns are zero-based indices of tokens in the vocab file.
+// The file is memory-mapped by the Dictionary instead of being parsed,
+// so all models and processes that use the same file share one copy of the data.
+// Layout of the file (native byte order, each section starts at 8-byte aligned offset):
+//   CoocFileHeader
+//   int32 ids[num_nonzeros]          (column indices, sorted within each row)
+//   float values[num_nonzeros]
+//   int64 row_offsets[num_rows + 1]
+struct CoocFileHeader {
+  char magic[8];
+  int32_t version;
+  int32_t reserved;
+  int64_t num_rows;
+  int64_t num_nonzeros;
+  int64_t ids_offset;
+  int64_t values_offset;
+  int64_t row_offsets_offset;
+};
+
+// CoocFileWriter writes binary co-occurrence file row by row, without keeping the matrix in memory.
+// Rows must be added in ascending order, and ids within each row must be sorted.
+// If symmetric is true each element (i, j) is also written as (j, i),
+// so only the upper triangle of the matrix (i <= j) should be added.
+// The file appears on disk only after Close(), so it's safe to rewrite a file that is mapped by someone.
+// Rows can be written in parallel by several writers, each one covering its own range of rows;
+// then Append() moves the rows of each writer (in ascending order of ranges) into the resulting one.
+class CoocFileWriter : private boost::noncopyable {
+ public:
+  CoocFileWriter(const std::string& file_name, int num_rows, bool symmetric);
+  ~CoocFileWriter();
+
+  void AddRow(int row, const std::vector<int>& ids, const std::vector<float>& values);
+  void Append(CoocFileWriter* writer);
+  void Close();
+
+ private:
+  std::string file_name_;
+  std::string records_file_name_;
+  std::ofstream records_;
+  int num_rows_;
+  bool symmetric_;
+  int last_row_;
+  int64_t num_nonzeros_;
+  std::vector<int64_t> row_sizes_;  // number of elements in each row of the resulting matrix
+  std::vector<int64_t> own_sizes_;  // number of elements added to each row by AddRow()
+  bool is_closed_;
+};
+
+class CoocFile {
+ public:
+  // checks whether the file is a binary co-occurrence file (otherwise it's treated as a text one)
+  static bool IsCoocFile(const std::string& file_name);
+
+  // maps the file into memory (read-only); the mapping lives as long as any copy of the matrix
+  static CoocMatrix Map(const std::string& file_name);
+
+  static void Write(const CoocMatrix& matrix, const std::string& file_name);
+};
+
+}  // namespace core
+}  // namespace artm
@@ -7,10 +7,13 @@
 #include <iomanip>
 #include <iostream>
 #include <fstream>
+#include <functional>
 #include <future>  // NOLINT
+#include <limits>
 #include <map>
 #include <memory>
 #include <mutex>  // NOLINT
+#include <numeric>
 #include <queue>
 #include <sstream>
 #include <stdexcept>
@@ -29,6 +32,7 @@
 
 #include "artm/core/collection_parser.h"
 #include "artm/core/common.h"
+#include "artm/core/cuckoo_watch.h"
 #include "artm/core/exceptions.h"
 
 namespace fs = boost::filesystem;
@@ -47,9 +51,33 @@ namespace core {
 // ToDo (MichaelSolotky): write docs
 // ToDo (MichaelSolotky): search for all bad-written parts of code with CLion
 
+// Approximate size of one pair of tokens in the hash table of CooccurrenceShard
+// (the node itself, the bucket and the overhead of allocator)
+const int64_t kBytesPerPairInMemory = 64;
+
+// Maximal number of files that ResultingBufferOfCooccurrences opens (cooc tf and df for writing and reading, ppmi)
+const int kMaxNumOfFilesInBuffer = 6;
+
+namespace {
+
+// Calls func(i) for every i in [0, n) on n threads; an exception is re-thrown on the calling thread
+void RunInParallel(int n, const std::function<void(int)>& func) {
+  std::vector<std::shared_future<void>> tasks;
+  for (int i = 0; i < n; ++i) {
+    tasks.emplace_back(std::async(std::launch::async, func, i));
+  }
+  for (int i = 0; i < n; ++i) {
+    tasks[i].get();
+  }
+}
+
+}  // namespace
+
 // ****************************** Methods of class CooccurrenceCollector ***********************************
 
-CooccurrenceCollector::CooccurrenceCollector(const CollectionParserConfig& collection_parser_config) {
+CooccurrenceCollector::CooccurrenceCollector(const CollectionParserConfig& collection_parser_config)
+    : open_files_counter_(0), total_num_of_pairs_(0), total_num_of_documents_(0), shard_width_(1),
+      num_of_pairs_in_memory_(0), is_in_memory_(false) {
   config_.set_gather_cooc(collection_parser_config.gather_cooc());
   if (config_.gather_cooc()) {
     config_.set_gather_cooc_tf(collection_parser_config.gather_cooc_tf());
@@ -91,10 +119,12 @@ CooccurrenceCollector::CooccurrenceCollector(const CollectionParserConfig& colle
       config_.set_calculate_ppmi_df(false);
     }
 
+    config_.set_cooc_file_format(collection_parser_config.cooc_file_format());
     config_.set_cooc_window_width(collection_parser_config.cooc_window_width());
     config_.set_cooc_min_tf(collection_parser_config.cooc_min_tf());
     config_.set_cooc_min_df(collection_parser_config.cooc_min_df());
     config_.set_max_num_of_open_files(500);
+    config_.set_max_memory_usage(collection_parser_config.cooc_max_memory_usage());
     config_.set_num_items_per_batch(collection_parser_config.num_items_per_batch());
 
     if (!collection_parser_config.has_num_threads() || collection_parser_config.num_threads() < 0) {
@@ -109,6 +139,14 @@ CooccurrenceCollector::CooccurrenceCollector(const CollectionParserConfig& colle
     } else {
       config_.set_num_of_cpu(collection_parser_config.num_threads());
     }
+
+    // There are several shards per thread, so threads rarely wait for each other
+    const int num_of_shards = std::max(1, std::min(static_cast<int>(VocabSize()), 8 * config_.num_of_cpu()));
+    shard_width_ = std::max(1, (static_cast<int>(VocabSize()) + num_of_shards - 1) / num_of_shards);
+    for (int i = 0; i < num_of_shards; ++i) {
+      shards_.push_back(std::make_shared<CooccurrenceShard>());
+    }
+    is_in_memory_ = config_.max_memory_usage() > 0;
   }
 }
 
@@ -255,11 +293,11 @@ void CooccurrenceCollector::ReadVowpalWabbit() {
         }
       }
       if (!cooc_stat_holder.storage_.empty()) {
-        // This function saves gathered statistics on disk
+        // This function saves gathered statistics in RAM or on disk (if it exceeds the memory budget)
         // After saving on disk statistics from all the batches needs to be merged
         // This is implemented in ReadAndMergeCooccurrenceBatches(), so the next step is to call this method
         // Sorting is needed before storing all pairs of tokens on disk (it's for future agregation)
-        UploadOnDisk(cooc_stat_holder);
+        SaveStatistics(cooc_stat_holder);
       }
     }
     {
@@ -296,6 +334,192 @@ std::vector<std::string> CooccurrenceCollector::ReadPortionOfDocuments(
   return portion;
 }
 
+void CooccurrenceCollector::SaveStatistics(const CooccurrenceStatisticsHolder& cooc_stat_holder) {
+  // Statistics is gathered in RAM until the memory budget is exceeded. Then all the pairs
+  // from memory are moved into a cooc batch and each next portion is uploaded on disk separately
+  if (is_in_memory_) {
+    SaveInMemory(cooc_stat_holder);
+    if (num_of_pairs_in_memory_ * kBytesPerPairInMemory > config_.max_memory_usage()) {
+      bool expected = true;
+      if (is_in_memory_.compare_exchange_strong(expected, false)) {
+        LOG(INFO) << "Co-occurrences exceed the memory budget of " << config_.max_memory_usage()
+                  << " bytes, they will be merged on disk";
+        SpillOnDisk();
+      }
+    }
+  } else {
+    UploadOnDisk(cooc_stat_holder);
+  }
+}
+
+void CooccurrenceCollector::SaveInMemory(const CooccurrenceStatisticsHolder& cooc_stat_holder) {
+  // First token ids in holder are sorted, so each shard is locked only once
+  // and shards are always locked in the same order
+  CooccurrenceShard* shard = nullptr;
+  std::unique_lock<std::mutex> lock;
+  int64_t num_of_new_pairs = 0;
+  for (auto iter = cooc_stat_holder.storage_.begin(); iter != cooc_stat_holder.storage_.end(); ++iter) {
+    CooccurrenceShard* first_token_shard = shards_[iter->first / shard_width_].get();
+    if (first_token_shard != shard) {
+      if (lock.owns_lock()) {
+        lock.unlock();
+      }
+      shard = first_token_shard;
+      lock = std::unique_lock<std::mutex>(shard->access);
+    }
+
+    const int64_t first_token_key = static_cast<int64_t>(iter->first) << 32;
+    for (const auto& second_token : iter->second.second_token_reference) {
+      CooccurrenceShard::Counters& counters = shard->pairs[first_token_key | second_token.first];
+      if (counters.cooc_df == 0) {
+        ++num_of_new_pairs;
+      }
+      counters.cooc_tf += second_token.second.cooc_tf;
+      counters.cooc_df += second_token.second.cooc_df;
+    }
+  }
+  num_of_pairs_in_memory_ += num_of_new_pairs;
+}
+
+std::vector<Cell> CooccurrenceCollector::ExtractCellsFromShard(CooccurrenceShard* shard) {
+  // Moves all the pairs out of the shard and returns them as cells, sorted by first and second token ids
+  std::vector<std::pair<int64_t, CooccurrenceShard::Counters>> pairs;
+  {
+    std::unique_lock<std::mutex> lock(shard->access);
+    pairs.assign(shard->pairs.begin(), shard->pairs.end());
+    std::unordered_map<int64_t, CooccurrenceShard::Counters>().swap(shard->pairs);
+    num_of_pairs_in_memory_ -= pairs.size();
+  }
+  std::sort(pairs.begin(), pairs.end(),
+            [](const std::pair<int64_t, CooccurrenceShard::Counters>& left,
+               const std::pair<int64_t, CooccurrenceShard::Counters>& right) { return left.first < right.first; });
+
+  std::vector<Cell> cells;
+  for (const auto& pair : pairs) {
+    const int first_token_id = static_cast<int>(pair.first >> 32);
+    if (cells.empty() || cells.back().first_token_id != first_token_id) {
+      cells.push_back(Cell(first_token_id));
+    }
+    CoocInfo cooc_info;
+    cooc_info.second_token_id = static_cast<int>(pair.first & 0xFFFFFFFF);
+    cooc_info.cooc_tf = pair.second.cooc_tf;
+    cooc_info.cooc_df = pair.second.cooc_df;
+    cells.back().records.push_back(cooc_info);
+  }
+  for (Cell& cell : cells) {
+    cell.num_of_records = cell.records.size();
+  }
+  return cells;
+}
+
+void CooccurrenceCollector::SpillOnDisk() {
+  // All the pairs from memory are written in one cooc batch
+  // Shards hold ascending ranges of first token ids, so the cells in batch are sorted
+  std::unique_lock<std::mutex> spill_lock(spill_access_);
+  std::shared_ptr<CooccurrenceBatch> batch(CreateNewCooccurrenceBatch());
+  OpenBatchOutputFile(batch);
+  for (auto& shard : shards_) {
+    std::vector<Cell> cells = ExtractCellsFromShard(shard.get());
+    for (Cell& cell : cells) {
+      batch->cell_ = std::move(cell);
+      batch->WriteCell();
+    }
+  }
+  CloseBatchOutputFile(batch);
+
+  std::unique_lock<std::mutex> lock(vector_of_batches_access_);
+  vector_of_batches_.push_back(std::move(batch));
+}
+
+void CooccurrenceCollector::MergeInMemory() {
+  // Shards are sorted and written in parallel by ranges, which hold approximately equal numbers of pairs
+  std::vector<int64_t> shard_sizes;
+  for (const auto& shard : shards_) {
+    shard_sizes.push_back(shard->pairs.size());
+  }
+  MergeRanges(SplitShardsIntoRanges(shard_sizes, config_.num_of_cpu()),
+              [this](int first_shard, int last_shard, ResultingBufferOfCooccurrences* res) {
+    for (int i = first_shard; i < last_shard; ++i) {
+      std::vector<Cell> cells = ExtractCellsFromShard(shards_[i].get());
+      for (Cell& cell : cells) {
+        res->cell_ = std::move(cell);
+        res->WriteCell();
+      }
+    }
+  });
+}
+
+std::vector<int> CooccurrenceCollector::SplitShardsIntoRanges(const std::vector<int64_t>& shard_sizes,
+                                                             int num_of_ranges) const {
+  // Ranges consist of adjacent shards and have approximately equal sizes
+  // The function returns bounds of ranges: i-th range holds shards [range_bounds[i], range_bounds[i + 1])
+  num_of_ranges = std::max(1, std::min(num_of_ranges, static_cast<int>(shard_sizes.size())));
+  const int64_t total_size = std::accumulate(shard_sizes.begin(), shard_sizes.end(), static_cast<int64_t>(0));
+  std::vector<int> range_bounds(1, 0);
+  int64_t size = 0;
+  for (int i = 0; i < static_cast<int>(shard_sizes.size()); ++i) {
+    size += shard_sizes[i];
+    if (static_cast<int>(range_bounds.size()) < num_of_ranges &&
+        size * num_of_ranges >= total_size * static_cast<int64_t>(range_bounds.size())) {
+      range_bounds.push_back(i + 1);
+    }
+  }
+  if (range_bounds.back() != static_cast<int>(shard_sizes.size())) {
+    range_bounds.push_back(shard_sizes.size());
+  }
+  return range_bounds;
+}
+
+void CooccurrenceCollector::MergeRanges(const std::vector<int>& range_bounds,
+    const std::function<void(int, int, ResultingBufferOfCooccurrences*)>& merge_range) {
+  // Every range of shards is merged by its own thread (merge_range(first_shard, last_shard, buffer))
+  // and written in temporary files, which are then appended to the resulting files in ascending order
+  // of first token ids. Ppmi needs statistics of all the ranges, so it's calculated in the same way afterwards
+  const int num_of_ranges = range_bounds.size() - 1;
+  CuckooWatch cuckoo("MergeRanges(" + std::to_string(num_of_ranges) + " ranges)");
+  ResultingBufferOfCooccurrences res(vocab_, num_of_documents_token_occurred_in_, config_);
+  std::vector<std::shared_ptr<ResultingBufferOfCooccurrences>> ranges;
+  int open_files_in_buffers = res.open_files_in_buf_;
+  for (int i = 0; i < num_of_ranges; ++i) {
+    ranges.emplace_back(new ResultingBufferOfCooccurrences(vocab_, num_of_documents_token_occurred_in_, config_,
+      std::min(range_bounds[i] * shard_width_, static_cast<int>(VocabSize())),
+      std::min(range_bounds[i + 1] * shard_width_, static_cast<int>(VocabSize())),
+      "." + std::to_string(i) + ".tmp"));
+    open_files_in_buffers += ranges.back()->open_files_in_buf_;
+  }
+  open_files_counter_ += open_files_in_buffers;
+
+  {
+    CuckooWatch cuckoo2("MergeCooccurrences", &cuckoo);
+    RunInParallel(num_of_ranges, [&range_bounds, &ranges, &merge_range](int i) {
+      merge_range(range_bounds[i], range_bounds[i + 1], ranges[i].get());
+    });
+    for (auto& range : ranges) {
+      res.AppendCoocFiles(range.get());
+    }
+    // Files are explicitly closed here, because it's necesery to push the data in files on this step
+    res.CloseCoocFiles();
+  }
+
+  if (config_.calculate_ppmi_tf() || config_.calculate_ppmi_df()) {
+    CuckooWatch cuckoo2("CalculatePpmi", &cuckoo);
+    RunInParallel(num_of_ranges, [&res, &ranges](int i) {
+      ranges[i]->num_of_pairs_token_occurred_in_ = res.num_of_pairs_token_occurred_in_;
+      ranges[i]->CalculatePpmi();
+      std::vector<int64_t>().swap(ranges[i]->num_of_pairs_token_occurred_in_);
+    });
+    for (auto& range : ranges) {
+      res.AppendPpmiFiles(range.get());
+    }
+    res.ClosePpmiFiles();
+  }
+  open_files_counter_ -= open_files_in_buffers;
+}
+
+int64_t CooccurrenceCollector::NumOfPairsInMemory() const {
+  return num_of_pairs_in_memory_;
+}
+
 void CooccurrenceCollector::UploadOnDisk(const CooccurrenceStatisticsHolder& cooc_stat_holder) {
   // Uploading is implemented as folowing:
   // 1. Create a batch which is associated with a specific file on a disk
@@ -312,11 +536,12 @@ void CooccurrenceCollector::UploadOnDisk(const CooccurrenceStatisticsHolder& coo
     batch->WriteCell();
   }
   CloseBatchOutputFile(batch);
+  std::unique_lock<std::mutex> lock(vector_of_batches_access_);
   vector_of_batches_.push_back(std::move(batch));
 }
 
 CooccurrenceBatch* CooccurrenceCollector::CreateNewCooccurrenceBatch() const {
-  return new CooccurrenceBatch(config_.target_folder());
+  return new CooccurrenceBatch(config_.target_folder(), shard_width_);
 }
 
 void CooccurrenceCollector::OpenBatchOutputFile(std::shared_ptr<CooccurrenceBatch> batch) {
@@ -329,6 +554,10 @@ void CooccurrenceCollector::OpenBatchOutputFile(std::shared_ptr<CooccurrenceBatc
 
 void CooccurrenceCollector::CloseBatchOutputFile(std::shared_ptr<CooccurrenceBatch> batch) {
   if (batch->out_batch_.is_open()) {
+    // The rest of shards (and the end of the last one) are located at the end of file
+    while (batch->shard_offsets_.size() <= shards_.size()) {
+      batch->shard_offsets_.push_back(batch->out_batch_.tellp());
+    }
     --open_files_counter_;
     batch->out_batch_.close();
   }
@@ -339,6 +568,7 @@ unsigned CooccurrenceCollector::CooccurrenceBatchesQuantity() const {
 }
 
 void CooccurrenceCollector::ReadAndMergeCooccurrenceBatches() {
+  // If all the statistics has fit into the memory budget, it's merged in RAM (see MergeInMemory())
   // After that all the statistics has been gathered and saved in form of cooc batches on disk, it
   // needs to be read and merged from cooc batches into one storage
   // If number of cooc batches <= number of files than can be open simultaniously, then
@@ -351,21 +581,28 @@ void CooccurrenceCollector::ReadAndMergeCooccurrenceBatches() {
   // If n is too large to merge all the batches into some small number of batches
   // this operation can be in cicle launched many times.
   // 2. then that n files need to be read and merged again (with dropping of rare pairs of tokens)
+  // This stage is done in parallel for ranges of first token ids (see MergeRanges())
   // Merging of k files is implemented in KWayMerge function
   // After the second stage the data is written in format of output file (not in format of cooc batches)
   // If there would be a need to calculate ppmi or other values which depend on co-occurrences
   // this data can be read back from output file.
 
-  // std::cout << "Step 2: merging batches" << std::endl;
+  if (is_in_memory_) {
+    MergeInMemory();
+    return;
+  }
+  if (NumOfPairsInMemory() != 0) {  // these pairs were added while the memory was being spilled on disk
+    SpillOnDisk();
+  }
+
   const unsigned min_num_of_batches_to_be_merged_in_parallel = 32;
-  while (vector_of_batches_.size() > min_num_of_batches_to_be_merged_in_parallel) {
-    FirstStageOfMerging();  // size is decreasing here
+  if (vector_of_batches_.size() > min_num_of_batches_to_be_merged_in_parallel) {
+    CuckooWatch cuckoo("FirstStageOfMerging(" + std::to_string(vector_of_batches_.size()) + " batches)");
+    while (vector_of_batches_.size() > min_num_of_batches_to_be_merged_in_parallel) {
+      FirstStageOfMerging();  // size is decreasing here
+    }
   }
-  ResultingBufferOfCooccurrences res(vocab_, num_of_documents_token_occurred_in_, config_);
-  open_files_counter_ += res.open_files_in_buf_;
-  SecondStageOfMerging(&res, &vector_of_batches_);
-  // std::cout << "Batches have been merged" << std::endl;
-  res.CalculatePpmi();
+  SecondStageOfMerging();
 }
 
 void CooccurrenceCollector::FirstStageOfMerging() {
@@ -433,20 +670,33 @@ void CooccurrenceCollector::FirstStageOfMerging() {
   vector_of_batches_ = std::move(intermediate_batches);
 }
 
-void CooccurrenceCollector::SecondStageOfMerging(ResultingBufferOfCooccurrences* res,
-                               std::vector<std::shared_ptr<CooccurrenceBatch>>* intermediate_batches) {
-  // Stage 2: merging of final batches (in single thread)
-  std::shared_ptr<std::mutex> open_close_file_mutex_ptr(new std::mutex);
-  // Note: the 4th arg is fake, it's not used later if mode == OUTPUT_FILE
-  KWayMerge(res, OUTPUT_FILE, intermediate_batches, (*intermediate_batches)[0], open_close_file_mutex_ptr);
-  // Files are explicitly closed here, because it's necesery to push the data in files on this step
-  if (config_.gather_cooc_tf()) {
-    res->cooc_tf_dict_out_.close();
-  }
-  if (config_.gather_cooc_df()) {
-    res->cooc_df_dict_out_.close();
+void CooccurrenceCollector::SecondStageOfMerging() {
+  // Stage 2: merging of final batches (in parallel by ranges of first token ids)
+  // Size of a shard is estimated as total size of its cells in batches, so the ranges are balanced
+  // Every range needs its own reader of each batch and its own output files
+  std::vector<int64_t> shard_sizes(shards_.size(), 0);
+  for (const auto& batch : vector_of_batches_) {
+    for (unsigned i = 0; i < shards_.size(); ++i) {
+      shard_sizes[i] += batch->shard_offsets_[i + 1] - batch->shard_offsets_[i];
+    }
   }
-  open_files_counter_ -= 2;
+  const int num_of_files_per_range = static_cast<int>(vector_of_batches_.size()) + kMaxNumOfFilesInBuffer;
+  const int num_of_ranges = std::min(config_.num_of_cpu(),
+    (config_.max_num_of_open_files() - open_files_counter_ - kMaxNumOfFilesInBuffer) / num_of_files_per_range);
+
+  std::shared_ptr<std::mutex> open_close_file_mutex_ptr(new std::mutex);
+  MergeRanges(SplitShardsIntoRanges(shard_sizes, num_of_ranges),
+              [&open_close_file_mutex_ptr, this](int first_shard, int last_shard,
+                                                 ResultingBufferOfCooccurrences* res) {
+    std::vector<std::shared_ptr<CooccurrenceBatch>> batches;
+    for (const auto& batch : vector_of_batches_) {
+      if (batch->shard_offsets_[first_shard] != batch->shard_offsets_[last_shard]) {
+        batches.emplace_back(new CooccurrenceBatch(*batch, first_shard, last_shard));
+      }
+    }
+    // Note: the 4th arg is fake, it's not used later if mode == OUTPUT_FILE
+    KWayMerge(res, OUTPUT_FILE, &batches, nullptr, open_close_file_mutex_ptr);
+  });
 }
 
 void CooccurrenceCollector::KWayMerge(ResultingBufferOfCooccurrences* res, const int mode,
@@ -504,15 +754,7 @@ void CooccurrenceCollector::KWayMerge(ResultingBufferOfCooccurrences* res, const
         out_batch->cell_ = res->cell_;
         out_batch->WriteCell();
       } else if (mode == OUTPUT_FILE) {
-        if (config_.calculate_ppmi_tf()) {
-          res->CalculateTFStatistics();
-        }
-        if (config_.gather_cooc_tf()) {
-          res->WriteCoocFromCell(TokenCoocFrequency, config_.cooc_min_tf());
-        }
-        if (config_.gather_cooc_df()) {
-          res->WriteCoocFromCell(DocumentCoocFrequency, config_.cooc_min_df());
-        }
+        res->WriteCell();
         // It's importants to set size = 0 after popping, because this value will be checked later
         res->cell_.records.resize(0);
       }
@@ -546,15 +788,7 @@ void CooccurrenceCollector::KWayMerge(ResultingBufferOfCooccurrences* res, const
       out_batch->cell_ = res->cell_;
       out_batch->WriteCell();
     } else if (mode == OUTPUT_FILE) {
-      if (config_.calculate_ppmi_tf()) {
-        res->CalculateTFStatistics();
-      }
-      if (config_.gather_cooc_tf()) {
-        res->WriteCoocFromCell(TokenCoocFrequency, config_.cooc_min_tf());
-      }
-      if (config_.gather_cooc_df()) {
-        res->WriteCoocFromCell(DocumentCoocFrequency, config_.cooc_min_df());
-      }
+      res->WriteCell();
     }
   }
 }
@@ -677,13 +911,18 @@ bool CooccurrenceStatisticsHolder::Empty() {
 
 // ************************************** Methods of class CooccurrenceBatch ******************************************
 
-CooccurrenceBatch::CooccurrenceBatch(const std::string& path_to_batches) : in_batch_offset_(0) {
+CooccurrenceBatch::CooccurrenceBatch(const std::string& path_to_batches, int shard_width)
+    : in_batch_offset_(0), shard_width_(shard_width), first_token_id_end_(std::numeric_limits<int>::max()) {
   boost::uuids::uuid uuid = boost::uuids::random_generator()();
   fs::path batch(boost::lexical_cast<std::string>(uuid));
   fs::path full_filename = fs::path(path_to_batches) / batch;
   filename_ = full_filename.string();
 }
 
+CooccurrenceBatch::CooccurrenceBatch(const CooccurrenceBatch& batch, int first_shard, int last_shard)
+    : filename_(batch.filename_), in_batch_offset_(batch.shard_offsets_[first_shard]),
+      shard_width_(batch.shard_width_), first_token_id_end_(last_shard * batch.shard_width_) { }
+
 void CooccurrenceBatch::FormNewCell(const std::map<int, CooccurrenceStatisticsHolder::FirstToken>
                                              ::const_iterator& cooc_stat_node) {
   // Here is initialization of a new cell
@@ -709,6 +948,10 @@ void CooccurrenceBatch::WriteCell() {
   // space and numbers in these triples are separeted the same
   // stringstream is used for fast bufferized i/o operations
   // Initially data is written into stringstreams and then one large stringstream is written in file
+  // Offsets of the first cells of shards are remembered, so ranges of shards can be read independently
+  while (static_cast<int>(shard_offsets_.size()) <= cell_.first_token_id / shard_width_) {
+    shard_offsets_.push_back(out_batch_.tellp());
+  }
   std::stringstream ss;
   ss << cell_.first_token_id << ' ';
   // The value of the variable cell_.num_of_records is invalid (wasn't updated from first read from batch)
@@ -723,7 +966,8 @@ void CooccurrenceBatch::WriteCell() {
 }
 
 bool CooccurrenceBatch::ReadCell() {
-  if (ReadCellHeader()) {
+  // Cells of the next ranges are left to other readers
+  if (ReadCellHeader() && cell_.first_token_id < first_token_id_end_) {
     ReadRecords();
     return true;
   }
@@ -770,36 +1014,79 @@ void CooccurrenceBatch::ReadRecords() {
 // A cell can from a batch can come in this buffer and be merged with current stored
 // (in case first_token_ids of cells are equal) or the current cell can be pushed from buffer in file
 // (in case first_token_ids aren't equal) and new cell takes place of the old one
+// The buffer of a range of first token ids writes its data in temporary files near the resulting ones
 ResultingBufferOfCooccurrences::ResultingBufferOfCooccurrences(
     const Vocab& vocab,
     const std::vector<unsigned>& num_of_documents_token_occurred_in,
-    const CooccurrenceCollectorConfig& config) : vocab_(vocab),
+    const CooccurrenceCollectorConfig& config,
+    const int first_token_id_begin, const int first_token_id_end,
+    const std::string& file_suffix) : vocab_(vocab),
                       num_of_documents_token_occurred_in_(num_of_documents_token_occurred_in),
-                      config_(config) {
+                      open_files_in_buf_(0), config_(config), first_token_id_begin_(first_token_id_begin),
+                      first_token_id_end_(first_token_id_end), file_suffix_(file_suffix) {
   num_of_pairs_token_occurred_in_.resize(vocab_.token_map_.size());
+  if (first_token_id_end_ < 0) {
+    first_token_id_end_ = vocab_.token_map_.size();
+  }
+  if (IsBinaryFormat()) {
+    return;  // binary files are created on the first write (see GetCoocFileWriter)
+  }
   // ToDo (MichaelSolotky): make it easier to read
-  if (config_.has_gather_cooc_tf()) {  // It's important firstly to create file (open output file)
-    cooc_tf_dict_out_.open(config_.cooc_tf_file_path(), std::ios::out);
-    CheckOutputFile(cooc_tf_dict_out_, config_.cooc_tf_file_path());
-    cooc_tf_dict_in_.open(config_.cooc_tf_file_path(), std::ios::in);
-    CheckInputFile(cooc_tf_dict_in_, config_.cooc_tf_file_path());
+  if (config_.gather_cooc_tf()) {  // It's important firstly to create file (open output file)
+    cooc_tf_dict_out_.open(GetFilePath(config_.cooc_tf_file_path()), std::ios::out);
+    CheckOutputFile(cooc_tf_dict_out_, GetFilePath(config_.cooc_tf_file_path()));
+    cooc_tf_dict_in_.open(GetFilePath(config_.cooc_tf_file_path()), std::ios::in);
+    CheckInputFile(cooc_tf_dict_in_, GetFilePath(config_.cooc_tf_file_path()));
+    open_files_in_buf_ += 2;
   }
-  if (config_.has_gather_cooc_df()) {
-    cooc_df_dict_out_.open(config_.cooc_df_file_path(), std::ios::out);
-    CheckOutputFile(cooc_df_dict_out_, config_.cooc_df_file_path());
-    cooc_df_dict_in_.open(config_.cooc_df_file_path(), std::ios::in);
-    CheckInputFile(cooc_df_dict_in_, config_.cooc_df_file_path());
+  if (config_.gather_cooc_df()) {
+    cooc_df_dict_out_.open(GetFilePath(config_.cooc_df_file_path()), std::ios::out);
+    CheckOutputFile(cooc_df_dict_out_, GetFilePath(config_.cooc_df_file_path()));
+    cooc_df_dict_in_.open(GetFilePath(config_.cooc_df_file_path()), std::ios::in);
+    CheckInputFile(cooc_df_dict_in_, GetFilePath(config_.cooc_df_file_path()));
+    open_files_in_buf_ += 2;
   }
-  if (config_.has_calculate_ppmi_tf()) {
-    ppmi_tf_dict_.open(config_.ppmi_tf_file_path(), std::ios::out);
-    CheckOutputFile(ppmi_tf_dict_, config_.ppmi_tf_file_path());
+  if (config_.calculate_ppmi_tf()) {
+    ppmi_tf_dict_.open(GetFilePath(config_.ppmi_tf_file_path()), std::ios::out);
+    CheckOutputFile(ppmi_tf_dict_, GetFilePath(config_.ppmi_tf_file_path()));
+    ++open_files_in_buf_;
   }
-  if (config_.has_calculate_ppmi_df()) {
-    ppmi_df_dict_.open(config_.ppmi_df_file_path(), std::ios::out);
-    CheckOutputFile(ppmi_df_dict_, config_.ppmi_df_file_path());
+  if (config_.calculate_ppmi_df()) {
+    ppmi_df_dict_.open(GetFilePath(config_.ppmi_df_file_path()), std::ios::out);
+    CheckOutputFile(ppmi_df_dict_, GetFilePath(config_.ppmi_df_file_path()));
+    ++open_files_in_buf_;
   }
 }
 
+ResultingBufferOfCooccurrences::~ResultingBufferOfCooccurrences() {
+  if (file_suffix_.empty() || IsBinaryFormat()) {
+    return;  // temporary binary files are removed by CoocFileWriter
+  }
+  cooc_tf_dict_in_.close();
+  cooc_tf_dict_out_.close();
+  cooc_df_dict_in_.close();
+  cooc_df_dict_out_.close();
+  ppmi_tf_dict_.close();
+  ppmi_df_dict_.close();
+  boost::system::error_code error;
+  if (config_.gather_cooc_tf()) {
+    fs::remove(GetFilePath(config_.cooc_tf_file_path()), error);
+  }
+  if (config_.gather_cooc_df()) {
+    fs::remove(GetFilePath(config_.cooc_df_file_path()), error);
+  }
+  if (config_.calculate_ppmi_tf()) {
+    fs::remove(GetFilePath(config_.ppmi_tf_file_path()), error);
+  }
+  if (config_.calculate_ppmi_df()) {
+    fs::remove(GetFilePath(config_.ppmi_df_file_path()), error);
+  }
+}
+
+std::string ResultingBufferOfCooccurrences::GetFilePath(const std::string& path) const {
+  return path + file_suffix_;
+}
+
 void ResultingBufferOfCooccurrences::CheckInputFile(const std::ifstream& file, const std::string& filename) {
   if (!file.good()) {
     BOOST_THROW_EXCEPTION(InvalidOperation("Failed to open input file " +
@@ -814,6 +1101,54 @@ void ResultingBufferOfCooccurrences::CheckOutputFile(const std::ofstream& file,
   }
 }
 
+void ResultingBufferOfCooccurrences::AppendFile(std::ofstream* range_file, const std::string& range_filename,
+                                                std::ofstream* file) {
+  range_file->close();
+  std::ifstream input(range_filename, std::ios::in);
+  CheckInputFile(input, range_filename);
+  if (input.peek() != std::ifstream::traits_type::eof()) {  // copying of empty file sets failbit of output
+    *file << input.rdbuf();
+  }
+}
+
+void ResultingBufferOfCooccurrences::AppendCoocFiles(ResultingBufferOfCooccurrences* range) {
+  // Ranges should be appended in ascending order of first token ids
+  for (unsigned i = 0; i < num_of_pairs_token_occurred_in_.size(); ++i) {
+    num_of_pairs_token_occurred_in_[i] += range->num_of_pairs_token_occurred_in_[i];
+  }
+  if (config_.gather_cooc_tf()) {
+    if (IsBinaryFormat()) {
+      GetCoocFileWriter(TokenCoocFrequency)->Append(range->GetCoocFileWriter(TokenCoocFrequency));
+    } else {
+      AppendFile(&range->cooc_tf_dict_out_, range->GetFilePath(config_.cooc_tf_file_path()), &cooc_tf_dict_out_);
+    }
+  }
+  if (config_.gather_cooc_df()) {
+    if (IsBinaryFormat()) {
+      GetCoocFileWriter(DocumentCoocFrequency)->Append(range->GetCoocFileWriter(DocumentCoocFrequency));
+    } else {
+      AppendFile(&range->cooc_df_dict_out_, range->GetFilePath(config_.cooc_df_file_path()), &cooc_df_dict_out_);
+    }
+  }
+}
+
+void ResultingBufferOfCooccurrences::AppendPpmiFiles(ResultingBufferOfCooccurrences* range) {
+  if (config_.calculate_ppmi_tf()) {
+    if (IsBinaryFormat()) {
+      GetPpmiFileWriter(TokenCoocFrequency)->Append(range->GetPpmiFileWriter(TokenCoocFrequency));
+    } else {
+      AppendFile(&range->ppmi_tf_dict_, range->GetFilePath(config_.ppmi_tf_file_path()), &ppmi_tf_dict_);
+    }
+  }
+  if (config_.calculate_ppmi_df()) {
+    if (IsBinaryFormat()) {
+      GetPpmiFileWriter(DocumentCoocFrequency)->Append(range->GetPpmiFileWriter(DocumentCoocFrequency));
+    } else {
+      AppendFile(&range->ppmi_df_dict_, range->GetFilePath(config_.ppmi_df_file_path()), &ppmi_df_dict_);
+    }
+  }
+}
+
 // ToDo (MichaelSolotky): may be this can be implemented in more optimal way
 void ResultingBufferOfCooccurrences::MergeWithExistingCell(const CooccurrenceBatch& batch) {
   // All the data in buffer are stored in a cell, so here are rules of updating each cell
@@ -850,6 +1185,18 @@ void ResultingBufferOfCooccurrences::MergeWithExistingCell(const CooccurrenceBat
   std::copy(se_iter, batch.cell_.records.end(), std::back_inserter(cell_.records));
 }
 
+void ResultingBufferOfCooccurrences::WriteCell() {
+  if (config_.calculate_ppmi_tf()) {
+    CalculateTFStatistics();
+  }
+  if (config_.gather_cooc_tf()) {
+    WriteCoocFromCell(TokenCoocFrequency, config_.cooc_min_tf());
+  }
+  if (config_.gather_cooc_df()) {
+    WriteCoocFromCell(DocumentCoocFrequency, config_.cooc_min_df());
+  }
+}
+
 void ResultingBufferOfCooccurrences::CalculateTFStatistics() {
   // Calculate statistics of occurrence (of first token which is associated with current cell)
   int64_t n_u = 0;
@@ -867,6 +1214,10 @@ void ResultingBufferOfCooccurrences::WriteCoocFromCell(const std::string mode, c
   // Output file format(s) are defined here
   // stringstream is used for fast bufferized i/o operations
   // Note: before writing in file all the information is stored in ram
+  if (IsBinaryFormat()) {
+    WriteBinaryCoocFromCell(mode, cooc_min);
+    return;
+  }
   std::stringstream output_buf;
   bool no_cooc_found = true;
   std::string prev_modality = "@default_class";
@@ -897,13 +1248,99 @@ void ResultingBufferOfCooccurrences::WriteCoocFromCell(const std::string mode, c
   }
 }
 
+bool ResultingBufferOfCooccurrences::IsBinaryFormat() const {
+  return config_.cooc_file_format() == CollectionParserConfig_CoocFileFormat_Binary;
+}
+
+CoocFileWriter* ResultingBufferOfCooccurrences::GetCoocFileWriter(const std::string& mode) {
+  // Binary files are created lazily, because intermediate buffers never write in them
+  // Pairs <u v> are stored only once (u <= v) in symetric case, so the writer mirrors them
+  std::shared_ptr<CoocFileWriter>& writer = mode == TokenCoocFrequency ? cooc_tf_writer_ : cooc_df_writer_;
+  if (writer == nullptr) {
+    writer = std::make_shared<CoocFileWriter>(
+      GetFilePath(mode == TokenCoocFrequency ? config_.cooc_tf_file_path() : config_.cooc_df_file_path()),
+      vocab_.token_map_.size(), config_.use_symetric_cooc());
+  }
+  return writer.get();
+}
+
+CoocFileWriter* ResultingBufferOfCooccurrences::GetPpmiFileWriter(const std::string& mode) {
+  // Ppmi is calculated from both <u v> and <v u> pairs, so there's nothing to mirror
+  std::shared_ptr<CoocFileWriter>& writer = mode == TokenCoocFrequency ? ppmi_tf_writer_ : ppmi_df_writer_;
+  if (writer == nullptr) {
+    writer = std::make_shared<CoocFileWriter>(
+      GetFilePath(mode == TokenCoocFrequency ? config_.ppmi_tf_file_path() : config_.ppmi_df_file_path()),
+      vocab_.token_map_.size(), /* symmetric = */ false);
+  }
+  return writer.get();
+}
+
+void ResultingBufferOfCooccurrences::WriteBinaryCoocFromCell(const std::string mode, const unsigned cooc_min) {
+  // The same pairs as in text format are written: frequent enough and with different tokens
+  std::vector<int> ids;
+  std::vector<float> values;
+  for (unsigned i = 0; i < cell_.records.size(); ++i) {
+    if (cell_.GetCoocFromCell(mode, i) >= cooc_min && cell_.first_token_id != cell_.records[i].second_token_id) {
+      ids.push_back(cell_.records[i].second_token_id);
+      values.push_back(static_cast<float>(cell_.GetCoocFromCell(mode, i)));
+    }
+  }
+  if (!ids.empty()) {
+    GetCoocFileWriter(mode)->AddRow(cell_.first_token_id, ids, values);
+  }
+}
+
+void ResultingBufferOfCooccurrences::CloseCoocFiles() {
+  if (IsBinaryFormat()) {
+    // Files are created even if there are no co-occurrences, because ppmi is calculated from them
+    if (config_.gather_cooc_tf()) {
+      GetCoocFileWriter(TokenCoocFrequency)->Close();
+    }
+    if (config_.gather_cooc_df()) {
+      GetCoocFileWriter(DocumentCoocFrequency)->Close();
+    }
+    return;
+  }
+  if (config_.gather_cooc_tf()) {
+    cooc_tf_dict_out_.close();
+  }
+  if (config_.gather_cooc_df()) {
+    cooc_df_dict_out_.close();
+  }
+}
+
+void ResultingBufferOfCooccurrences::ClosePpmiFiles() {
+  if (config_.calculate_ppmi_tf()) {
+    if (IsBinaryFormat()) {
+      GetPpmiFileWriter(TokenCoocFrequency)->Close();
+    } else {
+      ppmi_tf_dict_.close();
+    }
+  }
+  if (config_.calculate_ppmi_df()) {
+    if (IsBinaryFormat()) {
+      GetPpmiFileWriter(DocumentCoocFrequency)->Close();
+    } else {
+      ppmi_df_dict_.close();
+    }
+  }
+}
+
 void ResultingBufferOfCooccurrences::CalculatePpmi() {  // Wrapper around CalculateAndWritePpmi
   // std::cout << "Step 3: start calculation ppmi" << std::endl;
   if (config_.calculate_ppmi_tf()) {
-    CalculateAndWritePpmi(TokenCoocFrequency, config_.total_num_of_pairs());
+    if (IsBinaryFormat()) {
+      CalculateAndWriteBinaryPpmi(TokenCoocFrequency, config_.total_num_of_pairs());
+    } else {
+      CalculateAndWritePpmi(TokenCoocFrequency, config_.total_num_of_pairs());
+    }
   }
   if (config_.calculate_ppmi_df()) {
-    CalculateAndWritePpmi(DocumentCoocFrequency, config_.total_num_of_documents());
+    if (IsBinaryFormat()) {
+      CalculateAndWriteBinaryPpmi(DocumentCoocFrequency, config_.total_num_of_documents());
+    } else {
+      CalculateAndWritePpmi(DocumentCoocFrequency, config_.total_num_of_documents());
+    }
   }
   // std::cout << "Ppmi's have been calculated" << std::endl;
 }
@@ -974,6 +1411,40 @@ void ResultingBufferOfCooccurrences::CalculateAndWritePpmi(const std::string mod
   }
 }
 
+void ResultingBufferOfCooccurrences::CalculateAndWriteBinaryPpmi(const std::string mode, const long double n) {
+  // The same as CalculateAndWritePpmi, but the co-occurrences are read from memory-mapped binary file,
+  // which holds both <u v> and <v u> pairs, so the resulting ppmi file is symmetric too
+  // Note: the resulting cooc file (not the file of the range) is read, because rows of the range
+  // are completed only there (with pairs <v u> mirrored from other ranges)
+  CoocMatrix cooc = CoocFile::Map(mode == TokenCoocFrequency ? config_.cooc_tf_file_path()
+                                                             : config_.cooc_df_file_path());
+  CoocFileWriter& ppmi_writer = *GetPpmiFileWriter(mode);
+  std::vector<int> ids;
+  std::vector<float> values;
+  const int end = std::min(first_token_id_end_, cooc.num_rows());
+  for (int first_token_id = first_token_id_begin_; first_token_id < end; ++first_token_id) {
+    CoocRow row = cooc.row(first_token_id);
+    if (row.empty()) {
+      continue;
+    }
+    ids.clear();
+    values.clear();
+    long double n_u = GetTokenFreq(mode, first_token_id);
+    for (int i = 0; i < row.size(); ++i) {
+      long double n_v = GetTokenFreq(mode, row.id(i));
+      long double n_uv = static_cast<long double>(row.value(i));
+      double value_inside_logarithm = (n / n_u) / (n_v / n_uv);
+      if (value_inside_logarithm > 1.0) {
+        ids.push_back(row.id(i));
+        values.push_back(static_cast<float>(log(value_inside_logarithm)));
+      }
+    }
+    if (!ids.empty()) {
+      ppmi_writer.AddRow(first_token_id, ids, values);
+    }
+  }
+}
+
 double ResultingBufferOfCooccurrences::GetTokenFreq(const std::string& mode, const int token_id) const {
   if (mode == TokenCoocFrequency) {
     return num_of_pairs_token_occurred_in_[token_id];
@@ -2,9 +2,11 @@
 
 #pragma once
 
+#include <atomic>
 #include <iomanip>
 #include <iostream>
 #include <fstream>
+#include <functional>
 #include <map>
 #include <memory>
 #include <mutex>  // NOLINT
@@ -19,6 +21,7 @@
 
 #include "artm/core/collection_parser.h"
 #include "artm/core/common.h"
+#include "artm/core/cooc_file.h"
 
 namespace artm {
 namespace core {
@@ -61,6 +64,20 @@ class CooccurrenceStatisticsHolder;
 class CooccurrenceBatch;
 class ResultingBufferOfCooccurrences;
 
+// Co-occurrences that are gathered in RAM are stored in shards.
+// Each shard holds a range of first token ids in a hash table with its own lock,
+// so parsing threads can add their statistics in parallel.
+struct CooccurrenceShard {
+  struct Counters {
+    Counters() : cooc_tf(0), cooc_df(0) { }
+    int64_t cooc_tf;
+    unsigned cooc_df;
+  };
+
+  std::mutex access;
+  std::unordered_map<int64_t, Counters> pairs;  // (first_token_id << 32 | second_token_id) -> counters
+};
+
 class Vocab {
   friend class CooccurrenceCollector;
   friend class ResultingBufferOfCooccurrences;
@@ -94,15 +111,23 @@ class CooccurrenceCollector {
   std::vector<std::string> ReadPortionOfDocuments(std::shared_ptr<std::mutex> read_lock,
                                                   std::shared_ptr<std::ifstream> vowpal_wabbit_doc_ptr);
   unsigned CooccurrenceBatchesQuantity() const;
+  int64_t NumOfPairsInMemory() const;
   void ReadAndMergeCooccurrenceBatches();
 
  private:
   void CreateAndSetTargetFolder();
   std::string CreateFileInBatchDir() const;
+  void SaveStatistics(const CooccurrenceStatisticsHolder& cooc_stat_holder);
   void UploadOnDisk(const CooccurrenceStatisticsHolder& cooc_stat_holder);
+  void SaveInMemory(const CooccurrenceStatisticsHolder& cooc_stat_holder);
+  void SpillOnDisk();
+  void MergeInMemory();
+  std::vector<Cell> ExtractCellsFromShard(CooccurrenceShard* shard);
   void FirstStageOfMerging();
-  void SecondStageOfMerging(ResultingBufferOfCooccurrences* res,
-                            std::vector<std::shared_ptr<CooccurrenceBatch>>* intermediate_batches);
+  void SecondStageOfMerging();
+  std::vector<int> SplitShardsIntoRanges(const std::vector<int64_t>& shard_sizes, int num_of_ranges) const;
+  void MergeRanges(const std::vector<int>& range_bounds,
+                   const std::function<void(int, int, ResultingBufferOfCooccurrences*)>& merge_range);
   void KWayMerge(ResultingBufferOfCooccurrences* res, const int mode,
                  std::vector<std::shared_ptr<CooccurrenceBatch>>* vector_of_batches_ptr,
                  std::shared_ptr<CooccurrenceBatch> out_batch,
@@ -117,10 +142,20 @@ class CooccurrenceCollector {
   Vocab vocab_;  // Holds mapping tokens to their indices
   std::vector<unsigned> num_of_documents_token_occurred_in_;  // index is token_id
   std::vector<std::shared_ptr<CooccurrenceBatch>> vector_of_batches_;
-  int open_files_counter_;
+  std::mutex vector_of_batches_access_;
+  std::atomic<int> open_files_counter_;
   int64_t total_num_of_pairs_;
   unsigned total_num_of_documents_;
   CooccurrenceCollectorConfig config_;
+
+  // While gathered co-occurrences fit into config_.max_memory_usage() they are kept in shards_,
+  // then all of them are moved into a cooc batch on disk and the external merge is used
+  // Shards also split first token ids into ranges, which are merged in parallel
+  std::vector<std::shared_ptr<CooccurrenceShard>> shards_;
+  int shard_width_;  // number of first token ids in one shard
+  std::atomic<int64_t> num_of_pairs_in_memory_;
+  std::atomic_bool is_in_memory_;
+  std::mutex spill_access_;
 };
 
 class CooccurrenceStatisticsHolder {
@@ -167,13 +202,18 @@ class CooccurrenceBatch: private boost::noncopyable {
   bool ReadCell();  // Initiates reading of a cell from a file (e.g. call of ReadCellHeader() and ReadRecords())
 
  private:
-  explicit CooccurrenceBatch(const std::string& path_to_batches);
+  CooccurrenceBatch(const std::string& path_to_batches, int shard_width);
+  // Creates another reader of the same file, which reads only cells of shards [first_shard, last_shard)
+  CooccurrenceBatch(const CooccurrenceBatch& batch, int first_shard, int last_shard);
 
   Cell cell_;
   std::ifstream in_batch_;
   std::ofstream out_batch_;
   std::string filename_;
   int64_t in_batch_offset_;
+  int shard_width_;
+  std::vector<int64_t> shard_offsets_;  // offset of the first cell of each shard (and the end of file)
+  int first_token_id_end_;  // cells with greater first token ids aren't read
 };
 
 struct CooccurrenceBatch::CoocBatchComparator {
@@ -183,22 +223,39 @@ struct CooccurrenceBatch::CoocBatchComparator {
   }
 };
 
+// Resulting buffer can write only a range of first token ids [first_token_id_begin, first_token_id_end)
+// in temporary files (output file names + file_suffix), which are later appended to the resulting files
 class ResultingBufferOfCooccurrences {
   friend class CooccurrenceCollector;
  public:
+  ~ResultingBufferOfCooccurrences();
   void CalculatePpmi();
 
  private:
   ResultingBufferOfCooccurrences(const Vocab& vocab,
                                  const std::vector<unsigned>& num_of_documents_token_occurred_in_,
-                                 const CooccurrenceCollectorConfig& config);
+                                 const CooccurrenceCollectorConfig& config,
+                                 const int first_token_id_begin = 0, const int first_token_id_end = -1,
+                                 const std::string& file_suffix = "");
+  std::string GetFilePath(const std::string& path) const;
   void CheckInputFile(const std::ifstream& file, const std::string& filename);
   void CheckOutputFile(const std::ofstream& file, const std::string& filename);
+  void AppendFile(std::ofstream* range_file, const std::string& range_filename, std::ofstream* file);
+  void AppendCoocFiles(ResultingBufferOfCooccurrences* range);
+  void AppendPpmiFiles(ResultingBufferOfCooccurrences* range);
   void MergeWithExistingCell(const CooccurrenceBatch& batch);
+  void WriteCell();  // calculates statistics of the current cell and writes it in output files
   void CalculateTFStatistics();
   void WriteCoocFromCell(const std::string mode, const unsigned cooc_min);  // Output file formats are defined here
+  void WriteBinaryCoocFromCell(const std::string mode, const unsigned cooc_min);
+  CoocFileWriter* GetCoocFileWriter(const std::string& mode);
+  CoocFileWriter* GetPpmiFileWriter(const std::string& mode);
+  void CloseCoocFiles();
+  void ClosePpmiFiles();
   int64_t GetCoocFromCell(const std::string& mode, const unsigned record_pos) const;
   void CalculateAndWritePpmi(const std::string mode, const long double n);
+  void CalculateAndWriteBinaryPpmi(const std::string mode, const long double n);
+  bool IsBinaryFormat() const;
   double GetTokenFreq(const std::string& mode, const int token_id) const;
 
   const Vocab& vocab_;  // Holds mapping tokens to their indices
@@ -211,8 +268,15 @@ class ResultingBufferOfCooccurrences {
   std::ofstream cooc_df_dict_out_;
   std::ofstream ppmi_tf_dict_;
   std::ofstream ppmi_df_dict_;
+  std::shared_ptr<CoocFileWriter> cooc_tf_writer_;  // used instead of streams for binary cooc files
+  std::shared_ptr<CoocFileWriter> cooc_df_writer_;
+  std::shared_ptr<CoocFileWriter> ppmi_tf_writer_;
+  std::shared_ptr<CoocFileWriter> ppmi_df_writer_;
   Cell cell_;
   CooccurrenceCollectorConfig config_;
+  int first_token_id_begin_;
+  int first_token_id_end_;
+  std::string file_suffix_;
 };
 
 }  // namespace core
@@ -1,11 +1,104 @@
 // Copyright 2017, Additive Regularization of Topic Models.
 
 #include "artm/core/dictionary.h"
+
+#include <algorithm>
+
+#include "artm/core/exceptions.h"
 #include "artm/utility/memory_usage.h"
 
 namespace artm {
 namespace core {
 
+const float* CoocRow::find(int index) const {
+  const int* end = ids_ + size_;
+  const int* iter = std::lower_bound(ids_, end, index);
+  if (iter == end || *iter != index) {
+    return nullptr;
+  }
+
+  return values_ + (iter - ids_);
+}
+
+// CoocMatrixData owns the arrays of CoocMatrix built from CoocMap
+struct CoocMatrixData {
+  std::vector<int64_t> row_offsets;
+  std::vector<int> ids;
+  std::vector<float> values;
+};
+
+CoocMatrix::CoocMatrix()
+    : num_rows_(0), num_nonzeros_(0), byte_size_(0),
+      row_offsets_(nullptr), ids_(nullptr), values_(nullptr) { }
+
+void CoocMatrix::Build(const CoocMap& cooc_map, int num_rows) {
+  auto data = std::make_shared<CoocMatrixData>();
+
+  int64_t num_nonzeros = 0;
+  for (const auto& row : cooc_map) {
+    num_rows = std::max(num_rows, row.first + 1);
+    num_nonzeros += row.second.size();
+  }
+
+  // count the elements in each row, then turn the counts into offsets
+  data->row_offsets.assign(num_rows + 1, 0);
+  for (const auto& row : cooc_map) {
+    data->row_offsets[row.first + 1] = row.second.size();
+  }
+  for (int i = 0; i < num_rows; ++i) {
+    data->row_offsets[i + 1] += data->row_offsets[i];
+  }
+
+  data->ids.resize(num_nonzeros);
+  data->values.resize(num_nonzeros);
+  std::vector<std::pair<int, float> > buffer;
+  for (const auto& row : cooc_map) {
+    buffer.assign(row.second.begin(), row.second.end());
+    std::sort(buffer.begin(), buffer.end());
+
+    int64_t offset = data->row_offsets[row.first];
+    for (const auto& elem : buffer) {
+      data->ids[offset] = elem.first;
+      data->values[offset] = elem.second;
+      ++offset;
+    }
+  }
+
+  Attach(data, num_rows, num_nonzeros, data->row_offsets.data(), data->ids.data(), data->values.data());
+  byte_size_ = ::artm::utility::getMemoryUsage(data->row_offsets) +
+               ::artm::utility::getMemoryUsage(data->ids) +
+               ::artm::utility::getMemoryUsage(data->values);
+}
+
+void CoocMatrix::Attach(std::shared_ptr<const void> storage, int num_rows, int64_t num_nonzeros,
+                        const int64_t* row_offsets, const int* ids, const float* values) {
+  storage_ = storage;
+  num_rows_ = num_rows;
+  num_nonzeros_ = num_nonzeros;
+  byte_size_ = 0;
+  row_offsets_ = row_offsets;
+  ids_ = ids;
+  values_ = values;
+}
+
+CoocRow CoocMatrix::row(int index) const {
+  if (index < 0 || index >= num_rows_) {
+    return CoocRow();
+  }
+
+  int64_t begin = row_offsets_[index];
+  int64_t end = row_offsets_[index + 1];
+  if (begin == end) {
+    return CoocRow();
+  }
+
+  return CoocRow(ids_ + begin, values_ + begin, static_cast<int>(end - begin));
+}
+
+void CoocMatrix::clear() {
+  Attach(nullptr, 0, 0, nullptr, nullptr, nullptr);
+}
+
 void Dictionary::AddEntry(const DictionaryEntry& entry) {
   if (token_index_.find(entry.token()) != token_index_.end()) {
     LOG(WARNING) << "Token " << entry.token().keyword << " (" << entry.token().class_id
@@ -36,6 +129,10 @@ void Dictionary::AddCoocImpl(const Token& token_1, const Token& token_2, float v
 }
 
 void Dictionary::AddCoocImpl(int index_1, int index_2, float value, CoocMap* cooc_map) {
+  if (is_frozen_) {
+    BOOST_THROW_EXCEPTION(InvalidOperation("Unable to add co-occurrence into frozen dictionary " + name_));
+  }
+
   // try to find token_1 in the first level of cooc_map, if no one was found, add token_1
   auto iter_1 = cooc_map->find(index_1);
   if (iter_1 == cooc_map->end()) {
@@ -69,7 +166,47 @@ void Dictionary::AddCoocDf(int index_1, int index_2, float value) {
   AddCoocImpl(index_1, index_2, value, &cooc_dfs_);
 }
 
+void Dictionary::SetCoocValues(const CoocMatrix& cooc_values) {
+  if (is_frozen_) {
+    BOOST_THROW_EXCEPTION(InvalidOperation("Unable to set co-occurrences of frozen dictionary " + name_));
+  }
+
+  CoocMap().swap(cooc_values_);
+  cooc_values_matrix_ = cooc_values;
+}
+
+void Dictionary::Freeze() {
+  if (is_frozen_) {
+    return;
+  }
+
+  // empty maps are skipped to keep the matrices set by SetCoocValues()
+  if (!cooc_values_.empty()) {
+    cooc_values_matrix_.Build(cooc_values_, size());
+  }
+  if (!cooc_tfs_.empty()) {
+    cooc_tfs_matrix_.Build(cooc_tfs_, size());
+  }
+  if (!cooc_dfs_.empty()) {
+    cooc_dfs_matrix_.Build(cooc_dfs_, size());
+  }
+
+  CoocMap().swap(cooc_values_);
+  CoocMap().swap(cooc_tfs_);
+  CoocMap().swap(cooc_dfs_);
+  is_frozen_ = true;
+}
+
 bool Dictionary::has_valid_cooc_state() const {
+  if (is_frozen_) {
+    if (cooc_tfs_matrix_.empty() && cooc_dfs_matrix_.empty()) {
+      return true;
+    }
+
+    return (cooc_dfs_matrix_.num_nonzeros() == cooc_tfs_matrix_.num_nonzeros()) &&
+           (cooc_dfs_matrix_.num_nonzeros() == cooc_values_matrix_.num_nonzeros());
+  }
+
   if (cooc_tfs_.size() == 0 && cooc_dfs_.size() == 0) {
     return true;
   }
@@ -96,36 +233,35 @@ int64_t Dictionary::ByteSize() const {
     retval += ::artm::utility::getMemoryUsage(entry.second);
   }
 
+  retval += cooc_values_matrix_.ByteSize();
+  retval += cooc_tfs_matrix_.ByteSize();
+  retval += cooc_dfs_matrix_.ByteSize();
+
   for (const auto& entry : entries_) {
     retval += 2 * (entry.token().keyword.size() + entry.token().class_id.size());
   }
   return retval;
 }
 
-const std::unordered_map<int, float>* Dictionary::cooc_info_impl(const Token& token, const CoocMap& cooc_map) const {
+CoocRow Dictionary::cooc_info_impl(const Token& token, const CoocMatrix& cooc_matrix) const {
   auto index_iter = token_index_.find(token);
   if (index_iter == token_index_.end()) {
-    return nullptr;
-  }
-
-  auto cooc_map_iter = cooc_map.find(index_iter->second);
-  if (cooc_map_iter == cooc_map.end()) {
-    return nullptr;
+    return CoocRow();
   }
 
-  return &(cooc_map_iter->second);
+  return cooc_matrix.row(index_iter->second);
 }
 
-const std::unordered_map<int, float>*  Dictionary::token_cooc_values(const Token& token) const {
-  return cooc_info_impl(token, cooc_values_);
+CoocRow Dictionary::token_cooc_values(const Token& token) const {
+  return cooc_info_impl(token, cooc_values_matrix_);
 }
 
-const std::unordered_map<int, float>*  Dictionary::token_cooc_tfs(const Token& token) const {
-  return cooc_info_impl(token, cooc_tfs_);
+CoocRow Dictionary::token_cooc_tfs(const Token& token) const {
+  return cooc_info_impl(token, cooc_tfs_matrix_);
 }
 
-const std::unordered_map<int, float>*  Dictionary::token_cooc_dfs(const Token& token) const {
-  return cooc_info_impl(token, cooc_dfs_);
+CoocRow Dictionary::token_cooc_dfs(const Token& token) const {
+  return cooc_info_impl(token, cooc_dfs_matrix_);
 }
 
 const DictionaryEntry* Dictionary::entry(const Token& token) const {
@@ -166,8 +302,8 @@ float Dictionary::CountTopicCoherence(const std::vector<core::Token>& tokens_to_
       continue;
     }
 
-    auto cooc_map_iter = cooc_values_.find(indices[i]);
-    if (cooc_map_iter == cooc_values_.end()) {
+    CoocRow cooc_row = cooc_values_matrix_.row(indices[i]);
+    if (cooc_row.empty()) {
       continue;
     }
 
@@ -180,11 +316,11 @@ float Dictionary::CountTopicCoherence(const std::vector<core::Token>& tokens_to_
         continue;
       }
 
-      auto value_iter = cooc_map_iter->second.find(indices[j]);
-      if (value_iter == cooc_map_iter->second.end()) {
+      const float* value = cooc_row.find(indices[j]);
+      if (value == nullptr) {
         continue;
       }
-      coherence_value += static_cast<float>(value_iter->second);
+      coherence_value += *value;
     }
   }
 
@@ -202,6 +338,10 @@ void Dictionary::clear_cooc() {
   cooc_values_.clear();
   cooc_tfs_.clear();
   cooc_dfs_.clear();
+  cooc_values_matrix_.clear();
+  cooc_tfs_matrix_.clear();
+  cooc_dfs_matrix_.clear();
+  is_frozen_ = false;
 }
 
 }  // namespace core
@@ -3,6 +3,7 @@
 #pragma once
 
 #include <map>
+#include <memory>
 #include <string>
 #include <vector>
 #include <unordered_map>
@@ -26,6 +27,60 @@ typedef ThreadSafeCollectionHolder<std::string, Dictionary> ThreadSafeDictionary
 
 typedef std::unordered_map<int, std::unordered_map<int, float> > CoocMap;
 
+// CoocRow is a read-only view of one row of CoocMatrix.
+// It holds the indices of co-occurring tokens (sorted in ascending order) and their values.
+class CoocRow {
+ public:
+  CoocRow() : ids_(nullptr), values_(nullptr), size_(0) { }
+  CoocRow(const int* ids, const float* values, int size) : ids_(ids), values_(values), size_(size) { }
+
+  int size() const { return size_; }
+  bool empty() const { return size_ == 0; }
+  int id(int i) const { return ids_[i]; }
+  float value(int i) const { return values_[i]; }
+
+  // binary search of the token index in the row, returns nullptr if there's no such index
+  const float* find(int index) const;
+
+ private:
+  const int* ids_;
+  const float* values_;
+  int size_;
+};
+
+// CoocMatrix is a frozen co-occurrence matrix in compressed sparse row format.
+// Row i corresponds to the token with index i in the dictionary.
+// The matrix is either built once from CoocMap or attached to an external memory
+// (e.g. memory-mapped co-occurrence file), and is immutable after that.
+// Copies of the matrix share the same underlying data.
+class CoocMatrix {
+ public:
+  CoocMatrix();
+
+  void Build(const CoocMap& cooc_map, int num_rows);
+
+  // storage keeps the memory behind row_offsets, ids and values alive
+  void Attach(std::shared_ptr<const void> storage, int num_rows, int64_t num_nonzeros,
+              const int64_t* row_offsets, const int* ids, const float* values);
+
+  CoocRow row(int index) const;
+  int num_rows() const { return num_rows_; }
+  int64_t num_nonzeros() const { return num_nonzeros_; }
+  bool empty() const { return num_nonzeros_ == 0; }
+  int64_t ByteSize() const { return byte_size_; }  // external memory is not counted
+
+  void clear();
+
+ private:
+  std::shared_ptr<const void> storage_;
+  int num_rows_;
+  int64_t num_nonzeros_;
+  int64_t byte_size_;
+  const int64_t* row_offsets_;
+  const int* ids_;
+  const float* values_;
+};
+
 // DictionaryEntry represents one entry in the dictionary, associated with a specific token.
 class DictionaryEntry {
  public:
@@ -50,9 +105,11 @@ class DictionaryEntry {
 // entries will define the order of tokens in the PhiMatrix.
 // Dictionary also supports an efficient lookup of the entries by its token.
 // Dictionary also stores a co-occurence data, used by Coherence score and regularizer.
+// Co-occurrences are collected in CoocMap by AddCooc* methods. Freeze() converts them into
+// CoocMatrix, which is used by all cooc queries; no co-occurrences can be added after that.
 class Dictionary {
  public:
-  explicit Dictionary(const std::string& name) : name_(name) { }
+  explicit Dictionary(const std::string& name) : name_(name), is_frozen_(false) { }
 
   // SECTION OF SETTERS
   void AddEntry(const DictionaryEntry& entry);
@@ -67,13 +124,20 @@ class Dictionary {
 
   void SetNumItems(int num_items) { num_items_in_collection_ = num_items; }
 
+  // replaces co-occurrence values with the given matrix (e.g. memory-mapped from file)
+  void SetCoocValues(const CoocMatrix& cooc_values);
+
+  // converts collected co-occurrences into CoocMatrix and releases CoocMap
+  void Freeze();
+
   // SECTION OF GETTERS
   bool HasToken(const Token& token) const { return token_index_.find(token) != token_index_.end(); }
 
   // general method to return all cooc tokens with their values for given token
-  const std::unordered_map<int, float>* token_cooc_values(const Token& token) const;
-  const std::unordered_map<int, float>* token_cooc_tfs(const Token& token) const;
-  const std::unordered_map<int, float>* token_cooc_dfs(const Token& token) const;
+  // (the row is empty if the token has no co-occurrences or the dictionary is not frozen)
+  CoocRow token_cooc_values(const Token& token) const;
+  CoocRow token_cooc_tfs(const Token& token) const;
+  CoocRow token_cooc_dfs(const Token& token) const;
 
   const DictionaryEntry* entry(const Token& token) const;
   const DictionaryEntry* entry(int index) const;
@@ -81,15 +145,16 @@ class Dictionary {
   int size() const { return entries_.size(); }
   int num_items() const { return num_items_in_collection_; }
   const std::string& name() const { return name_; }
+  bool is_frozen() const { return is_frozen_; }
   bool has_valid_cooc_state() const;
   int64_t ByteSize() const;
 
   const std::vector<DictionaryEntry>& entries() const { return entries_; }
   const std::unordered_map<Token, int, TokenHasher>& token_index() const { return token_index_; }
 
-  const std::unordered_map<int, std::unordered_map<int, float> >& cooc_values() const { return cooc_values_; }
-  const std::unordered_map<int, std::unordered_map<int, float> >& cooc_tfs() const { return cooc_tfs_; }
-  const std::unordered_map<int, std::unordered_map<int, float> >& cooc_dfs() const { return cooc_dfs_; }
+  const CoocMatrix& cooc_values() const { return cooc_values_matrix_; }
+  const CoocMatrix& cooc_tfs() const { return cooc_tfs_matrix_; }
+  const CoocMatrix& cooc_dfs() const { return cooc_dfs_matrix_; }
 
   // SECTION OF OPERATIONS
   float CountTopicCoherence(const std::vector<core::Token>& tokens_to_score);
@@ -106,11 +171,15 @@ class Dictionary {
   CoocMap cooc_values_;
   CoocMap cooc_tfs_;
   CoocMap cooc_dfs_;
+  CoocMatrix cooc_values_matrix_;
+  CoocMatrix cooc_tfs_matrix_;
+  CoocMatrix cooc_dfs_matrix_;
   size_t num_items_in_collection_;
+  bool is_frozen_;
 
   void AddCoocImpl(const Token& token_1, const Token& token_2, float value, CoocMap* cooc_map);
   void AddCoocImpl(int index_1, int index_2, float value, CoocMap* cooc_map);
-  const std::unordered_map<int, float>* cooc_info_impl(const Token& token, const CoocMap& cooc_map) const;
+  CoocRow cooc_info_impl(const Token& token, const CoocMatrix& cooc_matrix) const;
 };
 
 }  // namespace core
@@ -1,11 +1,15 @@
 // Copyright 2017, Additive Regularization of Topic Models.
 
 #include <algorithm>
+#include <chrono>  // NOLINT
 #include <climits>
+#include <cstring>
 #include <fstream>
 #include <functional>
+#include <future>  // NOLINT
 #include <map>
 #include <string>
+#include <thread>  // NOLINT
 #include <unordered_map>
 #include <unordered_set>
 #include <memory>
@@ -18,6 +22,7 @@
 #include "boost/uuid/uuid_io.hpp"
 #include "boost/uuid/uuid_generators.hpp"
 
+#include "artm/core/cooc_file.h"
 #include "artm/core/helpers.h"
 #include "artm/utility/ifstream_or_cin.h"
 
@@ -50,6 +55,51 @@ std::shared_ptr<Dictionary> DictionaryOperations::Create(const DictionaryData& d
   return dictionary;
 }
 
+std::shared_ptr<Dictionary> DictionaryOperations::CreateFromArrays(const DictionaryArraysInfo& info,
+                                                                   const char* arrays, int64_t length) {
+  const int64_t num_entries = info.num_entries();
+  const int64_t tokens_offset = num_entries * (3 * sizeof(float) + sizeof(int));
+  if (num_entries < 0 || info.tokens_length() < 0 || length != tokens_offset + info.tokens_length()) {
+    std::stringstream ss;
+    ss << "Invalid length of dictionary arrays (" << tokens_offset + info.tokens_length()
+       << " bytes expected, found " << length << ")";
+    BOOST_THROW_EXCEPTION(InvalidOperation(ss.str()));
+  }
+
+  const float* token_value = reinterpret_cast<const float*>(arrays);
+  const float* token_tf = token_value + num_entries;
+  const float* token_df = token_tf + num_entries;
+  const int* class_index = reinterpret_cast<const int*>(token_df + num_entries);
+  const char* tokens = arrays + tokens_offset;
+  const char* tokens_end = tokens + info.tokens_length();
+
+  auto dictionary = std::make_shared<Dictionary>(Dictionary(info.name()));
+  dictionary->SetNumItems(info.num_items_in_collection());
+  for (int64_t i = 0; i < num_entries; ++i) {
+    const char* token_end = std::find(tokens, tokens_end, '\0');
+    if (token_end == tokens_end) {
+      BOOST_THROW_EXCEPTION(InvalidOperation("Dictionary arrays contain less tokens than entries"));
+    }
+
+    if (class_index[i] < 0 || class_index[i] >= info.class_id_size()) {
+      std::stringstream ss;
+      ss << "class_index[" << i << "] == " << class_index[i] << " is out of range [0, "
+         << info.class_id_size() << ")";
+      BOOST_THROW_EXCEPTION(InvalidOperation(ss.str()));
+    }
+
+    dictionary->AddEntry(DictionaryEntry(Token(info.class_id(class_index[i]), std::string(tokens, token_end)),
+                                         token_value[i], token_tf[i], token_df[i]));
+    tokens = token_end + 1;
+  }
+
+  if (tokens != tokens_end) {
+    BOOST_THROW_EXCEPTION(InvalidOperation("Dictionary arrays contain more tokens than entries"));
+  }
+
+  return dictionary;
+}
+
 void DictionaryOperations::Export(const ExportDictionaryArgs& args, const Dictionary& dict) {
   std::string file_name = args.file_name();
   if (!boost::algorithm::ends_with(file_name, ".dict")) {
@@ -69,9 +119,9 @@ void DictionaryOperations::Export(const ExportDictionaryArgs& args, const Dictio
   if (!dict.has_valid_cooc_state()) {
     BOOST_THROW_EXCEPTION(InvalidOperation("Dictionary " +
       args.dictionary_name() + " has invalid cooc state (num values: " +
-      std::to_string(dict.cooc_values().size()) +
-      ", num tfs: " + std::to_string(dict.cooc_tfs().size()) +
-      ", num dfs: " + std::to_string(dict.cooc_dfs().size()) + ")"));
+      std::to_string(dict.cooc_values().num_nonzeros()) +
+      ", num tfs: " + std::to_string(dict.cooc_tfs().num_nonzeros()) +
+      ", num dfs: " + std::to_string(dict.cooc_dfs().num_nonzeros()) + ")"));
   }
 
   LOG(INFO) << "Exporting dictionary " << args.dictionary_name() << " to " << file_name;
@@ -110,32 +160,29 @@ void DictionaryOperations::Export(const ExportDictionaryArgs& args, const Dictio
   DictionaryData cooc_dict_data;
   int current_cooc_length = 0;
   const int max_cooc_length = 10 * 1000 * 1000;
-  if (dict.cooc_values().size()) {
+  if (!dict.cooc_values().empty()) {
     for (int token_id = 0; token_id < token_size; ++token_id) {
-      auto entry = dict.entry(token_id);
-      auto cooc_values_info = dict.token_cooc_values(entry->token());
-      auto cooc_tfs_info = dict.token_cooc_tfs(entry->token());
-      auto cooc_dfs_info = dict.token_cooc_dfs(entry->token());
-
-      if (cooc_values_info != nullptr) {
-        for (auto iter = cooc_values_info->begin(); iter != cooc_values_info->end(); ++iter) {
-          cooc_dict_data.add_cooc_first_index(token_id);
-          cooc_dict_data.add_cooc_second_index(iter->first);
-          cooc_dict_data.add_cooc_value(iter->second);
-          if (cooc_tfs_info != nullptr) {
-            auto tf_iter = cooc_tfs_info->find(iter->first);
-            auto df_iter = cooc_dfs_info->find(iter->first);
-
-            if (tf_iter == cooc_tfs_info->end() || df_iter == cooc_dfs_info->end()) {
-              BOOST_THROW_EXCEPTION(InvalidOperation("Dictionary " +
-                  args.dictionary_name() + " has internal cooc tf/df inconsistence"));
-            }
-
-            cooc_dict_data.add_cooc_tf(tf_iter->second);
-            cooc_dict_data.add_cooc_df(df_iter->second);
+      CoocRow cooc_values_info = dict.cooc_values().row(token_id);
+      CoocRow cooc_tfs_info = dict.cooc_tfs().row(token_id);
+      CoocRow cooc_dfs_info = dict.cooc_dfs().row(token_id);
+
+      for (int i = 0; i < cooc_values_info.size(); ++i) {
+        cooc_dict_data.add_cooc_first_index(token_id);
+        cooc_dict_data.add_cooc_second_index(cooc_values_info.id(i));
+        cooc_dict_data.add_cooc_value(cooc_values_info.value(i));
+        if (!cooc_tfs_info.empty()) {
+          const float* tf = cooc_tfs_info.find(cooc_values_info.id(i));
+          const float* df = cooc_dfs_info.find(cooc_values_info.id(i));
+
+          if (tf == nullptr || df == nullptr) {
+            BOOST_THROW_EXCEPTION(InvalidOperation("Dictionary " +
+                args.dictionary_name() + " has internal cooc tf/df inconsistence"));
           }
-          current_cooc_length++;
+
+          cooc_dict_data.add_cooc_tf(*tf);
+          cooc_dict_data.add_cooc_df(*df);
         }
+        current_cooc_length++;
       }
 
       if ((current_cooc_length >= max_cooc_length) || ((token_id + 1) == token_size)) {
@@ -238,58 +285,148 @@ std::shared_ptr<Dictionary> DictionaryOperations::Import(const ImportDictionaryA
   return dictionary;
 }
 
-// TokenValues is used only from Dictionary::Gather method
-class TokenValues {
- public:
-  TokenValues()
-      : token_value(0.0f)
-      , token_tf(0.0f)
-      , token_df(0.0f) { }
+// ParseVocabFile reads tokens from vocab file; the index of a token is its line number (zero-based)
+static void ParseVocabFile(const std::string& file_name, std::vector<Token>* collection_vocab,
+                           std::unordered_map<Token, int, TokenHasher>* token_to_token_id) {
+  ifstream_or_cin stream_or_cin(file_name);
+  std::istream& vocab = stream_or_cin.get_stream();
+
+  std::string str;
+  int token_id = 0;
+  while (!vocab.eof()) {
+    std::getline(vocab, str);
+    if (vocab.eof() && str.empty()) {
+      break;
+    }
 
-  float token_value;
-  float token_tf;
-  float token_df;
-};
+    boost::algorithm::trim(str);
+    if (str.empty()) {
+      std::stringstream ss;
+      ss << "Empty token at line " << (token_id + 1) << ", file " << file_name;
+      BOOST_THROW_EXCEPTION(InvalidOperation(ss.str()));
+    }
 
-std::shared_ptr<Dictionary> DictionaryOperations::Gather(const GatherDictionaryArgs& args,
-  const ThreadSafeCollectionHolder<std::string, Batch>& mem_batches) {
-  auto dictionary = std::make_shared<Dictionary>(Dictionary(args.dictionary_target_name()));
+    std::vector<std::string> strs;
+    boost::split(strs, str, boost::is_any_of("\t "));
+    if ((strs.size() == 0) || (strs.size() > 2)) {
+      std::stringstream ss;
+      ss << "Error at line " << (token_id + 1) << ", file " << file_name
+        << ". Expected format: <token> [<class_id>]";
+      BOOST_THROW_EXCEPTION(InvalidOperation(ss.str()));
+    }
 
-  std::unordered_map<Token, TokenValues, TokenHasher> token_freq_map;
-  std::vector<std::string> batches;
+    ClassId class_id = (strs.size() == 2) ? strs[1] : DefaultClass;
+    Token token(class_id, strs[0]);
 
-  if (args.has_data_path()) {
-    for (const auto& batch_path : Helpers::ListAllBatches(args.data_path())) {
-      batches.push_back(batch_path.string());
-    }
-    LOG(INFO) << "Found " << batches.size() << " batches in '" << args.data_path() << "' folder";
-  } else {
-    for (const auto& batch : args.batch_path()) {
-      batches.push_back(batch);
+    if (token_to_token_id->find(token) != token_to_token_id->end()) {
+      std::stringstream ss;
+      ss << "Token (" << token.keyword << ", " << token.class_id << "' found twice, lines "
+        << (token_to_token_id->find(token)->second + 1)
+        << " and " << (token_id + 1) << ", file " << file_name;
+      BOOST_THROW_EXCEPTION(InvalidOperation(ss.str()));
     }
+
+    collection_vocab->push_back(token);
+    token_to_token_id->insert(std::make_pair(token, token_id));
+    token_id++;
   }
+}
 
-  int total_items_count = 0;
-  std::unordered_map<ClassId, float> sum_w_tf;
-  for (const std::string& batch_file : batches) {
-    std::shared_ptr<Batch> batch_ptr = mem_batches.get(batch_file);
-    try {
-      if (batch_ptr == nullptr) {
-        batch_ptr = std::make_shared<Batch>();
-        ::artm::core::Helpers::LoadMessage(batch_file, batch_ptr.get());
+// ParseCoocFile reads co-occurrences from text file, where each line contains a token and
+// pairs <token>:<value> of tokens, co-occurring with it (tokens may be prefixed with |modality)
+static void ParseCoocFile(const std::string& file_name,
+                          const std::unordered_map<Token, int, TokenHasher>& token_to_token_id,
+                          bool symmetric_cooc_values,
+                          std::function<void(int, int, float)> add_cooc_value) {
+  ifstream_or_cin stream_or_cin(file_name);
+  std::istream& user_cooc_data = stream_or_cin.get_stream();
+
+  // Craft the co-occurence part of dictionary
+  std::string str;
+  while (!user_cooc_data.eof()) {
+    std::getline(user_cooc_data, str);
+    boost::algorithm::trim(str);
+
+    ClassId first_token_class_id = DefaultClass;  // Here's how modality is indicated in output file
+    std::vector<std::string> strs;
+    boost::split(strs, str, boost::is_any_of(" :\t\r"));
+    unsigned pos_of_first_token = 0;
+    // Find modality and position of the first token
+    for (; pos_of_first_token < strs.size() && (strs[pos_of_first_token].empty() ||
+                                                strs[pos_of_first_token][0] == '|'); ++pos_of_first_token) {
+      if (!strs[pos_of_first_token].empty()) {
+        first_token_class_id = strs[pos_of_first_token];
+        first_token_class_id.erase(0, 1);
       }
     }
-    catch (std::exception& ex) {
-      LOG(ERROR) << ex.what() << ", the batch will be skipped.";
+    if (pos_of_first_token >= strs.size()) {
       continue;
     }
+    std::string first_token_str = strs[pos_of_first_token];
+    Token first_token(first_token_class_id, first_token_str);
+    auto first_token_ptr = token_to_token_id.find(first_token);
+    if (first_token_ptr == token_to_token_id.end()) {
+      std::stringstream ss;
+      ss << "Token (" << first_token.keyword << ", " << first_token.class_id << ") not found in vocab";
+      BOOST_THROW_EXCEPTION(InvalidOperation(ss.str()));
+    }
+    unsigned not_a_word_counter = 0;
+    for (unsigned i = pos_of_first_token + 1; i + not_a_word_counter < strs.size(); i += 2) {
+      ClassId second_token_class_id = first_token_class_id;
+      for (; i + not_a_word_counter < strs.size() && (strs[i + not_a_word_counter].empty() ||
+                                                      strs[i + not_a_word_counter][0] == '|');
+                                                      ++not_a_word_counter) {
+        if (!strs[i + not_a_word_counter].empty()) {
+          second_token_class_id = strs[i + not_a_word_counter];
+          second_token_class_id.erase(0, 1);
+        }
+      }
+      if (i + not_a_word_counter + 1 >= strs.size()) {
+        break;
+      }
+      std::string second_token_str = strs[i + not_a_word_counter];
+      Token second_token(second_token_class_id, second_token_str);
+      auto second_token_ptr = token_to_token_id.find(second_token);
+      if (second_token_ptr == token_to_token_id.end()) {
+        std::stringstream ss;
+        ss << "Token (" << second_token.keyword << ", " << second_token.class_id << ") not found in vocab";
+        BOOST_THROW_EXCEPTION(InvalidOperation(ss.str()));
+      }
+      int first_index = first_token_ptr->second;
+      int second_index = second_token_ptr->second;
+      float value = std::stof(strs[i + not_a_word_counter + 1]);
 
-    if (batch_ptr->token_size() == 0) {
-      BOOST_THROW_EXCEPTION(InvalidOperation(
-      "Dictionary::Gather() can not process batches with empty Batch.token field."));
+      add_cooc_value(first_index, second_index, value);
+
+      // ToDo(MelLain): support adding tf/df in future
+
+      if (symmetric_cooc_values) {
+        add_cooc_value(second_index, first_index, value);
+      }
     }
+  }
+}
 
-    const Batch& batch = *batch_ptr;
+// TokenValues is used only from Dictionary::Gather method
+class TokenValues {
+ public:
+  TokenValues()
+      : token_value(0.0f)
+      , token_tf(0.0f)
+      , token_df(0.0f) { }
+
+  float token_value;
+  float token_tf;
+  float token_df;
+};
+
+// TokenStatistics accumulates token frequencies over a subset of batches;
+// Gather method builds one instance per thread and then merges them.
+class TokenStatistics {
+ public:
+  TokenStatistics() : total_items_count(0) { }
+
+  void AddBatch(const Batch& batch) {
     std::vector<float> token_df(batch.token_size(), 0);
     std::vector<float> token_n_w(batch.token_size(), 0);
 
@@ -323,6 +460,102 @@ std::shared_ptr<Dictionary> DictionaryOperations::Gather(const GatherDictionaryA
     }
   }
 
+  void Merge(const TokenStatistics& other) {
+    total_items_count += other.total_items_count;
+    for (const auto& token_freq : other.token_freq_map) {
+      TokenValues& token_info = token_freq_map[token_freq.first];
+      token_info.token_tf += token_freq.second.token_tf;
+      token_info.token_df += token_freq.second.token_df;
+    }
+    for (const auto& class_tf : other.sum_w_tf) {
+      sum_w_tf[class_tf.first] += class_tf.second;
+    }
+  }
+
+  std::unordered_map<Token, TokenValues, TokenHasher> token_freq_map;
+  std::unordered_map<ClassId, float> sum_w_tf;
+  int total_items_count;
+};
+
+std::shared_ptr<Dictionary> DictionaryOperations::Gather(const GatherDictionaryArgs& args,
+  const ThreadSafeCollectionHolder<std::string, Batch>& mem_batches) {
+  auto dictionary = std::make_shared<Dictionary>(Dictionary(args.dictionary_target_name()));
+
+  std::vector<std::string> batches;
+
+  if (args.has_data_path()) {
+    for (const auto& batch_path : Helpers::ListAllBatches(args.data_path())) {
+      batches.push_back(batch_path.string());
+    }
+    LOG(INFO) << "Found " << batches.size() << " batches in '" << args.data_path() << "' folder";
+  } else {
+    for (const auto& batch : args.batch_path()) {
+      batches.push_back(batch);
+    }
+  }
+
+  int num_threads = args.num_threads();
+  if (!args.has_num_threads() || num_threads <= 0) {
+    num_threads = static_cast<int>(std::thread::hardware_concurrency());
+  }
+  num_threads = std::max(1, std::min(num_threads, static_cast<int>(batches.size())));
+
+  // each thread takes every num_threads-th batch, so the result doesn't depend on threads timing
+  std::vector<TokenStatistics> statistics(num_threads);
+  auto func = [&batches, &mem_batches, &statistics, num_threads](int thread_index) {
+    for (int i = thread_index; i < static_cast<int>(batches.size()); i += num_threads) {
+      const std::string& batch_file = batches[i];
+      std::shared_ptr<Batch> batch_ptr = mem_batches.get(batch_file);
+      try {
+        if (batch_ptr == nullptr) {
+          batch_ptr = std::make_shared<Batch>();
+          ::artm::core::Helpers::LoadMessage(batch_file, batch_ptr.get());
+        }
+      }
+      catch (std::exception& ex) {
+        LOG(ERROR) << ex.what() << ", the batch will be skipped.";
+        continue;
+      }
+
+      if (batch_ptr->token_size() == 0) {
+        BOOST_THROW_EXCEPTION(InvalidOperation(
+        "Dictionary::Gather() can not process batches with empty Batch.token field."));
+      }
+
+      statistics[thread_index].AddBatch(*batch_ptr);
+    }
+  };
+
+  auto start_time = std::chrono::steady_clock::now();
+  if (num_threads == 1) {
+    func(0);
+  } else {
+    // futures are used instead of plain threads to pass exceptions to the calling thread
+    std::vector<std::future<void>> tasks;
+    for (int i = 0; i < num_threads; ++i) {
+      tasks.push_back(std::async(std::launch::async, func, i));
+    }
+    for (auto& task : tasks) {
+      task.wait();
+    }
+    for (auto& task : tasks) {
+      task.get();
+    }
+  }
+
+  for (int i = 1; i < num_threads; ++i) {
+    statistics[0].Merge(statistics[i]);
+    statistics[i] = TokenStatistics();
+  }
+  std::unordered_map<Token, TokenValues, TokenHasher>& token_freq_map = statistics[0].token_freq_map;
+  std::unordered_map<ClassId, float>& sum_w_tf = statistics[0].sum_w_tf;
+  int total_items_count = statistics[0].total_items_count;
+
+  double elapsed_seconds = std::chrono::duration<double>(std::chrono::steady_clock::now() - start_time).count();
+  LOG(INFO) << "Processed " << batches.size() << " batches in " << elapsed_seconds << " sec ("
+            << batches.size() / std::max(elapsed_seconds, 1e-6) << " batches/sec) using "
+            << num_threads << " thread(s)";
+
   for (auto& token_freq : token_freq_map) {
     token_freq.second.token_value = static_cast<float>(token_freq.second.token_tf /
                                                        sum_w_tf[token_freq.first.class_id]);
@@ -339,48 +572,7 @@ std::shared_ptr<Dictionary> DictionaryOperations::Gather(const GatherDictionaryA
 
   if (use_vocab_file) {
     try {
-      ifstream_or_cin stream_or_cin(args.vocab_file_path());
-      std::istream& vocab = stream_or_cin.get_stream();
-
-      std::string str;
-      int token_id = 0;
-      while (!vocab.eof()) {
-        std::getline(vocab, str);
-        if (vocab.eof() && str.empty()) {
-          break;
-        }
-
-        boost::algorithm::trim(str);
-        if (str.empty()) {
-          std::stringstream ss;
-          ss << "Empty token at line " << (token_id + 1) << ", file " << args.vocab_file_path();
-          BOOST_THROW_EXCEPTION(InvalidOperation(ss.str()));
-        }
-
-        std::vector<std::string> strs;
-        boost::split(strs, str, boost::is_any_of("\t "));
-        if ((strs.size() == 0) || (strs.size() > 2)) {
-          std::stringstream ss;
-          ss << "Error at line " << (token_id + 1) << ", file " << args.vocab_file_path()
-            << ". Expected format: <token> [<class_id>]";
-          BOOST_THROW_EXCEPTION(InvalidOperation(ss.str()));
-        }
-
-        ClassId class_id = (strs.size() == 2) ? strs[1] : DefaultClass;
-        Token token(class_id, strs[0]);
-
-        if (token_to_token_id.find(token) != token_to_token_id.end()) {
-          std::stringstream ss;
-          ss << "Token (" << token.keyword << ", " << token.class_id << "' found twice, lines "
-            << (token_to_token_id.find(token)->second + 1)
-            << " and " << (token_id + 1) << ", file " << args.vocab_file_path();
-          BOOST_THROW_EXCEPTION(InvalidOperation(ss.str()));
-        }
-
-        collection_vocab.push_back(token);
-        token_to_token_id.insert(std::make_pair(token, token_id));
-        token_id++;
-      }
+      ParseVocabFile(args.vocab_file_path(), &collection_vocab, &token_to_token_id);
     }
     catch (std::exception& ex) {
       use_vocab_file = false;
@@ -403,72 +595,30 @@ std::shared_ptr<Dictionary> DictionaryOperations::Gather(const GatherDictionaryA
 
   if (args.has_cooc_file_path()) {
     try {
-      ifstream_or_cin stream_or_cin(args.cooc_file_path());
-      std::istream& user_cooc_data = stream_or_cin.get_stream();
-
-      // Craft the co-occurence part of dictionary
-      std::string str;
-      while (!user_cooc_data.eof()) {
-        std::getline(user_cooc_data, str);
-        boost::algorithm::trim(str);
-
-        ClassId first_token_class_id = DefaultClass;  // Here's how modality is indicated in output file
-        std::vector<std::string> strs;
-        boost::split(strs, str, boost::is_any_of(" :\t\r"));
-        unsigned pos_of_first_token = 0;
-        // Find modality and position of the first token
-        for (; pos_of_first_token < strs.size() && (strs[pos_of_first_token].empty() ||
-                                                    strs[pos_of_first_token][0] == '|'); ++pos_of_first_token) {
-          if (!strs[pos_of_first_token].empty()) {
-            first_token_class_id = strs[pos_of_first_token];
-            first_token_class_id.erase(0);
-          }
-        }
-        if (pos_of_first_token >= strs.size()) {
-          continue;
-        }
-        std::string first_token_str = strs[pos_of_first_token];
-        Token first_token(first_token_class_id, first_token_str);
-        auto first_token_ptr = token_to_token_id.find(first_token);
-        if (first_token_ptr == token_to_token_id.end()) {
-          std::stringstream ss;
-          ss << "Token (" << first_token.keyword << ", " << first_token.class_id << ") not found in vocab";
-          BOOST_THROW_EXCEPTION(InvalidOperation(ss.str()));
+      if (CoocFile::IsCoocFile(args.cooc_file_path())) {
+        // binary file is memory-mapped, its rows and columns are the indices of tokens in vocab file
+        if (!use_vocab_file) {
+          BOOST_THROW_EXCEPTION(InvalidOperation(
+            "Binary cooc file " + args.cooc_file_path() + " can be used only together with vocab file"));
         }
-        unsigned not_a_word_counter = 0;
-        for (unsigned i = pos_of_first_token + 1; i + not_a_word_counter < strs.size(); i += 2) {
-          ClassId second_token_class_id = first_token_class_id;
-          for (; i + not_a_word_counter < strs.size() && (strs[i + not_a_word_counter].empty() ||
-                                                          strs[i + not_a_word_counter][0] == '|');
-                                                          ++not_a_word_counter) {
-            if (!strs[i + not_a_word_counter].empty()) {
-              second_token_class_id = strs[i + not_a_word_counter];
-              second_token_class_id.erase(0);
-            }
-          }
-          if (i + not_a_word_counter + 1 >= strs.size()) {
-            break;
-          }
-          std::string second_token_str = strs[i + not_a_word_counter];
-          Token second_token(second_token_class_id, second_token_str);
-          auto second_token_ptr = token_to_token_id.find(second_token);
-          if (second_token_ptr == token_to_token_id.end()) {
-            std::stringstream ss;
-            ss << "Token (" << second_token.keyword << ", " << second_token.class_id << ") not found in vocab";
-            BOOST_THROW_EXCEPTION(InvalidOperation(ss.str()));
-          }
-          int first_index = first_token_ptr->second;
-          int second_index = second_token_ptr->second;
-          float value = std::stof(strs[i + not_a_word_counter + 1]);
 
-          dictionary->AddCoocValue(first_index, second_index, value);
-
-          // ToDo(MelLain): support adding tf/df in future
+        CoocMatrix cooc_values = CoocFile::Map(args.cooc_file_path());
+        if (cooc_values.num_rows() > dictionary->size()) {
+          BOOST_THROW_EXCEPTION(InvalidOperation(
+            "Binary cooc file " + args.cooc_file_path() + " has more rows than tokens in vocab file"));
+        }
 
-          if (args.symmetric_cooc_values()) {
-            dictionary->AddCoocValue(second_index, first_index, value);
-          }
+        if (args.symmetric_cooc_values()) {
+          LOG(WARNING) << "GatherDictionaryArgs.symmetric_cooc_values is ignored for binary cooc file "
+                       << args.cooc_file_path() << ", symmetric matrix should be written into the file";
         }
+
+        dictionary->SetCoocValues(cooc_values);
+      } else {
+        ParseCoocFile(args.cooc_file_path(), token_to_token_id, args.symmetric_cooc_values(),
+          [&dictionary](int index_1, int index_2, float value) {
+            dictionary->AddCoocValue(index_1, index_2, value);
+        });
       }
     }
     catch (std::exception& ex) {
@@ -563,19 +713,20 @@ std::shared_ptr<Dictionary> DictionaryOperations::Filter(const FilterDictionaryA
 
   auto& cooc_values = dict.cooc_values();
 
-  for (auto iter = cooc_values.begin(); iter != cooc_values.end(); ++iter) {
-    auto first_index_iter = old_index_new_index.find(iter->first);
+  for (int index = 0; index < cooc_values.num_rows(); ++index) {
+    auto first_index_iter = old_index_new_index.find(index);
     if (first_index_iter == old_index_new_index.end()) {
       continue;
     }
 
-    for (auto cooc_iter = iter->second.begin(); cooc_iter != iter->second.end(); ++cooc_iter) {
-      auto second_index_iter = old_index_new_index.find(cooc_iter->first);
+    CoocRow cooc_row = cooc_values.row(index);
+    for (int i = 0; i < cooc_row.size(); ++i) {
+      auto second_index_iter = old_index_new_index.find(cooc_row.id(i));
       if (second_index_iter == old_index_new_index.end()) {
         continue;
       }
 
-      dictionary->AddCoocValue(first_index_iter->second, second_index_iter->second, cooc_iter->second);
+      dictionary->AddCoocValue(first_index_iter->second, second_index_iter->second, cooc_row.value(i));
       // ToDo(MelLain): deal with tf/df
     }
   }
@@ -583,6 +734,127 @@ std::shared_ptr<Dictionary> DictionaryOperations::Filter(const FilterDictionaryA
   return dictionary;
 }
 
+// Adds values of the cooc matrix to cooc map, new_index maps token indices of the matrix to indices in the map
+static void AddCoocMatrix(const CoocMatrix& matrix, const std::vector<int>& new_index, CoocMap* cooc_map) {
+  for (int index = 0; index < matrix.num_rows(); ++index) {
+    CoocRow cooc_row = matrix.row(index);
+    if (cooc_row.empty()) {
+      continue;
+    }
+
+    auto& new_row = (*cooc_map)[new_index[index]];
+    for (int i = 0; i < cooc_row.size(); ++i) {
+      new_row[new_index[cooc_row.id(i)]] += cooc_row.value(i);
+    }
+  }
+}
+
+std::shared_ptr<Dictionary> DictionaryOperations::Merge(const MergeDictionaryArgs& args,
+  const std::vector<std::shared_ptr<Dictionary>>& dictionaries) {
+  auto dictionary = std::make_shared<Dictionary>(Dictionary(args.dictionary_target_name()));
+
+  // tokens keep the order of their first occurrence, so dictionaries with the same vocab are merged into it
+  std::vector<Token> collection_vocab;
+  std::unordered_map<Token, TokenValues, TokenHasher> token_freq_map;
+  std::unordered_map<ClassId, float> sum_w_tf;
+  int total_items_count = 0;
+  for (const auto& dict : dictionaries) {
+    total_items_count += dict->num_items();
+    for (const auto& entry : dict->entries()) {
+      auto iter = token_freq_map.find(entry.token());
+      if (iter == token_freq_map.end()) {
+        collection_vocab.push_back(entry.token());
+        iter = token_freq_map.insert(std::make_pair(entry.token(), TokenValues())).first;
+      }
+
+      iter->second.token_tf += entry.token_tf();
+      iter->second.token_df += entry.token_df();
+      sum_w_tf[entry.token().class_id] += entry.token_tf();
+    }
+  }
+
+  dictionary->SetNumItems(total_items_count);
+  for (const auto& token : collection_vocab) {
+    TokenValues& token_info = token_freq_map[token];
+    const float sum_tf = sum_w_tf[token.class_id];
+    token_info.token_value = sum_tf > 0.0f ? static_cast<float>(token_info.token_tf / sum_tf) : 0.0f;
+    dictionary->AddEntry(DictionaryEntry(token, token_info.token_value, token_info.token_tf, token_info.token_df));
+  }
+
+  LOG(INFO) << "Merged " << dictionaries.size() << " dictionaries into " << collection_vocab.size()
+            << " unique tokens in " << total_items_count << " items";
+
+  if (!args.merge_cooc()) {
+    return dictionary;
+  }
+
+  // cooc tf and df are merged only if all the dictionaries with co-occurrences have them,
+  // otherwise the merged dictionary would have invalid cooc state
+  bool merge_cooc_tf_df = true;
+  for (const auto& dict : dictionaries) {
+    if (!dict->cooc_values().empty() && (dict->cooc_tfs().empty() || dict->cooc_dfs().empty())) {
+      merge_cooc_tf_df = false;
+    }
+  }
+
+  CoocMap cooc_values, cooc_tfs, cooc_dfs;
+  for (const auto& dict : dictionaries) {
+    std::vector<int> new_index(dict->size());
+    for (int index = 0; index < dict->size(); ++index) {
+      new_index[index] = dictionary->token_index().find(dict->entry(index)->token())->second;
+    }
+
+    AddCoocMatrix(dict->cooc_values(), new_index, &cooc_values);
+    if (merge_cooc_tf_df) {
+      AddCoocMatrix(dict->cooc_tfs(), new_index, &cooc_tfs);
+      AddCoocMatrix(dict->cooc_dfs(), new_index, &cooc_dfs);
+    }
+  }
+
+  for (const auto& cooc_row : cooc_values) {
+    for (const auto& cooc : cooc_row.second) {
+      dictionary->AddCoocValue(cooc_row.first, cooc.first, cooc.second);
+    }
+  }
+  for (const auto& cooc_row : cooc_tfs) {
+    for (const auto& cooc : cooc_row.second) {
+      dictionary->AddCoocTf(cooc_row.first, cooc.first, cooc.second);
+    }
+  }
+  for (const auto& cooc_row : cooc_dfs) {
+    for (const auto& cooc : cooc_row.second) {
+      dictionary->AddCoocDf(cooc_row.first, cooc.first, cooc.second);
+    }
+  }
+
+  return dictionary;
+}
+
+void DictionaryOperations::ConvertCoocFile(const ConvertCoocFileArgs& args) {
+  if (boost::filesystem::exists(args.target_file_path())) {
+    BOOST_THROW_EXCEPTION(DiskWriteException("File already exists: " + args.target_file_path()));
+  }
+
+  std::vector<Token> collection_vocab;
+  std::unordered_map<Token, int, TokenHasher> token_to_token_id;
+  ParseVocabFile(args.vocab_file_path(), &collection_vocab, &token_to_token_id);
+
+  CoocMap cooc_map;
+  ParseCoocFile(args.source_file_path(), token_to_token_id, args.symmetric_cooc_values(),
+    [&cooc_map](int index_1, int index_2, float value) {
+      // the first value wins, as in Dictionary::AddCoocValue()
+      cooc_map[index_1].insert(std::make_pair(index_2, value));
+  });
+
+  CoocMatrix cooc_matrix;
+  cooc_matrix.Build(cooc_map, static_cast<int>(collection_vocab.size()));
+  CoocMap().swap(cooc_map);
+
+  LOG(INFO) << "Converting cooc file " << args.source_file_path() << " into binary file "
+            << args.target_file_path() << ", num_nonzeros = " << cooc_matrix.num_nonzeros();
+  CoocFile::Write(cooc_matrix, args.target_file_path());
+}
+
 void DictionaryOperations::StoreIntoDictionaryData(const Dictionary& dict, DictionaryData* data) {
   data->set_name(dict.name());
   data->set_num_items_in_collection(dict.num_items());
@@ -596,6 +868,50 @@ void DictionaryOperations::StoreIntoDictionaryData(const Dictionary& dict, Dicti
   }
 }
 
+void DictionaryOperations::StoreIntoArrays(const Dictionary& dict, DictionaryArraysInfo* info,
+                                           std::string* arrays) {
+  const int64_t num_entries = dict.size();
+  auto& entries = dict.entries();
+
+  std::unordered_map<ClassId, int> class_index_map;
+  int64_t tokens_length = 0;
+  for (const auto& entry : entries) {
+    if (entry.token().keyword.find('\0') != std::string::npos) {
+      BOOST_THROW_EXCEPTION(InvalidOperation(
+        "Token '" + entry.token().keyword + "' contains zero character and can't be stored into arrays"));
+    }
+
+    tokens_length += entry.token().keyword.size() + 1;
+    if (class_index_map.find(entry.token().class_id) == class_index_map.end()) {
+      class_index_map.emplace(entry.token().class_id, info->class_id_size());
+      info->add_class_id(entry.token().class_id);
+    }
+  }
+
+  info->set_name(dict.name());
+  info->set_num_entries(num_entries);
+  info->set_num_items_in_collection(dict.num_items());
+  info->set_tokens_length(tokens_length);
+
+  const int64_t tokens_offset = num_entries * (3 * sizeof(float) + sizeof(int));
+  arrays->resize(tokens_offset + tokens_length);
+  float* token_value = reinterpret_cast<float*>(&(*arrays)[0]);
+  float* token_tf = token_value + num_entries;
+  float* token_df = token_tf + num_entries;
+  int* class_index = reinterpret_cast<int*>(token_df + num_entries);
+  char* tokens = &(*arrays)[0] + tokens_offset;
+
+  for (int64_t i = 0; i < num_entries; ++i) {
+    const DictionaryEntry& entry = entries[i];
+    token_value[i] = entry.token_value();
+    token_tf[i] = entry.token_tf();
+    token_df[i] = entry.token_df();
+    class_index[i] = class_index_map[entry.token().class_id];
+    memcpy(tokens, entry.token().keyword.c_str(), entry.token().keyword.size() + 1);
+    tokens += entry.token().keyword.size() + 1;
+  }
+}
+
 void DictionaryOperations::WriteDictionarySummaryToLog(const Dictionary& dict) {
   std::map<ClassId, int> entries_per_class;
   for (int i = 0; i < dict.size(); i++) {
@@ -4,6 +4,7 @@
 
 #include <memory>
 #include <string>
+#include <vector>
 
 #include "artm/core/dictionary.h"
 
@@ -15,6 +16,10 @@ class DictionaryOperations {
  public:
   static std::shared_ptr<Dictionary> Create(const DictionaryData& data);
 
+  // creates dictionary from the arrays buffer (see DictionaryArraysInfo in messages.proto)
+  static std::shared_ptr<Dictionary> CreateFromArrays(const DictionaryArraysInfo& info,
+                                                      const char* arrays, int64_t length);
+
   static void Export(const ExportDictionaryArgs& args, const Dictionary& dict);
 
   static std::shared_ptr<Dictionary> Import(const ImportDictionaryArgs& args);
@@ -24,8 +29,16 @@ class DictionaryOperations {
 
   static std::shared_ptr<Dictionary> Filter(const FilterDictionaryArgs& args, const Dictionary& dict);
 
+  static std::shared_ptr<Dictionary> Merge(const MergeDictionaryArgs& args,
+                                           const std::vector<std::shared_ptr<Dictionary>>& dictionaries);
+
+  // converts text cooc file (as accepted by Gather) into binary cooc file (see cooc_file.h)
+  static void ConvertCoocFile(const ConvertCoocFileArgs& args);
+
   static void StoreIntoDictionaryData(const Dictionary& dict, DictionaryData* data);
 
+  static void StoreIntoArrays(const Dictionary& dict, DictionaryArraysInfo* info, std::string* arrays);
+
   static void WriteDictionarySummaryToLog(const Dictionary& dict);
 };
 
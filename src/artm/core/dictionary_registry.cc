@@ -0,0 +1,120 @@
+// Copyright 2017, Additive Regularization of Topic Models.
+
+#include "artm/core/dictionary_registry.h"
+
+#include <vector>
+
+#include "glog/logging.h"
+
+#include "artm/core/dictionary_operations.h"
+#include "artm/core/exceptions.h"
+
+namespace artm {
+namespace core {
+
+static ThreadSafeDictionaryCollection* dictionaries() {
+  return &ThreadSafeDictionaryCollection::singleton();
+}
+
+void DictionaryRegistry::Add(std::shared_ptr<Dictionary> dictionary) {
+  // co-occurrences are queried only from the frozen CSR representation
+  dictionary->Freeze();
+  Dispose(dictionary->name());
+  dictionaries()->set(dictionary->name(), dictionary);
+  DictionaryOperations::WriteDictionarySummaryToLog(*dictionary);
+}
+
+std::shared_ptr<Dictionary> DictionaryRegistry::GetSafe(const std::string& name) {
+  std::shared_ptr<Dictionary> dict_ptr = dictionaries()->get(name);
+  if (dict_ptr == nullptr) {
+    BOOST_THROW_EXCEPTION(InvalidOperation("Dictionary " + name + " does not exist or has no tokens"));
+  }
+
+  return dict_ptr;
+}
+
+void DictionaryRegistry::Dispose(const std::string& name) {
+  if (name.empty()) {
+    dictionaries()->clear();
+  } else {
+    dictionaries()->erase(name);
+  }
+}
+
+void DictionaryRegistry::Create(const DictionaryData& data) {
+  Add(DictionaryOperations::Create(data));
+}
+
+void DictionaryRegistry::CreateFromArrays(const DictionaryArraysInfo& info, const char* arrays, int64_t length) {
+  Add(DictionaryOperations::CreateFromArrays(info, arrays, length));
+}
+
+void DictionaryRegistry::Import(const ImportDictionaryArgs& args) {
+  auto dictionary = DictionaryOperations::Import(args);
+  Add(dictionary);
+  LOG(INFO) << "Import completed, token_size = " << dictionary->size();
+}
+
+void DictionaryRegistry::Export(const ExportDictionaryArgs& args) {
+  DictionaryOperations::Export(args, *GetSafe(args.dictionary_name()));
+}
+
+void DictionaryRegistry::Gather(const GatherDictionaryArgs& args,
+                                const ThreadSafeCollectionHolder<std::string, Batch>& mem_batches) {
+  Add(DictionaryOperations::Gather(args, mem_batches));
+}
+
+void DictionaryRegistry::Filter(const FilterDictionaryArgs& args) {
+  auto src_dictionary_ptr = dictionaries()->get(args.dictionary_name());
+  if (src_dictionary_ptr == nullptr) {
+    LOG(ERROR) << "Dictionary::Filter(): filter was requested for non-exists dictionary '"
+               << args.dictionary_name() << "', operation was aborted";
+    return;
+  }
+
+  Add(DictionaryOperations::Filter(args, *src_dictionary_ptr));
+}
+
+void DictionaryRegistry::Merge(const MergeDictionaryArgs& args) {
+  std::vector<std::shared_ptr<Dictionary>> dictionaries;
+  for (const auto& name : args.dictionary_name()) {
+    dictionaries.push_back(GetSafe(name));
+  }
+
+  Add(DictionaryOperations::Merge(args, dictionaries));
+}
+
+void DictionaryRegistry::Request(const GetDictionaryArgs& args, DictionaryData* result) {
+  DictionaryOperations::StoreIntoDictionaryData(*GetSafe(args.dictionary_name()), result);
+  result->set_name(args.dictionary_name());
+}
+
+void DictionaryRegistry::RequestArrays(const GetDictionaryArgs& args, DictionaryArraysInfo* result,
+                                       std::string* arrays) {
+  DictionaryOperations::StoreIntoArrays(*GetSafe(args.dictionary_name()), result, arrays);
+  result->set_name(args.dictionary_name());
+}
+
+void DictionaryRegistry::RequestInfo(const GetDictionaryArgs& args, MasterComponentInfo* result) {
+  std::vector<std::string> names;
+  if (args.has_dictionary_name() && !args.dictionary_name().empty()) {
+    names.push_back(args.dictionary_name());
+  } else {
+    names = dictionaries()->keys();
+  }
+
+  for (const auto& name : names) {
+    std::shared_ptr<Dictionary> dict = dictionaries()->get(name);
+    if (dict == nullptr) {
+      continue;
+    }
+
+    MasterComponentInfo::DictionaryInfo* info = result->add_dictionary();
+    info->set_name(name);
+    info->set_num_entries(dict->size());
+    info->set_byte_size(dict->ByteSize());
+  }
+}
+
+}  // namespace core
+}  // namespace artm
@@ -0,0 +1,46 @@
+// Copyright 2017, Additive Regularization of Topic Models.
+
+#pragma once
+
+#include <memory>
+#include <string>
+
+#include "artm/core/dictionary.h"
+
+namespace artm {
+namespace core {
+
+// DictionaryRegistry operates on the process-wide collection of dictionaries
+// (ThreadSafeDictionaryCollection::singleton()). Dictionaries are shared by all master components,
+// therefore these methods do not require a master component, and are used both from MasterComponent
+// and from ArtmXxxDictionaryGlobal methods in c_interface.
+class DictionaryRegistry {
+ public:
+  // Adds dictionary to the registry, replacing existing dictionary with the same name
+  static void Add(std::shared_ptr<Dictionary> dictionary);
+
+  // Returns the dictionary, or throws InvalidOperation if it does not exist
+  static std::shared_ptr<Dictionary> GetSafe(const std::string& name);
+
+  // Removes the dictionary from the registry; empty name removes all dictionaries
+  static void Dispose(const std::string& name);
+
+  static void Create(const DictionaryData& data);
+  static void CreateFromArrays(const DictionaryArraysInfo& info, const char* arrays, int64_t length);
+  static void Import(const ImportDictionaryArgs& args);
+  static void Export(const ExportDictionaryArgs& args);
+  static void Gather(const GatherDictionaryArgs& args,
+                     const ThreadSafeCollectionHolder<std::string, Batch>& mem_batches);
+  static void Filter(const FilterDictionaryArgs& args);
+  static void Merge(const MergeDictionaryArgs& args);
+
+  static void Request(const GetDictionaryArgs& args, DictionaryData* result);
+  static void RequestArrays(const GetDictionaryArgs& args, DictionaryArraysInfo* result, std::string* arrays);
+
+  // Fills MasterComponentInfo.dictionary for the given dictionary,
+  // or for all dictionaries in the registry if GetDictionaryArgs.dictionary_name is empty
+  static void RequestInfo(const GetDictionaryArgs& args, MasterComponentInfo* result);
+};
+
+}  // namespace core
+}  // namespace artm
@@ -36,6 +36,7 @@ enum ArtmErrorCodes {
     ARTM_INVALID_OPERATION = -6,
     ARTM_DISK_READ_ERROR = -7,
     ARTM_DISK_WRITE_ERROR = -8,
+    ARTM_OPERATION_CANCELLED = -9,
 };
 #endif
 
@@ -65,6 +66,7 @@ DEFINE_EXCEPTION_TYPE(CorruptedMessageException, std::runtime_error);
 DEFINE_EXCEPTION_TYPE(InvalidOperation, std::runtime_error);
 DEFINE_EXCEPTION_TYPE(DiskReadException, std::runtime_error);
 DEFINE_EXCEPTION_TYPE(DiskWriteException, std::runtime_error);
+DEFINE_EXCEPTION_TYPE(OperationCancelled, std::runtime_error);
 
 #undef DEFINE_EXCEPTION_TYPE
 
@@ -90,6 +92,9 @@ catch (const ::artm::core::InternalError& e) {                                 \
 } catch (const ::artm::core::DiskWriteException& e) {                          \
   set_last_error("DiskWriteException :  " + std::string(e.what()));            \
   return ARTM_DISK_WRITE_ERROR;                                                \
+} catch (const ::artm::core::OperationCancelled& e) {                          \
+  set_last_error("OperationCancelled :  " + std::string(e.what()));            \
+  return ARTM_OPERATION_CANCELLED;                                             \
 } catch (...) {                                                                \
   LOG(ERROR) << boost::current_exception_diagnostic_information();             \
   set_last_error(boost::current_exception_diagnostic_information());           \
@@ -111,6 +116,8 @@ catch (const InternalError& e) {                                               \
   response.Error(ARTM_DISK_READ_ERROR, e.what());                              \
 } catch (const DiskWriteException& e) {                                        \
   response.Error(ARTM_DISK_WRITE_ERROR, e.what());                             \
+} catch (const OperationCancelled& e) {                                        \
+  response.Error(ARTM_OPERATION_CANCELLED, e.what());                          \
 } catch (const std::runtime_error& e) {                                        \
   response.Error(ARTM_INTERNAL_ERROR, e.what());                               \
 } catch (...) {                                                                \
@@ -13,6 +13,7 @@
 #include "artm/core/common.h"
 #include "artm/core/helpers.h"
 #include "artm/core/cache_manager.h"
+#include "artm/core/dense_phi_matrix.h"
 #include "artm/core/score_manager.h"
 #include "artm/core/dictionary.h"
 #include "artm/core/exceptions.h"
@@ -72,6 +73,7 @@ Instance::Instance(const MasterModelConfig& config)
       score_calculators_(),
       batches_(),
       models_(),
+      cancel_generation_(0),
       processor_queue_(),
       cache_manager_(),
       score_manager_(),
@@ -87,6 +89,7 @@ Instance::Instance(const Instance& rhs)
       score_calculators_(),
       batches_(),
       models_(),
+      cancel_generation_(0),
       processor_queue_(),
       cache_manager_(),
       score_manager_(),
@@ -184,6 +187,8 @@ void Instance::RequestMasterComponentInfo(MasterComponentInfo* master_info) cons
       info->set_num_topics(p_wt->topic_size());
       info->set_type(typeid(*p_wt).name());
       info->set_byte_size(p_wt->ByteSize());
+      info->set_version(GetPhiVersion(name));
+      info->set_is_attached(IsPhiMatrixAttached(name));
     }
   }
 
@@ -191,6 +196,17 @@ void Instance::RequestMasterComponentInfo(MasterComponentInfo* master_info) cons
   master_info->set_num_processors(static_cast<int>(processors_.size()));
 }
 
+void Instance::RequestModelVersions(MasterComponentInfo* master_info) const {
+  for (const auto& name : models_.keys()) {
+    if (this->GetPhiMatrix(name) != nullptr) {
+      MasterComponentInfo::ModelInfo* info = master_info->add_model();
+      info->set_name(name);
+      info->set_version(GetPhiVersion(name));
+      info->set_is_attached(IsPhiMatrixAttached(name));
+    }
+  }
+}
+
 CacheManager* Instance::cache_manager() {
   return cache_manager_.get();
 }
@@ -205,6 +221,7 @@ ScoreTracker* Instance::score_tracker() {
 
 void Instance::DisposeModel(ModelName model_name) {
   models_.erase(model_name);
+  phi_versions_.erase(model_name);
 }
 
 void Instance::CreateOrReconfigureRegularizer(const RegularizerConfig& config) {
@@ -460,7 +477,34 @@ void Instance::SetPhiMatrix(ModelName model_name, std::shared_ptr< ::artm::core:
   models_.erase(model_name);
   if (phi_matrix != nullptr) {
     models_.set(model_name, phi_matrix);
+    BumpPhiVersion(model_name);
+  } else {
+    phi_versions_.erase(model_name);
+  }
+}
+
+static int64_t NextPhiVersion() {
+  static std::atomic<int64_t> phi_version_counter(0);
+  return ++phi_version_counter;
+}
+
+bool Instance::IsPhiMatrixAttached(ModelName model_name) const {
+  std::shared_ptr<const PhiMatrix> phi_matrix = GetPhiMatrix(model_name);
+  return dynamic_cast<const AttachedPhiMatrix*>(phi_matrix.get()) != nullptr;
+}
+
+int64_t Instance::GetPhiVersion(ModelName model_name) const {
+  // The buffer of attached matrix is modified outside of the core, so each request gets a new version
+  if (IsPhiMatrixAttached(model_name)) {
+    return NextPhiVersion();
   }
+
+  std::shared_ptr<int64_t> version = phi_versions_.get(model_name);
+  return (version != nullptr) ? *version : 0;
+}
+
+void Instance::BumpPhiVersion(ModelName model_name) {
+  phi_versions_.set(model_name, std::make_shared<int64_t>(NextPhiVersion()));
 }
 
 }  // namespace core
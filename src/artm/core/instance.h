@@ -2,6 +2,7 @@
 
 #pragma once
 
+#include <atomic>
 #include <map>
 #include <memory>
 #include <vector>
@@ -43,6 +44,7 @@ class Instance {
 
   std::shared_ptr<Instance> Duplicate() const;
   void RequestMasterComponentInfo(MasterComponentInfo* master_info) const;
+  void RequestModelVersions(MasterComponentInfo* master_info) const;
 
   std::shared_ptr<MasterModelConfig> config() const { return master_model_config_.get(); }
   ThreadSafeRegularizerCollection* regularizers() { return &regularizers_; }
@@ -71,6 +73,31 @@ class Instance {
   std::shared_ptr<const ::artm::core::PhiMatrix> GetPhiMatrixSafe(ModelName model_name) const;
   void SetPhiMatrix(ModelName model_name, std::shared_ptr< ::artm::core::PhiMatrix> phi_matrix);
 
+  // Version of phi matrix is changed each time the matrix is replaced (SetPhiMatrix) or
+  // modified in-place (BumpPhiVersion). Versions are unique across all instances in the process,
+  // so the pair (model_name, version) can be used as a key to cache phi matrices outside of the core.
+  // Attached matrices (see MasterComponent::AttachModel) get a new version on each request,
+  // because their values might be changed through the external buffer at any moment.
+  int64_t GetPhiVersion(ModelName model_name) const;
+  void BumpPhiVersion(ModelName model_name);
+  bool IsPhiMatrixAttached(ModelName model_name) const;
+
+  // Cancel generation is incremented by each call of ArtmCancelOperation.
+  // Long-running operations compare it with the value, observed at their start,
+  // to stop between iterations.
+  int64_t cancel_generation() const { return cancel_generation_; }
+  void BumpCancelGeneration() { ++cancel_generation_; }
+
+  // Operations, cancelled by ArtmCancelOperation with CancelOperationArgs.operation_id.
+  // Each operation forgets its id on completion, so that the set stays small.
+  void CancelOperation(const std::string& operation_id) {
+    cancelled_operations_.set(operation_id, std::make_shared<bool>(true));
+  }
+  bool IsOperationCancelled(const std::string& operation_id) const {
+    return !operation_id.empty() && cancelled_operations_.has_key(operation_id);
+  }
+  void ForgetOperation(const std::string& operation_id) { cancelled_operations_.erase(operation_id); }
+
  private:
   bool is_configured_;
 
@@ -85,6 +112,9 @@ class Instance {
   ThreadSafeScoreCollection score_calculators_;
   ThreadSafeBatchCollection batches_;
   ThreadSafeModelCollection models_;
+  ThreadSafeCollectionHolder<ModelName, int64_t> phi_versions_;
+  std::atomic<int64_t> cancel_generation_;
+  ThreadSafeCollectionHolder<std::string, bool> cancelled_operations_;
 
   ProcessorQueue processor_queue_;
 
@@ -7,6 +7,7 @@
 #include <vector>
 #include <unordered_set>
 #include <sstream>
+#include <thread>  // NOLINT
 #include <utility>
 
 #include "boost/algorithm/string.hpp"
@@ -23,6 +24,7 @@
 #include "artm/score_calculator_interface.h"
 
 #include "artm/core/dictionary_operations.h"
+#include "artm/core/dictionary_registry.h"
 #include "artm/core/exceptions.h"
 #include "artm/core/helpers.h"
 #include "artm/core/batch_manager.h"
@@ -172,6 +174,93 @@ static void HandleSparseThetaMatrixRequest(::artm::ThetaMatrix* theta_matrix, st
   theta_matrix->set_num_values(num_values);
 }
 
+// Writes CSR matrix into external buffer: int64 indptr[num_rows + 1], int32 indices[nnz], float values[nnz]
+static void WriteCsrMatrix(const std::vector<int64_t>& indptr, const std::vector<int32_t>& indices,
+                           const std::vector<float>& values, std::string* lm) {
+  assert(indices.size() == values.size());
+  int64_t indptr_byte_size = sizeof(int64_t) * indptr.size();
+  int64_t byte_size = sizeof(int32_t) * values.size();  // assert(sizeof(float) == sizeof(int32_t)
+  lm->resize(indptr_byte_size + 2 * byte_size);
+  memcpy(&(*lm)[0], &indptr[0], indptr_byte_size);
+  if (!values.empty()) {
+    memcpy(&(*lm)[indptr_byte_size], &indices[0], byte_size);
+    memcpy(&(*lm)[indptr_byte_size + byte_size], &values[0], byte_size);
+  }
+}
+
+// Rows of the resulting CSR matrix correspond to tokens, columns correspond to topics.
+static void HandleCsrTopicModelRequest(::artm::TopicModel* topic_model, std::string* lm) {
+  if (topic_model->token_weights_size() != topic_model->topic_indices_size()) {
+    BOOST_THROW_EXCEPTION(InternalError("topic_model->token_weights_size() != topic_model->topic_indices_size()"));
+  }
+
+  int64_t num_values = 0;
+  for (const auto& token_weights : topic_model->token_weights()) {
+    num_values += token_weights.value_size();
+  }
+
+  std::vector<int64_t> csr_indptr;
+  std::vector<int32_t> csr_topic_index;
+  std::vector<float> csr_weight;
+  csr_indptr.reserve(topic_model->token_weights_size() + 1);
+  csr_topic_index.reserve(num_values);
+  csr_weight.reserve(num_values);
+
+  csr_indptr.push_back(0);
+  for (int token_index = 0; token_index < topic_model->token_weights_size(); ++token_index) {
+    const artm::IntArray& topic_indices = topic_model->topic_indices(token_index);
+    const artm::FloatArray& token_weights = topic_model->token_weights(token_index);
+    csr_topic_index.insert(csr_topic_index.end(), topic_indices.value().begin(), topic_indices.value().end());
+    csr_weight.insert(csr_weight.end(), token_weights.value().begin(), token_weights.value().end());
+    csr_indptr.push_back(static_cast<int64_t>(csr_weight.size()));
+  }
+
+  WriteCsrMatrix(csr_indptr, csr_topic_index, csr_weight, lm);
+  topic_model->clear_token_weights();
+  topic_model->clear_topic_indices();
+  topic_model->set_num_values(num_values);
+}
+
+// Rows of the resulting CSR matrix correspond to topics, columns correspond to items.
+static void HandleCsrThetaMatrixRequest(::artm::ThetaMatrix* theta_matrix, std::string* lm) {
+  if (theta_matrix->item_weights_size() != theta_matrix->topic_indices_size()) {
+    BOOST_THROW_EXCEPTION(InternalError("theta_matrix->item_weights_size() != theta_matrix->topic_indices_size()"));
+  }
+
+  // Theta is stored item by item, so the first pass counts values in each topic (row of CSR matrix)
+  std::vector<int64_t> csr_indptr(theta_matrix->num_topics() + 1, 0);
+  int64_t num_values = 0;
+  for (const auto& topic_indices : theta_matrix->topic_indices()) {
+    for (int topic_index : topic_indices.value()) {
+      csr_indptr[topic_index + 1]++;
+    }
+    num_values += topic_indices.value_size();
+  }
+
+  for (int topic_index = 0; topic_index < theta_matrix->num_topics(); ++topic_index) {
+    csr_indptr[topic_index + 1] += csr_indptr[topic_index];
+  }
+
+  std::vector<int32_t> csr_item_index(num_values);
+  std::vector<float> csr_weight(num_values);
+  std::vector<int64_t> position(csr_indptr.begin(), csr_indptr.end() - 1);
+  for (int item_index = 0; item_index < theta_matrix->item_weights_size(); ++item_index) {
+    const artm::IntArray& topic_indices = theta_matrix->topic_indices(item_index);
+    const artm::FloatArray& item_weights = theta_matrix->item_weights(item_index);
+    for (int value_index = 0; value_index < topic_indices.value_size(); ++value_index) {
+      int64_t& pos = position[topic_indices.value(value_index)];
+      csr_item_index[pos] = item_index;
+      csr_weight[pos] = item_weights.value(value_index);
+      pos++;
+    }
+  }
+
+  WriteCsrMatrix(csr_indptr, csr_item_index, csr_weight, lm);
+  theta_matrix->clear_item_weights();
+  theta_matrix->clear_topic_indices();
+  theta_matrix->set_num_values(num_values);
+}
+
 void MasterComponent::CreateOrReconfigureMasterComponent(const MasterModelConfig& config,
                                                          bool reconfigure,
                                                          bool change_topic_name) {
@@ -216,6 +305,7 @@ void MasterComponent::CreateOrReconfigureMasterComponent(const MasterModelConfig
           for (int topic_index = 0; topic_index < config.topic_name_size(); topic_index++) {
             (const_cast<PhiMatrix*>(model.get()))->set_topic_name(topic_index, config.topic_name(topic_index));
           }
+          instance_->BumpPhiVersion(model_name);
         }
       }
     }
@@ -266,6 +356,45 @@ void MasterComponent::ClearScoreArrayCache(const ClearScoreArrayCacheArgs& args)
   instance_->score_tracker()->Clear();
 }
 
+// Removes pending tasks of the operation from the processor queue (all pending tasks if operation_id is empty),
+// and marks them as cancelled in their batch managers. Returns the number of removed tasks.
+static size_t CancelPendingTasks(ProcessorQueue* processor_queue, const std::string& operation_id) {
+  std::vector<std::shared_ptr<ProcessorInput>> pending;
+  if (operation_id.empty()) {
+    processor_queue->pop_all(&pending);
+  } else {
+    processor_queue->pop_if([&operation_id](const std::shared_ptr<ProcessorInput>& part) {  // NOLINT
+      return part->args().operation_id() == operation_id;
+    }, &pending);
+  }
+
+  for (auto& part : pending) {
+    if (part->batch_manager() != nullptr) {
+      part->batch_manager()->Cancel(part->task_id());
+    }
+  }
+
+  return pending.size();
+}
+
+// Removes pending tasks from the processor queue. The batches that are being processed at the moment
+// are not interrupted. Operations waiting for the removed tasks fail as soon as their in-flight batches finish.
+// Multi-pass operations (FitOffline, FitOnline) stop at the end of current iteration,
+// and leave p_wt normalized from n_wt, accumulated over all completely processed batches.
+// If args.operation_id is set, only the operations started with the same operation_id are affected.
+void MasterComponent::CancelOperation(const CancelOperationArgs& args) {
+  // The operation must be marked as cancelled before the queue is drained, so that any operation,
+  // that observes a cancelled batch, also observes the mark (see ArtmExecutor::IsCancelled).
+  if (args.operation_id().empty()) {
+    instance_->BumpCancelGeneration();
+  } else {
+    instance_->CancelOperation(args.operation_id());
+  }
+
+  size_t num_removed = CancelPendingTasks(instance_->processor_queue(), args.operation_id());
+  LOG(INFO) << "MasterComponent: " << num_removed << " pending batches were removed from processor queue";
+}
+
 void MasterComponent::CreateOrReconfigureRegularizer(const RegularizerConfig& config) {
   instance_->CreateOrReconfigureRegularizer(config);
 }
@@ -275,37 +404,28 @@ void MasterComponent::DisposeRegularizer(const std::string& name) {
 }
 
 void MasterComponent::AddDictionary(std::shared_ptr<Dictionary> dictionary) {
-  DisposeDictionary(dictionary->name());
-  instance_->dictionaries()->set(dictionary->name(), dictionary);
-  DictionaryOperations::WriteDictionarySummaryToLog(*dictionary);
+  DictionaryRegistry::Add(dictionary);
 }
 
 void MasterComponent::CreateDictionary(const DictionaryData& data) {
-  AddDictionary(DictionaryOperations::Create(data));
+  DictionaryRegistry::Create(data);
+}
+
+void MasterComponent::CreateDictionaryFromArrays(const DictionaryArraysInfo& info, const char* arrays,
+                                                 int64_t length) {
+  DictionaryRegistry::CreateFromArrays(info, arrays, length);
 }
 
 void MasterComponent::DisposeDictionary(const std::string& name) {
-  if (name.empty()) {
-    instance_->dictionaries()->clear();
-  } else {
-    instance_->dictionaries()->erase(name);
-  }
+  DictionaryRegistry::Dispose(name);
 }
 
 void MasterComponent::ExportDictionary(const ExportDictionaryArgs& args) {
-  std::shared_ptr<Dictionary> dict_ptr = instance_->dictionaries()->get(args.dictionary_name());
-  if (dict_ptr == nullptr) {
-    BOOST_THROW_EXCEPTION(InvalidOperation("Dictionary " +
-        args.dictionary_name() + " does not exist or has no tokens"));
-  }
-
-  DictionaryOperations::Export(args, *dict_ptr);
+  DictionaryRegistry::Export(args);
 }
 
 void MasterComponent::ImportDictionary(const ImportDictionaryArgs& args) {
-  auto dictionary = DictionaryOperations::Import(args);
-  AddDictionary(dictionary);
-  LOG(INFO) << "Import completed, token_size = " << dictionary->size();
+  DictionaryRegistry::Import(args);
 }
 
 void MasterComponent::Request(::artm::MasterModelConfig* result) {
@@ -319,13 +439,11 @@ void MasterComponent::Request(::artm::MasterModelConfig* result) {
 }
 
 void MasterComponent::Request(const GetDictionaryArgs& args, DictionaryData* result) {
-  std::shared_ptr<Dictionary> dict_ptr = instance_->dictionaries()->get(args.dictionary_name());
-  if (dict_ptr == nullptr) {
-    BOOST_THROW_EXCEPTION(InvalidOperation("Dictionary " +
-        args.dictionary_name() + " does not exist or has no tokens"));
-  }
-  DictionaryOperations::StoreIntoDictionaryData(*dict_ptr, result);
-  result->set_name(args.dictionary_name());
+  DictionaryRegistry::Request(args, result);
+}
+
+void MasterComponent::Request(const GetDictionaryArgs& args, DictionaryArraysInfo* result, std::string* external) {
+  DictionaryRegistry::RequestArrays(args, result, external);
 }
 
 void MasterComponent::ImportBatches(const ImportBatchesArgs& args) {
@@ -666,18 +784,15 @@ void MasterComponent::InitializeModel(const InitializeModelArgs& args) {
 }
 
 void MasterComponent::FilterDictionary(const FilterDictionaryArgs& args) {
-  auto src_dictionary_ptr = instance_->dictionaries()->get(args.dictionary_name());
-  if (src_dictionary_ptr == nullptr) {
-    LOG(ERROR) << "Dictionary::Filter(): filter was requested for non-exists dictionary '"
-               << args.dictionary_name() << "', operation was aborted";
-    return;
-  }
+  DictionaryRegistry::Filter(args);
+}
 
-  AddDictionary(DictionaryOperations::Filter(args, *src_dictionary_ptr));
+void MasterComponent::MergeDictionary(const MergeDictionaryArgs& args) {
+  DictionaryRegistry::Merge(args);
 }
 
 void MasterComponent::GatherDictionary(const GatherDictionaryArgs& args) {
-  AddDictionary(DictionaryOperations::Gather(args, *instance_->batches()));
+  DictionaryRegistry::Gather(args, *instance_->batches());
 }
 
 void MasterComponent::ReconfigureMasterModel(const MasterModelConfig& config) {
@@ -708,11 +823,30 @@ void MasterComponent::Request(const GetTopicModelArgs& args, ::artm::TopicModel*
   Request(args, result);
   if (args.matrix_layout() == artm::MatrixLayout_Sparse) {
     HandleSparseTopicModelRequest(result, external);
+  } else if (args.matrix_layout() == artm::MatrixLayout_SparseCsr) {
+    HandleCsrTopicModelRequest(result, external);
   } else {
     HandleExternalTopicModelRequest(result, external);
   }
 }
 
+void MasterComponent::Request(const GetTopTokensArgs& args, ::artm::TopTokens* result, std::string* external) {
+  std::shared_ptr<MasterModelConfig> config = instance_->config();
+  if (config != nullptr) {
+    if (!args.has_model_name()) {
+      const_cast<GetTopTokensArgs*>(&args)->set_model_name(config->pwt_name());
+    }
+  }
+
+  int num_threads = static_cast<int>(std::thread::hardware_concurrency());
+  if (num_threads <= 0) {
+    num_threads = 1;
+  }
+
+  auto phi_matrix = instance_->GetPhiMatrixSafe(args.model_name());
+  PhiMatrixOperations::RetrieveTopTokens(*phi_matrix, args, result, external, num_threads);
+}
+
 void MasterComponent::Request(const GetScoreValueArgs& args, ScoreData* result) {
   instance_->score_manager()->RequestScore(args.score_name(), result);
 }
@@ -721,8 +855,12 @@ void MasterComponent::Request(const GetScoreArrayArgs& args, ScoreArray* result)
   instance_->score_tracker()->RequestScoreArray(args, result);
 }
 
-void MasterComponent::Request(const GetMasterComponentInfoArgs& /*args*/, MasterComponentInfo* result) {
-  this->instance_->RequestMasterComponentInfo(result);
+void MasterComponent::Request(const GetMasterComponentInfoArgs& args, MasterComponentInfo* result) {
+  if (args.model_versions_only()) {
+    this->instance_->RequestModelVersions(result);
+  } else {
+    this->instance_->RequestMasterComponentInfo(result);
+  }
 }
 
 void MasterComponent::Request(const ProcessBatchesArgs& args, ProcessBatchesResult* result) {
@@ -781,6 +919,7 @@ void MasterComponent::RequestProcessBatchesImpl(const ProcessBatchesArgs& proces
     if (current_nwt_target != nullptr) {
       if (process_batches_args.reset_nwt()) {
         PhiMatrixOperations::AssignValue(0.0f, const_cast<::artm::core::PhiMatrix*>(current_nwt_target.get()));
+        instance_->BumpPhiVersion(args.nwt_target_name());
       }
     } else {
       auto nwt_target(std::make_shared<DensePhiMatrix>(args.nwt_target_name(), p_wt.topic_name()));
@@ -868,6 +1007,11 @@ void MasterComponent::RequestProcessBatchesImpl(const ProcessBatchesArgs& proces
     instance_->processor_queue()->push(pi);
   }
 
+  // The operation might have been cancelled while its tasks were being enqueued
+  if (instance_->IsOperationCancelled(args.operation_id())) {
+    CancelPendingTasks(instance_->processor_queue(), args.operation_id());
+  }
+
   if (async) {
     return;
   }
@@ -876,6 +1020,14 @@ void MasterComponent::RequestProcessBatchesImpl(const ProcessBatchesArgs& proces
     boost::this_thread::sleep(boost::posix_time::milliseconds(kIdleLoopFrequency));
   }
 
+  if (args.has_nwt_target_name()) {
+    instance_->BumpPhiVersion(args.nwt_target_name());
+  }
+
+  if (batch_manager->IsCancelled()) {
+    BOOST_THROW_EXCEPTION(OperationCancelled("The operation was cancelled by ArtmCancelOperation"));
+  }
+
   GetThetaMatrixArgs get_theta_matrix_args;
   switch (args.theta_matrix_type()) {
     case ThetaMatrixType_Dense:
@@ -885,6 +1037,10 @@ void MasterComponent::RequestProcessBatchesImpl(const ProcessBatchesArgs& proces
     case ThetaMatrixType_Sparse:
     case ThetaMatrixType_SparsePtdw:
       get_theta_matrix_args.set_matrix_layout(MatrixLayout_Sparse);
+      get_theta_matrix_args.set_eps(args.theta_eps());
+      if (args.has_theta_num_top_topics()) {
+        get_theta_matrix_args.set_num_top_topics(args.theta_num_top_topics());
+      }
       break;
   }
 
@@ -1048,11 +1204,9 @@ void MasterComponent::Request(const GetThetaMatrixArgs& args, ::artm::ThetaMatri
   instance_->cache_manager()->RequestThetaMatrix(args, result);
 }
 
-static void ValidateProcessedItems(std::string method_description, MasterComponent* master) {
-  ::artm::GetScoreValueArgs get_items_processed;
+static void ValidateProcessedItems(std::string method_description, const ScoreManager& score_manager) {
   ::artm::ScoreData items_processed_data;
-  get_items_processed.set_score_name("^^^ItemsProcessedScore^^^");
-  master->Request(get_items_processed, &items_processed_data);
+  score_manager.RequestScore("^^^ItemsProcessedScore^^^", &items_processed_data);
   ::artm::ItemsProcessedScore items_processed;
   items_processed.ParseFromString(items_processed_data.data());
   LOG(INFO) << method_description << ": " << DescribeMessage(items_processed);
@@ -1078,6 +1232,8 @@ void MasterComponent::Request(const GetThetaMatrixArgs& args,
   Request(args, result);
   if (args.matrix_layout() == artm::MatrixLayout_Sparse) {
     HandleSparseThetaMatrixRequest(result, external);
+  } else if (args.matrix_layout() == artm::MatrixLayout_SparseCsr) {
+    HandleCsrThetaMatrixRequest(result, external);
   } else {
     HandleExternalThetaMatrixRequest(result, external);
   }
@@ -1126,13 +1282,29 @@ void MasterComponent::Request(const TransformMasterModelArgs& args, ::artm::Thet
   if (args.has_predict_class_id()) {
     process_batches_args.set_predict_class_id(args.predict_class_id());
   }
+  process_batches_args.set_theta_eps(args.eps());
+  if (args.has_num_top_topics()) {
+    process_batches_args.set_theta_num_top_topics(args.num_top_topics());
+  }
+
+  if (args.has_operation_id()) {
+    process_batches_args.set_operation_id(args.operation_id());
+  }
+  call_on_destruction forget_operation([&]() {  // NOLINT
+    instance_->ForgetOperation(args.operation_id());
+  });
 
   FixMessage(&process_batches_args);
 
+  // Several transforms may run concurrently against the same p_wt.
+  // Each of them collects its own scores, and the score cache is replaced only on completion,
+  // so it always contains the scores of the latest completed transform.
+  ScoreManager score_manager(instance_.get());
   BatchManager batch_manager;
   RequestProcessBatchesImpl(process_batches_args, &batch_manager,
-                            /* async =*/ false, /*score_manager =*/ nullptr, result);
-  ValidateProcessedItems("Transform", this);
+                            /* async =*/ false, &score_manager, result);
+  ValidateProcessedItems("Transform", score_manager);
+  instance_->score_manager()->CopyFrom(score_manager);
 }
 
 void MasterComponent::Request(const TransformMasterModelArgs& args,
@@ -1141,14 +1313,19 @@ void MasterComponent::Request(const TransformMasterModelArgs& args,
   const bool is_dense_theta = args.theta_matrix_type() == artm::ThetaMatrixType_Dense;
   const bool is_dense_ptdw = args.theta_matrix_type() == artm::ThetaMatrixType_DensePtdw;
   const bool is_sparse_theta = args.theta_matrix_type() == artm::ThetaMatrixType_Sparse;
-  if (!is_dense_theta && !is_dense_ptdw && !is_sparse_theta) {
+  const bool is_sparse_ptdw = args.theta_matrix_type() == artm::ThetaMatrixType_SparsePtdw;
+  if (!is_dense_theta && !is_dense_ptdw && !is_sparse_theta && !is_sparse_ptdw) {
     BOOST_THROW_EXCEPTION(InvalidOperation(
         "Dense or sparse matrix format is required for ArtmRequestProcessBatchesExternal"));
   }
 
   Request(args, result);
-  if (is_sparse_theta) {
-    HandleSparseThetaMatrixRequest(result, external);
+  if (is_sparse_theta || is_sparse_ptdw) {
+    if (args.matrix_layout() == artm::MatrixLayout_SparseCsr) {
+      HandleCsrThetaMatrixRequest(result, external);
+    } else {
+      HandleSparseThetaMatrixRequest(result, external);
+    }
   } else {
     HandleExternalThetaMatrixRequest(result, external);
   }
@@ -1257,7 +1434,8 @@ class ArtmExecutor {
       : master_model_config_(master_model_config),
         pwt_name_(master_model_config.pwt_name()),
         nwt_name_(master_model_config.nwt_name()),
-        master_component_(master_component) {
+        master_component_(master_component),
+        cancel_generation_(master_component->instance_->cancel_generation()) {
     if (master_model_config.has_num_document_passes()) {
       process_batches_args_.set_num_document_passes(master_model_config.num_document_passes());
     }
@@ -1294,14 +1472,21 @@ class ArtmExecutor {
     const std::string rwt_name = "rwt";
     master_component_->ClearScoreCache(ClearScoreCacheArgs());
     for (int pass = 0; pass < num_collection_passes; ++pass) {
+      if (IsCancelled()) {
+        break;
+      }
+
       ::artm::core::ScoreManager score_manager(master_component_->instance_.get());
       ProcessBatches(pwt_name_, nwt_name_, iter, &score_manager);
       Regularize(pwt_name_, nwt_name_, rwt_name);
       Normalize(pwt_name_, nwt_name_, rwt_name);
-      StoreScores(&score_manager);
+      if (!IsCancelled()) {
+        StoreScores(&score_manager);
+      }
     }
 
     Dispose(rwt_name);
+    ThrowIfCancelled();
   }
 
   void ExecuteOnlineAlgorithm(OnlineBatchesIterator* iter) {
@@ -1309,7 +1494,7 @@ class ArtmExecutor {
     StringIndex nwt_hat_index("nwt_hat");
 
     master_component_->ClearScoreCache(ClearScoreCacheArgs());
-    while (iter->more()) {
+    while (iter->more() && !IsCancelled()) {
       float apply_weight = iter->apply_weight();
       float decay_weight = iter->decay_weight();
 
@@ -1319,12 +1504,15 @@ class ArtmExecutor {
       Dispose(nwt_hat_index);
       Regularize(pwt_name_, nwt_name_, rwt_name);
       Normalize(pwt_name_, nwt_name_, rwt_name);
-      StoreScores(&score_manager);
+      if (!IsCancelled()) {
+        StoreScores(&score_manager);
+      }
 
       nwt_hat_index++;
     }  // while (iter->more())
 
     iter->reset();
+    ThrowIfCancelled();
   }
 
   void ExecuteAsyncOnlineAlgorithm(OnlineBatchesIterator* iter) {
@@ -1350,7 +1538,8 @@ class ArtmExecutor {
     int op_id = AsyncProcessBatches(pwt_active, nwt_hat_index, iter);
 
     while (true) {
-      bool is_last = !iter->more();
+      // After cancellation no more batches are scheduled, and the current iteration becomes the last one
+      bool is_last = !iter->more() || IsCancelled();
       pwt_index++; nwt_hat_index++;
 
       float apply_weight = iter->apply_weight(op_id);
@@ -1379,6 +1568,7 @@ class ArtmExecutor {
     }
 
     iter->reset();
+    ThrowIfCancelled();
   }
 
   ProcessBatchesArgs* mutable_process_batches_args() {
@@ -1391,6 +1581,7 @@ class ArtmExecutor {
   const std::string& nwt_name_;
 
   MasterComponent* master_component_;
+  int64_t cancel_generation_;
   ProcessBatchesArgs process_batches_args_;
   RegularizeModelArgs regularize_model_args_;
   std::vector<std::shared_ptr<BatchManager>> async_;
@@ -1402,11 +1593,16 @@ class ArtmExecutor {
 
     BatchManager batch_manager;
     LOG(INFO) << DescribeMessage(process_batches_args_);
-    master_component_->RequestProcessBatchesImpl(process_batches_args_,
-                                                 &batch_manager,
-                                                 /* async =*/ false,
-                                                 /* score_manager =*/ score_manager,
-                                                 /* theta_matrix*/ nullptr);
+    try {
+      master_component_->RequestProcessBatchesImpl(process_batches_args_,
+                                                   &batch_manager,
+                                                   /* async =*/ false,
+                                                   /* score_manager =*/ score_manager,
+                                                   /* theta_matrix*/ nullptr);
+    } catch (const OperationCancelled&) {
+      // n_wt contains the counters from all batches processed before cancellation;
+      // the caller finishes current iteration and then reports cancellation (see IsCancelled)
+    }
     process_batches_args_.clear_batch_filename();
   }
 
@@ -1429,11 +1625,24 @@ class ArtmExecutor {
   }
 
   void Await(int operation_id) {
+    // Cancelled operations are not reported here, because the caller must merge
+    // the counters from already processed batches (see IsCancelled)
     while (!async_[operation_id]->IsEverythingProcessed()) {
       boost::this_thread::sleep(boost::posix_time::milliseconds(kIdleLoopFrequency));
     }
   }
 
+  bool IsCancelled() const {
+    return master_component_->instance_->cancel_generation() != cancel_generation_ ||
+           master_component_->instance_->IsOperationCancelled(process_batches_args_.operation_id());
+  }
+
+  void ThrowIfCancelled() const {
+    if (IsCancelled()) {
+      BOOST_THROW_EXCEPTION(OperationCancelled("The operation was cancelled by ArtmCancelOperation"));
+    }
+  }
+
   void Regularize(std::string pwt, std::string nwt, std::string rwt) {
     if (regularize_model_args_.regularizer_settings_size() > 0) {
       regularize_model_args_.set_nwt_source_name(nwt);
@@ -1503,7 +1712,15 @@ void MasterComponent::FitOnline(const FitOnlineMasterModelArgs& args) {
     }
   }
 
+  call_on_destruction forget_operation([&]() {  // NOLINT
+    instance_->ForgetOperation(args.operation_id());
+  });
+
   ArtmExecutor artm_executor(*config, this);
+  if (args.has_operation_id()) {
+    artm_executor.mutable_process_batches_args()->set_operation_id(args.operation_id());
+  }
+
   OnlineBatchesIterator iter(args.batch_filename(), args.batch_weight(), args.update_after(),
                              args.apply_weight(), args.decay_weight());
   if (args.async()) {
@@ -1512,7 +1729,7 @@ void MasterComponent::FitOnline(const FitOnlineMasterModelArgs& args) {
     artm_executor.ExecuteOnlineAlgorithm(&iter);
   }
 
-  ValidateProcessedItems("FitOnline", this);
+  ValidateProcessedItems("FitOnline", *instance_->score_manager());
 }
 
 void MasterComponent::FitOffline(const FitOfflineMasterModelArgs& args) {
@@ -1576,12 +1793,20 @@ void MasterComponent::FitOffline(const FitOfflineMasterModelArgs& args) {
     mutable_args->mutable_batch_weight()->Swap(args2.mutable_batch_weight());
   }
 
+  call_on_destruction forget_operation([&]() {  // NOLINT
+    instance_->ForgetOperation(args.operation_id());
+  });
+
   ArtmExecutor artm_executor(*config, this);
+  if (args.has_operation_id()) {
+    artm_executor.mutable_process_batches_args()->set_operation_id(args.operation_id());
+  }
+
   OfflineBatchesIterator iter(args.batch_filename(), args.batch_weight());
   artm_executor.mutable_process_batches_args()->set_reset_nwt(args.reset_nwt());
   artm_executor.ExecuteOfflineAlgorithm(args.num_collection_passes(), &iter);
 
-  ValidateProcessedItems("FitOffline", this);
+  ValidateProcessedItems("FitOffline", *instance_->score_manager());
 }
 
 }  // namespace core
@@ -47,6 +47,7 @@ class MasterComponent : boost::noncopyable {
   void Request(::artm::MasterModelConfig* result);
   void Request(const GetTopicModelArgs& args, ::artm::TopicModel* result);
   void Request(const GetTopicModelArgs& args, ::artm::TopicModel* result, std::string* external);
+  void Request(const GetTopTokensArgs& args, ::artm::TopTokens* result, std::string* external);
   void Request(const GetThetaMatrixArgs& args, ThetaMatrix* result);
   void Request(const GetThetaMatrixArgs& args, ThetaMatrix* result, std::string* external);
   void Request(const TransformMasterModelArgs& args, ThetaMatrix* result);
@@ -56,6 +57,7 @@ class MasterComponent : boost::noncopyable {
   void Request(const ProcessBatchesArgs& args, ProcessBatchesResult* result);
   void Request(const ProcessBatchesArgs& args, ProcessBatchesResult* result, std::string* external);
   void Request(const GetDictionaryArgs& args, DictionaryData* result);
+  void Request(const GetDictionaryArgs& args, DictionaryArraysInfo* result, std::string* external);
   void Request(const GetMasterComponentInfoArgs& args, MasterComponentInfo* result);
 
   // EXECUTE functionality
@@ -71,10 +73,12 @@ class MasterComponent : boost::noncopyable {
   void FitOnline(const FitOnlineMasterModelArgs& args);
   void FitOffline(const FitOfflineMasterModelArgs& args);
   void FilterDictionary(const FilterDictionaryArgs& args);
+  void MergeDictionary(const MergeDictionaryArgs& args);
   void GatherDictionary(const GatherDictionaryArgs& args);
   void ClearThetaCache(const ClearThetaCacheArgs& args);
   void ClearScoreCache(const ClearScoreCacheArgs& args);
   void ClearScoreArrayCache(const ClearScoreArrayCacheArgs& args);
+  void CancelOperation(const CancelOperationArgs& args);
   void ExportScoreTracker(const ExportScoreTrackerArgs& args);
   void ImportScoreTracker(const ImportScoreTrackerArgs& args);
 
@@ -97,6 +101,7 @@ class MasterComponent : boost::noncopyable {
   void CreateOrReconfigureRegularizer(const RegularizerConfig& config);
 
   void CreateDictionary(const DictionaryData& data);
+  void CreateDictionaryFromArrays(const DictionaryArraysInfo& info, const char* arrays, int64_t length);
 
   void AttachModel(const AttachModelArgs& args, int address_length, float* address);
 
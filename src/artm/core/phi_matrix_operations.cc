@@ -8,6 +8,7 @@
 #include <utility>
 #include <string>
 #include <set>
+#include <thread>  // NOLINT
 
 #include "boost/range/adaptor/map.hpp"
 
@@ -24,7 +25,8 @@ namespace core {
 void PhiMatrixOperations::RetrieveExternalTopicModel(const PhiMatrix& phi_matrix,
                                                      const ::artm::GetTopicModelArgs& get_model_args,
                                                      ::artm::TopicModel* topic_model) {
-  const bool has_sparse_format = (get_model_args.matrix_layout() == MatrixLayout_Sparse);
+  const bool has_sparse_format = (get_model_args.matrix_layout() == MatrixLayout_Sparse ||
+                                   get_model_args.matrix_layout() == MatrixLayout_SparseCsr);
   const bool use_default_class = (get_model_args.class_id_size() == 0);
 
   std::vector<int> tokens_to_use;
@@ -120,6 +122,101 @@ void PhiMatrixOperations::RetrieveExternalTopicModel(const PhiMatrix& phi_matrix
   }
 }
 
+void PhiMatrixOperations::RetrieveTopTokens(const PhiMatrix& phi_matrix,
+                                            const ::artm::GetTopTokensArgs& get_top_tokens_args,
+                                            ::artm::TopTokens* top_tokens, std::string* external,
+                                            int num_threads) {
+  const GetTopTokensArgs& args = get_top_tokens_args;  // short notation
+  if (args.num_tokens() <= 0) {
+    BOOST_THROW_EXCEPTION(artm::core::InvalidOperation("GetTopTokensArgs.num_tokens must be positive"));
+  }
+
+  std::vector<int> tokens_to_use;
+  for (int i = 0; i < phi_matrix.token_size(); ++i) {
+    if (args.class_id_size() == 0 || repeated_field_contains(args.class_id(), phi_matrix.token(i).class_id)) {
+      tokens_to_use.push_back(i);
+    }
+  }
+
+  std::vector<int> topics_to_use;
+  if (args.topic_name_size() != 0) {
+    auto this_topic_name = phi_matrix.topic_name();
+    for (int i = 0; i < args.topic_name_size(); ++i) {
+      int topic_index = repeated_field_index_of(this_topic_name, args.topic_name(i));
+      if (topic_index == -1) {
+        std::stringstream ss;
+        ss << "GetTopTokensArgs.topic_name[" << i << "] == " << args.topic_name(i)
+           << " does not exist in matrix" << phi_matrix.model_name();
+        BOOST_THROW_EXCEPTION(artm::core::InvalidOperation(ss.str()));
+      }
+      topics_to_use.push_back(topic_index);
+    }
+  } else {
+    for (int i = 0; i < phi_matrix.topic_size(); ++i) {
+      topics_to_use.push_back(i);
+    }
+  }
+
+  const int num_topics = static_cast<int>(topics_to_use.size());
+  const int num_tokens = std::min(args.num_tokens(), static_cast<int>(tokens_to_use.size()));
+
+  top_tokens->set_name(phi_matrix.model_name());
+  for (int topic_index : topics_to_use) {
+    top_tokens->add_topic_name(phi_matrix.topic_name(topic_index));
+  }
+  top_tokens->set_num_topics(num_topics);
+  top_tokens->set_num_tokens(num_tokens);
+
+  const int64_t num_values = static_cast<int64_t>(num_topics) * num_tokens;
+  external->resize(num_values * (sizeof(int32_t) + sizeof(float)));
+  if (num_values == 0) {
+    return;
+  }
+
+  int32_t* token_index_ptr = reinterpret_cast<int32_t*>(&(*external)[0]);
+  float* weight_ptr = reinterpret_cast<float*>(&(*external)[num_values * sizeof(int32_t)]);
+
+  // Each topic is handled independently: partial selection of top 'num_tokens' elements
+  // with std::nth_element, followed by sorting of the selected part only.
+  auto func = [&phi_matrix, &tokens_to_use, &topics_to_use, &num_topics, &num_tokens, &num_threads,
+               token_index_ptr, weight_ptr](int thread_index) {
+    std::vector<std::pair<float, int>> buffer(tokens_to_use.size());
+    auto greater = [](const std::pair<float, int>& lhs, const std::pair<float, int>& rhs) {
+      return (lhs.first > rhs.first) || (lhs.first == rhs.first && lhs.second < rhs.second);
+    };
+
+    for (int i = thread_index; i < num_topics; i += num_threads) {
+      const int topic_index = topics_to_use[i];
+      for (unsigned j = 0; j < tokens_to_use.size(); ++j) {
+        buffer[j] = std::make_pair(phi_matrix.get(tokens_to_use[j], topic_index), tokens_to_use[j]);
+      }
+
+      std::nth_element(buffer.begin(), buffer.begin() + (num_tokens - 1), buffer.end(), greater);
+      std::sort(buffer.begin(), buffer.begin() + num_tokens, greater);
+
+      const int64_t offset = static_cast<int64_t>(i) * num_tokens;
+      for (int j = 0; j < num_tokens; ++j) {
+        token_index_ptr[offset + j] = buffer[j].second;
+        weight_ptr[offset + j] = buffer[j].first;
+      }
+    }
+  };
+
+  num_threads = std::max(1, std::min(num_threads, num_topics));
+  if (num_threads == 1) {
+    func(0);
+    return;
+  }
+
+  std::vector<std::thread> workers;
+  for (int i = 0; i < num_threads; ++i) {
+    workers.emplace_back(func, i);
+  }
+  for (auto& worker : workers) {
+    worker.join();
+  }
+}
+
 void PhiMatrixOperations::ApplyTopicModelOperation(const ::artm::TopicModel& topic_model,
                                                    float apply_weight, bool add_missing_tokens,
                                                    PhiMatrix* phi_matrix) {
@@ -25,6 +25,13 @@ class PhiMatrixOperations {
     const PhiMatrix& phi_matrix, const ::artm::GetTopicModelArgs& get_model_args,
     ::artm::TopicModel* topic_model);
 
+  // Find 'num_tokens' tokens with highest p_wt in each topic.
+  // Indices of tokens and their weights are written into 'external' buffer (see ::artm::TopTokens).
+  // Topics are processed in parallel with 'num_threads' threads.
+  static void RetrieveTopTokens(
+    const PhiMatrix& phi_matrix, const ::artm::GetTopTokensArgs& get_top_tokens_args,
+    ::artm::TopTokens* top_tokens, std::string* external, int num_threads);
+
   // Apply protobuf message 'topic_model' to phi_matrix
   static void ApplyTopicModelOperation(
     const ::artm::TopicModel& topic_model, float apply_weight, bool add_missing_tokens, PhiMatrix* phi_matrix);
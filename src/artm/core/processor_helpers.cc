@@ -381,6 +381,46 @@ void ProcessorHelpers::InferPtdwAndUpdateNwtSparse(const ProcessBatchesArgs& arg
   CreateThetaCacheEntry(new_cache_entry_ptr, theta_matrix, batch, p_wt, args);
 }
 
+void ProcessorHelpers::InferThetaForItem(int num_topics,
+                                         const float* phi,
+                                         int num_tokens,
+                                         const int* token_ids,
+                                         const float* token_weights,
+                                         int num_document_passes,
+                                         float* theta) {
+  // Same computations as in the first branch of InferThetaAndUpdateNwtSparse, with no theta regularizers
+  std::vector<float> n_td(num_topics, 0.0f);
+  std::vector<float> r_td(num_topics, 0.0f);
+  NormalizeThetaAgent normalize_agent;
+
+  for (int inner_iter = 0; inner_iter < num_document_passes; ++inner_iter) {
+    std::fill(n_td.begin(), n_td.end(), 0.0f);
+
+    for (int i = 0; i < num_tokens; ++i) {
+      const float* phi_ptr = phi + static_cast<int64_t>(token_ids[i]) * num_topics;
+
+      float p_dw_val = 0.0f;
+      for (int k = 0; k < num_topics; ++k) {
+        p_dw_val += phi_ptr[k] * theta[k];
+      }
+      if (isZero(p_dw_val)) {
+        continue;
+      }
+
+      const float alpha = token_weights[i] / p_dw_val;
+      for (int k = 0; k < num_topics; ++k) {
+        n_td[k] += alpha * phi_ptr[k];
+      }
+    }
+
+    for (int k = 0; k < num_topics; ++k) {
+      theta[k] *= n_td[k];
+    }
+
+    normalize_agent.Apply(/* item_index = */ 0, inner_iter, num_topics, theta, &r_td[0]);
+  }
+}
+
 void ProcessorHelpers::InferThetaAndUpdateNwtSparse(const ProcessBatchesArgs& args,
                                                     const Batch& batch,
                                                     float batch_weight,
@@ -181,6 +181,16 @@ class ProcessorHelpers {
                                            util::Blas* blas,
                                            ThetaMatrix* new_cache_entry_ptr = nullptr);
 
+  // Infers theta of a single item from a dense row-major phi matrix with num_topics columns.
+  // The caller is responsible for the initial values in theta and for the range of token_ids.
+  static void InferThetaForItem(int num_topics,
+                                const float* phi,
+                                int num_tokens,
+                                const int* token_ids,
+                                const float* token_weights,
+                                int num_document_passes,
+                                float* theta);
+
   ProcessorHelpers() = delete;
 };
 
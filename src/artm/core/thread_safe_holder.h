@@ -164,6 +164,30 @@ class ThreadSafeQueue : boost::noncopyable {
     queue_.push(elem);
   }
 
+  void pop_all(std::vector<T>* elems) {
+    boost::lock_guard<boost::mutex> guard(lock_);
+    while (!queue_.empty()) {
+      elems->push_back(queue_.front());
+      queue_.pop();
+    }
+  }
+
+  // Removes the elements that satisfy the predicate, and keeps the order of the remaining elements.
+  template<typename Predicate>
+  void pop_if(Predicate pred, std::vector<T>* elems) {
+    boost::lock_guard<boost::mutex> guard(lock_);
+    std::queue<T> remaining;
+    while (!queue_.empty()) {
+      if (pred(queue_.front())) {
+        elems->push_back(queue_.front());
+      } else {
+        remaining.push(queue_.front());
+      }
+      queue_.pop();
+    }
+    queue_.swap(remaining);
+  }
+
   void reserve() {
     boost::lock_guard<boost::mutex> guard(lock_);
     reserved_++;
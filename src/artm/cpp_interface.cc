@@ -62,6 +62,8 @@ int64_t HandleErrorCode(int64_t artm_error_code) {
       throw DiskReadException(GetLastErrorMessage());
     case ARTM_DISK_WRITE_ERROR:
       throw DiskWriteException(GetLastErrorMessage());
+    case ARTM_OPERATION_CANCELLED:
+      throw OperationCancelledException(GetLastErrorMessage());
     default:
       throw InternalError("Unknown error code");
   }
@@ -125,6 +127,10 @@ CollectionParserInfo ParseCollection(const CollectionParserConfig& config) {
   return ArtmCopyResult<CollectionParserInfo>(length);
 }
 
+void ConvertCoocFile(const ConvertCoocFileArgs& args) {
+  ArtmExecute(args, ArtmConvertCoocFile);
+}
+
 void ConfigureLogging(const ConfigureLoggingArgs& args) {
   ArtmExecute(args, ArtmConfigureLogging);
 }
@@ -275,6 +281,10 @@ void MasterModel::FilterDictionary(const FilterDictionaryArgs& args) {
   ArtmExecute(id_, args, ArtmFilterDictionary);
 }
 
+void MasterModel::MergeDictionary(const MergeDictionaryArgs& args) {
+  ArtmExecute(id_, args, ArtmMergeDictionary);
+}
+
 DictionaryData MasterModel::GetDictionary(const GetDictionaryArgs& args) {
   return ArtmRequest<DictionaryData>(id_, args, ArtmRequestDictionary);
 }
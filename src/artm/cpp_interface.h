@@ -34,6 +34,7 @@ enum ArtmErrorCodes {
   ARTM_INVALID_OPERATION = -6,
   ARTM_DISK_READ_ERROR = -7,
   ARTM_DISK_WRITE_ERROR = -8,
+  ARTM_OPERATION_CANCELLED = -9,
 };
 #endif
 
@@ -53,12 +54,14 @@ DEFINE_EXCEPTION_TYPE(CorruptedMessageException, std::runtime_error);
 DEFINE_EXCEPTION_TYPE(InvalidOperationException, std::runtime_error);
 DEFINE_EXCEPTION_TYPE(DiskReadException, std::runtime_error);
 DEFINE_EXCEPTION_TYPE(DiskWriteException, std::runtime_error);
+DEFINE_EXCEPTION_TYPE(OperationCancelledException, std::runtime_error);
 
 DLL_PUBLIC int64_t HandleErrorCode(int64_t artm_error_code);
 
 #undef DEFINE_EXCEPTION_TYPE
 
 DLL_PUBLIC CollectionParserInfo ParseCollection(const CollectionParserConfig& config);
+DLL_PUBLIC void ConvertCoocFile(const ConvertCoocFileArgs& args);
 DLL_PUBLIC void ConfigureLogging(const ConfigureLoggingArgs& args);
 DLL_PUBLIC Batch LoadBatch(std::string filename);
 
@@ -101,6 +104,7 @@ class DLL_PUBLIC MasterModel {
   // Operations to work with dictionary through disk
   void GatherDictionary(const GatherDictionaryArgs& args);
   void FilterDictionary(const FilterDictionaryArgs& args);
+  void MergeDictionary(const MergeDictionaryArgs& args);
   void ImportDictionary(const ImportDictionaryArgs& args);
   void ExportDictionary(const ExportDictionaryArgs& args);
   void DisposeDictionary(const std::string& dictionary_name);
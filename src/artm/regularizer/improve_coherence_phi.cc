@@ -58,14 +58,14 @@ bool ImproveCoherencePhi::RegularizePhi(const ::artm::core::PhiMatrix& p_wt,
     }
 
     auto cooc_tokens_info = dictionary_ptr->token_cooc_values(token);
-    if (cooc_tokens_info == nullptr) {
+    if (cooc_tokens_info.empty()) {
       continue;
     }
 
     std::vector<float> values(topic_size, 0.0);
-    for (const auto& elem : *cooc_tokens_info) {
-      float mult_coef = elem.second;
-      int cooc_token_index = dict_to_phi_indices[elem.first];
+    for (int i = 0; i < cooc_tokens_info.size(); ++i) {
+      float mult_coef = cooc_tokens_info.value(i);
+      int cooc_token_index = dict_to_phi_indices[cooc_tokens_info.id(i)];
       if (cooc_token_index == -1) {
         continue;
       }
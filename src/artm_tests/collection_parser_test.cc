@@ -1,5 +1,12 @@
 // Copyright 2017, Additive Regularization of Topic Models.
 
+#include <fstream>
+#include <map>
+#include <set>
+#include <sstream>
+#include <string>
+#include <vector>
+
 #include "boost/filesystem.hpp"
 
 #include "gtest/gtest.h"
@@ -49,12 +56,14 @@ TEST(CollectionParser, UciBagOfWords) {
 
   auto dictionary_checker = [&mc, &target_folder] (
     const std::string &path_to_vocab,
-    const std::string &dict_name) -> void {
+    const std::string &dict_name,
+    int num_threads) -> void {
     // first of all, we gather dictionary into the core
     artm::GatherDictionaryArgs gather_config;
     gather_config.set_data_path(target_folder);
     gather_config.set_vocab_file_path(path_to_vocab);
     gather_config.set_dictionary_target_name(dict_name);
+    gather_config.set_num_threads(num_threads);
     mc.GatherDictionary(gather_config);
 
     // next, we retrieve it from the core
@@ -86,9 +95,10 @@ TEST(CollectionParser, UciBagOfWords) {
     ASSERT_APPROX_EQ(dict.token_value(2), 0.5);
   };
 
-  dictionary_checker(config.vocab_file_path(), "default_dictionary");
+  dictionary_checker(config.vocab_file_path(), "default_dictionary", 1);
+  dictionary_checker(config.vocab_file_path(), "parallel_dictionary", 2);
   dictionary_checker((::artm::test::Helpers::getTestDataDir() / "vocab.parser_test_no_newline.txt").string(),
-                     "no_newline_dictionary");
+                     "no_newline_dictionary", 1);
 
   try { fs::remove_all(target_folder); }
   catch (...) { }
@@ -352,4 +362,269 @@ TEST(CollectionParser, TransactionVowpalWabbit) {
   try { fs::remove_all(target_folder); }
   catch (...) {}
 }
+
+// To run this particular test:
+// artm_tests.exe --gtest_filter=CollectionParser.VowpalWabbitPrefilter
+TEST(CollectionParser, VowpalWabbitPrefilter) {
+  std::string target_folder = artm::test::Helpers::getUniqueString();
+  fs::create_directory(target_folder);
+  std::string vw_file = (fs::path(target_folder) / "vw.txt").string();
+  {
+    std::ofstream vw(vw_file);
+    vw << "doc1 a b c a\n";
+    vw << "doc2 b c |author x y\n";
+    vw << "doc3 c:2 a |author y\n";
+  }
+
+  auto parse = [&target_folder, &vw_file](float min_df, float min_tf, int64_t max_memory_usage,
+                                          bool parse_mapped_ranges = false) {
+    std::string output_folder = (fs::path(target_folder) / artm::test::Helpers::getUniqueString()).string();
+
+    ::artm::CollectionParserConfig config;
+    config.set_format(::artm::CollectionParserConfig_CollectionFormat_VowpalWabbit);
+    config.set_target_folder(output_folder);
+    config.set_docword_file_path(vw_file);
+    config.set_num_items_per_batch(2);
+    config.set_num_threads(2);
+    config.set_min_df(min_df);
+    config.set_min_tf(min_tf);
+    config.set_prefilter_max_memory_usage(max_memory_usage);
+    config.set_parse_mapped_ranges(parse_mapped_ranges);
+
+    ::artm::CollectionParserInfo info = ::artm::ParseCollection(config);
+    EXPECT_EQ(info.num_items(), 3);
+
+    std::set<std::string> tokens;
+    for (fs::directory_iterator it(output_folder); it != fs::directory_iterator(); ++it) {
+      ::artm::Batch batch;
+      ::artm::core::Helpers::LoadMessage(it->path().string(), &batch);
+      for (int i = 0; i < batch.token_size(); ++i) {
+        tokens.insert(batch.class_id(i) + ":" + batch.token(i));
+      }
+    }
+    EXPECT_EQ(info.dictionary_size(), tokens.size());
+    return tokens;
+  };
+
+  // df: a = 2, b = 2, c = 3, x = 1, y = 2; tf: a = 3, b = 2, c = 4, x = 1, y = 2
+  std::set<std::string> expected_min_df = { "@default_class:a", "@default_class:b", "@default_class:c", "author:y" };
+  std::set<std::string> expected_min_tf = { "@default_class:a", "@default_class:c" };
+  ASSERT_EQ(parse(2.0f, 0.0f, 0), expected_min_df);
+  ASSERT_EQ(parse(2.0f, 3.0f, 0), expected_min_tf);
+  ASSERT_EQ(parse(2.0f, 0.0f, 0, true), expected_min_df);
+
+  // large enough count-min sketch gives the same result as exact counters
+  ASSERT_EQ(parse(2.0f, 0.0f, 1 << 20), expected_min_df);
+  ASSERT_EQ(parse(2.0f, 3.0f, 1 << 20), expected_min_tf);
+
+  // sketch with a single cell overestimates all counters, but still never drops frequent tokens
+  ASSERT_EQ(parse(2.0f, 0.0f, 1).size(), 5);
+
+  try { fs::remove_all(target_folder); }
+  catch (...) {}
+}
+
+// To run this particular test:
+// artm_tests.exe --gtest_filter=CollectionParser.VowpalWabbitHashing
+TEST(CollectionParser, VowpalWabbitHashing) {
+  std::string target_folder = artm::test::Helpers::getUniqueString();
+  fs::create_directory(target_folder);
+  std::string vw_file = (fs::path(target_folder) / "vw.txt").string();
+  std::string lookup_file = (fs::path(target_folder) / "lookup.txt").string();
+  {
+    std::ofstream vw(vw_file);
+    vw << "doc1 a b c a\n";
+    vw << "doc2 b c |author x y\n";
+    vw << "doc3 c:2 a |author y\n";
+  }
+
+  ::artm::CollectionParserConfig config;
+  config.set_format(::artm::CollectionParserConfig_CollectionFormat_VowpalWabbit);
+  config.set_target_folder((fs::path(target_folder) / "batches").string());
+  config.set_docword_file_path(vw_file);
+  config.set_num_items_per_batch(2);
+  config.set_num_threads(2);
+  config.set_num_hash_buckets(2);
+  config.set_hash_lookup_file_path(lookup_file);
+
+  ::artm::CollectionParserInfo info = ::artm::ParseCollection(config);
+  ASSERT_EQ(info.num_items(), 3);
+  ASSERT_EQ(info.num_tokens(), 11);
+  ASSERT_LE(info.dictionary_size(), 4);
+
+  std::map<std::string, std::string> bucket_of_token;
+  std::ifstream lookup(lookup_file);
+  float total_weight = 0.0f;
+  for (std::string bucket, class_id, token, weight; lookup >> bucket >> class_id >> token >> weight;) {
+    ASSERT_TRUE(bucket == "#0" || bucket == "#1");
+    ASSERT_EQ(bucket_of_token.count(class_id + ":" + token), 0);
+    bucket_of_token[class_id + ":" + token] = bucket;
+    total_weight += std::stof(weight);
+  }
+  ASSERT_EQ(bucket_of_token.size(), 5);
+  ASSERT_EQ(total_weight, info.total_token_weight());
+
+  for (fs::directory_iterator it(config.target_folder()); it != fs::directory_iterator(); ++it) {
+    ::artm::Batch batch;
+    ::artm::core::Helpers::LoadMessage(it->path().string(), &batch);
+    for (int i = 0; i < batch.token_size(); ++i) {
+      ASSERT_TRUE(batch.token(i) == "#0" || batch.token(i) == "#1");
+    }
+
+    // the first item of the collection is 'a b c a'
+    for (const auto& item : batch.item()) {
+      if (item.title() == "doc1") {
+        ASSERT_EQ(item.token_id_size(), 4);
+        ASSERT_EQ(batch.token(item.token_id(0)), bucket_of_token["@default_class:a"]);
+        ASSERT_EQ(batch.token(item.token_id(1)), bucket_of_token["@default_class:b"]);
+        ASSERT_EQ(batch.token(item.token_id(2)), bucket_of_token["@default_class:c"]);
+      }
+    }
+  }
+
+  try { fs::remove_all(target_folder); }
+  catch (...) {}
+}
+
+// To run this particular test:
+// artm_tests.exe --gtest_filter=CollectionParser.VowpalWabbitMappedRanges
+TEST(CollectionParser, VowpalWabbitMappedRanges) {
+  std::string target_folder = artm::test::Helpers::getUniqueString();
+  fs::create_directory(target_folder);
+  std::string vw_file = (fs::path(target_folder) / "vw.txt").string();
+  {
+    std::ofstream vw(vw_file);
+    for (int i = 0; i < 25; ++i) {
+      vw << "doc" << i << " token" << i % 7 << " token" << i % 3 << ":" << i + 1 << " |author author" << i % 5;
+      if (i < 24) {  // the last line without '\n' is skipped in both modes
+        vw << "\n";
+      }
+    }
+  }
+
+  // Returns description of the batches in the order of their names
+  auto parse = [&target_folder](const std::string& docword_file_path, bool parse_mapped_ranges, int num_threads,
+                                ::artm::CollectionParserInfo* info) {
+    std::string output_folder = (fs::path(target_folder) / artm::test::Helpers::getUniqueString()).string();
+
+    ::artm::CollectionParserConfig config;
+    config.set_format(::artm::CollectionParserConfig_CollectionFormat_VowpalWabbit);
+    config.set_target_folder(output_folder);
+    config.set_docword_file_path(docword_file_path);
+    config.set_num_items_per_batch(4);
+    config.set_num_threads(num_threads);
+    config.set_name_type(::artm::CollectionParserConfig_BatchNameType_Code);
+    config.set_parse_mapped_ranges(parse_mapped_ranges);
+    *info = ::artm::ParseCollection(config);
+
+    std::map<std::string, std::string> batches;
+    for (fs::directory_iterator it(output_folder); it != fs::directory_iterator(); ++it) {
+      ::artm::Batch batch;
+      ::artm::core::Helpers::LoadMessage(it->path().string(), &batch);
+      std::stringstream ss;
+      for (const auto& item : batch.item()) {
+        ss << item.id() << " " << item.title() << ":";
+        for (int i = 0; i < item.token_id_size(); ++i) {
+          ss << " " << batch.class_id(item.token_id(i)) << "|" << batch.token(item.token_id(i))
+             << "|" << item.token_weight(i);
+        }
+        ss << "\n";
+      }
+      batches[it->path().filename().string()] = ss.str();
+    }
+    return batches;
+  };
+
+  ::artm::CollectionParserInfo expected_info;
+  auto expected_batches = parse(vw_file, false, 1, &expected_info);
+  ASSERT_EQ(expected_batches.size(), 6);
+  ASSERT_EQ(expected_info.num_items(), 24);
+
+  for (int num_threads : { 1, 2, 3, 8 }) {
+    ::artm::CollectionParserInfo info;
+    ASSERT_EQ(parse(vw_file, true, num_threads, &info), expected_batches);
+    ASSERT_EQ(info.num_items(), expected_info.num_items());
+    ASSERT_EQ(info.num_batches(), expected_info.num_batches());
+    ASSERT_EQ(info.num_tokens(), expected_info.num_tokens());
+    ASSERT_EQ(info.total_token_weight(), expected_info.total_token_weight());
+    ASSERT_EQ(info.dictionary_size(), expected_info.dictionary_size());
+  }
+
+  try { fs::remove_all(target_folder); }
+  catch (...) {}
+}
+
+// To run this particular test:
+// artm_tests.exe --gtest_filter=CollectionParser.Cooccurrences
+TEST(CollectionParser, Cooccurrences) {
+  std::string target_folder = artm::test::Helpers::getUniqueString();
+  fs::create_directory(target_folder);
+  std::string vw_file = (fs::path(target_folder) / "vw.txt").string();
+  std::string vocab_file = (fs::path(target_folder) / "vocab.txt").string();
+  {
+    std::ofstream vw(vw_file);
+    vw << "doc1 a b c a\n";
+    vw << "doc2 b c |author x y\n";
+    vw << "doc3 c:2 a |author y\n";
+    std::ofstream vocab(vocab_file);
+    vocab << "a\nb\nc\nx author\ny author\n";
+  }
+
+  auto read_file = [](const std::string& file_name) {
+    std::ifstream fin(file_name, std::ios::binary);
+    std::stringstream ss;
+    ss << fin.rdbuf();
+    return ss.str();
+  };
+
+  // co-occurrences are merged in memory, in memory with spilling on disk, and on disk only,
+  // in one range of first token ids or in several ones; all the ways should produce the same files
+  std::vector<std::string> cooc_tf, cooc_df, ppmi_tf;
+  for (int num_threads : { 1, 3 }) {
+    for (int64_t max_memory_usage : { static_cast<int64_t>(1) << 30, static_cast<int64_t>(1),
+                                      static_cast<int64_t>(0) }) {
+      std::string output_folder = (fs::path(target_folder) /
+        (std::to_string(num_threads) + "_" + std::to_string(max_memory_usage))).string();
+
+      ::artm::CollectionParserConfig config;
+      config.set_format(::artm::CollectionParserConfig_CollectionFormat_VowpalWabbit);
+      config.set_target_folder(output_folder);
+      config.set_docword_file_path(vw_file);
+      config.set_vocab_file_path(vocab_file);
+      config.set_num_items_per_batch(1);
+      config.set_gather_cooc(true);
+      config.set_gather_cooc_tf(true);
+      config.set_gather_cooc_df(true);
+      config.set_cooc_tf_file_path((fs::path(output_folder) / "cooc_tf.txt").string());
+      config.set_cooc_df_file_path((fs::path(output_folder) / "cooc_df.txt").string());
+      config.set_ppmi_tf_file_path((fs::path(output_folder) / "ppmi_tf.txt").string());
+      config.set_cooc_max_memory_usage(max_memory_usage);
+      config.set_num_threads(num_threads);
+
+      ::artm::ParseCollection(config);
+
+      cooc_tf.push_back(read_file(config.cooc_tf_file_path()));
+      cooc_df.push_back(read_file(config.cooc_df_file_path()));
+      ppmi_tf.push_back(read_file(config.ppmi_tf_file_path()));
+
+      // temporary files of ranges are removed
+      for (fs::directory_iterator it(output_folder); it != fs::directory_iterator(); ++it) {
+        ASSERT_NE(it->path().extension(), ".tmp");
+      }
+    }
+  }
+
+  // pairs are symmetric, so only <u v> with u < v are written
+  ASSERT_EQ(cooc_tf[0], "a b:2 c:3 \nb c:2 \n|author x y:1 \n");
+  ASSERT_EQ(cooc_df[0], "a b:1 c:2 \nb c:2 \n|author x y:1 \n");
+  ASSERT_FALSE(ppmi_tf[0].empty());
+  for (unsigned i = 1; i < cooc_tf.size(); ++i) {
+    ASSERT_EQ(cooc_tf[i], cooc_tf[0]);
+    ASSERT_EQ(cooc_df[i], cooc_df[0]);
+    ASSERT_EQ(ppmi_tf[i], ppmi_tf[0]);
+  }
+
+  try { fs::remove_all(target_folder); }
+  catch (...) {}
+}
 // vim: set ts=2 sw=2 sts=2:
@@ -0,0 +1,349 @@
+// Copyright 2017, Additive Regularization of Topic Models.
+
+#include <chrono>  // NOLINT
+#include <fstream>
+#include <iostream>
+#include <random>
+#include <string>
+
+#include "boost/filesystem.hpp"
+#include "boost/lexical_cast.hpp"
+#include "boost/uuid/uuid_generators.hpp"
+#include "boost/uuid/uuid_io.hpp"
+
+#include "gtest/gtest.h"
+
+#include "artm/core/cooc_file.h"
+#include "artm/core/dictionary.h"
+#include "artm/core/dictionary_operations.h"
+#include "artm/core/exceptions.h"
+#include "artm/utility/memory_usage.h"
+
+using ::artm::core::CoocFile;
+using ::artm::core::CoocFileWriter;
+using ::artm::core::CoocMap;
+using ::artm::core::CoocMatrix;
+using ::artm::core::CoocRow;
+using ::artm::core::Dictionary;
+using ::artm::core::DictionaryEntry;
+using ::artm::core::Token;
+
+namespace {
+
+CoocMap GenerateCoocMap(int num_tokens, int num_cooc_per_token) {
+  std::mt19937 generator(123);
+  std::uniform_int_distribution<int> token_distribution(0, num_tokens - 1);
+  std::uniform_real_distribution<float> value_distribution(0.0f, 1.0f);
+
+  CoocMap cooc_map;
+  for (int index_1 = 0; index_1 < num_tokens; ++index_1) {
+    auto& row = cooc_map[index_1];
+    for (int i = 0; i < num_cooc_per_token; ++i) {
+      row.insert(std::make_pair(token_distribution(generator), value_distribution(generator)));
+    }
+  }
+  return cooc_map;
+}
+
+int64_t GetCoocMapByteSize(const CoocMap& cooc_map) {
+  int64_t retval = ::artm::utility::getMemoryUsage(cooc_map);
+  for (const auto& entry : cooc_map) {
+    retval += ::artm::utility::getMemoryUsage(entry.second);
+  }
+  return retval;
+}
+
+}  // namespace
+
+// artm_tests.exe --gtest_filter=Dictionary.*
+TEST(Dictionary, CoocMatrix) {
+  CoocMap cooc_map;
+  cooc_map[0][5] = 1.0f;
+  cooc_map[0][2] = 2.0f;
+  cooc_map[0][7] = 3.0f;
+  cooc_map[3][0] = 4.0f;
+
+  CoocMatrix cooc_matrix;
+  cooc_matrix.Build(cooc_map, 5);
+  EXPECT_EQ(cooc_matrix.num_rows(), 5);
+  EXPECT_EQ(cooc_matrix.num_nonzeros(), 4);
+
+  CoocRow row = cooc_matrix.row(0);
+  ASSERT_EQ(row.size(), 3);
+  EXPECT_EQ(row.id(0), 2);
+  EXPECT_EQ(row.id(1), 5);
+  EXPECT_EQ(row.id(2), 7);
+  EXPECT_EQ(row.value(0), 2.0f);
+  ASSERT_NE(row.find(7), nullptr);
+  EXPECT_EQ(*row.find(7), 3.0f);
+  EXPECT_EQ(row.find(3), nullptr);
+
+  EXPECT_TRUE(cooc_matrix.row(1).empty());
+  EXPECT_TRUE(cooc_matrix.row(4).empty());
+  EXPECT_TRUE(cooc_matrix.row(10).empty());
+  EXPECT_EQ(cooc_matrix.row(3).size(), 1);
+}
+
+TEST(Dictionary, Freeze) {
+  Dictionary dictionary("dict");
+  dictionary.AddEntry(DictionaryEntry(Token("@default_class", "a"), 0.5f, 1.0f, 1.0f));
+  dictionary.AddEntry(DictionaryEntry(Token("@default_class", "b"), 0.5f, 1.0f, 1.0f));
+  dictionary.AddEntry(DictionaryEntry(Token("@default_class", "c"), 0.5f, 1.0f, 1.0f));
+  dictionary.AddCoocValue(0, 1, 2.0f);
+  dictionary.AddCoocValue(0, 2, 3.0f);
+  dictionary.AddCoocValue(1, 0, 2.0f);
+
+  EXPECT_TRUE(dictionary.token_cooc_values(Token("@default_class", "a")).empty());
+  dictionary.Freeze();
+  EXPECT_TRUE(dictionary.is_frozen());
+
+  CoocRow row = dictionary.token_cooc_values(Token("@default_class", "a"));
+  ASSERT_EQ(row.size(), 2);
+  EXPECT_EQ(*row.find(2), 3.0f);
+  EXPECT_TRUE(dictionary.token_cooc_values(Token("@default_class", "c")).empty());
+  EXPECT_TRUE(dictionary.token_cooc_values(Token("@default_class", "d")).empty());
+
+  std::vector<Token> tokens = { Token("@default_class", "a"), Token("@default_class", "b") };
+  EXPECT_EQ(dictionary.CountTopicCoherence(tokens), 2.0f);
+
+  ASSERT_THROW(dictionary.AddCoocValue(2, 0, 1.0f), ::artm::core::InvalidOperation);
+}
+
+// Compares memory usage and lookup latency of CoocMap and CoocMatrix.
+TEST(Dictionary, CoocMatrixBenchmark) {
+  const int num_tokens = 20000;
+  const int num_cooc_per_token = 50;
+  CoocMap cooc_map = GenerateCoocMap(num_tokens, num_cooc_per_token);
+
+  CoocMatrix cooc_matrix;
+  auto build_start = std::chrono::high_resolution_clock::now();
+  cooc_matrix.Build(cooc_map, num_tokens);
+  auto build_time = std::chrono::duration_cast<std::chrono::milliseconds>(
+    std::chrono::high_resolution_clock::now() - build_start);
+
+  std::mt19937 generator(456);
+  std::uniform_int_distribution<int> token_distribution(0, num_tokens - 1);
+  const int num_queries = 1000000;
+  std::vector<std::pair<int, int> > queries;
+  for (int i = 0; i < num_queries; ++i) {
+    queries.push_back(std::make_pair(token_distribution(generator), token_distribution(generator)));
+  }
+
+  double map_sum = 0.0;
+  auto map_start = std::chrono::high_resolution_clock::now();
+  for (const auto& query : queries) {
+    auto row_iter = cooc_map.find(query.first);
+    if (row_iter == cooc_map.end()) {
+      continue;
+    }
+    auto value_iter = row_iter->second.find(query.second);
+    if (value_iter != row_iter->second.end()) {
+      map_sum += value_iter->second;
+    }
+  }
+  auto map_time = std::chrono::duration_cast<std::chrono::milliseconds>(
+    std::chrono::high_resolution_clock::now() - map_start);
+
+  double matrix_sum = 0.0;
+  auto matrix_start = std::chrono::high_resolution_clock::now();
+  for (const auto& query : queries) {
+    const float* value = cooc_matrix.row(query.first).find(query.second);
+    if (value != nullptr) {
+      matrix_sum += *value;
+    }
+  }
+  auto matrix_time = std::chrono::duration_cast<std::chrono::milliseconds>(
+    std::chrono::high_resolution_clock::now() - matrix_start);
+
+  double map_scan_sum = 0.0;
+  auto map_scan_start = std::chrono::high_resolution_clock::now();
+  for (int index = 0; index < num_tokens; ++index) {
+    for (const auto& elem : cooc_map[index]) {
+      map_scan_sum += elem.second;
+    }
+  }
+  auto map_scan_time = std::chrono::duration_cast<std::chrono::milliseconds>(
+    std::chrono::high_resolution_clock::now() - map_scan_start);
+
+  double matrix_scan_sum = 0.0;
+  auto matrix_scan_start = std::chrono::high_resolution_clock::now();
+  for (int index = 0; index < num_tokens; ++index) {
+    CoocRow row = cooc_matrix.row(index);
+    for (int i = 0; i < row.size(); ++i) {
+      matrix_scan_sum += row.value(i);
+    }
+  }
+  auto matrix_scan_time = std::chrono::duration_cast<std::chrono::milliseconds>(
+    std::chrono::high_resolution_clock::now() - matrix_scan_start);
+
+  int64_t map_bytes = GetCoocMapByteSize(cooc_map);
+  int64_t matrix_bytes = cooc_matrix.ByteSize();
+
+  std::cout << "Co-occurrences: " << cooc_matrix.num_nonzeros() << ", build time: "
+            << build_time.count() << " ms\n"
+            << "CoocMap:    " << map_bytes << " bytes, " << num_queries << " lookups in "
+            << map_time.count() << " ms, full scan in " << map_scan_time.count() << " ms\n"
+            << "CoocMatrix: " << matrix_bytes << " bytes, " << num_queries << " lookups in "
+            << matrix_time.count() << " ms, full scan in " << matrix_scan_time.count() << " ms\n";
+
+  EXPECT_EQ(map_sum, matrix_sum);
+  EXPECT_NEAR(map_scan_sum, matrix_scan_sum, 1e-6 * map_scan_sum);
+  EXPECT_LT(matrix_bytes, map_bytes);
+}
+
+// artm_tests.exe --gtest_filter=CoocFile.*
+TEST(CoocFile, WriteAndMap) {
+  std::string target_folder = boost::lexical_cast<std::string>(boost::uuids::random_generator()());
+  boost::filesystem::create_directory(target_folder);
+  std::string file_name = (boost::filesystem::path(target_folder) / "cooc.bin").string();
+
+  {
+    // upper triangle of symmetric matrix, the writer adds mirrored elements
+    CoocFileWriter writer(file_name, 4, /* symmetric = */ true);
+    writer.AddRow(0, { 1, 3 }, { 1.0f, 3.0f });
+    writer.AddRow(2, { 2, 3 }, { 5.0f, 6.0f });
+    ASSERT_THROW(writer.AddRow(1, { 2 }, { 1.0f }), ::artm::core::InvalidOperation);
+    writer.Close();
+  }
+
+  ASSERT_TRUE(CoocFile::IsCoocFile(file_name));
+  CoocMatrix cooc_matrix = CoocFile::Map(file_name);
+  EXPECT_EQ(cooc_matrix.num_rows(), 4);
+  EXPECT_EQ(cooc_matrix.num_nonzeros(), 7);
+  EXPECT_EQ(cooc_matrix.ByteSize(), 0);
+
+  CoocRow row = cooc_matrix.row(3);
+  ASSERT_EQ(row.size(), 2);
+  EXPECT_EQ(row.id(0), 0);
+  EXPECT_EQ(row.value(0), 3.0f);
+  EXPECT_EQ(row.id(1), 2);
+  EXPECT_EQ(row.value(1), 6.0f);
+  EXPECT_EQ(*cooc_matrix.row(1).find(0), 1.0f);
+  EXPECT_EQ(*cooc_matrix.row(2).find(2), 5.0f);
+
+  // the mapping is kept alive by the dictionary
+  Dictionary dictionary("dict");
+  for (const std::string& keyword : { "a", "b", "c", "d" }) {
+    dictionary.AddEntry(DictionaryEntry(Token("@default_class", keyword), 0.25f, 1.0f, 1.0f));
+  }
+  dictionary.SetCoocValues(CoocFile::Map(file_name));
+  dictionary.Freeze();
+  EXPECT_EQ(dictionary.token_cooc_values(Token("@default_class", "a")).size(), 2);
+
+  // text file is converted into the same binary representation
+  std::string vocab_file_name = (boost::filesystem::path(target_folder) / "vocab.txt").string();
+  std::string text_file_name = (boost::filesystem::path(target_folder) / "cooc.txt").string();
+  std::string converted_file_name = (boost::filesystem::path(target_folder) / "converted.bin").string();
+  std::ofstream(vocab_file_name) << "a\nb\nc\nd\n";
+  std::ofstream(text_file_name) << "a b:1 d:3\nc c:5 d:6\n";
+  EXPECT_FALSE(CoocFile::IsCoocFile(text_file_name));
+
+  ::artm::ConvertCoocFileArgs args;
+  args.set_source_file_path(text_file_name);
+  args.set_target_file_path(converted_file_name);
+  args.set_vocab_file_path(vocab_file_name);
+  args.set_symmetric_cooc_values(true);
+  ::artm::core::DictionaryOperations::ConvertCoocFile(args);
+
+  CoocMatrix converted_matrix = CoocFile::Map(converted_file_name);
+  ASSERT_EQ(converted_matrix.num_nonzeros(), cooc_matrix.num_nonzeros());
+  for (int index = 0; index < cooc_matrix.num_rows(); ++index) {
+    CoocRow expected_row = cooc_matrix.row(index);
+    CoocRow converted_row = converted_matrix.row(index);
+    ASSERT_EQ(expected_row.size(), converted_row.size());
+    for (int i = 0; i < expected_row.size(); ++i) {
+      EXPECT_EQ(expected_row.id(i), converted_row.id(i));
+      EXPECT_EQ(expected_row.value(i), converted_row.value(i));
+    }
+  }
+
+  try { boost::filesystem::remove_all(target_folder); }
+  catch (...) { }
+}
+
+// artm_tests.exe --gtest_filter=Dictionary.Merge
+TEST(Dictionary, Merge) {
+  const Token a("@default_class", "a"), b("@default_class", "b"), c("@default_class", "c"), x("author", "x");
+
+  auto first = std::make_shared<Dictionary>("first");
+  first->SetNumItems(2);
+  first->AddEntry(DictionaryEntry(a, 0.0f, 2.0f, 1.0f));
+  first->AddEntry(DictionaryEntry(b, 0.0f, 1.0f, 1.0f));
+  first->AddEntry(DictionaryEntry(x, 0.0f, 1.0f, 1.0f));
+  first->AddCoocValue(a, b, 1.0f);
+  first->AddCoocValue(b, a, 1.0f);
+  first->Freeze();
+
+  auto second = std::make_shared<Dictionary>("second");
+  second->SetNumItems(3);
+  second->AddEntry(DictionaryEntry(b, 0.0f, 3.0f, 2.0f));
+  second->AddEntry(DictionaryEntry(c, 0.0f, 1.0f, 1.0f));
+  second->AddCoocValue(b, c, 2.0f);
+  second->AddCoocValue(c, b, 2.0f);
+  second->AddCoocValue(b, b, 4.0f);
+  second->Freeze();
+
+  ::artm::MergeDictionaryArgs args;
+  args.set_dictionary_target_name("merged");
+  auto merged = ::artm::core::DictionaryOperations::Merge(args, { first, second });
+  merged->Freeze();
+
+  ASSERT_EQ(merged->size(), 4);
+  EXPECT_EQ(merged->num_items(), 5);
+  EXPECT_EQ(merged->entry(0)->token(), a);
+  EXPECT_EQ(merged->entry(1)->token(), b);
+  EXPECT_EQ(merged->entry(2)->token(), x);
+  EXPECT_EQ(merged->entry(3)->token(), c);
+  EXPECT_EQ(merged->entry(b)->token_tf(), 4.0f);
+  EXPECT_EQ(merged->entry(b)->token_df(), 3.0f);
+  EXPECT_FLOAT_EQ(merged->entry(a)->token_value(), 2.0f / 7.0f);
+  EXPECT_FLOAT_EQ(merged->entry(b)->token_value(), 4.0f / 7.0f);
+  EXPECT_FLOAT_EQ(merged->entry(x)->token_value(), 1.0f);  // values are normalized within each modality
+  EXPECT_TRUE(merged->cooc_values().empty());
+
+  // co-occurrences are summed only on request
+  args.set_merge_cooc(true);
+  merged = ::artm::core::DictionaryOperations::Merge(args, { first, second, second });
+  merged->Freeze();
+  EXPECT_EQ(merged->num_items(), 8);
+  EXPECT_EQ(merged->cooc_values().num_nonzeros(), 5);
+  EXPECT_EQ(*merged->token_cooc_values(a).find(1), 1.0f);
+  EXPECT_EQ(*merged->token_cooc_values(b).find(0), 1.0f);
+  EXPECT_EQ(*merged->token_cooc_values(b).find(1), 8.0f);
+  EXPECT_EQ(*merged->token_cooc_values(b).find(3), 4.0f);
+  EXPECT_EQ(*merged->token_cooc_values(c).find(1), 4.0f);
+}
+
+// artm_tests.exe --gtest_filter=Dictionary.Arrays
+TEST(Dictionary, Arrays) {
+  Dictionary dictionary("dictionary");
+  dictionary.SetNumItems(7);
+  dictionary.AddEntry(DictionaryEntry(Token("@default_class", "a"), 0.25f, 1.0f, 1.0f));
+  dictionary.AddEntry(DictionaryEntry(Token("author", "b"), 1.0f, 3.0f, 2.0f));
+  dictionary.AddEntry(DictionaryEntry(Token("@default_class", "cc"), 0.75f, 3.0f, 3.0f));
+
+  ::artm::DictionaryArraysInfo info;
+  std::string arrays;
+  ::artm::core::DictionaryOperations::StoreIntoArrays(dictionary, &info, &arrays);
+  ASSERT_EQ(info.num_entries(), 3);
+  ASSERT_EQ(info.class_id_size(), 2);
+  EXPECT_EQ(info.num_items_in_collection(), 7);
+  EXPECT_EQ(info.tokens_length(), 7);
+  ASSERT_EQ(arrays.size(), 3 * 16 + 7);
+  EXPECT_EQ(arrays.substr(3 * 16), std::string("a\0b\0cc\0", 7));
+
+  info.set_name("restored");
+  auto restored = ::artm::core::DictionaryOperations::CreateFromArrays(info, arrays.c_str(), arrays.size());
+  EXPECT_EQ(restored->name(), "restored");
+  EXPECT_EQ(restored->num_items(), 7);
+  ASSERT_EQ(restored->size(), 3);
+  for (int i = 0; i < 3; ++i) {
+    EXPECT_EQ(restored->entry(i)->token(), dictionary.entry(i)->token());
+    EXPECT_EQ(restored->entry(i)->token_value(), dictionary.entry(i)->token_value());
+    EXPECT_EQ(restored->entry(i)->token_tf(), dictionary.entry(i)->token_tf());
+    EXPECT_EQ(restored->entry(i)->token_df(), dictionary.entry(i)->token_df());
+  }
+
+  EXPECT_THROW(::artm::core::DictionaryOperations::CreateFromArrays(info, arrays.c_str(), arrays.size() - 1),
+               ::artm::core::InvalidOperation);
+}
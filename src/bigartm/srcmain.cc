@@ -304,6 +304,7 @@ struct artm_options {
   std::string write_cooc_df;
   std::string write_ppmi_tf;
   std::string write_ppmi_df;
+  bool write_cooc_binary;
   std::string write_class_predictions;
   std::string write_scores;
   std::string write_vw_corpus;
@@ -1129,6 +1130,9 @@ class BatchVectorizer {
         if (!options_.write_ppmi_df.empty()) {
           collection_parser_config.set_ppmi_df_file_path(options_.write_ppmi_df);
         }
+        if (options_.write_cooc_binary) {
+          collection_parser_config.set_cooc_file_format(CollectionParserConfig_CoocFileFormat_Binary);
+        }
 
         collection_parser_config.set_gather_cooc_tf(collection_parser_config.has_cooc_tf_file_path() ||
                                                     collection_parser_config.has_ppmi_tf_file_path());
@@ -1397,6 +1401,9 @@ int execute(const artm_options& options, int argc, char* argv[]) {
     ::artm::GatherDictionaryArgs gather_dictionary_args;
     gather_dictionary_args.set_dictionary_target_name(options.main_dictionary_name);
     gather_dictionary_args.set_data_path(batch_vectorizer.batch_folder());
+    if (options.threads > 0) {
+      gather_dictionary_args.set_num_threads(options.threads);
+    }
 
     if (!options.read_cooc.empty()) {
       gather_dictionary_args.set_cooc_file_path(options.read_cooc);
@@ -1798,6 +1805,7 @@ int main(int argc, char * argv[]) {
       ("write-cooc-df", po::value(&options.write_cooc_df)->default_value(""), "save dictionary of co-occurrences with number of documents in which every specific pair occured together")
       ("write-ppmi-tf", po::value(&options.write_ppmi_tf)->default_value(""), "save values of positive pmi of pairs of tokens from cooc_tf dictionary")
       ("write-ppmi-df", po::value(&options.write_ppmi_df)->default_value(""), "save values of positive pmi of pairs of tokens from cooc_df dictionary")
+      ("write-cooc-binary", po::bool_switch(&options.write_cooc_binary)->default_value(false), "save co-occurrences and ppmi in binary format, that can be memory-mapped by --read-cooc")
       ("save-model", po::value(&options.save_model)->default_value(""), "save the model to binary file after processing")
       ("save-batches", po::value(&options.save_batches)->default_value(""), "batch folder")
       ("save-dictionary", po::value(&options.save_dictionary)->default_value(""), "filename of dictionary file")